@@ -1,4 +1,5 @@
 import sys
+import threading
 from pathlib import Path
 import streamlit as st
 
@@ -10,28 +11,58 @@ cache_resource = getattr(st, "cache_resource", st.experimental_singleton)
 
 from src import config
 from src.logging_config import setup_logging
-from src.storage.sqlite import init_db, list_jobs, list_resumes
-from src.storage.vectordb import get_chroma_client, get_or_create_collection
+from src.storage.migrations import run_backfills
+from src.storage.sqlite import init_db
+from src.storage.vectordb import lazy_collection
 from src.agents.resume_ingest import ResumeIngestAgent
 from src.agents.job_scout import JobScoutAgent
 from src.agents.match_rank import MatchRankAgent
-from src.tools.job_sources import get_sources_from_env
-from src.llm import embed, get_active_config
+from src.llm import get_residency_manager
+from src.status import get_status_service
+from src.tasks import TaskWorker, agent_handlers
 
 setup_logging()
 
 
 @cache_resource
 def load_collections():
-    jobs_client = get_chroma_client(config.VDB_JOBS_DIR)
-    resumes_client = get_chroma_client(config.VDB_RESUMES_DIR)
+    """Job and resume collections; each Chroma store is opened by its first query, not here."""
     return (
-        get_or_create_collection(jobs_client, "jobs"),
-        get_or_create_collection(resumes_client, "resumes"),
+        lazy_collection(config.VDB_JOBS_DIR, "jobs"),
+        lazy_collection(config.VDB_RESUMES_DIR, "resumes"),
     )
 
 
+@cache_resource
+def start_backfills():
+    """Finish schema backfills off the request path, once per server process."""
+    thread = threading.Thread(target=run_backfills, name="schema-backfill", daemon=True)
+    thread.start()
+    return thread
+
+
+@cache_resource
+def preload_models():
+    """Load the embed/chat models once per server process so first clicks don't wait on it."""
+    if config.OLLAMA_PRELOAD:
+        get_residency_manager().preload(background=True)
+    return True
+
+
+@cache_resource
+def start_task_worker():
+    """Run queued tasks on worker threads of the server process (not the page's script thread),
+    so they outlive page reruns and browser refreshes. Off when ``scripts/worker.py`` runs them."""
+    if not config.TASK_INPROCESS_WORKER:
+        return None
+    init_db(backfill=False)
+    jobs_col, resumes_col = load_collections()
+    return TaskWorker(agent_handlers(jobs_col, resumes_col)).start()
+
+
 def ensure_agents():
+    preload_models()
+    start_task_worker()
     if "agents" not in st.session_state:
         jobs_col, resumes_col = load_collections()
         st.session_state.agents = {
@@ -43,21 +74,25 @@ def ensure_agents():
 
 def sidebar_status():
     st.sidebar.header("System Status")
-    cfg = get_active_config()
-    try:
-        embed("ping")
-        st.sidebar.success(f"{cfg.provider.title()} reachable")
-    except Exception as exc:  # pragma: no cover
-        st.sidebar.error(f"LLM issue: {exc}")
-    st.sidebar.write(f"Resumes: {len(list_resumes())}")
-    st.sidebar.write(f"Jobs: {len(list_jobs())}")
-    st.sidebar.write(f"Sources: {[s.name for s in get_sources_from_env()]}")
+    status = get_status_service()
+    health = status.llm_health()
+    if health.ok is None:
+        st.sidebar.info(f"{health.provider.title()}: checking…")
+    elif health.ok:
+        st.sidebar.success(health.detail)
+    else:
+        st.sidebar.error(f"LLM issue: {health.detail}")
+    counts = status.counts()
+    st.sidebar.write(f"Resumes: {counts['resumes']}")
+    st.sidebar.write(f"Jobs: {counts['jobs']}")
+    st.sidebar.write(f"Sources: {status.sources()}")
 
 
 def main():
     st.set_page_config(page_title="Local Job Dashboard", page_icon="🧭", layout="wide")
     st.title("Local Agentic Job Dashboard")
-    init_db()
+    init_db(backfill=False)
+    start_backfills()
     ensure_agents()
     sidebar_status()
     st.write("Use the sidebar to navigate pages: Resumes, Job Search, Match & Rank, Settings & Logs.")
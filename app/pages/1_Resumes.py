@@ -1,3 +1,4 @@
+import hashlib
 import sys
 from pathlib import Path
 
@@ -9,8 +10,10 @@ if str(PROJECT_ROOT) not in sys.path:
 
 import app  # noqa: F401  # ensure project root is on sys.path
 from app.app import ensure_agents, load_collections
+from src import config
 from src.storage import vectordb
 from src.storage.sqlite import list_resumes
+from src.tasks import enqueue, get_task, list_tasks
 
 
 ensure_agents()
@@ -20,11 +23,47 @@ resumes_col = load_collections()[1]
 st.title("Resumes")
 uploaded = st.file_uploader("Upload resume", type=["pdf", "docx", "txt"])
 if uploaded and st.button("Ingest"):
-    path = f"/tmp/{uploaded.name}"
-    with open(path, "wb") as f:
-        f.write(uploaded.getbuffer())
-    resume_id = st.session_state.agents["resume"].ingest(path)
-    st.success(f"Ingested resume: {uploaded.name} ({resume_id})")
+    # The worker may run in another process, so keep the upload where it can read it; one copy
+    # per file content (the ingest itself returns the existing resume for a known file).
+    upload_dir = Path(config.UPLOAD_DIR) / hashlib.sha256(uploaded.getbuffer()).hexdigest()
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    path = upload_dir / Path(uploaded.name).name
+    if not path.exists():
+        path.write_bytes(uploaded.getbuffer())
+    st.session_state.ingest_task_id = enqueue("ingest", {"path": str(path), "filename": uploaded.name})
+if "ingest_task_id" not in st.session_state:
+    recent = list_tasks(kind="ingest", limit=1)
+    st.session_state.ingest_task_id = recent[0]["task_id"] if recent else None
+
+
+def _ingest_progress() -> None:
+    task_id = st.session_state.get("ingest_task_id")
+    task = get_task(task_id) if task_id else None
+    if task is None:
+        return
+    filename = task["params"].get("filename")
+    progress = task["progress"] or {}
+    if task["status"] == "done":
+        if st.session_state.get("ingest_task_seen") != task_id:
+            st.session_state.ingest_task_seen = task_id
+            st.rerun()
+        st.success(f"Ingested resume: {filename} ({task['result']['resume_id']})")
+    elif task["status"] == "failed":
+        st.error(f"Ingest of {filename} failed: {task['error']}")
+    elif task["status"] == "queued":
+        st.info(f"Ingest of {filename} is queued…")
+    elif progress.get("stage") == "embed":
+        st.info(f"Ingesting {filename}: embedded {progress['embedded']}/{progress['chunks']} chunks")
+    else:
+        st.info(f"Ingesting {filename}: {progress.get('stage', 'starting')}…")
+
+
+if hasattr(st, "fragment"):
+    st.fragment(run_every=2)(_ingest_progress)()
+else:  # older Streamlit fallback
+    _ingest_progress()
+    if st.button("Refresh ingest progress"):
+        st.rerun()
 
 resumes = list_resumes()
 resume_map = {r["resume_id"]: r for r in resumes}
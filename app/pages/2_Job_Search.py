@@ -1,4 +1,5 @@
 import sys
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import streamlit as st
@@ -9,16 +10,149 @@ if str(PROJECT_ROOT) not in sys.path:
 
 import app  # noqa: F401  # ensure project root is on sys.path
 from app.app import ensure_agents
-from src.storage.sqlite import list_jobs
+from src.refresh import add_saved_query, remove_saved_query
+from src.storage.sqlite import (
+    JOB_SORTS,
+    browse_jobs,
+    count_jobs,
+    job_facets,
+    list_refresh_targets,
+    list_saved_queries,
+)
+from src.tasks import enqueue, get_task, list_tasks
+
+cache_data = getattr(st, "cache_data", st.experimental_memo)
 
 ensure_agents()
 
+
+@cache_data(ttl=60, show_spinner=False)
+def job_facets_cached():
+    return job_facets()
+
+
 st.title("Job Search")
 query = st.text_input("Search query")
 limit = st.slider("Limit per source", 5, 100, 20)
-if st.button("Run JobScout") and query:
-    summary = st.session_state.agents["jobs"].run_search(query, limit_per_source=limit)
-    st.success(summary)
+col_run, col_save, _ = st.columns([1, 2, 4])
+if col_run.button("Run JobScout") and query:
+    st.session_state.search_task_id = enqueue("run_search", {"query": query, "limit_per_source": limit})
+if col_save.button("Save for scheduled refresh", help="Refreshed per board by scripts/refresh.py") and query:
+    add_saved_query(query, limit)
+    st.success(f"Saved \"{query}\" for scheduled refresh")
+if "search_task_id" not in st.session_state:
+    # After a reconnect, pick up the most recent search again.
+    recent = list_tasks(kind="run_search", limit=1)
+    st.session_state.search_task_id = recent[0]["task_id"] if recent else None
+
+
+def _search_progress() -> None:
+    task_id = st.session_state.get("search_task_id")
+    task = get_task(task_id) if task_id else None
+    if task is None:
+        return
+    query_text = task["params"].get("query")
+    progress = task["progress"] or {}
+    if task["status"] == "done":
+        if st.session_state.get("search_task_seen") != task_id:
+            st.session_state.search_task_seen = task_id
+            job_facets_cached.clear()
+            st.rerun()
+        st.success(f"Search \"{query_text}\" added {task['result']['added']} jobs: {task['result']['summary']}")
+        return
+    if task["status"] == "failed":
+        st.error(f"Search \"{query_text}\" failed: {task['error']}")
+        return
+    if task["status"] == "queued":
+        st.info(f"Search \"{query_text}\" is queued…")
+        return
+    current = progress.get("current")
+    st.info(f"Searching \"{query_text}\"… {progress.get('embedded', 0)} jobs embedded" + (f" (now: {current})" if current else ""))
+    if progress.get("sources"):
+        st.table([{"source": name, **counts} for name, counts in progress["sources"].items()])
+
+
+if hasattr(st, "fragment"):
+    st.fragment(run_every=2)(_search_progress)()
+else:  # older Streamlit fallback
+    _search_progress()
+    if st.button("Refresh search progress"):
+        st.rerun()
+
+with st.expander("Scheduled refresh"):
+    saved = [row["query"] for row in list_saved_queries()]
+    if not saved:
+        st.caption("No saved queries yet.")
+    else:
+        removed = st.selectbox("Saved queries", saved)
+        if st.button("Stop refreshing"):
+            remove_saved_query(removed)
+            st.rerun()
+
+        def _when(ts):
+            return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else ""
+
+        st.dataframe(
+            [
+                {
+                    "source": row["source"],
+                    "board": row["board"],
+                    "query": row["query"],
+                    "every (h)": round((row["interval_s"] or 0) / 3600, 1),
+                    "last seen": _when(row["last_seen_at"]),
+                    "last changed": _when(row["last_changed_at"]),
+                    "next": _when(row["next_due_at"]),
+                    "error": row["last_error"] or "",
+                }
+                for row in list_refresh_targets()
+            ],
+            use_container_width=True,
+        )
+
+st.subheader("Browse jobs")
+facets = job_facets_cached()
+col_text, col_location, col_source, col_company = st.columns([3, 2, 1, 2])
+text = col_text.text_input("Contains", help="Matches title, company, location and description (word prefixes).")
+location = col_location.text_input("Location")
+source = col_source.selectbox("Source", ["All"] + facets["sources"])
+company = col_company.selectbox("Company", ["All"] + facets["companies"])
+col_dates, col_sort, col_order, col_size = st.columns([3, 2, 1, 1])
+use_dates = col_dates.checkbox("Filter by posted date")
+posted = col_dates.date_input(
+    "Posted between", value=(date.today() - timedelta(days=30), date.today()), disabled=not use_dates
+)
+sort = col_sort.selectbox("Sort by", list(JOB_SORTS), format_func=lambda key: key.replace("_", " ").title())
+descending = col_order.radio("Order", ["Desc", "Asc"], horizontal=True) == "Desc"
+page_size = col_size.selectbox("Rows", [25, 50, 100], index=1)
+
+filters = {
+    "text": text.strip(),
+    "location": location.strip(),
+    "source": None if source == "All" else source,
+    "company": None if company == "All" else company,
+}
+if use_dates and isinstance(posted, (list, tuple)) and len(posted) == 2:
+    filters["posted_from"] = posted[0].isoformat()
+    filters["posted_to"] = (posted[1] + timedelta(days=1)).isoformat()
+
+# Keyset pagination: keep the cursor that starts each visited page; reset when the view changes.
+view = (tuple(sorted((k, v) for k, v in filters.items() if v)), sort, descending, page_size)
+if st.session_state.get("job_browser_view") != view:
+    st.session_state.job_browser_view = view
+    st.session_state.job_browser_cursors = [None]
+cursors = st.session_state.job_browser_cursors
 
-jobs = list_jobs()
-st.dataframe(jobs)
+rows, next_cursor = browse_jobs(filters, sort=sort, descending=descending, after=cursors[-1], page_size=page_size)
+total = count_jobs(filters)
+st.caption(f"{total} matching jobs · page {len(cursors)}")
+st.dataframe(
+    [{key: value for key, value in dict(row).items() if key != "sort_key"} for row in rows],
+    use_container_width=True,
+)
+col_prev, col_next, _ = st.columns([1, 1, 6])
+if col_prev.button("← Previous", disabled=len(cursors) == 1):
+    cursors.pop()
+    st.rerun()
+if col_next.button("Next →", disabled=next_cursor is None):
+    cursors.append(next_cursor)
+    st.rerun()
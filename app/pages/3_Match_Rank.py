@@ -9,7 +9,9 @@ if str(PROJECT_ROOT) not in sys.path:
 
 import app  # noqa: F401  # ensure project root is on sys.path
 from app.app import ensure_agents
-from src.storage.sqlite import list_resumes
+from src import config
+from src.storage.sqlite import alternate_urls, list_resumes
+from src.tasks import enqueue, get_task, list_tasks
 from src.tools.parsing import strip_html
 
 ensure_agents()
@@ -29,14 +31,77 @@ selected = st.selectbox(
 )
 top_k = st.slider("Top K", 5, 50, 25)
 use_llm = st.checkbox("Use LLM explanations", value=True)
+deadline_s = st.number_input(
+    "Show results after (seconds)",
+    min_value=0.0,
+    value=config.MATCH_DEADLINE_S,
+    step=1.0,
+    help="Hybrid results appear after this long; LLM scores fill in as they finish.",
+    disabled=not use_llm,
+)
 
 if st.button("Rank") and selected:
-    results = st.session_state.agents["match"].rank(selected, top_k=top_k, use_llm_rerank=use_llm)
-    st.session_state.match_results = results
+    st.session_state.match_task_id = enqueue(
+        "rank",
+        {"resume_id": selected, "top_k": top_k, "use_llm_rerank": use_llm, "deadline_s": deadline_s if use_llm else None},
+    )
+    st.session_state.match_results = []
+    st.session_state.match_run_id = None
+if "match_task_id" not in st.session_state:
+    # After a reconnect, show the latest ranking of this resume again.
+    recent = [task for task in list_tasks(kind="rank", limit=20) if task["params"].get("resume_id") == selected]
+    st.session_state.match_task_id = recent[0]["task_id"] if recent else None
+
+
+def _load_run(run_id: str) -> None:
+    jobs, status = st.session_state.agents["match"].fetch_results(run_id)
+    for job in jobs:
+        job["llm_pending"] = status in {"pending", "running"} and not job.get("match")
+    st.session_state.match_results = jobs
+    st.session_state.match_run_id = run_id
+
+
+def _refresh_pending() -> None:
+    task_id = st.session_state.get("match_task_id")
+    if task_id and not st.session_state.get("match_run_id"):
+        task = get_task(task_id)
+        if task is None:
+            return
+        if task["status"] in {"queued", "running"}:
+            st.caption("Ranking is queued…" if task["status"] == "queued" else "Ranking…")
+            return
+        if task["status"] == "failed":
+            st.error(f"Ranking failed: {task['error']}")
+            return
+        if (task["result"] or {}).get("run_id"):
+            _load_run(task["result"]["run_id"])
+            st.rerun()
+        return
+    run_id = st.session_state.get("match_run_id")
+    if not run_id or not any(job.get("llm_pending") for job in st.session_state.get("match_results", [])):
+        return
+    jobs, status = st.session_state.agents["match"].fetch_results(run_id)
+    scored = sum(1 for job in jobs if job.get("match"))
+    if status in {"done", "failed"}:
+        st.session_state.match_results = jobs
+        st.rerun()
+    st.caption(f"LLM scoring in progress: {scored}/{len(jobs)} jobs scored")
+    if scored != sum(1 for job in st.session_state.match_results if job.get("match")):
+        for job in jobs:
+            job["llm_pending"] = not job.get("match")
+        st.session_state.match_results = jobs
+        st.rerun()
+
+
+if hasattr(st, "fragment"):
+    st.fragment(run_every=2)(_refresh_pending)()
+elif st.button("Refresh results"):  # older Streamlit fallback
+    _refresh_pending()
 
 if not st.session_state.get("match_results"):
     st.info("No matches yet. Make sure jobs are ingested and try ranking.")
 
+alternates = alternate_urls([job["job_id"] for job in st.session_state.get("match_results", []) if job.get("job_id")])
 for job in st.session_state.get("match_results", []):
     st.subheader(f"{job['title']} at {job['company']} ({job.get('source')})")
     cols = st.columns(3)
@@ -44,6 +109,8 @@ for job in st.session_state.get("match_results", []):
     cols[1].metric("Vector distance", f"{job.get('distance', 0):.3f}")
     if job.get("match"):
         cols[2].metric("LLM score", f"{job['match'].get('score_0_to_100', 0):.1f}")
+    elif job.get("llm_pending"):
+        cols[2].metric("LLM score", "…")
     desc = strip_html(job.get("description", ""))[:800]
     st.write(desc)
     if job.get("match"):
@@ -55,6 +122,8 @@ for job in st.session_state.get("match_results", []):
         if match.get("short_reason"):
             st.write(f"**Why:** {match['short_reason']}")
     st.markdown(f"[Link]({job.get('url')})")
+    if alternates.get(job.get("job_id")):
+        st.caption("Also listed: " + " · ".join(f"[{alt['source']}]({alt['url']})" for alt in alternates[job["job_id"]]))
     if hasattr(st, "divider"):
         st.divider()
     else:  # older Streamlit fallback
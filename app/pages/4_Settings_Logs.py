@@ -1,4 +1,5 @@
 import sys
+import time
 from pathlib import Path
 
 import streamlit as st
@@ -10,9 +11,32 @@ if str(PROJECT_ROOT) not in sys.path:
 import app  # noqa: F401  # ensure project root is on sys.path
 from app.app import ensure_agents, load_collections
 from src import config
-from src.llm import get_active_config, set_runtime_llm_config
-from src.storage.sqlite import get_conn, wipe_jobs, wipe_resumes
+from src.llm import (
+    PRIORITY_INTERACTIVE,
+    get_active_config,
+    get_residency_manager,
+    get_scheduler,
+    set_runtime_llm_config,
+)
+from src.llm.endpoints import all_pool_stats
+from src.maintenance import expire_jobs, vacuum_sqlite, vectors_deleted_since_rebuild
+from src.profiling import list_profiles, memory_tracing_enabled, profiling_enabled, set_profiling
+from src.storage.sqlite import (
+    get_conn,
+    get_run_spans,
+    job_storage_stats,
+    list_traced_runs,
+    list_vector_collections,
+    llm_usage_by_model,
+    llm_usage_by_run,
+    recent_stage_spans,
+    wipe_jobs,
+    wipe_resumes,
+)
 from src.storage.vectordb import clear_collection
+from src.tasks import enqueue, list_tasks
+from src.tracing import stage_percentiles
+from src.vector_collections import KINDS, active_collection, embed_model_key
 
 ensure_agents()
 jobs_collection, resumes_collection = load_collections()
@@ -25,7 +49,10 @@ with st.form("llm-config"):
     base_url = st.text_input(
         "Base URL",
         value=active_cfg.base_url,
-        help="For Ollama, include protocol and port. For OpenAI-compatible APIs, include the version path.",
+        help=(
+            "For Ollama, include protocol and port; list several hosts comma-separated to load-balance. "
+            "For OpenAI-compatible APIs, include the version path."
+        ),
     )
     col_a, col_b = st.columns(2)
     with col_a:
@@ -43,6 +70,8 @@ with st.form("llm-config"):
             api_key=api_key,
         )
         st.success("LLM settings updated for this session.")
+        if any(active_collection(kind)["embed_model"] != embed_model_key() for kind in KINDS):
+            st.info("Stored vectors use another embedding model; re-embed them under Embedding Collections below.")
 
 st.subheader("Current configuration (environment defaults)")
 st.json(
@@ -61,6 +90,43 @@ st.json(
     }
 )
 
+st.subheader("LLM Scheduler")
+scheduler = get_scheduler()
+st.dataframe(scheduler.lane_snapshot())
+recent_calls = [
+    {
+        "provider": stat.provider,
+        "operation": stat.operation,
+        "priority": "interactive" if stat.priority <= PRIORITY_INTERACTIVE else "bulk",
+        "queue_wait_ms": round(stat.queue_wait_s * 1000, 1),
+        "service_ms": round(stat.service_s * 1000, 1),
+        "ok": stat.ok,
+    }
+    for stat in reversed(scheduler.recent_stats(limit=50))
+]
+st.caption("Most recent LLM calls (queue wait vs. service time)")
+st.dataframe(recent_calls)
+st.caption("Ollama endpoints (routing, health, loaded models)")
+st.dataframe(all_pool_stats())
+
+st.subheader("Model Residency")
+st.caption("Model load time is tracked separately from inference time (Ollama load_duration).")
+residency = get_residency_manager()
+st.dataframe(residency.stats())
+if st.button("Preload models now"):
+    residency.preload(background=False)
+    st.success("Embed and chat models loaded.")
+
+st.subheader("LLM Usage")
+if not config.LLM_METRICS:
+    st.caption("Per-call metrics are off (set LLM_METRICS=1 to record them).")
+window = st.selectbox("Window", ["Last hour", "Last 24 hours", "Last 7 days", "All time"], index=2)
+window_s = {"Last hour": 3600, "Last 24 hours": 86400, "Last 7 days": 7 * 86400}.get(window)
+st.caption("Per model: tokens in/out, cached prompt tokens, queue and load time, generation tokens/s")
+st.dataframe(llm_usage_by_model(since_ts=time.time() - window_s if window_s else 0.0))
+st.caption("Per run (most recent first)")
+st.dataframe(llm_usage_by_run(limit=30))
+
 conn = get_conn()
 st.subheader("Recent Job Runs")
 st.dataframe(conn.execute("SELECT * FROM job_runs ORDER BY started_at DESC LIMIT 20").fetchall())
@@ -69,6 +135,101 @@ st.subheader("Recent Match Runs")
 st.dataframe(conn.execute("SELECT * FROM match_runs ORDER BY started_at DESC LIMIT 20").fetchall())
 conn.close()
 
+st.subheader("Run Timings")
+traced_runs = list_traced_runs(limit=50)
+if not traced_runs:
+    st.caption("No traced runs yet.")
+else:
+    run_labels = {
+        row["run_id"]: f"{row['kind']} · {row['run_id'][:8]} · {row['duration_ms'] / 1000:.1f}s" for row in traced_runs
+    }
+    selected_run = st.selectbox("Run", list(run_labels), format_func=run_labels.get)
+    spans = get_run_spans(selected_run)
+    names = {row["span_id"]: row["name"] for row in spans}
+    st.dataframe(
+        [
+            {
+                "stage": row["name"],
+                "parent": names.get(row["parent_id"], ""),
+                "calls": row["count"],
+                "duration_ms": round(row["duration_ms"], 1),
+                "attrs": row["attrs"] or "",
+            }
+            for row in spans
+        ]
+    )
+    kinds = sorted({row["kind"] for row in traced_runs})
+    st.caption("Per-stage p50/p95 over the last 50 runs of each kind")
+    st.dataframe([row for kind in kinds for row in stage_percentiles(recent_stage_spans(kind, limit_runs=50))])
+
+st.subheader("Profiling")
+st.caption("Profile job searches, resume ingests and rank runs (cProfile; tracemalloc adds noticeable overhead).")
+col_p1, col_p2 = st.columns(2)
+with col_p1:
+    profile_on = st.checkbox("Profile runs", value=profiling_enabled())
+with col_p2:
+    memory_on = st.checkbox("Track allocations (tracemalloc)", value=memory_tracing_enabled(), disabled=not profile_on)
+if profile_on != profiling_enabled() or memory_on != memory_tracing_enabled():
+    set_profiling(profile_on, trace_memory=memory_on)
+profiles = list_profiles()
+if not profiles:
+    st.caption(f"No profiles saved in {config.PROFILE_DIR}.")
+else:
+    profile_labels = {
+        idx: f"{p['kind']} · {p['run_id'][:8]} · {p['duration_ms'] / 1000:.1f}s" for idx, p in enumerate(profiles)
+    }
+    chosen = profiles[st.selectbox("Profile", list(profile_labels), format_func=profile_labels.get)]
+    st.caption("Hot functions (by cumulative time)")
+    st.dataframe(chosen["hot_functions"])
+    if chosen["allocations"]:
+        st.caption("Largest allocation sites")
+        st.dataframe(chosen["allocations"])
+    if Path(chosen["path"]).exists():
+        st.download_button(
+            "Download .prof", Path(chosen["path"]).read_bytes(), file_name=Path(chosen["path"]).name
+        )
+
+st.subheader("Job Storage")
+stats = job_storage_stats()
+store_cols = st.columns(4)
+store_cols[0].metric("Live jobs", stats["live_jobs"])
+store_cols[1].metric("Tombstones", stats["tombstones"])
+store_cols[2].metric("Database size", f"{stats['db_bytes'] / 1e6:.1f} MB")
+store_cols[3].metric("Free space", f"{stats['free_bytes'] / 1e6:.1f} MB")
+st.caption(
+    f"Jobs expire after {config.JOB_MISSING_AFTER_S / 86400:.0f} days unseen or {config.JOB_TTL_S / 86400:.0f} days since "
+    f"posting. {vectors_deleted_since_rebuild()} vectors deleted since the last index rebuild "
+    "(run `python scripts/maintain.py --rebuild-index` with the app stopped to reclaim them)."
+)
+if st.button("Expire stale jobs now"):
+    counts = expire_jobs(jobs_collection)
+    vacuum = vacuum_sqlite()
+    st.success(
+        f"Expired {counts['missing']} unseen and {counts['ttl']} old jobs; deleted {counts['vectors_deleted']} vectors, "
+        f"purged {counts['purged']} tombstones" + ("; database vacuumed." if vacuum["vacuumed"] else ".")
+    )
+
+st.subheader("Embedding Collections")
+st.caption(
+    "Vectors are kept per embedding model. Ranking and new jobs/resumes use the active collection's model "
+    "until a re-embed into the configured model finishes and switches over."
+)
+target_model = embed_model_key()
+actives = {kind: active_collection(kind) for kind in KINDS}
+st.dataframe(list_vector_collections())
+running = [task for task in list_tasks("reembed", limit=10) if task["status"] in ("queued", "running")]
+for task in running:
+    progress = task["progress"] or {}
+    st.info(
+        f"Re-embedding {task['params']['kind']} with {task['params']['model']}: "
+        f"{progress.get('stage', task['status'])} {progress.get('copied', 0)}/{progress.get('total') or '?'}"
+    )
+stale = [kind for kind, record in actives.items() if record["embed_model"] != target_model]
+if stale and not running and st.button(f"Re-embed {' and '.join(stale)} with {target_model}"):
+    for kind in stale:
+        enqueue("reembed", {"kind": kind, "model": target_model})
+    st.success("Re-embed queued; ranking keeps using the current vectors until it finishes.")
+
 st.subheader("Data Management")
 st.caption("Danger zone: permanently delete stored records and vector embeddings.")
 col1, col2 = st.columns(2)
@@ -0,0 +1,72 @@
+"""
+Embeddings/second through the LLM client at different concurrency levels.
+
+Starts a local stand-in for Ollama's ``/api/embeddings`` endpoint (fixed per-request latency,
+threaded so it can serve requests in parallel) and pushes the same batch of texts through:
+- the sync ``embed`` in a loop (baseline), and
+- ``aembed_many`` at concurrency 1, 8 and 32.
+
+Usage:
+    python benchmarks/bench_async_embed.py --texts 256 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from stand_in import start_stand_in  # noqa: E402
+
+from src.llm import aembed_many, embed, get_scheduler, set_runtime_llm_config  # noqa: E402
+from src.llm.http import aclose_async_session  # noqa: E402
+
+
+async def _async_run(texts, concurrency: int) -> None:
+    try:
+        await aembed_many(texts, concurrency=concurrency)
+    finally:
+        await aclose_async_session()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark embedding throughput vs. concurrency.")
+    parser.add_argument("--texts", type=int, default=256, help="Texts embedded per level.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stand-in server latency per request.")
+    parser.add_argument("--levels", type=str, default="1,8,32", help="Comma-separated concurrency levels.")
+    args = parser.parse_args()
+
+    server = start_stand_in(args.latency_ms / 1000.0)
+    set_runtime_llm_config(provider="ollama", base_url=f"http://127.0.0.1:{server.server_port}")
+    texts = [f"job description {i}" for i in range(args.texts)]
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+    scheduler = get_scheduler()
+    results = {}
+
+    scheduler.set_capacity("embed", 1)
+    started = time.perf_counter()
+    for text in texts:
+        embed(text)
+    results["sync_serial"] = len(texts) / (time.perf_counter() - started)
+
+    for level in levels:
+        # Lift the scheduler cap so the level under test is the only limit.
+        scheduler.set_capacity("embed", level)
+        started = time.perf_counter()
+        asyncio.run(_async_run(texts, level))
+        results[f"async_c{level}"] = len(texts) / (time.perf_counter() - started)
+
+    server.shutdown()
+    for name, rate in results.items():
+        print(f"{name:>12}: {rate:8.1f} embeddings/s")
+    print(json.dumps({"texts": len(texts), "latency_ms": args.latency_ms, "embeddings_per_s": results}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Deterministic crawl/ingest benchmark over recorded job source traffic.
+
+``--record`` runs the enabled sources (``JOB_SOURCES``, or ``--sources``) against the live
+boards once and writes one cassette per source (see ``src/tools/job_sources/transport.py``).
+Without it, the cassettes are replayed at each ``--latency-scales`` factor (1 = the recorded
+latencies, 0 = no network delay, i.e. pure parsing/dedupe/store cost) and the full
+``JobScoutAgent.run_search`` is timed with in-process hash embeddings and temporary storage. The
+ingest-time ``JOB_TTL_S`` filter is off, so cassettes keep their postings as they age.
+``--min-jobs-per-s`` turns the run into a throughput regression check (exit code 1 below it).
+
+Usage:
+    python benchmarks/bench_crawl.py --record --query "data engineer" --cassettes benchmarks/cassettes
+    python benchmarks/bench_crawl.py --query "data engineer" --cassettes benchmarks/cassettes --latency-scales 0,1
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from corpus import hash_embedding  # noqa: E402
+
+import src.config as config  # noqa: E402
+from src.agents import job_scout  # noqa: E402
+from src.storage import sqlite, vectordb  # noqa: E402
+from src.tools.job_sources import SOURCE_MAP, get_sources_from_env  # noqa: E402
+from src.tools.job_sources.transport import cassette_path, use_cassettes  # noqa: E402
+
+
+def _sources(names: str) -> List[Any]:
+    if not names:
+        return get_sources_from_env()
+    return [SOURCE_MAP[name.strip()]() for name in names.split(",") if name.strip() in SOURCE_MAP]
+
+
+def record(sources: List[Any], query: str, limit: int, directory: str) -> None:
+    with use_cassettes("record", directory):
+        for source in sources:
+            started = time.perf_counter()
+            jobs = source.search(query, limit)
+            print(f"{source.name:>12}: {len(jobs)} jobs in {time.perf_counter() - started:.2f}s -> {cassette_path(source.name, directory)}")
+
+
+def replay(sources: List[Any], query: str, limit: int, directory: str, scale: float, workdir: Path) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"latency_scale": scale, "sources": {}}
+    with use_cassettes("replay", directory, latency_scale=scale):
+        for source in sources:
+            started = time.perf_counter()
+            jobs = source.search(query, limit)
+            elapsed = time.perf_counter() - started
+            out["sources"][source.name] = {"jobs": len(jobs), "fetch_s": round(elapsed, 3)}
+
+        config.SQLITE_PATH = str(workdir / f"scale-{scale}" / "app.db")
+        sqlite.init_db()
+        client = vectordb.get_chroma_client(str(workdir / f"vdb-{scale}"))
+        scout = job_scout.JobScoutAgent(vectordb.get_or_create_collection(client, "jobs"))
+        scout.sources = sources
+        started = time.perf_counter()
+        summary = scout.run_search(query, limit_per_source=limit)
+        elapsed = time.perf_counter() - started
+    fetched = sum(source["jobs"] for source in out["sources"].values())
+    out["run_search"] = {
+        "fetched": fetched,
+        "added": sum(summary.values()),
+        "seconds": round(elapsed, 3),
+        "jobs_per_s": round(fetched / elapsed, 1) if elapsed else None,
+    }
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record job source traffic, or benchmark crawl/ingest against the recording.")
+    parser.add_argument("--query", type=str, required=True)
+    parser.add_argument("--limit", type=int, default=50, help="Jobs per source.")
+    parser.add_argument("--sources", type=str, default="", help="Comma-separated source names (default: JOB_SOURCES).")
+    parser.add_argument("--cassettes", type=str, default=config.JOB_SOURCE_CASSETTE_DIR, help="Cassette directory.")
+    parser.add_argument("--record", action="store_true", help="Fetch live and write cassettes instead of benchmarking.")
+    parser.add_argument("--latency-scales", type=str, default="0,1", help="Comma-separated replay latency multipliers.")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension.")
+    parser.add_argument("--min-jobs-per-s", type=float, default=0.0, help="Fail if any replay is slower than this.")
+    parser.add_argument("--out", type=str, default="", help="Write results JSON here.")
+    args = parser.parse_args()
+
+    sources = _sources(args.sources)
+    if args.record:
+        record(sources, args.query, args.limit, args.cassettes)
+        return 0
+
+    config.PROFILE_RUNS = False
+    config.JOB_TTL_S = 0  # recorded postings age; don't drop them as expired
+    job_scout.embed = lambda text, **_kwargs: hash_embedding(text, args.dim)
+    results: Dict[str, Any] = {"query": args.query, "limit": args.limit, "replays": []}
+    with tempfile.TemporaryDirectory(prefix="ljd-crawl-") as tmp:
+        for scale in [float(value) for value in args.latency_scales.split(",") if value.strip()]:
+            result = replay(sources, args.query, args.limit, args.cassettes, scale, Path(tmp))
+            results["replays"].append(result)
+            print(json.dumps(result, indent=2), flush=True)
+
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Wrote {args.out}")
+    slow = [r for r in results["replays"] if (r["run_search"]["jobs_per_s"] or 0) < args.min_jobs_per_s]
+    if slow:
+        print(f"Throughput below {args.min_jobs_per_s} jobs/s at latency scale(s) {[r['latency_scale'] for r in slow]}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Near-duplicate lookup latency and accuracy at scale.
+
+Indexes the MinHash signatures of ``--jobs`` synthetic postings (``corpus.py``) in a temporary
+SQLite store, then looks up ``--probes`` postings: half are reposts of indexed jobs with a
+different board footer and tracking text, half are new jobs. Reports signature and lookup
+latency percentiles and how many reposts were found / new jobs wrongly matched.
+``--max-lookup-ms`` turns the run into a regression check on the p99 lookup (exit code 1 above it).
+
+Usage:
+    python benchmarks/bench_dedupe.py --jobs 100000 --probes 2000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from corpus import generate_jobs  # noqa: E402
+
+import src.config as config  # noqa: E402
+from src.models import Job  # noqa: E402
+from src.storage import sqlite  # noqa: E402
+from src.tools.dedupe import job_signature, title_key  # noqa: E402
+from src.tools.parsing import strip_html  # noqa: E402
+
+
+def _repost(job: Job, rng: random.Random) -> Job:
+    footer = f"Apply via {rng.choice(['Greenhouse', 'Lever', 'Remotive'])}. Ref {rng.randint(1000, 9999)}. Posted by our talent team."
+    return Job(**{**job.model_dump(), "url": f"{job.url}?via=bench", "description": f"{job.description}\n{footer}"})
+
+
+def _percentiles(values):
+    values = sorted(values)
+    return {
+        "p50_ms": round(statistics.median(values) * 1000, 3),
+        "p99_ms": round(values[int(len(values) * 0.99) - 1] * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate lookups.")
+    parser.add_argument("--jobs", type=int, default=20000, help="Jobs indexed before probing.")
+    parser.add_argument("--probes", type=int, default=1000, help="Lookups timed (half reposts, half new).")
+    parser.add_argument("--threshold", type=float, default=config.NEAR_DUP_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-lookup-ms", type=float, default=0.0, help="Fail if the p99 lookup is slower than this.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = generate_jobs(args.jobs + args.probes // 2, seed=args.seed, duplicate_rate=0.0)
+    for job in jobs:
+        job.description = strip_html(job.description)
+    indexed, fresh = jobs[: args.jobs], jobs[args.jobs :]
+    with tempfile.TemporaryDirectory(prefix="ljd-dedupe-") as tmp:
+        config.SQLITE_PATH = str(Path(tmp) / "app.db")
+        sqlite.init_db()
+        conn = sqlite.get_conn()
+        started = time.perf_counter()
+        for i, job in enumerate(indexed):
+            job.job_id = f"job{i}"
+            sqlite.write_job_signature(conn, job.job_id, title_key(job.title), job_signature(job))
+        conn.executemany(
+            "INSERT INTO jobs(job_id, title, company, url, source, description) VALUES (?, ?, ?, ?, ?, '')",
+            [(job.job_id, job.title, job.company, job.url, job.source) for job in indexed],
+        )
+        conn.commit()
+        conn.close()
+        index_s = time.perf_counter() - started
+
+        probes = [(_repost(job, rng), job.job_id) for job in rng.sample(indexed, args.probes - len(fresh))]
+        probes += [(job, None) for job in fresh]
+        signature_times, lookup_times, found, false_matches = [], [], 0, 0
+        with sqlite.SignatureIndex() as index:
+            for job, original in probes:
+                started = time.perf_counter()
+                signature = job_signature(job)
+                signature_times.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                match = index.find(signature, title_key(job.title), args.threshold)
+                lookup_times.append(time.perf_counter() - started)
+                if original is not None:
+                    found += bool(match and match[0] == original)
+                else:
+                    false_matches += match is not None
+    reposts = len(probes) - len(fresh)
+    result = {
+        "jobs": args.jobs,
+        "index_s": round(index_s, 2),
+        "signature": _percentiles(signature_times),
+        "lookup": _percentiles(lookup_times),
+        "reposts_found": f"{found}/{reposts}",
+        "new_jobs_matched": f"{false_matches}/{len(fresh)}",
+    }
+    print(json.dumps(result, indent=2))
+    if args.max_lookup_ms and result["lookup"]["p99_ms"] > args.max_lookup_ms:
+        print(f"p99 lookup above {args.max_lookup_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Throughput scaling across several Ollama hosts.
+
+Each stand-in host can only run ``--host-parallel`` requests at a time (like one GPU), so a
+single host saturates. The same batch of embeddings is pushed through ``aembed_many`` with
+1, 2 and 4 hosts listed in the base URL; near-linear scaling means the pool spreads load.
+
+Usage:
+    python benchmarks/bench_endpoint_pool.py --texts 512 --hosts 1,2,4
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from stand_in import start_stand_in  # noqa: E402
+
+from src.llm import aembed_many, set_runtime_llm_config  # noqa: E402
+from src.llm.endpoints import get_endpoint_pool  # noqa: E402
+from src.llm.http import aclose_async_session  # noqa: E402
+
+
+async def _async_run(texts, concurrency: int) -> None:
+    try:
+        await aembed_many(texts, concurrency=concurrency)
+    finally:
+        await aclose_async_session()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark embedding throughput vs. number of hosts.")
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--host-parallel", type=int, default=2, help="Requests each stand-in host runs at once.")
+    parser.add_argument("--hosts", type=str, default="1,2,4")
+    args = parser.parse_args()
+
+    host_counts = [int(n) for n in args.hosts.split(",") if n.strip()]
+    servers = [start_stand_in(args.latency_ms / 1000.0, args.host_parallel) for _ in range(max(host_counts))]
+    texts = [f"job description {i}" for i in range(args.texts)]
+    report = {}
+    for count in host_counts:
+        base_url = ",".join(f"http://127.0.0.1:{s.server_port}" for s in servers[:count])
+        set_runtime_llm_config(provider="ollama", base_url=base_url)
+        started = time.perf_counter()
+        asyncio.run(_async_run(texts, concurrency=count * args.host_parallel * 2))
+        rate = len(texts) / (time.perf_counter() - started)
+        report[count] = {"embeddings_per_s": rate, "endpoints": get_endpoint_pool(base_url).stats()}
+        print(f"{count} host(s): {rate:8.1f} embeddings/s")
+    base = report[host_counts[0]]["embeddings_per_s"]
+    for count in host_counts:
+        print(f"  speedup x{report[count]['embeddings_per_s'] / base:.2f} with {count} host(s)")
+    for server in servers:
+        server.shutdown()
+    print(json.dumps(report, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Resume ingest throughput: one file at a time vs. the batch mode.
+
+Writes ``--resumes`` synthetic resumes (``corpus.py``; a third each PDF, DOCX and TXT, PDFs
+paginated at ``--lines-per-page``) to a temporary folder, starts the LLM stand-in
+(``stand_in.py``) with ``--latency-ms`` per embedding request, and times:
+- ``ResumeIngestAgent.ingest`` per file (the previous CLI path), on the first ``--serial`` files, and
+- ``ResumeIngestAgent.ingest_many`` on the whole folder at each ``--workers`` level.
+Reports resumes per minute and where batch time went (parse, chunk, embed, store).
+
+Usage:
+    python benchmarks/bench_ingest.py --resumes 500 --workers 1,4
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from corpus import write_resume_files  # noqa: E402
+from stand_in import start_stand_in  # noqa: E402
+
+import src.config as config  # noqa: E402
+from src.agents.resume_ingest import ResumeIngestAgent, resume_paths  # noqa: E402
+from src.llm import get_scheduler, set_runtime_llm_config  # noqa: E402
+from src.storage import sqlite, vectordb  # noqa: E402
+
+
+def _agent(workdir: Path, name: str) -> ResumeIngestAgent:
+    config.SQLITE_PATH = str(workdir / name / "app.db")
+    sqlite.init_db()
+    client = vectordb.get_chroma_client(str(workdir / name / "vdb"))
+    return ResumeIngestAgent(vectordb.get_or_create_collection(client, "resumes"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark serial vs. batch resume ingest.")
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--serial", type=int, default=60, help="Files timed through the one-at-a-time path.")
+    parser.add_argument("--workers", type=str, default="1,4", help="Comma-separated parser process counts.")
+    parser.add_argument("--lines-per-page", type=int, default=12)
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Stand-in latency per embedding request.")
+    parser.add_argument("--dim", type=int, default=768)
+    args = parser.parse_args()
+
+    config.PROFILE_RUNS = False
+    config.LLM_METRICS = False
+    server = start_stand_in(args.latency_ms / 1000.0, dim=args.dim)
+    set_runtime_llm_config(provider="ollama", base_url=f"http://127.0.0.1:{server.server_port}")
+    get_scheduler().set_capacity("embed", config.INGEST_EMBED_CONCURRENCY)
+    results = {"resumes": args.resumes, "latency_ms": args.latency_ms}
+    with tempfile.TemporaryDirectory(prefix="ljd-ingest-") as tmp:
+        workdir = Path(tmp)
+        write_resume_files(workdir / "resumes", args.resumes, lines_per_page=args.lines_per_page)
+        paths = resume_paths(str(workdir / "resumes"))
+
+        agent = _agent(workdir, "serial")
+        started = time.perf_counter()
+        for path in paths[: args.serial]:
+            agent.ingest(path)
+        elapsed = time.perf_counter() - started
+        results["serial"] = {"files": args.serial, "resumes_per_min": round(args.serial / elapsed * 60, 1)}
+        print(json.dumps({"serial": results["serial"]}), flush=True)
+
+        for workers in [int(value) for value in args.workers.split(",") if value.strip()]:
+            result = _agent(workdir, f"batch-{workers}").ingest_many(paths, workers=workers)
+            results[f"batch_w{workers}"] = {
+                "ingested": len(result.ingested),
+                "failed": len(result.failed),
+                "seconds": round(result.seconds, 2),
+                "resumes_per_min": round(result.resumes_per_min, 1),
+                "stage_s": result.stages,
+            }
+            print(json.dumps({f"batch_w{workers}": results[f"batch_w{workers}"]}), flush=True)
+    server.shutdown()
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Cold-start cost of the dashboard and the CLI scripts.
+
+Each measurement runs in a fresh interpreter (``--runs`` times, median reported):
+- ``import_ms``: importing what ``app/app.py`` imports from ``src`` (agents, tasks, storage, LLM client),
+- ``<script>_help_ms``: wall time of ``python scripts/<script>.py --help``,
+- ``first_paint_ms``: process start to the end of the first run of ``app/app.py`` under Streamlit's
+  ``AppTest`` harness (skipped when Streamlit is not installed),
+and lists which heavy optional modules (chromadb, pypdf, docx, aiohttp, numpy) the app imports
+before any page needs them. ``--max-import-ms`` turns the run into a regression check (exit code 1
+above it, or when a heavy module is loaded at import).
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5 --max-import-ms 400
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+APP_MODULES = (
+    "src.config",
+    "src.logging_config",
+    "src.storage.migrations",
+    "src.storage.sqlite",
+    "src.storage.vectordb",
+    "src.agents.resume_ingest",
+    "src.agents.job_scout",
+    "src.agents.match_rank",
+    "src.llm",
+    "src.status",
+    "src.tasks",
+)
+HEAVY_MODULES = ("chromadb", "pypdf", "docx", "aiohttp", "numpy")
+SCRIPTS = ("match", "ingest_resume", "fetch_jobs", "worker")
+
+_IMPORT_PROBE = f"""
+import sys, time
+started = time.perf_counter()
+for name in {APP_MODULES!r}:
+    __import__(name)
+print((time.perf_counter() - started) * 1000)
+print(",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+"""
+
+_PAINT_PROBE = """
+import sys, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+app.run()
+print(len(app.exception))
+"""
+
+
+def _env() -> dict:
+    return {**os.environ, "PYTHONPATH": str(ROOT), "OLLAMA_PRELOAD": "0", "TASK_INPROCESS_WORKER": "0"}
+
+
+def _run(args) -> tuple:
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, *args], cwd=ROOT, env=_env(), capture_output=True, text=True, check=True)
+    return (time.perf_counter() - started) * 1000, proc.stdout.splitlines()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark app and CLI cold start.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=0.0, help="Fail if the median app import is slower than this.")
+    args = parser.parse_args()
+
+    imports, heavy = [], set()
+    for _ in range(args.runs):
+        _wall, lines = _run(["-c", _IMPORT_PROBE])
+        imports.append(float(lines[0]))
+        heavy.update(name for name in (lines[1] if len(lines) > 1 else "").split(",") if name)
+    result = {"import_ms": round(statistics.median(imports), 1), "heavy_modules_at_import": sorted(heavy)}
+    for script in SCRIPTS:
+        result[f"{script}_help_ms"] = round(statistics.median(_run([f"scripts/{script}.py", "--help"])[0] for _ in range(args.runs)), 1)
+    if importlib.util.find_spec("streamlit") is None:
+        result["first_paint_ms"] = None
+    else:
+        result["first_paint_ms"] = round(statistics.median(_run(["-c", _PAINT_PROBE, "app/app.py"])[0] for _ in range(args.runs)), 1)
+    print(json.dumps(result, indent=2))
+    failed = bool(heavy)
+    if args.max_import_ms and result["import_ms"] > args.max_import_ms:
+        print(f"app import above {args.max_import_ms} ms")
+        failed = True
+    if heavy:
+        print(f"heavy modules imported at startup: {', '.join(sorted(heavy))}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Offline benchmark suite for the ingest/search/rank hot paths.
+
+For each corpus size (default 1k, 10k and 100k jobs) this generates a synthetic corpus (see
+``corpus.py``) and measures:
+- ``strip_html``, ``chunk_text``, ``keyword_overlap`` and ``stable_job_id`` throughput,
+- SQLite ``insert_job`` writes (one connection per job, as ``run_search`` does) and job browser
+  page latency (keyset pages, filtered and full-text pages),
+- Chroma adds (per job, as ``run_search`` does, and batched) and top-25 query latency,
+- end-to-end ``JobScoutAgent.run_search`` and ``MatchRankAgent.rank`` (no LLM rerank).
+
+By default embeddings come from ``hash_embedding`` in-process so the numbers measure the
+pipeline itself, not the embedding model. ``--llm stand-in`` instead sends every embed and the
+rerank through the real client to the local stand-in server (``stand_in.py``), which adds our
+HTTP/scheduling overhead without model variance (see ``bench_async_embed.py`` for LLM throughput). Storage goes to a
+temporary directory. The ingest-time ``JOB_TTL_S`` filter is switched off: the synthetic postings
+carry fixed 2026 dates and would otherwise mostly be dropped as expired. Results are printed and
+written as JSON; pass ``--compare`` with an earlier results file to print the change per metric.
+
+Usage:
+    python benchmarks/bench_suite.py --sizes 1000,10000 --out benchmarks/results/$(date +%F).json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from corpus import generate_jobs, generate_resumes, hash_embedding  # noqa: E402
+from stand_in import start_stand_in  # noqa: E402
+
+import src.config as config  # noqa: E402
+from src.agents import job_scout, match_rank, resume_ingest  # noqa: E402
+from src.llm import set_runtime_llm_config  # noqa: E402
+from src.models import Job  # noqa: E402
+from src.storage import sqlite, vectordb  # noqa: E402
+from src.tools.chunking import chunk_text  # noqa: E402
+from src.tools.dedupe import stable_job_id  # noqa: E402
+from src.tools.job_sources.base import BaseJobSource  # noqa: E402
+from src.tools.parsing import strip_html  # noqa: E402
+from src.tools.scoring import keyword_overlap  # noqa: E402
+
+
+class CorpusSource(BaseJobSource):
+    name = "corpus"
+
+    def __init__(self, jobs: List[Job]):
+        self.jobs = jobs
+
+    def search(self, _query: str, limit: int = 50) -> List[Job]:
+        return [job.copy() for job in self.jobs[:limit]]
+
+
+def _throughput(fn: Callable[[Any], Any], items: List[Any]) -> Dict[str, float]:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    elapsed = time.perf_counter() - started
+    return {
+        "n": len(items),
+        "seconds": round(elapsed, 4),
+        "per_s": round(len(items) / elapsed, 1) if elapsed else None,
+        "us_per_op": round(elapsed / len(items) * 1e6, 2) if items else None,
+    }
+
+
+def _latencies(fn: Callable[[Any], Any], items: List[Any]) -> Dict[str, float]:
+    samples = []
+    for item in items:
+        started = time.perf_counter()
+        fn(item)
+        samples.append((time.perf_counter() - started) * 1000)
+    ordered = sorted(samples)
+    return {
+        "n": len(samples),
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * (len(ordered) - 1) + 0.5))], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def _use_hash_embeddings(dim: int) -> None:
+    def _embed(text: str, **_kwargs) -> List[float]:
+        return hash_embedding(text, dim)
+
+    for module in (job_scout, resume_ingest, match_rank):
+        module.embed = _embed
+
+
+def bench_size(
+    n: int, resumes: List[str], dim: int, seed: int, workdir: Path, e2e: bool, rerank: bool = False
+) -> Dict[str, Any]:
+    jobs = generate_jobs(n, seed=seed)
+    descriptions = [job.description for job in jobs]
+    stripped = [strip_html(text) for text in descriptions]
+    resume = resumes[0]
+    out: Dict[str, Any] = {"jobs": n, "description_kb_avg": round(sum(map(len, descriptions)) / n / 1024, 2)}
+
+    out["strip_html"] = _throughput(strip_html, descriptions)
+    out["chunk_text"] = _throughput(chunk_text, stripped)
+    out["keyword_overlap"] = _throughput(lambda doc: keyword_overlap(resume, doc), stripped)
+    out["stable_job_id"] = _throughput(lambda job: stable_job_id(job.title, job.company, job.location or "", job.url), jobs)
+
+    config.SQLITE_PATH = str(workdir / f"sqlite-{n}" / "app.db")
+    sqlite.init_db()
+    for idx, job in enumerate(jobs):
+        job.job_id = f"job-{idx}"
+    out["sqlite_insert_job"] = _throughput(sqlite.insert_job, jobs)
+    cursors = [None]
+    for _ in range(20):
+        _rows, cursor = sqlite.browse_jobs(after=cursors[-1])
+        if cursor is None:
+            break
+        cursors.append(cursor)
+    out["browse_page"] = _latencies(lambda cursor: sqlite.browse_jobs(after=cursor), cursors)
+    browse_filters = [{"text": skill} for skill in ("python", "kafka", "figma")] + [
+        {"source": "lever"},
+        {"location": "berlin"},
+        {"posted_from": "2026-03-01", "posted_to": "2026-04-01"},
+    ]
+    out["browse_filtered"] = _latencies(lambda filters: sqlite.browse_jobs(filters, sort="posted_at"), browse_filters)
+
+    client = vectordb.get_chroma_client(str(workdir / f"vdb-{n}"))
+    per_doc = vectordb.get_or_create_collection(client, "per_doc")
+    sample = list(enumerate(stripped[: min(n, 500)]))
+    out["vector_add_per_doc"] = _throughput(
+        lambda item: vectordb.add_documents(
+            per_doc, ids=[f"job-{item[0]}"], documents=[item[1]], metadatas=[{"i": item[0]}], embeddings=[hash_embedding(item[1], dim)]
+        ),
+        sample,
+    )
+    batched = vectordb.get_or_create_collection(client, "batched")
+    embeddings = [hash_embedding(text, dim) for text in stripped]
+    batches = [list(range(start, min(n, start + 1000))) for start in range(0, n, 1000)]
+    result = _throughput(
+        lambda idx: vectordb.add_documents(
+            batched,
+            ids=[f"job-{i}" for i in idx],
+            documents=[stripped[i] for i in idx],
+            metadatas=[{"i": i} for i in idx],
+            embeddings=[embeddings[i] for i in idx],
+        ),
+        batches,
+    )
+    result["docs_per_s"] = round(n / result["seconds"], 1) if result["seconds"] else None
+    out["vector_add_batched"] = result
+    queries = [hash_embedding(f"query {i}", dim) for i in range(50)]
+    out["vector_query_top25"] = _latencies(lambda q: vectordb.query(batched, q, n_results=25), queries)
+
+    if e2e:
+        config.SQLITE_PATH = str(workdir / f"e2e-{n}" / "app.db")
+        sqlite.init_db()
+        e2e_client = vectordb.get_chroma_client(str(workdir / f"e2e-vdb-{n}"))
+        job_col = vectordb.get_or_create_collection(e2e_client, "jobs")
+        resume_col = vectordb.get_or_create_collection(e2e_client, "resumes")
+        scout = job_scout.JobScoutAgent(job_col)
+        scout.sources = [CorpusSource(jobs)]
+        counts: Dict[str, Any] = {}
+        started = time.perf_counter()
+        summary = scout.run_search("benchmark", limit_per_source=n, on_progress=lambda progress: counts.update(progress["sources"]))
+        elapsed = time.perf_counter() - started
+        # Rate over the postings the pipeline actually handled, not the ones requested.
+        processed = sum(c.get("added", 0) + c.get("unchanged", 0) + c.get("duplicates", 0) for c in counts.values())
+        out["run_search"] = {
+            "n": n,
+            "added": sum(summary.values()),
+            "processed": processed,
+            "seconds": round(elapsed, 3),
+            "per_s": round(processed / elapsed, 1) if elapsed else None,
+        }
+
+        ingest = resume_ingest.ResumeIngestAgent(resume_col)
+        resume_ids = []
+        for idx, text in enumerate(resumes):
+            path = workdir / f"resume-{n}-{idx}.txt"
+            path.write_text(text, encoding="utf-8")
+            resume_ids.append(ingest.ingest(str(path)))
+        ranker = match_rank.MatchRankAgent(resume_col, job_col)
+        out["rank_no_llm"] = _latencies(lambda rid: ranker.rank(rid, top_k=25, use_llm_rerank=False), resume_ids)
+        if rerank:
+            out["rank_llm"] = _latencies(lambda rid: ranker.rank(rid, top_k=25, use_llm_rerank=True), resume_ids)
+    return out
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def _compare(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    for size, metrics in current["sizes"].items():
+        old = previous.get("sizes", {}).get(size)
+        if not old:
+            continue
+        print(f"\nvs. {previous['meta'].get('git_rev') or 'previous'} at {size} jobs:")
+        for name, values in metrics.items():
+            if not isinstance(values, dict) or name not in old:
+                continue
+            for key in ("per_s", "p50_ms", "p95_ms"):
+                if values.get(key) and old[name].get(key):
+                    print(f"  {name:>20}.{key:<7} {old[name][key]:>12} -> {values[key]:>12}  ({values[key] / old[name][key]:.2f}x)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks at several corpus sizes.")
+    parser.add_argument("--sizes", type=str, default="1000,10000,100000", help="Comma-separated job counts.")
+    parser.add_argument("--resumes", type=int, default=5, help="Resumes ingested and ranked per size.")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-e2e", action="store_true", help="Skip end-to-end run_search/rank.")
+    parser.add_argument(
+        "--llm",
+        choices=["hash", "stand-in"],
+        default="hash",
+        help="hash: in-process embeddings; stand-in: real client against the local stand-in server (adds LLM rerank).",
+    )
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Stand-in latency per request.")
+    parser.add_argument("--out", type=str, default="", help="Write results JSON here.")
+    parser.add_argument("--compare", type=str, default="", help="Earlier results JSON to compare against.")
+    args = parser.parse_args()
+
+    config.PROFILE_RUNS = False
+    config.OLLAMA_PRELOAD = False
+    config.JOB_TTL_S = 0  # the corpus has fixed dates; don't drop them as expired
+    server = None
+    if args.llm == "stand-in":
+        server = start_stand_in(latency_s=args.llm_latency_ms / 1000.0, dim=args.dim)
+        set_runtime_llm_config(provider="ollama", base_url=server.url)
+    else:
+        _use_hash_embeddings(args.dim)
+    resumes = generate_resumes(args.resumes, seed=args.seed)
+    results: Dict[str, Any] = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "dim": args.dim,
+            "seed": args.seed,
+            "resumes": args.resumes,
+            "llm": args.llm,
+            "llm_latency_ms": args.llm_latency_ms if server else None,
+        },
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="ljd-bench-") as tmp:
+        for n in [int(size) for size in args.sizes.split(",") if size.strip()]:
+            print(f"Benchmarking {n} jobs...", flush=True)
+            results["sizes"][str(n)] = bench_size(
+                n, resumes, args.dim, args.seed, Path(tmp), not args.no_e2e, rerank=server is not None
+            )
+            print(json.dumps(results["sizes"][str(n)], indent=2), flush=True)
+
+    if server is not None:
+        server.shutdown()
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Wrote {args.out}")
+    if args.compare:
+        _compare(results, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
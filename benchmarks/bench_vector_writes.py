@@ -0,0 +1,92 @@
+"""
+Vector write throughput: one Chroma write per job vs. the batched ``VectorWriter``.
+
+Stores ``--jobs`` synthetic postings (``corpus.py``) in a temporary SQLite database, then writes a
+random ``--dim``-dimensional vector for each into a fresh Chroma collection, timed per path:
+- ``per_job``: ``add_documents`` with single-element lists per job, vector states recorded at the end
+  (the previous ``JobScoutAgent`` path), and
+- ``batch_<n>``: ``VectorWriter`` upserts of ``n`` records, each batch marked ``stored`` in SQLite
+  as it lands, for every size in ``--batches``.
+Embedding is left out: both paths receive ready vectors. Reports vectors written per second.
+
+Usage:
+    python benchmarks/bench_vector_writes.py --jobs 5000 --batches 64,256,1024
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from corpus import generate_jobs  # noqa: E402
+
+import src.config as config  # noqa: E402
+from src.storage import sqlite, vectordb  # noqa: E402
+
+
+def _records(jobs, dim: int, seed: int):
+    rng = random.Random(seed)
+    for job in jobs:
+        doc = f"{job.title} at {job.company} {job.location or ''}\n{job.description}"[:9000]
+        yield job.job_id, doc, job.model_dump(), [rng.random() for _ in range(dim)]
+
+
+def _collection(workdir: Path, name: str):
+    return vectordb.get_or_create_collection(vectordb.get_chroma_client(str(workdir / name)), "jobs")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-job vs. batched vector writes.")
+    parser.add_argument("--jobs", type=int, default=3000)
+    parser.add_argument("--batches", type=str, default="64,256,1024", help="Comma-separated VectorWriter batch sizes.")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    jobs = generate_jobs(args.jobs, seed=args.seed, duplicate_rate=0.0)
+    for i, job in enumerate(jobs):
+        job.job_id = f"job{i}"
+    results = {"jobs": args.jobs, "dim": args.dim}
+    with tempfile.TemporaryDirectory(prefix="ljd-vwrite-") as tmp:
+        workdir = Path(tmp)
+        config.SQLITE_PATH = str(workdir / "app.db")
+        sqlite.init_db()
+        for job in jobs:
+            sqlite.insert_job(job, vector_state="pending")
+        ids = [job.job_id for job in jobs]
+
+        collection = _collection(workdir, "per_job")
+        started = time.perf_counter()
+        for job_id, doc, meta, vector in _records(jobs, args.dim, args.seed):
+            vectordb.add_documents(collection, ids=[job_id], documents=[doc], metadatas=[meta], embeddings=[vector])
+        sqlite.set_vector_states(ids, "stored")
+        elapsed = time.perf_counter() - started
+        results["per_job"] = {"seconds": round(elapsed, 2), "vectors_per_s": round(args.jobs / elapsed, 1)}
+        print(json.dumps({"per_job": results["per_job"]}), flush=True)
+
+        for size in [int(value) for value in args.batches.split(",") if value.strip()]:
+            sqlite.set_vector_states(ids, "pending")
+            collection = _collection(workdir, f"batch_{size}")
+            started = time.perf_counter()
+            with vectordb.VectorWriter(
+                collection, batch_size=size, flush_interval_s=3600, on_flush=lambda done: sqlite.set_vector_states(done, "stored")
+            ) as writer:
+                for record in _records(jobs, args.dim, args.seed):
+                    writer.add(*record)
+            elapsed = time.perf_counter() - started
+            assert collection.count() == args.jobs
+            results[f"batch_{size}"] = {"seconds": round(elapsed, 2), "vectors_per_s": round(args.jobs / elapsed, 1)}
+            print(json.dumps({f"batch_{size}": results[f"batch_{size}"]}), flush=True)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
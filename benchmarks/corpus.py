@@ -0,0 +1,216 @@
+"""
+Synthetic job/resume corpus for the offline benchmarks.
+
+Jobs look like what the real sources return: HTML descriptions of 1.5-8 KB built from a shared
+skills vocabulary (so keyword overlap is non-trivial), spread over the real source names, with
+a share of cross-posted duplicates (same posting with tracking params, or re-listed under a
+new URL). Resumes are plain text of 2-6 KB drawing on the same vocabulary. Everything is
+deterministic for a given seed.
+
+Usage:
+    python benchmarks/corpus.py --jobs 1000 --resumes 10 --out /tmp/corpus.jsonl
+"""
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from stand_in import hash_embedding  # noqa: E402, F401 - re-exported for the benchmarks
+
+from src.models import Job  # noqa: E402
+
+SOURCES = ["remotive", "greenhouse", "lever", "scraper"]
+SENIORITY = ["Junior", "", "Senior", "Staff", "Principal", "Lead"]
+ROLES = [
+    "Data Engineer",
+    "Machine Learning Engineer",
+    "Backend Engineer",
+    "Frontend Engineer",
+    "Full Stack Developer",
+    "Data Scientist",
+    "Site Reliability Engineer",
+    "Platform Engineer",
+    "Analytics Engineer",
+    "Product Manager",
+    "Security Engineer",
+    "Mobile Engineer",
+]
+SKILLS = [
+    "python", "sql", "spark", "airflow", "dbt", "kafka", "flink", "snowflake", "bigquery", "redshift",
+    "postgres", "mysql", "mongodb", "redis", "elasticsearch", "kubernetes", "docker", "terraform",
+    "aws", "gcp", "azure", "linux", "bash", "go", "rust", "java", "scala", "kotlin", "typescript",
+    "javascript", "react", "vue", "angular", "nodejs", "graphql", "rest", "grpc", "pytorch",
+    "tensorflow", "scikit-learn", "pandas", "numpy", "llm", "rag", "nlp", "computer vision",
+    "mlops", "feature store", "a/b testing", "statistics", "tableau", "looker", "power bi", "ci/cd",
+    "github actions", "observability", "prometheus", "grafana", "opentelemetry", "security",
+    "oauth", "microservices", "distributed systems", "streaming", "data modeling", "etl",
+    "data quality", "governance", "swift", "ios", "android", "figma", "roadmapping", "agile",
+]
+COMPANY_PARTS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne", "Tyrell", "Cyberdyne"]
+COMPANY_SUFFIX = ["Labs", "Systems", "Analytics", "Health", "Cloud", "AI", "Robotics", "Finance", "Works", "Data"]
+LOCATIONS = ["Remote", "Remote - US", "Remote - EU", "New York, NY", "San Francisco, CA", "London, UK", "Berlin, DE", "Toronto, CA"]
+FILLER = [
+    "You will partner with cross-functional teams to ship reliable features at scale.",
+    "We value ownership, clear writing and pragmatic engineering trade-offs.",
+    "Our stack processes billions of events per day across several regions.",
+    "You will mentor engineers and help shape our technical roadmap.",
+    "We offer flexible hours, a learning budget and competitive equity.",
+    "Experience working in a fast-paced startup environment is a plus.",
+    "You care about testing, code review and operational excellence.",
+    "The team owns services end to end, from design to on-call.",
+]
+
+
+def _company(rng: random.Random) -> str:
+    return f"{rng.choice(COMPANY_PARTS)} {rng.choice(COMPANY_SUFFIX)}"
+
+
+def _description_html(rng: random.Random, skills: List[str], target_chars: int) -> str:
+    parts = [f"<h2>About the role</h2><p>{rng.choice(FILLER)} {rng.choice(FILLER)}</p>"]
+    parts.append("<h3>Requirements</h3><ul>" + "".join(f"<li>Experience with <strong>{s}</strong></li>" for s in skills) + "</ul>")
+    while sum(len(p) for p in parts) < target_chars:
+        sentence = " ".join(rng.choice(FILLER) for _ in range(3))
+        mention = ", ".join(rng.sample(skills, k=min(3, len(skills))))
+        parts.append(f"<p>{sentence} Bonus points for {mention} &amp; curiosity.</p>")
+    parts.append("<p><em>We are an equal opportunity employer.</em></p>")
+    return "\n".join(parts)
+
+
+def generate_jobs(n: int, seed: int = 0, duplicate_rate: float = 0.05) -> List[Job]:
+    """``n`` jobs, of which about ``duplicate_rate`` repost an earlier job from another source."""
+
+    rng = random.Random(seed)
+    jobs: List[Job] = []
+    for i in range(n):
+        if jobs and rng.random() < duplicate_rate:
+            original = rng.choice(jobs)
+            relisted = rng.random() < 0.5
+            url = f"{original.url}-relist{i}" if relisted else f"{original.url}?utm_source={rng.choice(SOURCES)}&ref={i}"
+            jobs.append(
+                Job(
+                    job_id="",
+                    title=original.title,
+                    company=original.company,
+                    location=original.location,
+                    url=url,
+                    source=rng.choice(SOURCES),
+                    posted_at=original.posted_at,
+                    description=original.description,
+                )
+            )
+            continue
+        role = rng.choice(ROLES)
+        title = f"{rng.choice(SENIORITY)} {role}".strip()
+        skills = rng.sample(SKILLS, k=rng.randint(5, 12))
+        company = _company(rng)
+        jobs.append(
+            Job(
+                job_id="",
+                title=title,
+                company=company,
+                location=rng.choice(LOCATIONS),
+                url=f"https://jobs.example.com/{company.lower().replace(' ', '-')}/{i}",
+                source=rng.choice(SOURCES),
+                posted_at=f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}T00:00:00",
+                description=_description_html(rng, skills, rng.randint(1500, 8000)),
+            )
+        )
+    return jobs
+
+
+def generate_resumes(m: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed + 1)
+    resumes = []
+    for i in range(m):
+        skills = rng.sample(SKILLS, k=rng.randint(10, 20))
+        lines = [f"Candidate {i}", f"{rng.choice(SENIORITY)} {rng.choice(ROLES)}".strip(), "", "Skills: " + ", ".join(skills), ""]
+        target = rng.randint(2000, 6000)
+        while sum(len(line) + 1 for line in lines) < target:
+            lines.append(f"{_company(rng)} — {rng.choice(ROLES)} ({rng.randint(2012, 2025)})")
+            for _ in range(3):
+                lines.append(f"- Built {rng.choice(skills)} and {rng.choice(skills)} services; {rng.choice(FILLER)}")
+            lines.append("")
+        resumes.append("\n".join(lines))
+    return resumes
+
+
+def simple_pdf(pages: List[str]) -> bytes:
+    """A minimal valid PDF with one page per entry; each line of an entry is drawn as text."""
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", "", "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        lines = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in text.splitlines()]
+        stream = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1', 'replace'))} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1", "replace")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def write_resume_files(directory: Path, m: int, seed: int = 0, lines_per_page: int = 40) -> List[Path]:
+    """Write ``m`` resumes to ``directory``, cycling through .pdf (one page per ``lines_per_page``
+    lines), .docx and .txt."""
+
+    from docx import Document
+
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for idx, text in enumerate(generate_resumes(m, seed=seed)):
+        kind = ("pdf", "docx", "txt")[idx % 3]
+        path = directory / f"resume-{idx:04d}.{kind}"
+        if kind == "pdf":
+            lines = text.splitlines()
+            pages = ["\n".join(lines[i : i + lines_per_page]) for i in range(0, len(lines), lines_per_page)]
+            path.write_bytes(simple_pdf(pages))
+        elif kind == "docx":
+            doc = Document()
+            for line in text.splitlines():
+                doc.add_paragraph(line)
+            doc.save(str(path))
+        else:
+            path.write_text(text, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic job/resume corpus as JSON lines.")
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--resumes", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--out", type=str, required=True)
+    args = parser.parse_args()
+
+    with open(args.out, "w", encoding="utf-8") as fh:
+        for job in generate_jobs(args.jobs, seed=args.seed, duplicate_rate=args.duplicate_rate):
+            fh.write(json.dumps({"type": "job", **job.dict()}) + "\n")
+        for idx, text in enumerate(generate_resumes(args.resumes, seed=args.seed)):
+            fh.write(json.dumps({"type": "resume", "resume_id": f"resume-{idx}", "text": text}) + "\n")
+    print(f"Wrote {args.jobs} jobs and {args.resumes} resumes to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
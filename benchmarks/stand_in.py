@@ -0,0 +1,335 @@
+"""
+Deterministic local stand-in for Ollama and OpenAI-compatible LLM servers.
+
+Serves ``/api/embeddings``, ``/api/embed``, ``/api/chat``, ``/api/ps``, ``/api/tags``,
+``/v1/embeddings`` and ``/v1/chat/completions``. Embeddings are hash-derived unit vectors
+(same text, same vector); chat requests that carry a ``{"jobs": [...]}`` payload (the
+``MatchRankAgent`` rerank prompt) get a schema-valid JSON array scoring every job, other chats
+get a short deterministic reply. Replies include Ollama timing/token fields and OpenAI
+``usage`` so the client's accounting paths run too; prompt tokens shared with the previous
+chat prompt are reported as cached, like a KV-cache prefix hit.
+
+Latency, parallel capacity, generation speed, model load time and failure rate are configurable,
+so benchmarks measure our own overhead separately from model speed. Point ``OLLAMA_BASE_URL`` or
+``OPENAI_BASE_URL`` (``<url>/v1``) at it.
+
+Usage:
+    python benchmarks/stand_in.py --port 11500 --latency-ms 20 --max-parallel 4 --failure-rate 0.01
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def hash_embedding(text: str, dim: int = 768) -> List[float]:
+    """Deterministic unit vector derived from the text, standing in for a real embedding model."""
+
+    values: List[float] = []
+    counter = 0
+    while len(values) < dim:
+        digest = hashlib.sha256(f"{counter}:{text}".encode()).digest()
+        values.extend(x / 2**31 for x in struct.unpack("<8i", digest))
+        counter += 1
+    values = values[:dim]
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [v / norm for v in values]
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _stable_int(text: str, modulo: int) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16) % modulo
+
+
+def _messages_text(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(str(m.get("content") or "") for m in messages)
+
+
+def rerank_reply(messages: List[Dict[str, Any]]) -> Optional[str]:
+    """Schema-valid rerank JSON for a prompt whose last message lists jobs, else ``None``."""
+
+    if not messages:
+        return None
+    raw = str(messages[-1].get("content") or "")
+    try:
+        payload = json.loads(raw.split("\n\n")[0])
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("jobs"), list):
+        return None
+    resume = _messages_text(messages[:-1]) or str(payload.get("resume") or "")
+    resume_words = set(resume.lower().split())
+    items = []
+    for job in payload["jobs"]:
+        job_id = job.get("job_id")
+        if not job_id:
+            continue
+        words = [w for w in str(job.get("description") or "").lower().split() if w.isalpha() and len(w) > 3]
+        shared = sorted({w for w in words if w in resume_words})[:3]
+        missing = sorted({w for w in words if w not in resume_words})[:2]
+        items.append(
+            {
+                "job_id": job_id,
+                "score_0_to_100": _stable_int(job_id + resume[:200], 101),
+                "strengths": shared,
+                "gaps": missing,
+                "short_reason": f"Stand-in score for {job.get('title') or job_id}",
+            }
+        )
+    return json.dumps(items)
+
+
+class StandInState:
+    """Counters, prefix cache and failure RNG shared by the handler threads."""
+
+    def __init__(self, seed: int = 0):
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.requests: Counter = Counter()
+        self.failures = 0
+        self.loaded: Dict[str, float] = {}
+        self.last_prompt: Dict[str, str] = {}
+
+    def should_fail(self, rate: float) -> bool:
+        with self.lock:
+            fail = rate > 0 and self.rng.random() < rate
+            if fail:
+                self.failures += 1
+            return fail
+
+    def load_model(self, model: str) -> bool:
+        """Mark ``model`` loaded; True if this call loaded it."""
+
+        with self.lock:
+            cold = model not in self.loaded
+            self.loaded[model] = time.time()
+            return cold
+
+    def cached_chars(self, model: str, prompt: str) -> int:
+        with self.lock:
+            previous = self.last_prompt.get(model, "")
+            self.last_prompt[model] = prompt
+        shared = 0
+        for a, b in zip(previous, prompt, strict=False):
+            if a != b:
+                break
+            shared += 1
+        return shared
+
+
+def start_stand_in(
+    latency_s: float = 0.0,
+    max_parallel: Optional[int] = None,
+    dim: int = 768,
+    failure_rate: float = 0.0,
+    load_s: float = 0.0,
+    gen_tokens_per_s: Optional[float] = None,
+    seed: int = 0,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> ThreadingHTTPServer:
+    """Start the stand-in on a background thread and return the server (``server.url``).
+
+    ``latency_s`` is added to every request; ``max_parallel`` models a GPU box that can only run
+    that many requests at once (extra requests queue inside the server, like a saturated Ollama
+    host); ``gen_tokens_per_s`` adds generation time proportional to the reply length;
+    ``load_s`` is charged on the first request for each model; ``failure_rate`` is the share of
+    requests answered with HTTP 500.
+    """
+
+    slots = threading.Semaphore(max_parallel) if max_parallel else None
+    state = StandInState(seed)
+
+    def _work(model: str, out_tokens: int) -> Tuple[float, float]:
+        """Sleep like the model would; returns (load_s, eval_s) charged."""
+
+        loaded_s = load_s if model and state.load_model(model) else 0.0
+        eval_s = out_tokens / gen_tokens_per_s if gen_tokens_per_s else 0.0
+        delay = latency_s + loaded_s + eval_s
+        if slots is not None:
+            with slots:
+                time.sleep(delay)
+        elif delay:
+            time.sleep(delay)
+        return loaded_s, eval_s
+
+    def _ollama_timing(started: float, load: float, prompt_tokens: int, out_tokens: int, eval_s: float) -> dict:
+        total_ns = int((time.perf_counter() - started) * 1e9)
+        return {
+            "total_duration": total_ns,
+            "load_duration": int(load * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_tokens * 2e5),
+            "eval_count": out_tokens,
+            "eval_duration": int(eval_s * 1e9) or out_tokens * 1_000_000,
+        }
+
+    def _chat(model: str, messages: List[Dict[str, Any]]) -> Tuple[str, int, int, int]:
+        prompt = _messages_text(messages)
+        content = rerank_reply(messages) or f"stand-in reply {_stable_int(prompt, 10**6)}"
+        cached = _tokens(prompt[: state.cached_chars(model, prompt)]) if prompt else 0
+        prompt_tokens = _tokens(prompt)
+        return content, prompt_tokens, min(cached, prompt_tokens), _tokens(content)
+
+    def handle(path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        started = time.perf_counter()
+        model = str(body.get("model") or "stand-in")
+        if path == "/api/embeddings":
+            _work(model, 0)
+            return 200, {"embedding": hash_embedding(str(body.get("prompt") or ""), dim)}
+        if path == "/api/embed":
+            inputs = body.get("input") or []
+            inputs = [inputs] if isinstance(inputs, str) else list(inputs)
+            load, _ = _work(model, 0)
+            tokens = sum(_tokens(text) for text in inputs)
+            return 200, {
+                "model": model,
+                "embeddings": [hash_embedding(text, dim) for text in inputs],
+                "total_duration": int((time.perf_counter() - started) * 1e9),
+                "load_duration": int(load * 1e9),
+                "prompt_eval_count": tokens,
+            }
+        if path == "/api/chat":
+            messages = body.get("messages") or []
+            if not messages:  # preload request
+                load, _ = _work(model, 0)
+                return 200, {"model": model, "message": {"role": "assistant", "content": ""}, "done": True,
+                             "done_reason": "load", "load_duration": int(load * 1e9),
+                             "total_duration": int((time.perf_counter() - started) * 1e9)}
+            content, prompt_tokens, cached, out_tokens = _chat(model, messages)
+            load, eval_s = _work(model, out_tokens)
+            return 200, {
+                "model": model,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "message": {"role": "assistant", "content": content},
+                "done": True,
+                "done_reason": "stop",
+                **_ollama_timing(started, load, prompt_tokens - cached, out_tokens, eval_s),
+            }
+        if path == "/v1/embeddings":
+            inputs = body.get("input") or []
+            inputs = [inputs] if isinstance(inputs, str) else list(inputs)
+            _work(model, 0)
+            tokens = sum(_tokens(text) for text in inputs)
+            return 200, {
+                "object": "list",
+                "model": model,
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": hash_embedding(text, dim)}
+                    for i, text in enumerate(inputs)
+                ],
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            }
+        if path == "/v1/chat/completions":
+            content, prompt_tokens, cached, out_tokens = _chat(model, body.get("messages") or [])
+            _work(model, out_tokens)
+            return 200, {
+                "id": f"chatcmpl-{_stable_int(content, 10**9)}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": out_tokens,
+                    "total_tokens": prompt_tokens + out_tokens,
+                    "prompt_tokens_details": {"cached_tokens": cached},
+                },
+            }
+        return 404, {"error": f"unknown path {path}"}
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):  # noqa: N802 - http.server naming
+            with state.lock:
+                state.requests[self.path] += 1
+                models = [{"name": name, "model": name} for name in sorted(state.loaded)]
+            if self.path in {"/api/ps", "/api/tags"}:
+                self._reply(200, {"models": models})
+            elif self.path == "/v1/models":
+                self._reply(200, {"object": "list", "data": [{"id": m["name"], "object": "model"} for m in models]})
+            else:
+                self._reply(404, {"error": f"unknown path {self.path}"})
+
+        def do_POST(self):  # noqa: N802 - http.server naming
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            with state.lock:
+                state.requests[self.path] += 1
+            if state.should_fail(failure_rate):
+                self._reply(500, {"error": "stand-in injected failure"})
+                return
+            status, payload = handle(self.path, body)
+            self._reply(status, payload)
+
+        def log_message(self, *_args):
+            return
+
+    class _Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 256
+
+    server = _Server((host, port), _Handler)
+    server.state = state
+    server.url = f"http://{host}:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the stand-in LLM server in the foreground.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed latency added to every request.")
+    parser.add_argument("--max-parallel", type=int, default=0, help="Requests served at once (0 = unlimited).")
+    parser.add_argument("--gen-tokens-per-s", type=float, default=0.0, help="Simulated generation speed for chat.")
+    parser.add_argument("--load-ms", type=float, default=0.0, help="Model load time charged on first use.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with HTTP 500.")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_stand_in(
+        latency_s=args.latency_ms / 1000.0,
+        max_parallel=args.max_parallel or None,
+        dim=args.dim,
+        failure_rate=args.failure_rate,
+        load_s=args.load_ms / 1000.0,
+        gen_tokens_per_s=args.gen_tokens_per_s or None,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Stand-in LLM server on {server.url} (OLLAMA_BASE_URL={server.url}, OPENAI_BASE_URL={server.url}/v1)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 import math
 from typing import List
 
-from src.storage.vectordb import get_chroma_client, get_or_create_collection, query
+from src.storage.sqlite import init_db
+from src.storage.vectordb import lazy_collection, query
 import src.config as config
 
 # Dummy evaluation samples
@@ -26,8 +27,8 @@ def mrr(retrieved: List[str], relevant: List[str]) -> float:
 
 
 def main():
-    client = get_chroma_client(config.VDB_JOBS_DIR)
-    col = get_or_create_collection(client, "jobs")
+    init_db()
+    col = lazy_collection(config.VDB_JOBS_DIR, "jobs")
     precisions = []
     rr = []
     for sample in SAMPLES:
@@ -1,8 +1,10 @@
 import argparse
 
-from src.storage.vectordb import get_chroma_client, get_or_create_collection
+from src.storage.vectordb import lazy_collection
 from src.storage.sqlite import init_db
+from src.llm import get_residency_manager
 from src.agents.job_scout import JobScoutAgent
+from src.tools.job_sources.transport import set_cassette_mode
 import src.config as config
 
 
@@ -10,10 +12,16 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--query", required=True)
     parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--cassettes", choices=["record", "replay"], default=None, help="Record or replay source HTTP traffic.")
+    parser.add_argument("--cassette_dir", default=None)
+    parser.add_argument("--latency_scale", type=float, default=None, help="Replay latency multiplier (0 = no delay).")
     args = parser.parse_args()
+    if args.cassettes:
+        set_cassette_mode(args.cassettes, args.cassette_dir, args.latency_scale)
     init_db()
-    client = get_chroma_client(config.VDB_JOBS_DIR)
-    collection = get_or_create_collection(client, "jobs")
+    if config.OLLAMA_PRELOAD:
+        get_residency_manager().preload(workloads=("embed",))
+    collection = lazy_collection(config.VDB_JOBS_DIR, "jobs")
     agent = JobScoutAgent(collection)
     summary = agent.run_search(args.query, limit_per_source=args.limit)
     print(summary)
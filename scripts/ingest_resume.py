@@ -1,21 +1,38 @@
 import argparse
 
-from src.storage.vectordb import get_chroma_client, get_or_create_collection
+from src.storage.vectordb import lazy_collection
 from src.storage.sqlite import init_db
-from src.agents.resume_ingest import ResumeIngestAgent
+from src.llm import get_residency_manager
+from src.agents.resume_ingest import ResumeIngestAgent, resume_paths
 import src.config as config
 
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--file", required=True)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file")
+    source.add_argument("--dir", help="Ingest every pdf/docx/txt resume under this directory.")
+    source.add_argument("--glob", help="Ingest the resumes matching this pattern (quote it), e.g. 'cvs/**/*.pdf'.")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes for --dir/--glob (default INGEST_WORKERS).")
     args = parser.parse_args()
     init_db()
-    client = get_chroma_client(config.VDB_RESUMES_DIR)
-    collection = get_or_create_collection(client, "resumes")
+    if config.OLLAMA_PRELOAD:
+        get_residency_manager().preload(workloads=("embed",))
+    collection = lazy_collection(config.VDB_RESUMES_DIR, "resumes")
     agent = ResumeIngestAgent(collection)
-    resume_id = agent.ingest(args.file)
-    print(f"Ingested {resume_id}")
+    if args.file:
+        resume_id = agent.ingest(args.file)
+        print(f"Ingested {resume_id}")
+        return
+    paths = resume_paths(args.dir or args.glob)
+    result = agent.ingest_many(paths, workers=args.workers)
+    for entry in result.failed:
+        print(f"FAILED {entry['path']}: {entry['error']}")
+    print(
+        f"Ingested {len(result.ingested)} of {len(paths)} resumes ({sum(e['chunks'] for e in result.ingested)} chunks, "
+        f"{len(result.skipped)} already ingested) "
+        f"in {result.seconds:.1f}s: {result.resumes_per_min:.0f} resumes/min; stage seconds {result.stages}"
+    )
 
 
 if __name__ == "__main__":
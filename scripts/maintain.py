@@ -0,0 +1,55 @@
+import argparse
+
+import src.config as config
+from src.agents.job_scout import JobScoutAgent
+from src.logging_config import setup_logging
+from src.maintenance import (
+    expire_jobs,
+    rebuild_collection,
+    vacuum_chroma,
+    vacuum_sqlite,
+    vectors_deleted_since_rebuild,
+)
+from src.storage.sqlite import init_db, job_storage_stats, list_maintenance
+from src.storage.vectordb import get_chroma_client, lazy_collection
+from src.vector_collections import active_collection
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expire stale jobs, settle interrupted vector writes and compact the job stores.")
+    parser.add_argument("--expire", action="store_true", help="Tombstone stale jobs and delete their vectors.")
+    parser.add_argument("--dry_run", action="store_true", help="With --expire, only count what would expire.")
+    parser.add_argument(
+        "--reconcile", action="store_true", help="Re-embed jobs whose vector write was interrupted (vector_state 'pending')."
+    )
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the app database and the Chroma store.")
+    parser.add_argument(
+        "--rebuild-index", dest="rebuild_index", action="store_true",
+        help="Copy live job vectors into a fresh index. Stop the app and workers first.",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    init_db()
+    client = get_chroma_client(config.VDB_JOBS_DIR)
+    if args.reconcile:
+        print("Reconciled:", JobScoutAgent(lazy_collection(config.VDB_JOBS_DIR, "jobs")).reconcile_vectors())
+    if args.expire:
+        counts = expire_jobs(lazy_collection(config.VDB_JOBS_DIR, "jobs"), dry_run=args.dry_run)
+        print(("Would expire: " if args.dry_run else "Expired: ") + str(counts))
+    if args.vacuum:
+        print("App database:", vacuum_sqlite(min_free_ratio=0.0))
+        print("Chroma store:", vacuum_chroma(config.VDB_JOBS_DIR))
+    if args.rebuild_index:
+        collection = rebuild_collection(client, active_collection("jobs")["name"])
+        print(f"Rebuilt job index with {collection.count()} vectors")
+    stats = job_storage_stats()
+    print(
+        f"{stats['live_jobs']} live jobs, {stats['tombstones']} tombstones, database {stats['db_bytes'] / 1e6:.1f} MB "
+        f"({stats['free_bytes'] / 1e6:.1f} MB free), {vectors_deleted_since_rebuild()} vectors deleted since last rebuild"
+    )
+    for row in list_maintenance(limit=5):
+        print(f"{row['finished_at']} {row['operation']:<14} {row['details']}")
+
+
+if __name__ == "__main__":
+    main()
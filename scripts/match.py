@@ -1,7 +1,9 @@
 import argparse
+import time
 
-from src.storage.vectordb import get_chroma_client, get_or_create_collection
+from src.storage.vectordb import lazy_collection
 from src.storage.sqlite import init_db
+from src.llm import get_residency_manager
 from src.agents.match_rank import MatchRankAgent
 import src.config as config
 
@@ -11,14 +13,34 @@ def main():
     parser.add_argument("--resume_id", required=True)
     parser.add_argument("--top_k", type=int, default=25)
     parser.add_argument("--no_llm", action="store_true")
+    parser.add_argument(
+        "--deadline_s",
+        type=float,
+        default=None,
+        help="Print hybrid results after this many seconds, then LLM scores as they arrive",
+    )
     args = parser.parse_args()
     init_db()
-    resumes_client = get_chroma_client(config.VDB_RESUMES_DIR)
-    jobs_client = get_chroma_client(config.VDB_JOBS_DIR)
-    resume_col = get_or_create_collection(resumes_client, "resumes")
-    job_col = get_or_create_collection(jobs_client, "jobs")
+    if config.OLLAMA_PRELOAD:
+        get_residency_manager().preload(workloads=("embed",) if args.no_llm else ("embed", "chat"))
+    resume_col = lazy_collection(config.VDB_RESUMES_DIR, "resumes")
+    job_col = lazy_collection(config.VDB_JOBS_DIR, "jobs")
     agent = MatchRankAgent(resume_col, job_col)
-    results = agent.rank(args.resume_id, top_k=args.top_k, use_llm_rerank=not args.no_llm)
+    results = agent.rank(args.resume_id, top_k=args.top_k, use_llm_rerank=not args.no_llm, deadline_s=args.deadline_s)
+    print(results)
+    if not any(job.get("llm_pending") for job in results):
+        return
+    run_id = results[0]["run_id"]
+    scored = sum(1 for job in results if job.get("match"))
+    while True:
+        time.sleep(2)
+        results, status = agent.fetch_results(run_id)
+        now_scored = sum(1 for job in results if job.get("match"))
+        if now_scored != scored:
+            scored = now_scored
+            print(f"LLM scored {scored}/{len(results)} jobs")
+        if status in {"done", "failed"}:
+            break
     print(results)
 
 
@@ -0,0 +1,26 @@
+import argparse
+
+from src.storage.migrations import migrate, migration_status, run_backfills
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upgrade the SQLite schema and run pending data backfills.")
+    parser.add_argument("--status", action="store_true", help="Only print each migration's state.")
+    parser.add_argument("--target", type=int, default=None, help="Stop at this schema version.")
+    parser.add_argument("--no_backfill", action="store_true", help="Apply schema changes only.")
+    parser.add_argument("--batch_size", type=int, default=None)
+    parser.add_argument("--pause_s", type=float, default=None, help="Sleep between backfill batches.")
+    args = parser.parse_args()
+    if not args.status:
+        applied = migrate(target=args.target)
+        print(f"Applied migrations: {applied or 'none'}")
+        if not args.no_backfill:
+            batches = run_backfills(batch_size=args.batch_size, pause_s=args.pause_s)
+            print(f"Backfill batches: {batches or 'none pending'}")
+    for row in migration_status():
+        state = "pending" if not row["applied_at"] else ("backfilling" if not row["backfilled_at"] else "done")
+        print(f"{row['version']:>3} {row['name']:<20} {state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import contextlib
+from datetime import datetime
+
+import src.config as config
+from src.agents.job_scout import JobScoutAgent
+from src.logging_config import setup_logging
+from src.refresh import RefreshScheduler, add_saved_query, remove_saved_query
+from src.storage.sqlite import init_db, list_refresh_targets, list_saved_queries
+from src.storage.vectordb import lazy_collection
+
+
+def _when(ts):
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh saved job queries on a per-board schedule.")
+    parser.add_argument("--add", metavar="QUERY", help="Save a query for scheduled refresh.")
+    parser.add_argument("--limit", type=int, default=50, help="Jobs per board for --add.")
+    parser.add_argument("--remove", metavar="QUERY", help="Stop refreshing a saved query.")
+    parser.add_argument("--status", action="store_true", help="Print saved queries and each board's schedule.")
+    parser.add_argument("--once", action="store_true", help="Refresh what is due now and exit.")
+    args = parser.parse_args()
+    setup_logging()
+    init_db()
+    if args.add:
+        add_saved_query(args.add, args.limit)
+    if args.remove:
+        remove_saved_query(args.remove)
+    if args.status or args.add or args.remove:
+        print("Saved queries:", [row["query"] for row in list_saved_queries()])
+        for row in list_refresh_targets():
+            print(
+                f"{row['source']:<10} {row['board']:<20} {row['query']!r:<20} every {int(row['interval_s'] or 0):>7}s "
+                f"seen {_when(row['last_seen_at'])} changed {_when(row['last_changed_at'])} next {_when(row['next_due_at'])}"
+                + (f" error: {row['last_error']}" if row["last_error"] else "")
+            )
+        return
+    scheduler = RefreshScheduler(JobScoutAgent(lazy_collection(config.VDB_JOBS_DIR, "jobs")))
+    if args.once:
+        scheduler.sync_targets()
+        outcomes = scheduler.run_due()
+        print(f"Refreshed {len(outcomes)} boards, {sum(o.added for o in outcomes)} jobs added, {sum(1 for o in outcomes if o.error)} failed")
+        return
+    with contextlib.suppress(KeyboardInterrupt):
+        scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import json
+import random
+
+from src.logging_config import setup_logging
+from src.storage.sqlite import init_db
+
+COLLECTIONS = ("jobs", "resumes")
+
+
+def _ints(value: str):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def _collection(kind: str):
+    """Chroma client and the active collection of ``kind``."""
+    from src.storage.vectordb import get_chroma_client
+    from src.vector_collections import active_collection, persist_dir
+
+    client = get_chroma_client(persist_dir(kind))
+    return client, client.get_collection(active_collection(kind)["name"])
+
+
+def stats(args) -> None:
+    from src.vector_index import collection_stats
+
+    for name in COLLECTIONS if args.collection == "all" else [args.collection]:
+        try:
+            print(json.dumps(collection_stats(_collection(name)[1])))
+        except Exception as exc:  # collection not created yet
+            print(json.dumps({"name": name, "error": str(exc)}))
+
+
+def rebuild(args) -> None:
+    from src.maintenance import rebuild_collection
+    from src.vector_collections import active_collection, embed_documents, model_name
+    from src.vector_index import collection_stats
+
+    client, collection = _collection(args.collection)
+    model = model_name(active_collection(args.collection)["embed_model"])
+    given = {"hnsw:space": args.space, "hnsw:M": args.m, "hnsw:construction_ef": args.construction_ef, "hnsw:search_ef": args.search_ef}
+    overrides = {key: value for key, value in given.items() if value}
+    print("Before:", json.dumps(collection_stats(collection)))
+    reembed = (lambda documents: embed_documents(list(documents), model)) if args.reembed else None
+    rebuilt = rebuild_collection(client, collection.name, index=overrides, embed_documents=reembed)
+    print("After: ", json.dumps(collection_stats(rebuilt)))
+
+
+def sweep(args) -> None:
+    import numpy as np
+
+    from src.vector_index import collection_stats, load_vectors
+    from src.vector_index import sweep as run_sweep
+
+    _client, collection = _collection(args.collection)
+    ids, vectors = load_vectors(collection, limit=args.limit or None)
+    if not ids:
+        raise SystemExit(f"Collection {args.collection} is empty")
+    space = args.space or collection_stats(collection)["space"]
+    rng = random.Random(args.seed)
+    queries = None
+    if args.query_source == "resumes" and args.collection != "resumes":
+        try:
+            _resume_ids, queries = load_vectors(_collection("resumes")[1])
+        except Exception:
+            queries = None
+        if queries is not None and len(queries):
+            queries = queries[rng.sample(range(len(queries)), min(args.queries, len(queries)))]
+        else:
+            queries = None
+    if queries is None:
+        # Held-out vectors of the collection itself: queried, but not indexed.
+        if len(ids) < 2:
+            raise SystemExit(f"Collection {args.collection} has a single vector; held-out queries need at least 2")
+        held_out = set(rng.sample(range(len(ids)), min(args.queries, len(ids) // 10 or 1)))
+        queries = vectors[sorted(held_out)]
+        keep = [i for i in range(len(ids)) if i not in held_out]
+        ids, vectors = [ids[i] for i in keep], vectors[np.asarray(keep)]
+    print(f"Sweeping {len(ids)} vectors, {len(queries)} queries, space {space}, k={args.k}", flush=True)
+    rows = run_sweep(
+        ids,
+        vectors,
+        queries,
+        space=space,
+        ms=_ints(args.m),
+        construction_efs=_ints(args.construction_ef),
+        search_efs=_ints(args.search_ef),
+        k=args.k,
+    )
+    for row in rows:
+        print(json.dumps(row))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as handle:
+            json.dump({"collection": args.collection, "vectors": len(ids), "queries": len(queries), "results": rows}, handle, indent=2)
+        print(f"Wrote {args.out}")
+
+
+def collections(_args) -> None:
+    from src.storage.sqlite import list_vector_collections
+    from src.vector_collections import active_collection
+
+    for kind in COLLECTIONS:
+        active_collection(kind)
+    for record in list_vector_collections():
+        print(json.dumps(record))
+
+
+def migrate(args) -> None:
+    from src.tasks import enqueue
+    from src.vector_collections import drop_retired, embed_model_key, migrate_collection
+
+    if args.drop_retired:
+        print("Dropped:", drop_retired() or "nothing")
+        return
+    model = args.model or embed_model_key()
+    for kind in COLLECTIONS if args.collection == "all" else [args.collection]:
+        if args.background:
+            print(f"Queued {kind} re-embed with {model}: task {enqueue('reembed', {'kind': kind, 'model': model})}")
+        else:
+            print(json.dumps(migrate_collection(kind, model=model, on_progress=lambda p: print(json.dumps(p), flush=True))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect, rebuild and tune the Chroma vector indexes.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stats_cmd = commands.add_parser("stats", help="Vector count, dimension, space and HNSW settings.")
+    stats_cmd.add_argument("--collection", choices=[*COLLECTIONS, "all"], default="all")
+    stats_cmd.set_defaults(run=stats)
+
+    collections_cmd = commands.add_parser("collections", help="Collections per embedding model and their status.")
+    collections_cmd.set_defaults(run=collections)
+
+    migrate_cmd = commands.add_parser(
+        "migrate", help="Re-embed stored text into a collection for another embedding model, then switch to it."
+    )
+    migrate_cmd.add_argument("--collection", choices=[*COLLECTIONS, "all"], default="all")
+    migrate_cmd.add_argument("--model", help="provider:model to migrate to (default: the configured embedding model).")
+    migrate_cmd.add_argument("--background", action="store_true", help="Queue it for the task worker instead of running here.")
+    migrate_cmd.add_argument(
+        "--drop-retired", dest="drop_retired", action="store_true", help="Delete collections replaced by earlier migrations."
+    )
+    migrate_cmd.set_defaults(run=migrate)
+
+    rebuild_cmd = commands.add_parser("rebuild", help="Rebuild a collection's index; stop the app and workers first.")
+    rebuild_cmd.add_argument("--collection", choices=COLLECTIONS, default="jobs")
+    rebuild_cmd.add_argument("--space", choices=["cosine", "l2", "ip"], help="Distance space (default: keep).")
+    rebuild_cmd.add_argument("--m", type=int, help="HNSW neighbors per node (default: keep).")
+    rebuild_cmd.add_argument("--construction-ef", dest="construction_ef", type=int, help="HNSW build candidates (default: keep).")
+    rebuild_cmd.add_argument("--search-ef", dest="search_ef", type=int, help="HNSW query candidates (default: keep).")
+    rebuild_cmd.add_argument("--reembed", action="store_true", help="Embed the stored documents again with the active model.")
+    rebuild_cmd.set_defaults(run=rebuild)
+
+    sweep_cmd = commands.add_parser("sweep", help="Recall and latency of HNSW settings against exact search.")
+    sweep_cmd.add_argument("--collection", choices=COLLECTIONS, default="jobs")
+    sweep_cmd.add_argument("--space", choices=["cosine", "l2", "ip"], help="Distance space (default: the collection's).")
+    sweep_cmd.add_argument("--m", default="8,16,32")
+    sweep_cmd.add_argument("--construction-ef", dest="construction_ef", default="64,128,256")
+    sweep_cmd.add_argument("--search-ef", dest="search_ef", default="10,32,64,128")
+    sweep_cmd.add_argument("--k", type=int, default=25, help="Neighbors per query (the Match page's Top K).")
+    sweep_cmd.add_argument("--queries", type=int, default=200)
+    sweep_cmd.add_argument(
+        "--query-source", dest="query_source", choices=["resumes", "held-out"], default="resumes",
+        help="Query with resume chunk vectors (what ranking does) or held-out vectors of the collection.",
+    )
+    sweep_cmd.add_argument("--limit", type=int, default=0, help="Index at most this many vectors (0 = all).")
+    sweep_cmd.add_argument("--seed", type=int, default=0)
+    sweep_cmd.add_argument("--out", help="Also write the results as JSON here.")
+    sweep_cmd.set_defaults(run=sweep)
+
+    args = parser.parse_args()
+    setup_logging()
+    init_db()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import time
+
+import src.config as config
+from src.llm import get_residency_manager
+from src.logging_config import setup_logging
+from src.storage.sqlite import init_db
+from src.storage.vectordb import lazy_collection
+from src.tasks import TaskWorker, agent_handlers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued job search, resume ingest and rank tasks.")
+    parser.add_argument("--parallelism", type=int, default=None, help="Worker threads (default TASK_WORKERS).")
+    parser.add_argument("--once", action="store_true", help="Drain the queue and exit.")
+    args = parser.parse_args()
+    setup_logging()
+    init_db()
+    if config.OLLAMA_PRELOAD:
+        get_residency_manager().preload(background=True)
+    jobs_col = lazy_collection(config.VDB_JOBS_DIR, "jobs")
+    resumes_col = lazy_collection(config.VDB_RESUMES_DIR, "resumes")
+    worker = TaskWorker(agent_handlers(jobs_col, resumes_col), parallelism=args.parallelism)
+    if args.once:
+        ran = 0
+        while worker.run_once():
+            ran += 1
+        print(f"Ran {ran} tasks")
+        return
+    worker.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        worker.stop(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
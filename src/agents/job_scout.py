@@ -1,17 +1,39 @@
+import hashlib
 import logging
+import time
 import uuid
 from datetime import datetime
-from typing import Dict
+from typing import Any, Callable, Dict, List, Optional
 
+from .. import config
+from ..models import Job
 from ..storage import vectordb
-from ..storage.sqlite import insert_job, log_job_run
-from ..tools.dedupe import is_duplicate, stable_job_id
+from ..storage.sqlite import (
+    SignatureIndex,
+    alternate_canonicals,
+    get_job_states,
+    get_jobs,
+    insert_job,
+    jobs_with_vector_state,
+    log_job_run,
+    mark_jobs_seen,
+    record_job_alternates,
+    set_vector_states,
+    update_job_content,
+)
+from ..tools.dedupe import content_hash, is_duplicate, job_signature, normalize_url, stable_job_id, title_key
 from ..tools.job_sources import get_sources_from_env
-from ..tools.parsing import strip_html
-from ..llm import LLMProviderError, embed
+from ..tools.job_sources.base import BaseJobSource
+from ..tools.parsing import posted_epoch, strip_html
+from ..llm import PRIORITY_BULK, LLMProviderError, embed, llm_priority
+from ..profiling import profile_run
+from ..tracing import Tracer
 
 logger = logging.getLogger(__name__)
 
+# vector_state of expired jobs (see ``src/maintenance.py``); their text is restored if they reappear.
+_TOMBSTONED = ("delete_pending", "removed")
+
 
 class JobScoutAgent:
     def __init__(self, job_collection):
@@ -19,43 +41,223 @@ class JobScoutAgent:
         self.sources = get_sources_from_env()
         self.max_embed_chars = 9000  # avoid exceeding embed context
 
-    def run_search(self, query: str, limit_per_source: int = 50) -> Dict[str, int]:
+    def run_search(
+        self, query: str, limit_per_source: int = 50, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, int]:
+        """Fetch, dedupe, store and embed jobs from every enabled source; returns jobs added per source.
+
+        Jobs already stored with the same text and an embedding are skipped; changed postings are
+        updated and re-embedded. Near-duplicates of a stored job (the same posting on another
+        board) are kept as alternate URLs of that job instead of being embedded again. ``on_progress`` is called as work advances with ``{"sources":
+        {name: {"fetched", "added", "unchanged", "duplicates", "failed"}}, "current": name, "embedded": total}``
+        (the same dict, updated in place).
+        """
+
         run_id = str(uuid.uuid4())
         started = datetime.utcnow().isoformat()
         summary: Dict[str, int] = {}
         existing_urls: set = set()
         total_added = 0
-        for source in self.sources:
-            jobs = source.search(query, limit_per_source)
-            added_here = 0
+        progress: Dict[str, Any] = {"sources": {}, "current": None, "embedded": 0}
+        tracer = Tracer(run_id, "job_search")
+
+        def _notify(added: bool) -> None:
+            if added:
+                progress["embedded"] += 1
+            if on_progress:
+                on_progress(progress)
+
+        with profile_run(run_id, "job_search"), tracer.span("run_search", sources=len(self.sources)):
+            for source in self.sources:
+                with tracer.span("source", source=source.name):
+                    with tracer.span("fetch"):
+                        jobs = source.search(query, limit_per_source)
+                    counts = progress["sources"][source.name] = {"fetched": len(jobs)}
+                    progress["current"] = source.name
+                    if on_progress:
+                        on_progress(progress)
+                    self._store_jobs(jobs, tracer, existing_urls, counts, _notify)
+                    summary[source.name] = counts["added"]
+                    total_added += counts["added"]
+        progress["current"] = None
+        if on_progress:
+            on_progress(progress)
+        tracer.flush()
+        finished = datetime.utcnow().isoformat()
+        log_job_run(run_id, query, started, finished, total_added, str(summary))
+        logger.info("Job scout run %s added %s jobs", run_id, total_added)
+        return summary
+
+    def refresh_board(self, source: BaseJobSource, board: str, query: str, limit: int = 50) -> Dict[str, Any]:
+        """Fetch one board of a source for a saved query and store what is new or changed.
+
+        Returns the counts plus a ``fingerprint`` of the listing (ids and content hashes), which the
+        refresh scheduler compares between runs. Fetch errors propagate.
+        """
+
+        run_id = str(uuid.uuid4())
+        started = datetime.utcnow().isoformat()
+        tracer = Tracer(run_id, "job_search")
+        try:
+            with tracer.span("refresh", source=source.name, board=board):
+                with tracer.span("fetch"):
+                    jobs = source.search_board(board, query, limit)
+                counts: Dict[str, Any] = {"fetched": len(jobs)}
+                hashes = self._store_jobs(jobs, tracer, set(), counts)
+        finally:
+            tracer.flush()
+        counts["fingerprint"] = hashlib.sha256("\n".join(sorted(hashes)).encode("utf-8")).hexdigest()
+        summary = {f"{source.name}:{board}": counts["added"]}
+        log_job_run(run_id, query, started, datetime.utcnow().isoformat(), counts["added"], str(summary))
+        return counts
+
+    def _document(self, job: Job) -> str:
+        # What gets embedded (and stored as the Chroma document) for a posting with cleaned text.
+        return f"{job.title} at {job.company} {job.location or ''}\n{job.description}"[: self.max_embed_chars]
+
+    def reconcile_vectors(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """Settle jobs an interrupted run left ``pending``: those whose vector reached Chroma with
+        the current text are marked ``stored``, the rest are embedded again from their stored text.
+        Returns ``{"checked", "stored", "reembedded", "failed"}``."""
+
+        batch_size = batch_size or config.VECTOR_WRITE_BATCH
+        counts = {"checked": 0, "stored": 0, "reembedded": 0, "failed": 0}
+        done: set = set()
+
+        def _written(job_ids: List[str]) -> None:
+            set_vector_states(job_ids, "stored")
+            counts["reembedded"] += len(job_ids)
+
+        def _write_failed(job_ids: List[str], _exc: Exception) -> None:
+            set_vector_states(job_ids, "failed")
+            counts["failed"] += len(job_ids)
+
+        with vectordb.VectorWriter(self.job_collection, batch_size=batch_size, on_flush=_written, on_error=_write_failed) as writer:
+            while True:
+                job_ids = [job_id for job_id in jobs_with_vector_state("pending", batch_size) if job_id not in done]
+                if not job_ids:
+                    break
+                done.update(job_ids)
+                counts["checked"] += len(job_ids)
+                hashes = {job_id: state[0] for job_id, state in get_job_states(job_ids).items()}
+                found = vectordb.get(self.job_collection, ids=job_ids, include=["metadatas"])
+                landed = [
+                    job_id
+                    for job_id, meta in zip(found.get("ids") or [], found.get("metadatas") or [], strict=True)
+                    if (meta or {}).get("content_hash") == hashes.get(job_id)
+                ]
+                set_vector_states(landed, "stored")
+                counts["stored"] += len(landed)
+                failed = []
+                for job in get_jobs([job_id for job_id in job_ids if job_id not in set(landed)]):
+                    doc = self._document(job)
+                    try:
+                        with llm_priority(PRIORITY_BULK):
+                            embedding = embed(doc, model=vectordb.collection_embed_model(self.job_collection))
+                    except LLMProviderError as exc:
+                        logger.warning("Embedding failed for job %s: %s", job.job_id, exc)
+                        failed.append(job.job_id)
+                        continue
+                    writer.add(job.job_id, doc, {**job.dict(), "content_hash": hashes[job.job_id]}, embedding)
+                writer.flush()
+                set_vector_states(failed, "failed")
+                counts["failed"] += len(failed)
+        if counts["checked"]:
+            logger.info("Vector reconcile: %s", counts)
+        return counts
+
+    def _store_jobs(
+        self,
+        jobs: List[Job],
+        tracer: Tracer,
+        existing_urls: set,
+        counts: Dict[str, Any],
+        notify: Optional[Callable[[bool], None]] = None,
+    ) -> List[str]:
+        """Dedupe, store and embed ``jobs``, tallying added/unchanged/duplicates/failed into ``counts``;
+        returns ``job_id:content_hash`` for every posting seen."""
+
+        counts.update(added=0, unchanged=0, duplicates=0, failed=0)
+        near_dup = config.NEAR_DUP_THRESHOLD > 0
+        if config.JOB_TTL_S > 0:
+            # Postings past the TTL would only be expired again; boards often list them for months.
+            oldest = time.time() - config.JOB_TTL_S
+            jobs = [job for job in jobs if (posted_epoch(job.posted_at) or oldest) >= oldest]
+        for job in jobs:
+            if not job.job_id:
+                job.job_id = stable_job_id(job.title, job.company, job.location or "", job.url)
+        with tracer.span("store_sqlite", aggregate=True):
+            states = get_job_states([job.job_id for job in jobs])
+            collapsed = alternate_canonicals([job.job_id for job in jobs if job.job_id not in states]) if near_dup else {}
+        failed, seen, alternates, canonicals_seen = [], [], [], []
+
+        def _write_failed(job_ids: List[str], _exc: Exception) -> None:
+            set_vector_states(job_ids, "failed")
+            counts["added"] -= len(job_ids)
+            counts["failed"] += len(job_ids)
+
+        # Rows are written "pending" and marked "stored" as their vector batch lands; rows an
+        # interrupted run leaves pending are finished by ``reconcile_vectors``.
+        writer = vectordb.VectorWriter(
+            self.job_collection, on_flush=lambda job_ids: set_vector_states(job_ids, "stored"), on_error=_write_failed
+        )
+        with SignatureIndex() as signatures:
             for job in jobs:
-                cleaned_desc = strip_html(job.description)
-                if not job.job_id:
-                    job.job_id = stable_job_id(job.title, job.company, job.location or "", job.url)
-                if is_duplicate(existing_urls, job):
-                    continue
-                job.description = cleaned_desc
-                meta = job.dict()
-                meta["description"] = cleaned_desc
-                insert_job(job)
-                doc = f"{job.title} at {job.company} {job.location or ''}\n{cleaned_desc}"
-                doc_for_embed = doc[: self.max_embed_chars]
+                with tracer.span("dedupe", aggregate=True):
+                    cleaned_desc = strip_html(job.description)
+                    if is_duplicate(existing_urls, job):
+                        continue
+                    job.description = cleaned_desc
+                    digest = content_hash(job.title, job.company, job.location or "", cleaned_desc)
+                    seen.append(f"{job.job_id}:{digest}")
+                    previous = states.get(job.job_id)
+                    if previous and previous == (digest, "stored"):
+                        counts["unchanged"] += 1
+                        continue
+                    signature, canonical = None, None
+                    if previous is None and job.job_id in collapsed:
+                        canonical = (collapsed[job.job_id], None)
+                    elif near_dup and (previous is None or previous[0] != digest):
+                        signature = job_signature(job)
+                        if previous is None:
+                            canonical = signatures.find(signature, title_key(job.title), config.NEAR_DUP_THRESHOLD)
+                    if canonical:
+                        alternates.append((normalize_url(job.url), job.job_id, canonical[0], job.source, canonical[1]))
+                        canonicals_seen.append(canonical[0])
+                        counts["duplicates"] += 1
+                        continue
+                with tracer.span("store_sqlite", aggregate=True):
+                    if previous is None:
+                        insert_job(job, vector_state="pending")
+                    elif previous[0] != digest or previous[1] in _TOMBSTONED:
+                        update_job_content(job, vector_state="pending")
+                    else:
+                        set_vector_states([job.job_id], "pending")
+                    if signature is not None:
+                        signatures.add(job.job_id, title_key(job.title), signature)
+                doc_for_embed = self._document(job)
                 try:
-                    embedding = embed(doc_for_embed)
+                    with tracer.span("embed", aggregate=True), llm_priority(PRIORITY_BULK):
+                        embedding = embed(doc_for_embed, model=vectordb.collection_embed_model(self.job_collection))
                 except LLMProviderError as exc:
                     logger.warning("Embedding failed for job %s: %s", job.job_id, exc)
+                    failed.append(job.job_id)
+                    counts["failed"] += 1
+                    if notify:
+                        notify(False)
                     continue
-                vectordb.add_documents(
-                    self.job_collection,
-                    ids=[job.job_id],
-                    documents=[doc_for_embed],
-                    metadatas=[meta],
-                    embeddings=[embedding],
-                )
-                added_here += 1
-            summary[source.name] = added_here
-            total_added += added_here
-        finished = datetime.utcnow().isoformat()
-        log_job_run(run_id, query, started, finished, total_added, str(summary))
-        logger.info("Job scout run %s added %s jobs", run_id, total_added)
-        return summary
+                with tracer.span("store_vectors", aggregate=True):
+                    writer.add(job.job_id, doc_for_embed, {**job.dict(), "content_hash": digest}, embedding)
+                counts["added"] += 1
+                if notify:
+                    notify(True)
+            with tracer.span("store_vectors", aggregate=True):
+                writer.flush()
+        with tracer.span("store_sqlite", aggregate=True):
+            set_vector_states(failed, "failed")
+            now = time.time()
+            mark_jobs_seen([key.rsplit(":", 1)[0] for key in seen], now)
+            # A repost keeps its canonical job listed, but can't revive an expired one.
+            mark_jobs_seen(canonicals_seen, now, revive=False)
+            record_job_alternates(alternates, now)
+        return seen
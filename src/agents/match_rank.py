@@ -1,18 +1,74 @@
+import contextvars
+import hashlib
 import json
 import logging
 import re
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 
-from ..llm import LLMProviderError, chat, embed
+from ..llm import (
+    PRIORITY_INTERACTIVE,
+    LLMProviderError,
+    capture_usage,
+    chat,
+    embed,
+    get_residency_manager,
+    llm_priority,
+    prompt_affinity,
+)
+from ..profiling import profile_run
 from ..storage import vectordb
-from ..storage.sqlite import log_match_run
+from ..storage.sqlite import (
+    get_match_results,
+    get_match_run,
+    log_match_run,
+    save_match_results,
+    set_match_rerank_status,
+    update_match_scores,
+)
 from ..tools.parsing import strip_html
 from ..tools.scoring import distance_to_score, hybrid_score, keyword_overlap
+from ..tracing import Tracer
 
 logger = logging.getLogger(__name__)
 
+RERANK_SYSTEM_PROMPT = (
+    "You are a ranking function. The next message is the candidate's resume; the message after it "
+    "lists jobs as JSON. Return only a JSON array (no code fences, no prose) with one item PER job provided "
+    "(do not drop any). Use this shape exactly for every job: "
+    '[{"job_id": "string", "score_0_to_100": 0-100 integer, "strengths": ["string"], '
+    '"gaps": ["string"], "short_reason": "string"}]. If there are no matches, return [].'
+)
+
+# Retries vary only the tail of the prompt so the system + resume prefix stays cacheable.
+RERANK_RETRY_HINTS = [
+    "",
+    "Respond ONLY with the JSON array. Begin with '[' and end with ']'.",
+    "Return ONLY the JSON array of matches using the exact shape above. If unsure, return an empty array [].",
+]
+
+_backfill_executor: Optional[ThreadPoolExecutor] = None
+_backfill_lock = threading.Lock()
+
+
+def _get_backfill_executor() -> ThreadPoolExecutor:
+    """Shared worker that keeps scoring jobs with the LLM after ``rank`` has returned."""
+
+    global _backfill_executor
+    with _backfill_lock:
+        if _backfill_executor is None:
+            _backfill_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rerank-backfill")
+        return _backfill_executor
+
+
+def _match_sort_key(job: dict) -> float:
+    return job.get("match", {}).get("score_0_to_100", job.get("hybrid_score", 0))
+
 
 class MatchRankAgent:
     def __init__(self, resume_collection, job_collection):
@@ -21,75 +77,112 @@ class MatchRankAgent:
         self.max_embed_chars = 6000
         self.max_llm_resume_chars = 6000
         self.max_llm_job_chars = 4000
+        self.llm_batch_size = 10
+        self.last_rerank_usage: List[dict] = []
 
     def _resume_query_text(self, resume_id: str, top_n: int = 3) -> str:
         res = vectordb.get(self.resume_collection, where_filter={"resume_id": resume_id}, limit=top_n)
         docs = res.get("documents", [])
         return "\n".join(docs)
 
-    def _llm_rerank(self, resume_text: str, jobs: List[dict]) -> dict:
-        base_prompt = (
-            "You are a ranking function. Return only a JSON array (no code fences, no prose) with one item PER job provided (do not drop any). "
-            "Use this shape exactly for every job: "
-            '[{"job_id": "string", "score_0_to_100": 0-100 integer, "strengths": ["string"], '
-            '"gaps": ["string"], "short_reason": "string"}]. If there are no matches, return [].'
-        )
-        prompts = [
-            base_prompt,
-            base_prompt + " Respond ONLY with the JSON array. Begin with '[' and end with ']'.",
-            "Return ONLY the JSON array of matches using the exact shape above. If unsure, return an empty array [].",
+    def _rerank_prefix(self, resume_text: str) -> List[dict]:
+        """Messages shared by every rerank call for a resume (batches and retries alike).
+
+        Keeping them byte-identical and first lets Ollama reuse the KV cache for the prefix and
+        OpenAI-compatible APIs apply prompt caching, so the resume is evaluated once per rank.
+        """
+
+        return [
+            {"role": "system", "content": RERANK_SYSTEM_PROMPT},
+            {"role": "user", "content": "Resume:\n" + resume_text[: self.max_llm_resume_chars]},
         ]
-        trimmed_jobs = []
-        for job in jobs:
-            trimmed_jobs.append(
-                {
-                    **job,
-                    "description": (job.get("description") or "")[: self.max_llm_job_chars],
-                }
-            )
-        job_ids = [job.get("job_id") for job in trimmed_jobs if job.get("job_id")]
-        job_lookup = {job["job_id"]: job for job in trimmed_jobs if job.get("job_id")}
-        logger.info("LLM rerank input: %s jobs sent (ids=%s)", len(trimmed_jobs), job_ids)
-        parsed = None
+
+    def _rerank_batch(self, prefix: List[dict], batch: List[dict]) -> Optional[dict]:
+        """Score one batch of jobs, retrying only the jobs the model dropped.
+
+        Returns ``None`` if the model never produced parseable JSON for the batch.
+        """
+
+        batch_ids = [job["job_id"] for job in batch]
+        scored: dict = {}
+        pending = batch
+        parsed_any = False
         last_raw = ""
-        missing_ids: List[str] = []
-        for idx, prompt in enumerate(prompts):
-            messages = [
-                {"role": "system", "content": prompt},
-                {
-                    "role": "user",
-                    "content": json.dumps({"resume": resume_text[: self.max_llm_resume_chars], "jobs": trimmed_jobs}),
-                },
-            ]
-            last_raw = chat(messages, format="json")
+        for idx, hint in enumerate(RERANK_RETRY_HINTS):
+            suffix = json.dumps({"jobs": pending})
+            if hint:
+                suffix += "\n\n" + hint
+            last_raw = chat(prefix + [{"role": "user", "content": suffix}], format="json")
             parsed = self._parse_llm_json(last_raw)
             if parsed is None:
                 continue
-            returned_ids = [item.get("job_id") for item in parsed if item.get("job_id")]
-            missing_ids = [jid for jid in job_ids if jid not in returned_ids]
-            if missing_ids and idx < len(prompts) - 1:
+            parsed_any = True
+            pending_ids = {job["job_id"] for job in pending}
+            for item in parsed:
+                jid = item.get("job_id")
+                if jid in pending_ids:
+                    scored[jid] = item
+                elif jid:
+                    logger.info("LLM rerank returned unknown job id (not in prompt): %s", jid)
+            pending = [job for job in pending if job["job_id"] not in scored]
+            if not pending:
+                break
+            if idx < len(RERANK_RETRY_HINTS) - 1:
                 logger.info(
                     "LLM rerank missing %s/%s jobs after prompt %s; retrying",
-                    len(missing_ids),
-                    len(job_ids),
+                    len(pending),
+                    len(batch_ids),
                     idx + 1,
                 )
-                parsed = None  # trigger next prompt
-                continue
-            break
-        if parsed is None:  # pragma: no cover - resiliency for non-JSON model output
+        if not parsed_any:  # pragma: no cover - resiliency for non-JSON model output
             logger.warning("LLM rerank parse failed after retries: %s", last_raw)
+            return None
+        return scored
+
+    def _llm_rerank(
+        self, resume_text: str, jobs: List[dict], on_batch: Optional[Callable[[dict], None]] = None
+    ) -> dict:
+        trimmed_jobs = []
+        for job in jobs:
+            if not job.get("job_id"):
+                continue
+            trimmed_jobs.append(
+                {
+                    **job,
+                    "description": (job.get("description") or "")[: self.max_llm_job_chars],
+                }
+            )
+        job_ids = [job["job_id"] for job in trimmed_jobs]
+        job_lookup = {job["job_id"]: job for job in trimmed_jobs}
+        logger.info("LLM rerank input: %s jobs sent (ids=%s)", len(trimmed_jobs), job_ids)
+        prefix = self._rerank_prefix(resume_text)
+        affinity_key = hashlib.sha1(json.dumps(prefix).encode("utf-8")).hexdigest()
+        match_map: dict = {}
+        parsed_any = False
+        batch_size = max(1, self.llm_batch_size)
+        with capture_usage() as calls, prompt_affinity(affinity_key):
+            for start in range(0, len(trimmed_jobs), batch_size):
+                scored = self._rerank_batch(prefix, trimmed_jobs[start : start + batch_size])
+                if scored is not None:
+                    parsed_any = True
+                    match_map.update(scored)
+                    if on_batch is not None and scored:
+                        on_batch(scored)
+        self.last_rerank_usage = [usage.as_dict() for usage in calls]
+        if calls:
+            logger.info(
+                "LLM rerank prompt tokens per call: evaluated=%s cached=%s prompt_eval_ms=%s",
+                [usage.prompt_tokens for usage in calls],
+                [usage.cached_prompt_tokens for usage in calls],
+                [round(usage.prompt_eval_s * 1000) if usage.prompt_eval_s is not None else None for usage in calls],
+            )
+        if not parsed_any:
             return {}
-        returned_ids = [item.get("job_id") for item in parsed if item.get("job_id")]
-        missing_ids = [jid for jid in job_ids if jid not in returned_ids]
-        unknown_ids = [jid for jid in returned_ids if jid not in job_ids]
+        returned_ids = list(match_map)
+        missing_ids = [jid for jid in job_ids if jid not in match_map]
         logger.info("LLM rerank output: %s jobs scored (%s)", len(returned_ids), returned_ids)
         if missing_ids:
             logger.info("LLM rerank missing %s jobs (not returned by model): %s", len(missing_ids), missing_ids)
-        if unknown_ids:
-            logger.info("LLM rerank returned %s unknown job ids (not in prompt): %s", len(unknown_ids), unknown_ids)
-        match_map = {item["job_id"]: item for item in parsed if item.get("job_id")}
-        if missing_ids:
             for jid in missing_ids:
                 hybrid_score_val = job_lookup.get(jid, {}).get("hybrid_score", 0) or 0
                 match_map[jid] = {
@@ -137,12 +230,77 @@ class MatchRankAgent:
             return [data]
         return None
 
-    def rank(self, resume_id: str, top_k: int = 25, use_llm_rerank: bool = True):
+    def rank(self, resume_id: str, top_k: int = 25, use_llm_rerank: bool = True, deadline_s: Optional[float] = None):
+        """Rank jobs for a resume.
+
+        Without ``deadline_s`` this waits for the LLM rerank. With it, the hybrid ranking is
+        returned once ``deadline_s`` has elapsed and the rerank keeps running in the background;
+        jobs it hasn't scored yet carry ``llm_pending`` and ``fetch_results(run_id)`` returns the
+        scores persisted so far. Every job carries the ``run_id``.
+        """
+
         run_id = str(uuid.uuid4())
+        tracer = Tracer(run_id, "rank")
+        with llm_priority(PRIORITY_INTERACTIVE):
+            try:
+                with profile_run(run_id, "rank"), tracer.span("rank", top_k=top_k, llm=use_llm_rerank):
+                    return self._rank(run_id, tracer, resume_id, top_k, use_llm_rerank, deadline_s)
+            finally:
+                tracer.flush()
+
+    def fetch_results(self, run_id: str) -> Tuple[List[dict], Optional[str]]:
+        """Persisted results of a run (best first) and its rerank status."""
+
+        jobs = get_match_results(run_id)
+        jobs.sort(key=_match_sort_key, reverse=True)
+        run = get_match_run(run_id)
+        return jobs, run["rerank_status"] if run else None
+
+    def _rerank_and_store(
+        self, run_id: str, resume_text: str, jobs: List[dict], tracer: Tracer, background: bool = False
+    ) -> dict:
+        set_match_rerank_status(run_id, "running")
+        try:
+            with tracer.span("rerank", jobs=len(jobs), background=background):
+                llm_matches = self._llm_rerank(
+                    resume_text, jobs, on_batch=lambda scored: update_match_scores(run_id, scored)
+                )
+        except LLMProviderError as exc:
+            logger.warning("LLM rerank skipped due to provider error: %s", exc)
+            set_match_rerank_status(run_id, "failed")
+            return {}
+        except Exception:
+            set_match_rerank_status(run_id, "failed")
+            raise
+        finally:
+            if background:
+                tracer.flush()
+        update_match_scores(run_id, llm_matches)
+        set_match_rerank_status(run_id, "done")
+        logger.info("LLM scores applied to %s/%s jobs (run %s)", len(llm_matches), len(jobs), run_id)
+        return llm_matches
+
+    def _rank(
+        self,
+        run_id: str,
+        tracer: Tracer,
+        resume_id: str,
+        top_k: int,
+        use_llm_rerank: bool,
+        deadline_s: Optional[float] = None,
+    ):
         started = datetime.utcnow().isoformat()
-        resume_text = self._resume_query_text(resume_id)
+        t0 = time.monotonic()
+        if use_llm_rerank:
+            # Load the chat model while embedding/retrieval run so the rerank doesn't pay for it.
+            get_residency_manager().prewarm("chat")
+        with tracer.span("resume_text"):
+            resume_text = self._resume_query_text(resume_id)
         try:
-            query_embedding = embed(resume_text[: self.max_embed_chars])
+            with tracer.span("embed_query"):
+                query_embedding = embed(
+                    resume_text[: self.max_embed_chars], model=vectordb.collection_embed_model(self.job_collection)
+                )
         except LLMProviderError as exc:
             logger.error("Embedding resume failed: %s", exc)
             raise
@@ -150,7 +308,8 @@ class MatchRankAgent:
             logger.warning("Empty embedding returned for resume %s; skipping match", resume_id)
             return []
         try:
-            results = vectordb.query(self.job_collection, query_embedding, n_results=top_k)
+            with tracer.span("retrieve"):
+                results = vectordb.query(self.job_collection, query_embedding, n_results=top_k)
         except IndexError:
             logger.warning("Vector DB query failed (likely empty index); skipping match")
             return []
@@ -164,7 +323,8 @@ class MatchRankAgent:
             doc_text = strip_html(results.get("documents", [[]])[0][idx])
             desc = strip_html(meta.get("description", ""))
             distance_score = distance_to_score(distance)
-            keyword_score = keyword_overlap(resume_text, doc_text)
+            with tracer.span("keyword_score", aggregate=True):
+                keyword_score = keyword_overlap(resume_text, doc_text)
             final_score = hybrid_score(distance_score, keyword_score)
             jobs.append(
                 {
@@ -182,21 +342,42 @@ class MatchRankAgent:
                 }
             )
         logger.info("Hybrid retrieval produced %s jobs (top_k=%s)", len(jobs), top_k)
+        for job in jobs:
+            job["run_id"] = run_id
+        jobs.sort(key=_match_sort_key, reverse=True)
+        with tracer.span("store_results"):
+            save_match_results(run_id, jobs)
         llm_matches = {}
+        pending = False
         if use_llm_rerank and jobs:
-            try:
-                llm_matches = self._llm_rerank(resume_text, jobs)
-            except LLMProviderError as exc:
-                logger.warning("LLM rerank skipped due to provider error: %s", exc)
-                llm_matches = {}
+            if deadline_s is None:
+                llm_matches = self._rerank_and_store(run_id, resume_text, jobs, tracer)
+            else:
+                set_match_rerank_status(run_id, "pending")
+                # Copy the context so the backfill keeps the caller's (interactive) priority.
+                ctx = contextvars.copy_context()
+                future = _get_backfill_executor().submit(
+                    ctx.run,
+                    self._rerank_and_store,
+                    run_id,
+                    resume_text,
+                    [dict(job) for job in jobs],
+                    tracer,
+                    background=True,
+                )
+                try:
+                    llm_matches = future.result(timeout=max(0.0, deadline_s - (time.monotonic() - t0)))
+                except FutureTimeoutError:
+                    pending = True
+                    logger.info("Rank deadline of %.1fs reached; LLM scores continue in background (run %s)", deadline_s, run_id)
             for job in jobs:
                 if job["job_id"] in llm_matches:
                     job["match"] = llm_matches[job["job_id"]]
-            logger.info("LLM scores applied to %s/%s jobs", len(llm_matches), len(jobs))
-        jobs.sort(
-            key=lambda j: j.get("match", {}).get("score_0_to_100", j.get("hybrid_score", 0)),
-            reverse=True,
-        )
+                elif pending:
+                    job["llm_pending"] = True
+        else:
+            set_match_rerank_status(run_id, "skipped")
+        jobs.sort(key=_match_sort_key, reverse=True)
         finished = datetime.utcnow().isoformat()
         log_match_run(run_id, resume_id, started, finished, top_k, "llm" if use_llm_rerank else "no-llm")
         logger.info("Match rank run %s completed", run_id)
@@ -1,42 +1,393 @@
+import asyncio
+import glob
+import itertools
 import logging
+import os
+import time
 import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from ..llm import embed
+from .. import config
+from ..llm import PRIORITY_BULK, aembed_many, embed, llm_priority
+from ..llm.http import aclose_async_session
+from ..profiling import profile_run
 from ..storage import vectordb
-from ..storage.sqlite import insert_resume
-from ..tools.chunking import chunk_text
-from ..tools.parsing import extract_text
+from ..storage.sqlite import cache_parsed_text, get_parsed_text, get_resume_by_hash, insert_resume
+from ..tools.chunking import CHUNKING_KEY, chunk_text
+from ..tools.parsing import (
+    PARSER_VERSION,
+    extract_pdf_pages,
+    extract_text,
+    file_hash,
+    normalize_text,
+    pdf_page_count,
+)
+from ..tracing import Tracer
+from ..vector_collections import embed_model_key, model_name
 
 logger = logging.getLogger(__name__)
 
+RESUME_SUFFIXES = (".pdf", ".docx", ".doc", ".txt")
+
+
+def resume_paths(pattern: str) -> List[str]:
+    """Resume files under a directory (recursively) or matching a glob, sorted."""
+
+    if os.path.isdir(pattern):
+        candidates = glob.glob(os.path.join(pattern, "**", "*"), recursive=True)
+    else:
+        candidates = glob.glob(pattern, recursive=True)
+    return sorted(path for path in candidates if os.path.isfile(path) and Path(path).suffix.lower() in RESUME_SUFFIXES)
+
+
+def _extract_part(path: str, pages: Optional[Tuple[int, int]]) -> str:
+    # Runs in a pool process: a whole file, or one page range of a long PDF.
+    return extract_text(path) if pages is None else extract_pdf_pages(path, *pages)
+
+
+async def _embed_all(texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+    try:
+        return await aembed_many(texts, model=model, concurrency=config.INGEST_EMBED_CONCURRENCY)
+    finally:
+        await aclose_async_session()
+
+
+def _error(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def parse_files(
+    paths: List[str], workers: Optional[int] = None, pages_per_task: Optional[int] = None
+) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """Extract the text of ``paths`` on a process pool, yielding ``(path, text, error)`` as files
+    finish. PDFs longer than ``pages_per_task`` pages are split into page ranges extracted in
+    parallel. ``workers=1`` parses in this process."""
+
+    workers = workers or config.INGEST_WORKERS
+    pages_per_task = max(1, pages_per_task or config.INGEST_PDF_PAGES_PER_TASK)
+    if workers <= 1:
+        for path in paths:
+            try:
+                yield path, extract_text(path), None
+            except Exception as exc:
+                yield path, None, _error(exc)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts: Dict[str, List[Future]] = {}
+        owners: Dict[Future, str] = {}
+        for path in paths:
+            ranges: List[Optional[Tuple[int, int]]] = [None]
+            if Path(path).suffix.lower() == ".pdf":
+                try:
+                    pages = pdf_page_count(path)
+                except Exception as exc:
+                    yield path, None, _error(exc)
+                    continue
+                if pages > pages_per_task:
+                    ranges = [(start, min(start + pages_per_task, pages)) for start in range(0, pages, pages_per_task)]
+            parts[path] = [pool.submit(_extract_part, path, pages) for pages in ranges]
+            owners.update((future, path) for future in parts[path])
+        for future in as_completed(owners):
+            path = owners[future]
+            if path not in parts or not all(part.done() for part in parts[path]):
+                continue
+            futures = parts.pop(path)
+            errors = [part.exception() for part in futures if part.exception() is not None]
+            if errors:
+                yield path, None, _error(errors[0])
+            elif len(futures) == 1:
+                yield path, futures[0].result(), None
+            else:
+                yield path, normalize_text("\n".join(part.result() for part in futures)), None
+
+
+@dataclass
+class BatchIngestResult:
+    # One entry per file: {"path", "resume_id", "chunks", "skipped", "error"}
+    files: List[Dict[str, Any]]
+    seconds: float
+    stages: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ingested(self) -> List[Dict[str, Any]]:
+        return [entry for entry in self.files if entry["resume_id"] and not entry["skipped"]]
+
+    @property
+    def skipped(self) -> List[Dict[str, Any]]:
+        """Files already ingested with the current chunking and embedding model."""
+        return [entry for entry in self.files if entry["skipped"]]
+
+    @property
+    def failed(self) -> List[Dict[str, Any]]:
+        return [entry for entry in self.files if entry["error"]]
+
+    @property
+    def resumes_per_min(self) -> float:
+        return len(self.ingested) / self.seconds * 60 if self.seconds else 0.0
+
+
+@dataclass
+class _Pending:
+    # A parsed file waiting for its embedding round.
+    path: str
+    resume_id: str
+    file_hash: str
+    chunks: List[str]
+    known: Dict[str, List[float]]
+    stale_ids: List[str]
+
 
 class ResumeIngestAgent:
+    """Resumes are identified by the SHA-256 of the file: ingesting the same file again returns
+    its existing ``resume_id`` without parsing or embedding, unless the chunking or embedding model
+    changed since, in which case it is re-chunked and only chunks without a vector from the current
+    model are embedded. Extracted text is cached by file hash."""
+
     def __init__(self, resume_collection):
         self.resume_collection = resume_collection
 
-    def ingest(self, filepath: str) -> str:
-        text = extract_text(filepath)
+    def ingest(
+        self,
+        filepath: str,
+        display_name: Optional[str] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> str:
+        """Extract, chunk, embed and store a resume; returns its ``resume_id``.
+
+        ``display_name`` defaults to the file name. ``on_progress`` receives ``{"stage", "chunks",
+        "embedded"}`` as the stages advance.
+        """
+
+        digest = file_hash(filepath)
+        existing = get_resume_by_hash(digest)
+        model = self._model_key()
+        if existing and (existing["chunking"], existing["embed_model"]) == (CHUNKING_KEY, model):
+            logger.info("Resume %s (%s) is already ingested", existing["resume_id"], existing["filename"])
+            return existing["resume_id"]
+        resume_id = existing["resume_id"] if existing else digest[:32]
+        display_name = display_name or Path(filepath).name
+        tracer = Tracer(resume_id, "resume_ingest")
+        try:
+            with profile_run(resume_id, "resume_ingest"), tracer.span("ingest", file=display_name):
+                return self._ingest(
+                    filepath, display_name, resume_id, digest, existing is not None, model, tracer, on_progress or (lambda _progress: None)
+                )
+        finally:
+            tracer.flush()
+
+    def ingest_many(
+        self,
+        paths: List[str],
+        workers: Optional[int] = None,
+        embed_batch: Optional[int] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> BatchIngestResult:
+        """Ingest many resumes: parse on a process pool (see ``parse_files``), then embed the
+        chunks of several files together, ``embed_batch`` chunks per round with
+        ``INGEST_EMBED_CONCURRENCY`` requests in flight. Files already ingested are skipped and
+        cached text is not parsed again; copies of one file within ``paths`` share a resume. A
+        file that fails to parse, embed or store is reported in the result and the rest carry on.
+        ``on_progress`` receives ``{"files", "parsed", "ingested", "skipped", "failed"}``.
+        """
+
+        run_id = str(uuid.uuid4())
+        embed_batch = max(1, embed_batch or config.INGEST_EMBED_BATCH)
+        model = self._model_key()
+        files = {path: {"path": path, "resume_id": None, "chunks": 0, "skipped": False, "error": None} for path in paths}
+        progress = {"files": len(paths), "parsed": 0, "ingested": 0, "skipped": 0, "failed": 0}
+        pending: List[_Pending] = []
+        tracer = Tracer(run_id, "resume_ingest")
+        started = time.perf_counter()
+
+        def _report() -> None:
+            if on_progress:
+                on_progress(dict(progress))
+
+        def _fail(path: str, error: str) -> None:
+            files[path]["error"] = error
+            progress["failed"] += 1
+            logger.warning("Ingest of %s failed: %s", path, error)
+
+        def _flush() -> None:
+            texts = list(dict.fromkeys(chunk for item in pending for chunk in item.chunks if chunk not in item.known))
+            try:
+                with tracer.span("embed", aggregate=True), llm_priority(PRIORITY_BULK):
+                    vectors = dict(zip(texts, asyncio.run(_embed_all(texts, model_name(model))) if texts else [], strict=True))
+            except Exception as exc:
+                for item in pending:
+                    _fail(item.path, _error(exc))
+            else:
+                for item in pending:
+                    embeddings = [item.known[chunk] if chunk in item.known else vectors[chunk] for chunk in item.chunks]
+                    try:
+                        with tracer.span("store", aggregate=True):
+                            self._store(
+                                item.resume_id, Path(item.path).name, item.path, item.chunks, embeddings, item.file_hash, model, item.stale_ids
+                            )
+                    except Exception as exc:
+                        _fail(item.path, _error(exc))
+                    else:
+                        files[item.path].update(resume_id=item.resume_id, chunks=len(item.chunks))
+                        progress["ingested"] += 1
+            pending.clear()
+            _report()
+
+        try:
+            with profile_run(run_id, "resume_ingest"), tracer.span("ingest_many", files=len(paths)):
+                targets: Dict[str, Tuple[str, str, bool]] = {}  # path -> (hash, resume_id, re-ingest)
+                copies: Dict[str, str] = {}  # path -> first path with the same content
+                cached: List[Tuple[str, Optional[str], Optional[str]]] = []
+                first: Dict[str, str] = {}
+                with tracer.span("hash", aggregate=True):
+                    for path in paths:
+                        try:
+                            digest = file_hash(path)
+                        except Exception as exc:
+                            _fail(path, _error(exc))
+                            continue
+                        if digest in first:
+                            copies[path] = first[digest]
+                            continue
+                        first[digest] = path
+                        existing = get_resume_by_hash(digest)
+                        if existing and (existing["chunking"], existing["embed_model"]) == (CHUNKING_KEY, model):
+                            files[path].update(resume_id=existing["resume_id"], skipped=True)
+                            progress["skipped"] += 1
+                            continue
+                        targets[path] = (digest, existing["resume_id"] if existing else digest[:32], existing is not None)
+                        text = get_parsed_text(digest, PARSER_VERSION)
+                        if text is not None:
+                            cached.append((path, text, None))
+                _report()
+                have_text = {path for path, _text, _error in cached}
+                to_parse = [path for path in targets if path not in have_text]
+                parsed = itertools.chain(cached, parse_files(to_parse, workers=workers))
+                while True:
+                    with tracer.span("parse", aggregate=True):
+                        item = next(parsed, None)
+                    if item is None:
+                        break
+                    path, text, error = item
+                    digest, resume_id, reingest = targets[path]
+                    progress["parsed"] += 1
+                    if error is None and not (text or "").strip():
+                        error = "ValueError: Extracted text is empty"
+                    if error is not None:
+                        _fail(path, error)
+                        _report()
+                        continue
+                    cache_parsed_text(digest, PARSER_VERSION, text)
+                    with tracer.span("chunk", aggregate=True):
+                        chunks = chunk_text(text)
+                    known, stale_ids = self._stored_vectors(resume_id, model) if reingest else ({}, [])
+                    pending.append(_Pending(path, resume_id, digest, chunks, known, stale_ids))
+                    if sum(len(item.chunks) - len(item.known) for item in pending) >= embed_batch:
+                        _flush()
+                if pending:
+                    _flush()
+                for path, original in copies.items():
+                    source = files[original]
+                    files[path].update(resume_id=source["resume_id"], skipped=source["resume_id"] is not None, error=source["error"])
+                    progress["skipped" if source["resume_id"] else "failed"] += 1
+                if copies:
+                    _report()
+        finally:
+            tracer.flush()
+        stages = {}
+        for span in tracer.spans:
+            if span.parent_id is not None:
+                stages[span.name] = round(stages.get(span.name, 0.0) + span.duration_s, 3)
+        result = BatchIngestResult(list(files.values()), time.perf_counter() - started, stages)
+        logger.info(
+            "Ingested %s of %s resumes (%s already ingested) in %.1fs (%.1f/min)",
+            len(result.ingested),
+            len(paths),
+            len(result.skipped),
+            result.seconds,
+            result.resumes_per_min,
+        )
+        return result
+
+    def _ingest(
+        self,
+        filepath: str,
+        display_name: str,
+        resume_id: str,
+        digest: str,
+        reingest: bool,
+        model: str,
+        tracer: Tracer,
+        on_progress: Callable[[Dict[str, Any]], None],
+    ) -> str:
+        on_progress({"stage": "extract", "chunks": 0, "embedded": 0})
+        with tracer.span("extract"):
+            text = get_parsed_text(digest, PARSER_VERSION)
+            if text is None:
+                text = extract_text(filepath)
+                if text.strip():
+                    cache_parsed_text(digest, PARSER_VERSION, text)
         if not text.strip():
             raise ValueError("Extracted text is empty")
-        chunks = chunk_text(text)
-        resume_id = str(uuid.uuid4())
-        display_name = Path(filepath).name
-        embeddings = [embed(chunk) for chunk in chunks]
+        with tracer.span("chunk"):
+            chunks = chunk_text(text)
+        known, stale_ids = self._stored_vectors(resume_id, model) if reingest else ({}, [])
+        embeddings = []
+        with tracer.span("embed", chunks=len(chunks), reused=sum(chunk in known for chunk in chunks)), llm_priority(PRIORITY_BULK):
+            for chunk in chunks:
+                on_progress({"stage": "embed", "chunks": len(chunks), "embedded": len(embeddings)})
+                if chunk not in known:
+                    known[chunk] = embed(chunk, model=model_name(model))
+                embeddings.append(known[chunk])
+        on_progress({"stage": "store", "chunks": len(chunks), "embedded": len(embeddings)})
+        with tracer.span("store"):
+            self._store(resume_id, display_name, filepath, chunks, embeddings, digest, model, stale_ids)
+        logger.info("Ingested resume %s (%s) with %s chunks", resume_id, display_name, len(chunks))
+        return resume_id
+
+    def _model_key(self) -> str:
+        # Embed with the model of the active resume collection, which changes only by migration.
+        return vectordb.collection_model_key(self.resume_collection) or embed_model_key()
+
+    def _stored_vectors(self, resume_id: str, model: str) -> Tuple[Dict[str, List[float]], List[str]]:
+        """``({chunk text: vector}, ids)`` of the chunks stored for a resume; vectors are only
+        returned for chunks embedded with ``model``."""
+
+        stored = vectordb.get(self.resume_collection, where_filter={"resume_id": resume_id}, include=["documents", "metadatas", "embeddings"])
+        ids = list(stored.get("ids") or [])
+        embeddings = stored.get("embeddings")
+        known = {}
+        if embeddings is not None:
+            for document, metadata, vector in zip(stored.get("documents") or [], stored.get("metadatas") or [], embeddings, strict=True):
+                if (metadata or {}).get("embed_model") == model:
+                    known[document] = [float(value) for value in vector]
+        return known, ids
+
+    def _store(
+        self,
+        resume_id: str,
+        display_name: str,
+        filepath: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+        digest: str,
+        model: str,
+        stale_ids: List[str],
+    ) -> None:
         ids = [f"{resume_id}:{i}" for i in range(len(chunks))]
         metadatas: list[dict[str, Any]] = [
-            {"resume_id": resume_id, "chunk_index": i, "source_file": filepath}
+            {"resume_id": resume_id, "chunk_index": i, "source_file": filepath, "embed_model": model}
             for i in range(len(chunks))
         ]
-        vectordb.add_documents(
+        vectordb.upsert_documents(
             self.resume_collection,
             ids=ids,
             documents=chunks,
             metadatas=metadatas,
             embeddings=embeddings,
         )
-        insert_resume(resume_id, display_name, datetime.utcnow().isoformat())
-        logger.info("Ingested resume %s (%s) with %s chunks", resume_id, display_name, len(chunks))
-        return resume_id
+        vectordb.delete(self.resume_collection, sorted(set(stale_ids) - set(ids)))
+        insert_resume(resume_id, display_name, datetime.utcnow().isoformat(), digest, CHUNKING_KEY, model)
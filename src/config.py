@@ -4,6 +4,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_BASE_URLS = [u.strip().rstrip("/") for u in OLLAMA_BASE_URL.split(",") if u.strip()]
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1")
 OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama")
@@ -18,3 +19,87 @@ JOB_SOURCES = [s.strip() for s in os.getenv("JOB_SOURCES", "remotive,scraper").s
 GREENHOUSE_BOARDS = [b.strip() for b in os.getenv("GREENHOUSE_BOARDS", "").split(",") if b.strip()]
 LEVER_COMPANIES = [c.strip() for c in os.getenv("LEVER_COMPANIES", "").split(",") if c.strip()]
 REMOTIVE_CATEGORY = os.getenv("REMOTIVE_CATEGORY", "")
+# LLM request scheduling
+LLM_EMBED_CONCURRENCY = int(os.getenv("LLM_EMBED_CONCURRENCY", "4"))
+LLM_CHAT_CONCURRENCY = int(os.getenv("LLM_CHAT_CONCURRENCY", "1"))
+OPENAI_REQUESTS_PER_MINUTE = float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+OPENAI_BURST = int(os.getenv("OPENAI_BURST", "10"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN_S = float(os.getenv("LLM_BREAKER_COOLDOWN_S", "30"))
+# Multi-host Ollama routing (OLLAMA_BASE_URL may list several hosts, comma-separated)
+OLLAMA_ROUTING = os.getenv("OLLAMA_ROUTING", "least_outstanding")
+OLLAMA_HEALTH_INTERVAL_S = float(os.getenv("OLLAMA_HEALTH_INTERVAL_S", "10"))
+# Ollama model residency: how long models stay loaded after a call, and whether to preload at start
+OLLAMA_KEEP_ALIVE_EMBED = os.getenv("OLLAMA_KEEP_ALIVE_EMBED", "30m")
+OLLAMA_KEEP_ALIVE_CHAT = os.getenv("OLLAMA_KEEP_ALIVE_CHAT", "15m")
+OLLAMA_PRELOAD = os.getenv("OLLAMA_PRELOAD", "1").lower() in {"1", "true", "yes"}
+# Interactive ranking: return hybrid results after this many seconds and backfill LLM scores
+MATCH_DEADLINE_S = float(os.getenv("MATCH_DEADLINE_S", "5"))
+# Persist per-call LLM token/latency metrics to the llm_calls table
+LLM_METRICS = os.getenv("LLM_METRICS", "1").lower() in {"1", "true", "yes"}
+# Opt-in profiling of search/ingest/rank runs (cProfile, optional tracemalloc)
+PROFILE_RUNS = os.getenv("PROFILE_RUNS", "0").lower() in {"1", "true", "yes"}
+PROFILE_TRACEMALLOC = os.getenv("PROFILE_TRACEMALLOC", "0").lower() in {"1", "true", "yes"}
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./data/profiles")
+PROFILE_RETENTION = int(os.getenv("PROFILE_RETENTION", "50"))
+# Record/replay job source HTTP traffic ("record" or "replay"; empty = live)
+JOB_SOURCE_CASSETTES = os.getenv("JOB_SOURCE_CASSETTES", "").strip().lower()
+JOB_SOURCE_CASSETTE_DIR = os.getenv("JOB_SOURCE_CASSETTE_DIR", "./data/cassettes")
+JOB_SOURCE_REPLAY_LATENCY_SCALE = float(os.getenv("JOB_SOURCE_REPLAY_LATENCY_SCALE", "1.0"))
+# Sidebar LLM health check is cached this long and refreshed in the background
+STATUS_TTL_S = float(os.getenv("STATUS_TTL_S", "30"))
+# Schema migration backfills: rows per batch and pause between batches (keeps the DB responsive)
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "2000"))
+MIGRATION_BATCH_PAUSE_S = float(os.getenv("MIGRATION_BATCH_PAUSE_S", "0.02"))
+# Background task queue: worker threads, queue poll interval, heartbeat timeout and retries
+TASK_WORKERS = int(os.getenv("TASK_WORKERS", "2"))
+TASK_POLL_S = float(os.getenv("TASK_POLL_S", "1.0"))
+TASK_STALE_S = float(os.getenv("TASK_STALE_S", "120"))
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "2"))
+# Run the task worker inside the Streamlit server; set to 0 when running scripts/worker.py instead
+TASK_INPROCESS_WORKER = os.getenv("TASK_INPROCESS_WORKER", "1").lower() in {"1", "true", "yes"}
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./data/uploads")
+# Scheduled refresh of saved queries (scripts/refresh.py): base interval, optional overrides per
+# source or board ("greenhouse=3600,greenhouse:databricks=1800"), backoff for unchanged boards,
+# jitter fraction and concurrency (boards overall / per source)
+REFRESH_INTERVAL_S = float(os.getenv("REFRESH_INTERVAL_S", "21600"))
+REFRESH_INTERVALS = {
+    key.strip(): float(value)
+    for key, _, value in (item.partition("=") for item in os.getenv("REFRESH_INTERVALS", "").split(","))
+    if key.strip() and value.strip()
+}
+REFRESH_MAX_INTERVAL_S = float(os.getenv("REFRESH_MAX_INTERVAL_S", "259200"))
+REFRESH_BACKOFF = float(os.getenv("REFRESH_BACKOFF", "2.0"))
+REFRESH_JITTER = float(os.getenv("REFRESH_JITTER", "0.1"))
+REFRESH_CONCURRENCY = int(os.getenv("REFRESH_CONCURRENCY", "4"))
+REFRESH_PER_SOURCE_CONCURRENCY = int(os.getenv("REFRESH_PER_SOURCE_CONCURRENCY", "2"))
+REFRESH_POLL_S = float(os.getenv("REFRESH_POLL_S", "60"))
+# Job expiry (src/maintenance.py): tombstone jobs no fetch has returned for JOB_MISSING_AFTER_S or
+# posted more than JOB_TTL_S ago (0 disables either), purge tombstones after
+# JOB_TOMBSTONE_RETENTION_S; the refresh daemon runs it every JOB_EXPIRY_INTERVAL_S
+JOB_MISSING_AFTER_S = float(os.getenv("JOB_MISSING_AFTER_S", "1209600"))
+JOB_TTL_S = float(os.getenv("JOB_TTL_S", "5184000"))
+JOB_TOMBSTONE_RETENTION_S = float(os.getenv("JOB_TOMBSTONE_RETENTION_S", "15552000"))
+JOB_EXPIRY_BATCH = int(os.getenv("JOB_EXPIRY_BATCH", "500"))
+JOB_EXPIRY_INTERVAL_S = float(os.getenv("JOB_EXPIRY_INTERVAL_S", "86400"))
+# VACUUM the app database once this fraction of it is free pages
+SQLITE_VACUUM_MIN_FREE = float(os.getenv("SQLITE_VACUUM_MIN_FREE", "0.2"))
+# Near-duplicate postings (MinHash estimate of shared word shingles, same title) collapse into the
+# stored job as alternate URLs; 0 turns detection off
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+# Batch resume ingest (scripts/ingest_resume.py --dir/--glob): parser processes, PDF pages per
+# parse task, chunks embedded per round and embedding requests in flight
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1)))
+INGEST_PDF_PAGES_PER_TASK = int(os.getenv("INGEST_PDF_PAGES_PER_TASK", "4"))
+INGEST_EMBED_BATCH = int(os.getenv("INGEST_EMBED_BATCH", "128"))
+INGEST_EMBED_CONCURRENCY = int(os.getenv("INGEST_EMBED_CONCURRENCY", "8"))
+# Vector writes: jobs are upserted into Chroma in batches of this many, or after this many
+# seconds since the oldest unwritten one.
+VECTOR_WRITE_BATCH = int(os.getenv("VECTOR_WRITE_BATCH", "256"))
+VECTOR_WRITE_FLUSH_S = float(os.getenv("VECTOR_WRITE_FLUSH_S", "2.0"))
+# Vector index settings for new collections: distance space (cosine, l2, ip) and HNSW graph
+# parameters (0 = Chroma's default). Existing collections change only when rebuilt.
+VECTOR_SPACE = os.getenv("VECTOR_SPACE", "cosine")
+HNSW_M = int(os.getenv("HNSW_M", "0"))
+HNSW_CONSTRUCTION_EF = int(os.getenv("HNSW_CONSTRUCTION_EF", "0"))
+HNSW_SEARCH_EF = int(os.getenv("HNSW_SEARCH_EF", "0"))
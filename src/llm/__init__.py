@@ -1,19 +1,39 @@
 from .client import (
     LLMConfig,
     LLMProviderError,
+    achat,
+    aembed,
+    aembed_many,
     chat,
+    check_provider,
     clear_runtime_llm_config,
     embed,
     get_active_config,
     set_runtime_llm_config,
 )
+from .endpoints import prompt_affinity
+from .residency import get_residency_manager
+from .scheduler import PRIORITY_BULK, PRIORITY_INTERACTIVE, get_scheduler, llm_priority
+from .usage import LLMUsage, capture_usage
 
 __all__ = [
     "LLMConfig",
     "LLMProviderError",
+    "LLMUsage",
+    "PRIORITY_BULK",
+    "PRIORITY_INTERACTIVE",
+    "achat",
+    "aembed",
+    "aembed_many",
+    "capture_usage",
     "chat",
+    "check_provider",
     "clear_runtime_llm_config",
     "embed",
     "get_active_config",
+    "get_residency_manager",
+    "get_scheduler",
+    "llm_priority",
+    "prompt_affinity",
     "set_runtime_llm_config",
 ]
@@ -1,11 +1,17 @@
+import asyncio
 import logging
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 import requests
 
 from .. import config
 from . import ollama_client
+from .endpoints import get_endpoint_pool, parse_base_urls, probe_endpoint
+from .http import get_async_session, get_session
+from .residency import get_residency_manager
+from .scheduler import CircuitOpenError, get_scheduler
+from .usage import record_usage, usage_from_ollama, usage_from_openai
 
 logger = logging.getLogger(__name__)
 
@@ -76,27 +82,164 @@ def get_active_config() -> LLMConfig:
     )
 
 
+def _scheduled(cfg: LLMConfig, operation: str, fn):
+    try:
+        return get_scheduler().run(cfg.provider, cfg.base_url or "", operation, fn)
+    except CircuitOpenError as exc:
+        raise LLMProviderError(str(exc)) from exc
+
+
+async def _ascheduled(cfg: LLMConfig, operation: str, fn):
+    try:
+        return await get_scheduler().arun(cfg.provider, cfg.base_url or "", operation, fn)
+    except CircuitOpenError as exc:
+        raise LLMProviderError(str(exc)) from exc
+
+
+def _ollama_routed(cfg: LLMConfig, operation: str, model: Optional[str], fn):
+    """Pick an endpoint from the Ollama pool, then queue in that host's scheduler lane."""
+
+    pool = get_endpoint_pool(cfg.base_url)
+    try:
+        return pool.call(model, lambda url: get_scheduler().run("ollama", url, operation, lambda: fn(url)))
+    except CircuitOpenError as exc:
+        raise LLMProviderError(str(exc)) from exc
+
+
+async def _aollama_routed(cfg: LLMConfig, operation: str, model: Optional[str], fn):
+    pool = get_endpoint_pool(cfg.base_url)
+    try:
+        return await pool.acall(model, lambda url: get_scheduler().arun("ollama", url, operation, lambda: fn(url)))
+    except CircuitOpenError as exc:
+        raise LLMProviderError(str(exc)) from exc
+
+
 def embed(text: str, model: Optional[str] = None) -> List[float]:
     cfg = get_active_config()
+    model = model or cfg.embed_model
+    if cfg.provider == "openai":
+        return _scheduled(cfg, "embed", lambda: _openai_embed(text, model, cfg))
+    return _ollama_routed(cfg, "embed", model, lambda url: _ollama_embed(url, text, model))
+
+
+async def aembed(text: str, model: Optional[str] = None) -> List[float]:
+    cfg = get_active_config()
+    model = model or cfg.embed_model
     if cfg.provider == "openai":
-        return _openai_embed(text, model or cfg.embed_model, cfg)
-    return ollama_client.embed(text, base_url=cfg.base_url, embed_model=model or cfg.embed_model)
+        return (await _ascheduled(cfg, "embed", lambda: _aopenai_embed([text], model, cfg)))[0]
+    return await _aollama_routed(cfg, "embed", model, lambda url: _aollama_embed(url, text, model))
+
+
+async def aembed_many(
+    texts: Sequence[str], model: Optional[str] = None, concurrency: int = 8, batch_size: int = 64
+) -> List[List[float]]:
+    """Embed many texts concurrently, preserving input order.
+
+    OpenAI-compatible APIs accept a list input, so texts are sent ``batch_size`` at a time;
+    Ollama gets one request per text, spread across the endpoint pool. At most ``concurrency``
+    requests are in flight from this call, and the scheduler's per-endpoint cap still applies.
+    """
+
+    cfg = get_active_config()
+    model = model or cfg.embed_model
+    gate = asyncio.Semaphore(max(1, concurrency))
+    if cfg.provider == "openai":
+        batches = [list(texts[i : i + batch_size]) for i in range(0, len(texts), batch_size)]
+
+        async def _one_batch(batch: List[str]) -> List[List[float]]:
+            async with gate:
+                return await _ascheduled(cfg, "embed", lambda: _aopenai_embed(batch, model, cfg))
+
+        results = await asyncio.gather(*(_one_batch(batch) for batch in batches))
+        return [vector for batch in results for vector in batch]
+
+    async def _one(text: str) -> List[float]:
+        async with gate:
+            return await aembed(text, model=model)
+
+    return list(await asyncio.gather(*(_one(text) for text in texts)))
 
 
 def chat(messages: List[dict], model: Optional[str] = None, format: Optional[str] = None) -> str:
     cfg = get_active_config()
+    model = model or cfg.model
     if cfg.provider == "openai":
-        return _openai_chat(messages, model or cfg.model, format, cfg)
-    return ollama_client.chat(messages, model=model or cfg.model, format=format, base_url=cfg.base_url)
+        return _scheduled(cfg, "chat", lambda: _openai_chat(messages, model, format, cfg))
+    return _ollama_routed(cfg, "chat", model, lambda url: _ollama_chat(url, messages, model, format))
 
 
-def _openai_post(path: str, payload: dict, cfg: LLMConfig) -> requests.Response:
+async def achat(messages: List[dict], model: Optional[str] = None, format: Optional[str] = None) -> str:
+    cfg = get_active_config()
+    model = model or cfg.model
+    if cfg.provider == "openai":
+        return await _ascheduled(cfg, "chat", lambda: _aopenai_chat(messages, model, format, cfg))
+    return await _aollama_routed(cfg, "chat", model, lambda url: _aollama_chat(url, messages, model, format))
+
+
+def check_provider(cfg: Optional[LLMConfig] = None, timeout: float = 3.0) -> Tuple[bool, str]:
+    """Cheap reachability probe (no model call): Ollama ``/api/ps`` on each host, OpenAI ``/models``."""
+
+    cfg = cfg or get_active_config()
+    if cfg.provider == "openai":
+        url, headers = _openai_request("/models", cfg)
+        try:
+            resp = get_session().get(url, headers=headers, timeout=timeout)
+        except requests.RequestException as exc:
+            return False, f"OpenAI is not reachable: {exc}"
+        if resp.status_code >= 400:
+            return False, f"OpenAI returned HTTP {resp.status_code}"
+        return True, "OpenAI reachable"
+    urls = parse_base_urls(cfg.base_url)
+    up = [url for url in urls if probe_endpoint(url, timeout=timeout) is not None]
+    if not up:
+        return False, f"Ollama is not reachable at {', '.join(urls)}"
+    return True, f"Ollama reachable ({len(up)}/{len(urls)} hosts)" if len(urls) > 1 else "Ollama reachable"
+
+
+def _ollama_embed(url: str, text: str, model: str) -> List[float]:
+    residency = get_residency_manager()
+    data = ollama_client.embed_response(text, url, model, residency.keep_alive_for("embed"))
+    residency.observe(url, model, "embed", data)
+    record_usage(usage_from_ollama(url, model, "embed", data))
+    return data.get("embedding", [])
+
+
+async def _aollama_embed(url: str, text: str, model: str) -> List[float]:
+    residency = get_residency_manager()
+    data = await ollama_client.aembed_response(text, url, model, residency.keep_alive_for("embed"))
+    residency.observe(url, model, "embed", data)
+    record_usage(usage_from_ollama(url, model, "embed", data))
+    return data.get("embedding", [])
+
+
+def _ollama_chat(url: str, messages: List[dict], model: str, format: Optional[str]) -> str:
+    residency = get_residency_manager()
+    data = ollama_client.chat_response(messages, model, format, url, residency.keep_alive_for("chat"))
+    residency.observe(url, model, "chat", data)
+    record_usage(usage_from_ollama(url, model, "chat", data))
+    return data.get("message", {}).get("content", "")
+
+
+async def _aollama_chat(url: str, messages: List[dict], model: str, format: Optional[str]) -> str:
+    residency = get_residency_manager()
+    data = await ollama_client.achat_response(messages, model, format, url, residency.keep_alive_for("chat"))
+    residency.observe(url, model, "chat", data)
+    record_usage(usage_from_ollama(url, model, "chat", data))
+    return data.get("message", {}).get("content", "")
+
+
+def _openai_request(path: str, cfg: LLMConfig) -> tuple:
     url = f"{cfg.base_url.rstrip('/')}{path}"
     headers = {"Content-Type": "application/json"}
     if cfg.api_key:
         headers["Authorization"] = f"Bearer {cfg.api_key}"
+    return url, headers
+
+
+def _openai_post(path: str, payload: dict, cfg: LLMConfig) -> requests.Response:
+    url, headers = _openai_request(path, cfg)
     try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=60)
+        resp = get_session().post(url, json=payload, headers=headers, timeout=60)
         resp.raise_for_status()
     except (requests.ConnectionError, requests.Timeout) as exc:  # pragma: no cover - network
         raise LLMProviderError("OpenAI is not reachable; check base URL and connectivity") from exc
@@ -105,18 +248,59 @@ def _openai_post(path: str, payload: dict, cfg: LLMConfig) -> requests.Response:
     return resp
 
 
-def _openai_embed(text: str, model: str, cfg: LLMConfig) -> List[float]:
-    payload = {"model": model, "input": text}
-    resp = _openai_post("/embeddings", payload, cfg)
-    data = resp.json()
-    embedding = (data.get("data") or [{}])[0].get("embedding")
-    return embedding or []
+async def _aopenai_post(path: str, payload: dict, cfg: LLMConfig) -> dict:
+    import aiohttp
+
+    url, headers = _openai_request(path, cfg)
+    try:
+        async with get_async_session().post(
+            url, json=payload, headers=headers, timeout=aiohttp.ClientTimeout(total=60)
+        ) as resp:
+            if resp.status >= 400:  # pragma: no cover - passthrough for debugging
+                raise LLMProviderError(f"OpenAI error: {await resp.text()}")
+            return await resp.json(content_type=None)
+    except (TimeoutError, aiohttp.ClientConnectionError) as exc:  # pragma: no cover - network
+        raise LLMProviderError("OpenAI is not reachable; check base URL and connectivity") from exc
 
 
-def _openai_chat(messages: List[dict], model: str, format: Optional[str], cfg: LLMConfig) -> str:
+def _openai_embed_vectors(data: dict, expected: int) -> List[List[float]]:
+    items = sorted(data.get("data") or [], key=lambda item: item.get("index", 0))
+    vectors = [item.get("embedding") or [] for item in items]
+    return vectors + [[] for _ in range(expected - len(vectors))]
+
+
+def _openai_chat_payload(messages: List[dict], model: str, format: Optional[str]) -> dict:
     payload = {"model": model, "messages": messages}
     if format == "json":
         payload["response_format"] = {"type": "json_object"}
-    resp = _openai_post("/chat/completions", payload, cfg)
-    data = resp.json()
+    return payload
+
+
+def _openai_chat_content(data: dict) -> str:
     return (data.get("choices") or [{}])[0].get("message", {}).get("content", "")
+
+
+def _openai_embed(text: str, model: str, cfg: LLMConfig) -> List[float]:
+    payload = {"model": model, "input": text}
+    data = _openai_post("/embeddings", payload, cfg).json()
+    record_usage(usage_from_openai(cfg.base_url or "", model, "embed", data))
+    return _openai_embed_vectors(data, 1)[0]
+
+
+async def _aopenai_embed(texts: List[str], model: str, cfg: LLMConfig) -> List[List[float]]:
+    payload = {"model": model, "input": texts}
+    data = await _aopenai_post("/embeddings", payload, cfg)
+    record_usage(usage_from_openai(cfg.base_url or "", model, "embed", data))
+    return _openai_embed_vectors(data, len(texts))
+
+
+def _openai_chat(messages: List[dict], model: str, format: Optional[str], cfg: LLMConfig) -> str:
+    data = _openai_post("/chat/completions", _openai_chat_payload(messages, model, format), cfg).json()
+    record_usage(usage_from_openai(cfg.base_url or "", model, "chat", data))
+    return _openai_chat_content(data)
+
+
+async def _aopenai_chat(messages: List[dict], model: str, format: Optional[str], cfg: LLMConfig) -> str:
+    data = await _aopenai_post("/chat/completions", _openai_chat_payload(messages, model, format), cfg)
+    record_usage(usage_from_openai(cfg.base_url or "", model, "chat", data))
+    return _openai_chat_content(data)
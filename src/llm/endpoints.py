@@ -0,0 +1,276 @@
+"""Routing across a pool of Ollama hosts.
+
+``OLLAMA_BASE_URL`` (or the runtime base URL) may hold several comma-separated hosts. Each call
+is routed to the healthy endpoint with the fewest outstanding requests (or the best
+outstanding x latency score), preferring endpoints that already have the requested model loaded
+so calls don't force a model swap. Endpoints that fail to connect are taken out of rotation
+and probed in the background until they answer again. Calls made inside ``prompt_affinity(key)``
+go back to the endpoint that last served ``key`` so a shared prompt prefix stays in its KV cache.
+"""
+
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type
+
+import requests
+
+from .. import config
+from .http import get_session
+from .ollama_client import OllamaUnavailableError
+from .scheduler import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("least_outstanding", "latency")
+_MAX_AFFINITY_KEYS = 256
+
+_current_affinity: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_affinity", default=None)
+
+
+@contextlib.contextmanager
+def prompt_affinity(key: Optional[str]) -> Iterator[None]:
+    """Route calls inside the block to the endpoint that served ``key`` last, when it isn't busy."""
+
+    token = _current_affinity.set(key)
+    try:
+        yield
+    finally:
+        _current_affinity.reset(token)
+
+
+def parse_base_urls(base_url: Optional[str]) -> List[str]:
+    return [url.strip().rstrip("/") for url in (base_url or "").split(",") if url.strip()]
+
+
+@dataclass
+class Endpoint:
+    url: str
+    outstanding: int = 0
+    ewma_latency_s: Optional[float] = None
+    healthy: bool = True
+    down_since: Optional[float] = None
+    last_error: str = ""
+    loaded_models: Set[str] = field(default_factory=set)
+    requests: int = 0
+    failures: int = 0
+
+
+def probe_endpoint(url: str, timeout: float = 3.0) -> Optional[Set[str]]:
+    """Return the models currently loaded on ``url`` (via ``/api/ps``), or ``None`` if unreachable."""
+
+    try:
+        resp = get_session().get(f"{url}/api/ps", timeout=timeout)
+        resp.raise_for_status()
+    except requests.RequestException:
+        return None
+    try:
+        models = resp.json().get("models") or []
+    except ValueError:
+        return set()
+    return {m.get("name") or m.get("model") for m in models if m.get("name") or m.get("model")}
+
+
+class EndpointPool:
+    def __init__(
+        self,
+        urls: List[str],
+        strategy: str = config.OLLAMA_ROUTING,
+        health_interval_s: float = config.OLLAMA_HEALTH_INTERVAL_S,
+        probe: Callable[[str], Optional[Set[str]]] = probe_endpoint,
+        unavailable_types: Tuple[Type[BaseException], ...] = (OllamaUnavailableError, CircuitOpenError),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not urls:
+            raise ValueError("EndpointPool needs at least one URL")
+        if strategy not in STRATEGIES:
+            logger.warning("Unknown routing strategy '%s', using least_outstanding", strategy)
+            strategy = "least_outstanding"
+        self.endpoints = [Endpoint(url=url) for url in urls]
+        self.strategy = strategy
+        self.health_interval_s = health_interval_s
+        self.probe = probe
+        self.unavailable_types = unavailable_types
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._health_thread: Optional[threading.Thread] = None
+        self._affinity: OrderedDict[str, str] = OrderedDict()
+
+    def _score(self, endpoint: Endpoint) -> Tuple[float, float]:
+        latency = endpoint.ewma_latency_s if endpoint.ewma_latency_s is not None else 0.0
+        if self.strategy == "latency":
+            # Unmeasured endpoints get explored first (score 0).
+            return ((endpoint.outstanding + 1) * latency, endpoint.outstanding)
+        return (endpoint.outstanding, latency)
+
+    def _pick(self, model: Optional[str], exclude: Set[str], affinity: Optional[str] = None) -> Optional[Endpoint]:
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.healthy and e.url not in exclude]
+            if not candidates:
+                return None
+            least = min(e.outstanding for e in candidates)
+            if model:
+                warm = [e for e in candidates if model in e.loaded_models]
+                # Stay sticky unless every warm endpoint is busier than a cold one is idle.
+                if warm and min(e.outstanding for e in warm) <= least + 1:
+                    candidates = warm
+            preferred = self._affinity.get(affinity) if affinity else None
+            sticky = [e for e in candidates if e.url == preferred and e.outstanding <= least + 1]
+            chosen = sticky[0] if sticky else min(candidates, key=self._score)
+            chosen.outstanding += 1
+            chosen.requests += 1
+            return chosen
+
+    def _finish(
+        self,
+        endpoint: Endpoint,
+        model: Optional[str],
+        started: float,
+        exc: Optional[BaseException],
+        affinity: Optional[str] = None,
+    ):
+        elapsed = self._clock() - started
+        start_health = False
+        with self._lock:
+            endpoint.outstanding -= 1
+            if exc is None:
+                prev = endpoint.ewma_latency_s
+                endpoint.ewma_latency_s = elapsed if prev is None else 0.8 * prev + 0.2 * elapsed
+                if model:
+                    endpoint.loaded_models.add(model)
+                if affinity:
+                    self._affinity[affinity] = endpoint.url
+                    self._affinity.move_to_end(affinity)
+                    while len(self._affinity) > _MAX_AFFINITY_KEYS:
+                        self._affinity.popitem(last=False)
+            elif isinstance(exc, self.unavailable_types):
+                endpoint.failures += 1
+                endpoint.last_error = str(exc)
+                if endpoint.healthy:
+                    endpoint.healthy = False
+                    endpoint.down_since = self._clock()
+                    endpoint.loaded_models.clear()
+                    logger.warning("LLM endpoint %s marked down: %s", endpoint.url, exc)
+                    start_health = True
+        if start_health:
+            self._ensure_health_thread()
+
+    def call(self, model: Optional[str], fn: Callable[[str], Any]) -> Any:
+        """Run ``fn(url)`` on the best endpoint, failing over to others if one is unreachable."""
+
+        affinity = _current_affinity.get()
+        tried: Set[str] = set()
+        last_exc: Optional[BaseException] = None
+        while True:
+            endpoint = self._pick(model, tried, affinity)
+            if endpoint is None:
+                if last_exc is not None:
+                    raise last_exc
+                raise OllamaUnavailableError("No healthy LLM endpoints; all are being health-checked")
+            tried.add(endpoint.url)
+            started = self._clock()
+            try:
+                result = fn(endpoint.url)
+            except BaseException as exc:
+                self._finish(endpoint, model, started, exc)
+                if not isinstance(exc, self.unavailable_types):
+                    raise
+                last_exc = exc
+                continue
+            self._finish(endpoint, model, started, None, affinity)
+            return result
+
+    async def acall(self, model: Optional[str], fn: Callable[[str], Awaitable[Any]]) -> Any:
+        affinity = _current_affinity.get()
+        tried: Set[str] = set()
+        last_exc: Optional[BaseException] = None
+        while True:
+            endpoint = self._pick(model, tried, affinity)
+            if endpoint is None:
+                if last_exc is not None:
+                    raise last_exc
+                raise OllamaUnavailableError("No healthy LLM endpoints; all are being health-checked")
+            tried.add(endpoint.url)
+            started = self._clock()
+            try:
+                result = await fn(endpoint.url)
+            except BaseException as exc:
+                self._finish(endpoint, model, started, exc)
+                if not isinstance(exc, self.unavailable_types):
+                    raise
+                last_exc = exc
+                continue
+            self._finish(endpoint, model, started, None, affinity)
+            return result
+
+    def check_health(self) -> None:
+        """Probe every down endpoint once and bring back the ones that answer."""
+
+        with self._lock:
+            down = [e for e in self.endpoints if not e.healthy]
+        for endpoint in down:
+            loaded = self.probe(endpoint.url)
+            if loaded is None:
+                continue
+            with self._lock:
+                endpoint.healthy = True
+                endpoint.down_since = None
+                endpoint.loaded_models = set(loaded)
+            logger.info("LLM endpoint %s is back in rotation", endpoint.url)
+
+    def _ensure_health_thread(self) -> None:
+        with self._lock:
+            if self._health_thread is not None and self._health_thread.is_alive():
+                return
+            self._health_thread = threading.Thread(target=self._health_loop, name="llm-endpoint-health", daemon=True)
+            self._health_thread.start()
+
+    def _health_loop(self) -> None:
+        while True:
+            time.sleep(self.health_interval_s)
+            self.check_health()
+            with self._lock:
+                if all(e.healthy for e in self.endpoints):
+                    return
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "url": e.url,
+                    "healthy": e.healthy,
+                    "outstanding": e.outstanding,
+                    "requests": e.requests,
+                    "failures": e.failures,
+                    "ewma_latency_ms": round(e.ewma_latency_s * 1000, 1) if e.ewma_latency_s is not None else None,
+                    "loaded_models": sorted(e.loaded_models),
+                    "last_error": e.last_error,
+                }
+                for e in self.endpoints
+            ]
+
+
+_pools: Dict[Tuple[str, ...], EndpointPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_endpoint_pool(base_url: Optional[str]) -> EndpointPool:
+    """Shared pool for a base URL list, so routing state survives across calls."""
+
+    urls = tuple(parse_base_urls(base_url) or parse_base_urls(config.OLLAMA_BASE_URL))
+    with _pools_lock:
+        pool = _pools.get(urls)
+        if pool is None:
+            pool = EndpointPool(list(urls))
+            _pools[urls] = pool
+        return pool
+
+
+def all_pool_stats() -> List[Dict[str, Any]]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [row for pool in pools for row in pool.stats()]
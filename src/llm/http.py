@@ -0,0 +1,58 @@
+"""Pooled HTTP clients shared by the Ollama and OpenAI-compatible providers.
+
+``aiohttp`` is imported by the first async request, so sync-only callers never load it."""
+
+import asyncio
+import threading
+import weakref
+from typing import TYPE_CHECKING, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    import aiohttp
+
+_POOL_SIZE = 64
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_session() -> requests.Session:
+    """Process-wide ``requests`` session so sync calls reuse keep-alive connections."""
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def get_async_session() -> "aiohttp.ClientSession":
+    """One ``aiohttp.ClientSession`` per running event loop (sessions cannot cross loops)."""
+
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=_POOL_SIZE))
+        _async_sessions[loop] = session
+    return session
+
+
+async def aclose_async_session() -> None:
+    """Close the current loop's session; call before the loop shuts down to avoid warnings."""
+
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.pop(loop, None)
+    if session is not None:
+        await session.close()
@@ -1,11 +1,12 @@
-import json
+import asyncio
 import logging
 import time
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import requests
 
-from ..config import OLLAMA_BASE_URL, OLLAMA_EMBED_MODEL, OLLAMA_MODEL
+from ..config import OLLAMA_BASE_URLS, OLLAMA_EMBED_MODEL, OLLAMA_MODEL
+from .http import get_async_session, get_session
 
 logger = logging.getLogger(__name__)
 
@@ -14,29 +15,128 @@ class OllamaError(RuntimeError):
     pass
 
 
+class OllamaUnavailableError(OllamaError):
+    """The host could not be reached at all (as opposed to rejecting the request)."""
+
+
+def _default_base_url() -> str:
+    return OLLAMA_BASE_URLS[0] if OLLAMA_BASE_URLS else "http://localhost:11434"
+
+
 def _post_with_retry(
     endpoint: str, payload: dict, retries: int = 2, timeout: int = 30, base_url: Optional[str] = None
 ) -> requests.Response:
-    url = f"{base_url or OLLAMA_BASE_URL}{endpoint}"
+    url = f"{base_url or _default_base_url()}{endpoint}"
     for attempt in range(retries + 1):
         try:
-            resp = requests.post(url, json=payload, timeout=timeout)
+            resp = get_session().post(url, json=payload, timeout=timeout)
             resp.raise_for_status()
             return resp
         except (requests.ConnectionError, requests.Timeout) as exc:  # pragma: no cover
             if attempt >= retries:
-                raise OllamaError("Ollama is not reachable; ensure it is running") from exc
+                raise OllamaUnavailableError("Ollama is not reachable; ensure it is running") from exc
             time.sleep(1.5)
         except requests.HTTPError as exc:  # pragma: no cover
             raise OllamaError(f"Ollama error: {resp.text}") from exc
     raise OllamaError("Unknown error contacting Ollama")
 
 
-def embed(text: str, base_url: Optional[str] = None, embed_model: Optional[str] = None) -> List[float]:
+async def _apost_with_retry(
+    endpoint: str, payload: dict, retries: int = 2, timeout: int = 30, base_url: Optional[str] = None
+) -> dict:
+    """Async twin of ``_post_with_retry`` (same retries, backoff and errors); returns the JSON body."""
+
+    import aiohttp
+
+    url = f"{base_url or _default_base_url()}{endpoint}"
+    for attempt in range(retries + 1):
+        try:
+            async with get_async_session().post(
+                url, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as resp:
+                if resp.status >= 400:  # pragma: no cover
+                    raise OllamaError(f"Ollama error: {await resp.text()}")
+                return await resp.json(content_type=None)
+        except (TimeoutError, aiohttp.ClientConnectionError) as exc:  # pragma: no cover
+            if attempt >= retries:
+                raise OllamaUnavailableError("Ollama is not reachable; ensure it is running") from exc
+            await asyncio.sleep(1.5)
+    raise OllamaError("Unknown error contacting Ollama")
+
+
+KeepAlive = Optional[Union[str, int]]
+
+
+def _embed_payload(text: str, embed_model: Optional[str], keep_alive: KeepAlive = None) -> dict:
     payload = {"model": embed_model or OLLAMA_EMBED_MODEL, "prompt": text}
-    resp = _post_with_retry("/api/embeddings", payload, base_url=base_url)
-    data = resp.json()
-    return data.get("embedding", [])
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+def _chat_payload(
+    messages: List[dict], model: Optional[str], format: Optional[str], keep_alive: KeepAlive = None
+) -> dict:
+    payload = {"model": model or OLLAMA_MODEL, "messages": messages, "stream": False}
+    if format:
+        payload["format"] = format
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+def embed_response(
+    text: str, base_url: Optional[str] = None, embed_model: Optional[str] = None, keep_alive: KeepAlive = None
+) -> dict:
+    """Full ``/api/embeddings`` reply (embedding plus any timing fields the server sends)."""
+
+    resp = _post_with_retry("/api/embeddings", _embed_payload(text, embed_model, keep_alive), base_url=base_url)
+    return resp.json()
+
+
+async def aembed_response(
+    text: str, base_url: Optional[str] = None, embed_model: Optional[str] = None, keep_alive: KeepAlive = None
+) -> dict:
+    return await _apost_with_retry(
+        "/api/embeddings", _embed_payload(text, embed_model, keep_alive), base_url=base_url
+    )
+
+
+def embed(
+    text: str, base_url: Optional[str] = None, embed_model: Optional[str] = None, keep_alive: KeepAlive = None
+) -> List[float]:
+    return embed_response(text, base_url, embed_model, keep_alive).get("embedding", [])
+
+
+async def aembed(
+    text: str, base_url: Optional[str] = None, embed_model: Optional[str] = None, keep_alive: KeepAlive = None
+) -> List[float]:
+    return (await aembed_response(text, base_url, embed_model, keep_alive)).get("embedding", [])
+
+
+def chat_response(
+    messages: List[dict],
+    model: Optional[str] = None,
+    format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    keep_alive: KeepAlive = None,
+) -> dict:
+    """Full ``/api/chat`` reply, including ``load_duration``/``prompt_eval_count``/``eval_count``."""
+
+    resp = _post_with_retry("/api/chat", _chat_payload(messages, model, format, keep_alive), base_url=base_url)
+    return resp.json()
+
+
+async def achat_response(
+    messages: List[dict],
+    model: Optional[str] = None,
+    format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    keep_alive: KeepAlive = None,
+) -> dict:
+    return await _apost_with_retry(
+        "/api/chat", _chat_payload(messages, model, format, keep_alive), base_url=base_url
+    )
 
 
 def chat(
@@ -44,10 +144,18 @@ def chat(
     model: Optional[str] = None,
     format: Optional[str] = None,
     base_url: Optional[str] = None,
+    keep_alive: KeepAlive = None,
 ) -> str:
-    payload = {"model": model or OLLAMA_MODEL, "messages": messages, "stream": False}
-    if format:
-        payload["format"] = format
-    resp = _post_with_retry("/api/chat", payload, base_url=base_url)
-    data = resp.json()
+    data = chat_response(messages, model, format, base_url, keep_alive)
+    return data.get("message", {}).get("content", "")
+
+
+async def achat(
+    messages: List[dict],
+    model: Optional[str] = None,
+    format: Optional[str] = None,
+    base_url: Optional[str] = None,
+    keep_alive: KeepAlive = None,
+) -> str:
+    data = await achat_response(messages, model, format, base_url, keep_alive)
     return data.get("message", {}).get("content", "")
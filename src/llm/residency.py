@@ -0,0 +1,248 @@
+"""Keep Ollama models resident so the first call after idle doesn't pay the model load.
+
+``ResidencyManager`` preloads the configured embed/chat models on every pool endpoint at app or
+script start, supplies the per-workload ``keep_alive`` sent with each request, and records
+model load time separately from inference time (from Ollama's ``load_duration`` and
+``total_duration``). ``prewarm`` lets ``MatchRankAgent.rank`` load the chat model in the
+background while retrieval is still running.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .. import config
+from ..tracing import percentile
+from .http import get_session
+
+logger = logging.getLogger(__name__)
+
+# Ollama reports a few ms of load_duration even for a resident model; above this it was a real load.
+COLD_LOAD_THRESHOLD_S = 0.25
+
+_DURATION_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+
+def keep_alive_value(raw: Union[str, int, None]) -> Optional[Union[str, int]]:
+    """Normalize an env keep_alive: bare numbers become ints (Ollama rejects unit-less strings)."""
+
+    if raw is None or raw == "":
+        return None
+    if isinstance(raw, int):
+        return raw
+    text = str(raw).strip()
+    if re.fullmatch(r"-?\d+", text):
+        return int(text)
+    return text
+
+
+def keep_alive_seconds(raw: Union[str, int, None]) -> float:
+    """Seconds a model stays loaded for a keep_alive value; negative means forever."""
+
+    if raw is None or raw == "":
+        return 300.0  # Ollama's default
+    match = _DURATION_RE.match(str(raw))
+    if not match:
+        return 300.0
+    value = float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    return float("inf") if value < 0 else value
+
+
+@dataclass
+class ModelResidency:
+    url: str
+    model: str
+    workload: str
+    last_used: Optional[float] = None
+    loads: int = 0
+    last_load_s: Optional[float] = None
+    total_load_s: float = 0.0
+    calls: int = 0
+    inference_s: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+
+class ResidencyManager:
+    def __init__(
+        self,
+        keep_alive: Optional[Dict[str, Union[str, int, None]]] = None,
+        post: Optional[Callable[..., Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        raw = keep_alive or {"embed": config.OLLAMA_KEEP_ALIVE_EMBED, "chat": config.OLLAMA_KEEP_ALIVE_CHAT}
+        self.keep_alive = {workload: keep_alive_value(value) for workload, value in raw.items()}
+        self._post = post
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[str, str], ModelResidency] = {}
+        self._inflight: set = set()
+
+    def keep_alive_for(self, workload: str) -> Optional[Union[str, int]]:
+        return self.keep_alive.get(workload)
+
+    def _entry(self, url: str, model: str, workload: str) -> ModelResidency:
+        key = (url, model)
+        entry = self._models.get(key)
+        if entry is None:
+            entry = ModelResidency(url=url, model=model, workload=workload)
+            self._models[key] = entry
+        return entry
+
+    def observe(self, url: str, model: str, workload: str, data: Dict[str, Any]) -> None:
+        """Record one Ollama reply: split its wall time into model load and inference."""
+
+        load_s = (data.get("load_duration") or 0) / 1e9
+        total_s = (data.get("total_duration") or 0) / 1e9
+        with self._lock:
+            entry = self._entry(url, model, workload)
+            entry.last_used = self._clock()
+            entry.calls += 1
+            if load_s >= COLD_LOAD_THRESHOLD_S:
+                entry.loads += 1
+                entry.last_load_s = load_s
+                entry.total_load_s += load_s
+                logger.info("Ollama loaded %s on %s in %.2fs", model, url, load_s)
+            if total_s:
+                entry.inference_s.append(max(0.0, total_s - load_s))
+
+    def is_warm(self, url: str, model: str, workload: str) -> bool:
+        with self._lock:
+            entry = self._models.get((url, model))
+            if entry is None or entry.last_used is None:
+                return False
+            ttl = keep_alive_seconds(self.keep_alive.get(workload))
+            return self._clock() - entry.last_used < ttl
+
+    def _do_post(self, url: str, payload: dict) -> dict:
+        if self._post is not None:
+            return self._post(url, payload)
+        resp = get_session().post(url, json=payload, timeout=300)
+        resp.raise_for_status()
+        return resp.json()
+
+    def load(self, url: str, model: str, workload: str) -> Optional[float]:
+        """Load ``model`` on ``url`` without running inference; returns the load time in seconds."""
+
+        keep_alive = self.keep_alive_for(workload)
+        started = self._clock()
+        try:
+            if workload == "chat":
+                payload = {"model": model, "messages": [], "stream": False}
+                if keep_alive is not None:
+                    payload["keep_alive"] = keep_alive
+                data = self._do_post(f"{url}/api/chat", payload)
+            else:
+                payload = {"model": model, "input": []}
+                if keep_alive is not None:
+                    payload["keep_alive"] = keep_alive
+                data = self._do_post(f"{url}/api/embed", payload)
+        except Exception as exc:  # pragma: no cover - network
+            logger.warning("Preloading %s on %s failed: %s", model, url, exc)
+            return None
+        wall_s = self._clock() - started
+        if not data.get("load_duration"):
+            data = {**data, "load_duration": int(wall_s * 1e9)}
+        self.observe(url, model, workload, {"load_duration": data["load_duration"]})
+        return data["load_duration"] / 1e9
+
+    def preload(
+        self, workloads: Tuple[str, ...] = ("embed", "chat"), background: bool = True
+    ) -> Optional[threading.Thread]:
+        """Load the active models for ``workloads`` on every Ollama endpoint."""
+
+        from .client import get_active_config
+        from .endpoints import get_endpoint_pool
+
+        cfg = get_active_config()
+        if cfg.provider != "ollama":
+            return None
+        urls = [endpoint.url for endpoint in get_endpoint_pool(cfg.base_url).endpoints]
+        models = {"embed": cfg.embed_model, "chat": cfg.model}
+        jobs = [(url, models[workload], workload) for workload in workloads for url in urls]
+
+        def _run() -> None:
+            for url, model, workload in jobs:
+                if model and not self.is_warm(url, model, workload):
+                    self.load(url, model, workload)
+
+        if not background:
+            _run()
+            return None
+        thread = threading.Thread(target=_run, name="ollama-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def prewarm(self, workload: str = "chat") -> Optional[threading.Thread]:
+        """Start loading the active model for ``workload`` in the background unless it is warm."""
+
+        from .client import get_active_config
+        from .endpoints import get_endpoint_pool
+
+        cfg = get_active_config()
+        if cfg.provider != "ollama":
+            return None
+        model = cfg.model if workload == "chat" else cfg.embed_model
+        cold = [
+            endpoint.url
+            for endpoint in get_endpoint_pool(cfg.base_url).endpoints
+            if endpoint.healthy and not self.is_warm(endpoint.url, model, workload)
+        ]
+        with self._lock:
+            cold = [url for url in cold if (url, model) not in self._inflight]
+            self._inflight.update((url, model) for url in cold)
+        if not cold:
+            return None
+
+        def _run() -> None:
+            for url in cold:
+                try:
+                    self.load(url, model, workload)
+                finally:
+                    with self._lock:
+                        self._inflight.discard((url, model))
+
+        thread = threading.Thread(target=_run, name=f"ollama-prewarm-{workload}", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = list(self._models.values())
+        now = self._clock()
+        rows = []
+        for entry in entries:
+            inference = list(entry.inference_s)
+            p50 = percentile(inference, 50)
+            p95 = percentile(inference, 95)
+            rows.append(
+                {
+                    "url": entry.url,
+                    "model": entry.model,
+                    "workload": entry.workload,
+                    "warm": self.is_warm(entry.url, entry.model, entry.workload),
+                    "idle_s": round(now - entry.last_used, 1) if entry.last_used is not None else None,
+                    "loads": entry.loads,
+                    "last_load_ms": round(entry.last_load_s * 1000) if entry.last_load_s else None,
+                    "total_load_ms": round(entry.total_load_s * 1000),
+                    "calls": entry.calls,
+                    "inference_p50_ms": round(p50 * 1000) if p50 is not None else None,
+                    "inference_p95_ms": round(p95 * 1000) if p95 is not None else None,
+                }
+            )
+        return rows
+
+
+_manager: Optional[ResidencyManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_residency_manager() -> ResidencyManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ResidencyManager()
+        return _manager
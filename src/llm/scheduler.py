@@ -0,0 +1,440 @@
+"""Central admission control for outbound LLM requests.
+
+Every embed/chat call goes through ``LLMScheduler.run``. Calls wait in a priority queue per
+lane (provider + base URL + operation) so interactive work (ranking from the UI) is admitted
+ahead of bulk work (job fetch/ingest embeddings) when a lane is saturated. On top of the
+concurrency cap, OpenAI-compatible hosts get a token-bucket rate limit, and every host has a
+circuit breaker that fails fast after repeated provider errors.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Type
+
+from .. import config
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+_current_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "llm_priority", default=PRIORITY_BULK
+)
+
+
+@contextlib.contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    """Run LLM calls issued inside the block at the given priority (lower runs first).
+
+    Calls default to ``PRIORITY_BULK``; user-facing paths opt in to ``PRIORITY_INTERACTIVE``.
+    The setting lives in a ``contextvars.ContextVar``, which ``threading.Thread`` does not copy
+    into new threads, so work started on another thread runs at the bulk default unless that
+    thread enters its own ``llm_priority`` block.
+    """
+
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+
+_queue_wait: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("llm_queue_wait", default=None)
+
+
+def current_queue_wait() -> Optional[float]:
+    """Seconds the call now running spent queued in the scheduler (``None`` outside ``run``)."""
+
+    return _queue_wait.get()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+
+@dataclass
+class CallStats:
+    provider: str
+    base_url: str
+    operation: str
+    priority: int
+    queue_wait_s: float
+    service_s: float
+    ok: bool
+    finished_at: float = field(default_factory=time.time)
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, up to ``capacity`` banked."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must sleep before using it."""
+
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures; allows one trial call after ``cooldown_s``."""
+
+    def __init__(self, threshold: int, cooldown_s: float, clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.cooldown_s:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.cooldown_s or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Settle a call that ended without a verdict on host health (e.g. a parse error)."""
+
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = self._clock()
+
+
+class _Lane:
+    """Priority-ordered admission for one (provider, base_url, operation) lane."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.in_flight = 0
+        self.waiters: List[Tuple[int, int]] = []
+        self.cond = threading.Condition()
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        embed_concurrency: int = config.LLM_EMBED_CONCURRENCY,
+        chat_concurrency: int = config.LLM_CHAT_CONCURRENCY,
+        openai_rpm: float = config.OPENAI_REQUESTS_PER_MINUTE,
+        openai_burst: int = config.OPENAI_BURST,
+        breaker_threshold: int = config.LLM_BREAKER_THRESHOLD,
+        breaker_cooldown_s: float = config.LLM_BREAKER_COOLDOWN_S,
+        failure_types: Tuple[Type[BaseException], ...] = (Exception,),
+        history: int = 500,
+    ):
+        self.capacities = {"embed": embed_concurrency, "chat": chat_concurrency}
+        self.openai_rpm = openai_rpm
+        self.openai_burst = openai_burst
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown_s = breaker_cooldown_s
+        self.failure_types = failure_types
+        self._lanes: Dict[Tuple[str, str, str], _Lane] = {}
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stats: Deque[CallStats] = deque(maxlen=history)
+
+    def _lane(self, key: Tuple[str, str, str]) -> _Lane:
+        with self._lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = _Lane(self.capacities.get(key[2], 1))
+                self._lanes[key] = lane
+            return lane
+
+    def _bucket(self, provider: str, base_url: str) -> Optional[TokenBucket]:
+        if provider != "openai" or self.openai_rpm <= 0:
+            return None
+        with self._lock:
+            bucket = self._buckets.get((provider, base_url))
+            if bucket is None:
+                bucket = TokenBucket(self.openai_rpm / 60.0, max(1, self.openai_burst))
+                self._buckets[(provider, base_url)] = bucket
+            return bucket
+
+    def breaker(self, provider: str, base_url: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get((provider, base_url))
+            if breaker is None:
+                breaker = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown_s)
+                self._breakers[(provider, base_url)] = breaker
+            return breaker
+
+    def set_capacity(self, operation: str, capacity: int) -> None:
+        """Change the concurrency cap for an operation, including lanes already in use."""
+
+        self.capacities[operation] = capacity
+        with self._lock:
+            lanes = [lane for key, lane in self._lanes.items() if key[2] == operation]
+        for lane in lanes:
+            with lane.cond:
+                lane.capacity = max(1, capacity)
+                lane.cond.notify_all()
+
+    def _enqueue(self, lane: _Lane, priority: int) -> Tuple[int, int]:
+        ticket = (priority, next(self._seq))
+        heapq.heappush(lane.waiters, ticket)
+        return ticket
+
+    @staticmethod
+    def _try_admit(lane: _Lane, ticket: Tuple[int, int]) -> bool:
+        if lane.waiters[0] != ticket or lane.in_flight >= lane.capacity:
+            return False
+        heapq.heappop(lane.waiters)
+        lane.in_flight += 1
+        lane.cond.notify_all()
+        return True
+
+    def acquire(self, key: Tuple[str, str, str], priority: int) -> None:
+        lane = self._lane(key)
+        with lane.cond:
+            ticket = self._enqueue(lane, priority)
+            while not self._try_admit(lane, ticket):
+                lane.cond.wait()
+
+    def release(self, key: Tuple[str, str, str]) -> None:
+        lane = self._lane(key)
+        with lane.cond:
+            lane.in_flight -= 1
+            lane.cond.notify_all()
+
+    async def aacquire(self, key: Tuple[str, str, str], priority: int) -> None:
+        """Async twin of ``acquire``; polls instead of blocking the event loop."""
+
+        lane = self._lane(key)
+        with lane.cond:
+            ticket = self._enqueue(lane, priority)
+        delay = 0.001
+        try:
+            while True:
+                with lane.cond:
+                    if self._try_admit(lane, ticket):
+                        return
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.02)
+        except BaseException:
+            with lane.cond:
+                if ticket in lane.waiters:
+                    lane.waiters.remove(ticket)
+                    heapq.heapify(lane.waiters)
+                    lane.cond.notify_all()
+            raise
+
+    def _check_breaker(self, provider: str, base_url: str) -> CircuitBreaker:
+        breaker = self.breaker(provider, base_url)
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"{provider} at {base_url} failed {self.breaker_threshold} times in a row; "
+                f"retrying after {self.breaker_cooldown_s:.0f}s cooldown"
+            )
+        return breaker
+
+    def run(
+        self,
+        provider: str,
+        base_url: str,
+        operation: str,
+        fn: Callable[[], Any],
+        priority: Optional[int] = None,
+    ) -> Any:
+        """Run ``fn`` once admitted to its lane; raises ``CircuitOpenError`` if the host is tripped."""
+
+        priority = current_priority() if priority is None else priority
+        breaker = self._check_breaker(provider, base_url)
+        key = (provider, base_url, operation)
+        enqueued = time.perf_counter()
+        self.acquire(key, priority)
+        started: Optional[float] = None
+        ok = False
+        try:
+            bucket = self._bucket(provider, base_url)
+            if bucket is not None:
+                bucket.acquire()
+            started = time.perf_counter()
+            wait_token = _queue_wait.set(started - enqueued)
+            try:
+                result = fn()
+            except self.failure_types:
+                breaker.record_failure()
+                raise
+            except BaseException:
+                breaker.release_trial()
+                raise
+            finally:
+                _queue_wait.reset(wait_token)
+            breaker.record_success()
+            ok = True
+            return result
+        finally:
+            self.release(key)
+            self._record(provider, base_url, operation, priority, enqueued, started, ok)
+
+    async def arun(
+        self,
+        provider: str,
+        base_url: str,
+        operation: str,
+        fn: Callable[[], Awaitable[Any]],
+        priority: Optional[int] = None,
+    ) -> Any:
+        """Async twin of ``run``: ``fn`` returns the coroutine to await once admitted."""
+
+        priority = current_priority() if priority is None else priority
+        breaker = self._check_breaker(provider, base_url)
+        key = (provider, base_url, operation)
+        enqueued = time.perf_counter()
+        await self.aacquire(key, priority)
+        started: Optional[float] = None
+        ok = False
+        try:
+            bucket = self._bucket(provider, base_url)
+            if bucket is not None:
+                delay = bucket.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            started = time.perf_counter()
+            wait_token = _queue_wait.set(started - enqueued)
+            try:
+                result = await fn()
+            except self.failure_types:
+                breaker.record_failure()
+                raise
+            except BaseException:
+                breaker.release_trial()
+                raise
+            finally:
+                _queue_wait.reset(wait_token)
+            breaker.record_success()
+            ok = True
+            return result
+        finally:
+            self.release(key)
+            self._record(provider, base_url, operation, priority, enqueued, started, ok)
+
+    def _record(
+        self,
+        provider: str,
+        base_url: str,
+        operation: str,
+        priority: int,
+        enqueued: float,
+        started: Optional[float],
+        ok: bool,
+    ) -> CallStats:
+        finished = time.perf_counter()
+        started = finished if started is None else started
+        stats = CallStats(
+            provider=provider,
+            base_url=base_url,
+            operation=operation,
+            priority=priority,
+            queue_wait_s=started - enqueued,
+            service_s=finished - started,
+            ok=ok,
+        )
+        self._stats.append(stats)
+        logger.debug(
+            "LLM %s %s priority=%s queue=%.3fs service=%.3fs ok=%s",
+            provider,
+            operation,
+            priority,
+            stats.queue_wait_s,
+            stats.service_s,
+            ok,
+        )
+        return stats
+
+    def recent_stats(self, limit: Optional[int] = None) -> List[CallStats]:
+        stats = list(self._stats)
+        return stats[-limit:] if limit else stats
+
+    def lane_snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            lanes = list(self._lanes.items())
+        return [
+            {
+                "provider": key[0],
+                "base_url": key[1],
+                "operation": key[2],
+                "in_flight": lane.in_flight,
+                "waiting": len(lane.waiters),
+                "capacity": lane.capacity,
+                "breaker": self.breaker(key[0], key[1]).state,
+            }
+            for key, lane in lanes
+        ]
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from .client import LLMProviderError
+            from .ollama_client import OllamaError
+
+            _scheduler = LLMScheduler(failure_types=(LLMProviderError, OllamaError))
+        return _scheduler
@@ -0,0 +1,201 @@
+"""Normalized token/timing usage for LLM calls.
+
+Ollama replies carry ``prompt_eval_count``/``prompt_eval_duration``/``eval_count``/
+``eval_duration``/``load_duration``; OpenAI-compatible replies carry ``usage`` (with
+``prompt_tokens_details.cached_tokens`` when prompt caching kicked in). Both are mapped onto
+``LLMUsage`` so callers can see, per call, how many prompt tokens were actually evaluated.
+With ``LLM_METRICS`` on, every record also goes to the ``llm_calls`` table through a buffered
+writer, tagged with the scheduler queue wait and the traced run it belongs to.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .. import config
+from ..tracing import current_run
+from .scheduler import current_queue_wait
+
+logger = logging.getLogger(__name__)
+
+_NS = 1e9
+
+
+@dataclass
+class LLMUsage:
+    provider: str
+    model: str
+    endpoint: str
+    operation: str
+    prompt_tokens: Optional[int] = None
+    cached_prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    prompt_eval_s: Optional[float] = None
+    eval_s: Optional[float] = None
+    load_s: Optional[float] = None
+    total_s: Optional[float] = None
+    queue_s: Optional[float] = None
+    run_id: Optional[str] = None
+    run_kind: Optional[str] = None
+    ts: float = field(default_factory=time.time)
+
+    @property
+    def gen_tokens_per_s(self) -> Optional[float]:
+        if self.completion_tokens and self.eval_s:
+            return self.completion_tokens / self.eval_s
+        return None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "gen_tokens_per_s": self.gen_tokens_per_s}
+
+
+def _seconds(value: Optional[int]) -> Optional[float]:
+    return value / _NS if value is not None else None
+
+
+def usage_from_ollama(endpoint: str, model: str, operation: str, data: Dict[str, Any]) -> LLMUsage:
+    return LLMUsage(
+        provider="ollama",
+        model=model,
+        endpoint=endpoint,
+        operation=operation,
+        prompt_tokens=data.get("prompt_eval_count"),
+        completion_tokens=data.get("eval_count"),
+        prompt_eval_s=_seconds(data.get("prompt_eval_duration")),
+        eval_s=_seconds(data.get("eval_duration")),
+        load_s=_seconds(data.get("load_duration")),
+        total_s=_seconds(data.get("total_duration")),
+    )
+
+
+def usage_from_openai(endpoint: str, model: str, operation: str, data: Dict[str, Any]) -> LLMUsage:
+    usage = data.get("usage") or {}
+    details = usage.get("prompt_tokens_details") or {}
+    return LLMUsage(
+        provider="openai",
+        model=data.get("model") or model,
+        endpoint=endpoint,
+        operation=operation,
+        prompt_tokens=usage.get("prompt_tokens"),
+        cached_prompt_tokens=details.get("cached_tokens"),
+        completion_tokens=usage.get("completion_tokens"),
+    )
+
+
+_collectors: contextvars.ContextVar[Tuple[List[LLMUsage], ...]] = contextvars.ContextVar(
+    "llm_usage_collectors", default=()
+)
+
+
+@contextlib.contextmanager
+def capture_usage() -> Iterator[List[LLMUsage]]:
+    """Collect the ``LLMUsage`` of every LLM call made inside the block (same thread/task)."""
+
+    calls: List[LLMUsage] = []
+    token = _collectors.set(_collectors.get() + (calls,))
+    try:
+        yield calls
+    finally:
+        _collectors.reset(token)
+
+
+def record_usage(usage: LLMUsage) -> None:
+    """Attach queue wait and run, hand the record to active collectors and the metrics store."""
+
+    if usage.queue_s is None:
+        usage.queue_s = current_queue_wait()
+    run = current_run()
+    if run is not None and usage.run_id is None:
+        usage.run_id, usage.run_kind = run
+    for calls in _collectors.get():
+        calls.append(usage)
+    if config.LLM_METRICS:
+        get_usage_store().add(usage)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+class UsageStore:
+    """Buffers usage records and writes them to SQLite in batches off the request path."""
+
+    def __init__(self, flush_interval_s: float = 2.0, max_buffer: int = 256):
+        self.flush_interval_s = flush_interval_s
+        self.max_buffer = max_buffer
+        self._buffer: List[LLMUsage] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, usage: LLMUsage) -> None:
+        with self._lock:
+            self._buffer.append(usage)
+            overflow = len(self._buffer) >= self.max_buffer
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._flush_loop, name="llm-usage-writer", daemon=True)
+                self._thread.start()
+        if overflow:
+            self.flush()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self.flush_interval_s)
+            self.flush()
+            with self._lock:
+                if not self._buffer:
+                    self._thread = None
+                    return
+
+    def flush(self) -> None:
+        from ..storage.sqlite import insert_llm_calls
+
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            try:
+                insert_llm_calls(
+                    [
+                        (
+                            u.ts,
+                            u.run_id,
+                            u.run_kind,
+                            u.provider,
+                            u.model,
+                            u.endpoint,
+                            u.operation,
+                            u.prompt_tokens,
+                            u.cached_prompt_tokens,
+                            u.completion_tokens,
+                            _ms(u.queue_s),
+                            _ms(u.load_s),
+                            _ms(u.prompt_eval_s),
+                            _ms(u.eval_s),
+                            _ms(u.total_s),
+                            u.gen_tokens_per_s,
+                        )
+                        for u in batch
+                    ]
+                )
+            except Exception as exc:  # metrics must never break LLM calls
+                logger.warning("Dropped %s LLM usage records: %s", len(batch), exc)
+
+
+_store: Optional[UsageStore] = None
+_store_lock = threading.Lock()
+
+
+def get_usage_store() -> UsageStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UsageStore()
+            atexit.register(_store.flush)
+        return _store
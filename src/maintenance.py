@@ -0,0 +1,190 @@
+"""Job expiry and storage compaction.
+
+Every fetch records ``last_seen_at`` on the postings it returns. ``expire_jobs`` tombstones live
+jobs that no fetch has returned for ``JOB_MISSING_AFTER_S`` or that were posted (or first seen,
+without a post date) more than ``JOB_TTL_S`` ago. The row stays, without its description, so a
+posting that reappears is recognized and restored. Their vectors are then deleted from Chroma
+in batches. Tombstones older than ``JOB_TOMBSTONE_RETENTION_S`` are purged. Each step works in
+batches of ``JOB_EXPIRY_BATCH`` and is safe to interrupt: pending vector deletes are kept as
+``vector_state = 'delete_pending'`` and finished on the next run.
+
+Deleting from Chroma doesn't shrink its files: the SQLite store keeps free pages and the HNSW
+index keeps deleted slots. ``vacuum_sqlite`` and ``vacuum_chroma`` reclaim the SQLite side;
+``rebuild_collection`` copies the live vectors into a fresh index. A rebuild replaces the
+collection, so run it while the app and workers are stopped (``scripts/maintain.py
+--rebuild-index``).
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from . import config
+from .storage.sqlite import (
+    expiry_candidates,
+    get_conn,
+    job_storage_stats,
+    jobs_with_vector_state,
+    list_maintenance,
+    log_maintenance,
+    purge_tombstones,
+    set_vector_states,
+    tombstone_jobs,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def expire_jobs(
+    job_collection, now: Optional[float] = None, batch_size: Optional[int] = None, dry_run: bool = False
+) -> Dict[str, int]:
+    """Tombstone stale jobs, delete their vectors and purge old tombstones; returns counts."""
+
+    now = time.time() if now is None else now
+    batch_size = batch_size or config.JOB_EXPIRY_BATCH
+    missing_before = now - config.JOB_MISSING_AFTER_S if config.JOB_MISSING_AFTER_S > 0 else None
+    posted_before = now - config.JOB_TTL_S if config.JOB_TTL_S > 0 else None
+    started = datetime.utcnow().isoformat()
+    counts = {"missing": 0, "ttl": 0, "vectors_deleted": 0, "purged": 0}
+    if dry_run:
+        for _job_id, reason in expiry_candidates(missing_before, posted_before, limit=1_000_000):
+            counts[reason] += 1
+        return counts
+    if missing_before is not None or posted_before is not None:
+        while True:
+            batch = expiry_candidates(missing_before, posted_before, batch_size)
+            if not batch:
+                break
+            tombstone_jobs(batch, now)
+            for _job_id, reason in batch:
+                counts[reason] += 1
+    while True:
+        pending = jobs_with_vector_state("delete_pending", batch_size)
+        if not pending:
+            break
+        job_collection.delete(ids=pending)
+        set_vector_states(pending, "removed")
+        counts["vectors_deleted"] += len(pending)
+    if config.JOB_TOMBSTONE_RETENTION_S > 0:
+        while True:
+            purged = purge_tombstones(now - config.JOB_TOMBSTONE_RETENTION_S, batch_size)
+            counts["purged"] += purged
+            if purged < batch_size:
+                break
+    if any(counts.values()):
+        log_maintenance("expire", started, datetime.utcnow().isoformat(), counts)
+    logger.info("Job expiry: %s", counts)
+    return counts
+
+
+def _backfills_pending() -> bool:
+    conn = get_conn()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM schema_version WHERE backfilled_at IS NULL").fetchone()[0] > 0
+    finally:
+        conn.close()
+
+
+def vacuum_sqlite(min_free_ratio: Optional[float] = None) -> Dict[str, Any]:
+    """VACUUM the app database once at least ``min_free_ratio`` of it is free pages, then rebuild
+    ``jobs_fts`` (VACUUM may renumber ``jobs`` rowids, which the index is keyed on)."""
+
+    min_free_ratio = config.SQLITE_VACUUM_MIN_FREE if min_free_ratio is None else min_free_ratio
+    before = job_storage_stats()
+    if before["db_bytes"] == 0 or before["free_bytes"] / before["db_bytes"] < min_free_ratio:
+        return {"vacuumed": False, **before}
+    if _backfills_pending():
+        # Backfill cursors are rowids; let them finish before rowids can change.
+        logger.info("Skipping VACUUM while schema backfills are pending")
+        return {"vacuumed": False, **before}
+    started = datetime.utcnow().isoformat()
+    conn = get_conn()
+    try:
+        conn.execute("VACUUM")
+        conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild')")
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+    after = job_storage_stats()
+    details = {"bytes_before": before["db_bytes"], "bytes_after": after["db_bytes"]}
+    log_maintenance("vacuum_sqlite", started, datetime.utcnow().isoformat(), details)
+    logger.info("Vacuumed %s: %s -> %s bytes", config.SQLITE_PATH, before["db_bytes"], after["db_bytes"])
+    return {"vacuumed": True, **details}
+
+
+def vacuum_chroma(persist_dir: str, timeout_s: float = 30.0) -> Dict[str, Any]:
+    """VACUUM the SQLite file of a Chroma store (what ``chroma utils vacuum`` does)."""
+
+    path = os.path.join(persist_dir, "chroma.sqlite3")
+    if not os.path.exists(path):
+        return {"vacuumed": False}
+    before = os.path.getsize(path)
+    started = datetime.utcnow().isoformat()
+    conn = sqlite3.connect(path, timeout=timeout_s)
+    try:
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    details = {"path": path, "bytes_before": before, "bytes_after": os.path.getsize(path)}
+    log_maintenance("vacuum_chroma", started, datetime.utcnow().isoformat(), details)
+    return {"vacuumed": True, **details}
+
+
+def vectors_deleted_since_rebuild() -> int:
+    """Vectors deleted by expiry since the last index rebuild (dead slots left in the HNSW index)."""
+
+    deleted = 0
+    for row in list_maintenance(limit=10_000):
+        if row["operation"] == "rebuild_index":
+            break
+        if row["operation"] == "expire":
+            deleted += json.loads(row["details"] or "{}").get("vectors_deleted", 0)
+    return deleted
+
+
+def rebuild_collection(
+    client,
+    name: str,
+    batch_size: int = 1000,
+    index: Optional[Dict[str, Any]] = None,
+    embed_documents: Optional[Callable[[List[str]], List[List[float]]]] = None,
+):
+    """Copy the live vectors of collection ``name`` into a fresh index and swap it in by name;
+    returns the new collection. The old collection object stops working.
+
+    ``index`` overrides ``hnsw:*`` settings (see ``vector_index.index_metadata``); the rest are
+    kept from the old index. With ``embed_documents``, vectors are computed again from the stored
+    documents instead of copied."""
+
+    from .vector_index import current_index_metadata
+
+    started = datetime.utcnow().isoformat()
+    source = client.get_collection(name)
+    settings = {**current_index_metadata(source), **(index or {})}
+    temp_name = f"{name}-rebuild"
+    with contextlib.suppress(Exception):
+        client.delete_collection(temp_name)  # left over from an interrupted rebuild
+    metadata = {key: value for key, value in (source.metadata or {}).items() if not key.startswith("hnsw:")}
+    target = client.create_collection(temp_name, metadata={**metadata, **settings})
+    copied = 0
+    while True:
+        page = source.get(include=["embeddings", "documents", "metadatas"], limit=batch_size, offset=copied)
+        if not page["ids"]:
+            break
+        embeddings = embed_documents(page["documents"]) if embed_documents else page["embeddings"]
+        target.add(ids=page["ids"], embeddings=embeddings, documents=page["documents"], metadatas=page["metadatas"])
+        copied += len(page["ids"])
+    client.delete_collection(name)
+    target.modify(name=name)
+    details = {"collection": name, "vectors": copied, "index": settings, "reembedded": embed_documents is not None}
+    log_maintenance("rebuild_index", started, datetime.utcnow().isoformat(), details)
+    logger.info("Rebuilt vector collection %s with %s vectors (%s)", name, copied, settings)
+    return client.get_collection(name)
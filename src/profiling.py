@@ -0,0 +1,203 @@
+"""Opt-in per-run profiling for job search, resume ingest and ranking.
+
+``profile_run(run_id, kind)`` wraps a run in ``cProfile`` (and optionally ``tracemalloc``) when
+profiling is enabled via ``PROFILE_RUNS`` or ``set_profiling``. Each profile is written to
+``PROFILE_DIR`` as a ``.prof`` file (loadable with ``pstats``/snakeviz) plus a JSON summary of the
+hottest functions and largest allocation sites; only the newest ``PROFILE_RETENTION`` are kept.
+When disabled, ``profile_run`` returns a shared no-op context manager.
+"""
+
+import contextlib
+import cProfile
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+TOP_N = 25
+
+_enabled = config.PROFILE_RUNS
+_trace_memory = config.PROFILE_TRACEMALLOC
+_active = threading.local()
+_NOOP = contextlib.nullcontext()
+# Runs on several task-worker threads share tracemalloc: it is started by the first run that
+# needs it and stopped when the last one finishes (unless something else had started it).
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def set_profiling(enabled: bool, trace_memory: Optional[bool] = None) -> None:
+    """Turn profiling on/off for this process (overrides ``PROFILE_RUNS``/``PROFILE_TRACEMALLOC``)."""
+
+    global _enabled, _trace_memory
+    _enabled = enabled
+    if trace_memory is not None:
+        _trace_memory = trace_memory
+
+
+def profiling_enabled() -> bool:
+    return _enabled
+
+
+def memory_tracing_enabled() -> bool:
+    return _trace_memory
+
+
+def profile_run(run_id: str, kind: str):
+    """Profile the enclosed run if profiling is on; otherwise a no-op."""
+
+    if not _enabled or getattr(_active, "profiling", False):
+        return _NOOP
+    return _profile(run_id, kind, _trace_memory)
+
+
+@contextlib.contextmanager
+def _profile(run_id: str, kind: str, trace_memory: bool) -> Iterator[None]:
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as exc:  # another profiler already owns this thread
+        logger.info("Skipping profile for run %s: %s", run_id, exc)
+        profiler = None
+    if profiler is None:
+        yield
+        return
+    tracing = trace_memory and _acquire_tracemalloc()
+    before = _snapshot() if tracing else None
+    _active.profiling = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        _active.profiling = False
+        allocations: List[Dict[str, Any]] = []
+        if tracing:
+            after = _snapshot() if before is not None else None
+            if after is not None:
+                try:
+                    allocations = _top_allocations(after.compare_to(before, "lineno"))
+                except Exception as exc:  # allocation stats are best-effort
+                    logger.warning("Could not compare allocations for run %s: %s", run_id, exc)
+            _release_tracemalloc()
+        try:
+            _save(run_id, kind, profiler, elapsed, allocations)
+        except OSError as exc:  # profiling must never break a run
+            logger.warning("Could not save profile for run %s: %s", run_id, exc)
+
+
+def _acquire_tracemalloc() -> bool:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            try:
+                tracemalloc.start(10)
+            except Exception as exc:
+                logger.warning("Could not start tracemalloc: %s", exc)
+                return False
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+        return True
+
+
+def _release_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+def _snapshot() -> Optional[tracemalloc.Snapshot]:
+    try:
+        return tracemalloc.take_snapshot()
+    except RuntimeError as exc:  # tracing was stopped elsewhere; drop allocation stats
+        logger.warning("Could not take a tracemalloc snapshot: %s", exc)
+        return None
+
+
+def _hot_functions(stats: pstats.Stats, limit: int = TOP_N) -> List[Dict[str, Any]]:
+    rows = []
+    for (filename, lineno, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{func} ({Path(filename).name}:{lineno})" if lineno else func,
+                "calls": nc,
+                "primitive_calls": cc,
+                "tottime_ms": round(tt * 1000, 2),
+                "cumtime_ms": round(ct * 1000, 2),
+            }
+        )
+    rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+    return rows[:limit]
+
+
+def _top_allocations(diffs: List[tracemalloc.StatisticDiff], limit: int = TOP_N) -> List[Dict[str, Any]]:
+    rows = []
+    for diff in diffs[:limit]:
+        frame = diff.traceback[0]
+        rows.append(
+            {
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_kb": round(diff.size_diff / 1024, 1),
+                "count": diff.count_diff,
+            }
+        )
+    return rows
+
+
+def _save(run_id: str, kind: str, profiler: cProfile.Profile, elapsed: float, allocations: List[dict]) -> None:
+    directory = Path(config.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{time.strftime('%Y%m%dT%H%M%S')}_{kind}_{run_id}"
+    prof_path = directory / f"{stem}.prof"
+    profiler.dump_stats(str(prof_path))
+    summary = {
+        "run_id": run_id,
+        "kind": kind,
+        "created_at": time.time(),
+        "duration_ms": round(elapsed * 1000, 1),
+        "prof_file": prof_path.name,
+        "hot_functions": _hot_functions(pstats.Stats(profiler)),
+        "allocations": allocations,
+    }
+    (directory / f"{stem}.json").write_text(json.dumps(summary), encoding="utf-8")
+    _enforce_retention(directory, config.PROFILE_RETENTION)
+
+
+def _enforce_retention(directory: Path, keep: int) -> None:
+    summaries = sorted(directory.glob("*.json"), key=lambda p: (p.stat().st_mtime_ns, p.name), reverse=True)
+    for stale in summaries[max(0, keep) :]:
+        for path in (stale, stale.with_suffix(".prof")):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Saved profile summaries, newest first."""
+
+    directory = Path(config.PROFILE_DIR)
+    if not directory.exists():
+        return []
+    profiles = []
+    for path in directory.glob("*.json"):
+        try:
+            summary = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        summary["path"] = str(path.with_suffix(".prof"))
+        profiles.append(summary)
+    profiles.sort(key=lambda summary: summary.get("created_at", 0), reverse=True)
+    return profiles
@@ -0,0 +1,221 @@
+"""Scheduled, incremental refresh of saved queries.
+
+Every (source, board, saved query) is a refresh target with its own schedule in the
+``refresh_targets`` table. A board is a part of a source that is fetched on its own (a
+Greenhouse board, a Lever company, a scraper provider; other sources are one board). Each
+target starts at ``REFRESH_INTERVAL_S`` or a per-source / per-board override from
+``REFRESH_INTERVALS``. When a refresh finds the listing unchanged, the interval is multiplied by
+``REFRESH_BACKOFF`` up to ``REFRESH_MAX_INTERVAL_S``; a change resets it to the base. Failed
+fetches retry with exponential backoff. Every next run is jittered by ``REFRESH_JITTER`` so
+targets don't fire together. Due targets run in parallel, at most ``REFRESH_CONCURRENCY`` at a
+time and ``REFRESH_PER_SOURCE_CONCURRENCY`` per source. Postings already stored unchanged are
+not re-embedded (see ``JobScoutAgent.refresh_board``).
+
+The daemon also expires stale jobs every ``JOB_EXPIRY_INTERVAL_S`` (see ``src/maintenance.py``),
+first re-embedding jobs whose vector write was interrupted (``JobScoutAgent.reconcile_vectors``).
+
+Run with ``python scripts/refresh.py``.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import config
+from .maintenance import expire_jobs, vacuum_sqlite
+from .storage.sqlite import (
+    delete_saved_query,
+    due_refresh_targets,
+    list_refresh_targets,
+    list_saved_queries,
+    save_query,
+    sync_refresh_targets,
+    update_refresh_target,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT_PER_SOURCE = 50
+
+
+@dataclass
+class RefreshOutcome:
+    source: str
+    board: str
+    query: str
+    fetched: int = 0
+    added: int = 0
+    unchanged: int = 0
+    changed: bool = False
+    error: Optional[str] = None
+    next_due_at: Optional[float] = None
+
+
+def add_saved_query(query: str, limit_per_source: int = DEFAULT_LIMIT_PER_SOURCE) -> None:
+    save_query(query.strip(), limit_per_source, datetime.utcnow().isoformat())
+
+
+def remove_saved_query(query: str) -> None:
+    delete_saved_query(query)
+
+
+def base_interval(source: str, board: str) -> float:
+    """Configured refresh interval for a board: board override, then source override, then default."""
+
+    intervals = config.REFRESH_INTERVALS
+    return intervals.get(f"{source}:{board}", intervals.get(source, config.REFRESH_INTERVAL_S))
+
+
+def next_interval(current: Optional[float], base: float, changed: bool) -> float:
+    """Reset to ``base`` when the board changed, otherwise back off towards ``REFRESH_MAX_INTERVAL_S``."""
+
+    if changed or not current:
+        return base
+    return min(max(base, config.REFRESH_MAX_INTERVAL_S), current * config.REFRESH_BACKOFF)
+
+
+def retry_interval(base: float, failures: int) -> float:
+    """Retry delay after ``failures`` consecutive failed fetches: 5 minutes, doubling up to ``base``."""
+
+    return min(base, 300.0 * 2 ** max(0, failures - 1))
+
+
+class RefreshScheduler:
+    def __init__(
+        self,
+        scout,
+        concurrency: Optional[int] = None,
+        per_source_concurrency: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.scout = scout
+        self.concurrency = max(1, concurrency or config.REFRESH_CONCURRENCY)
+        self.per_source = max(1, per_source_concurrency or config.REFRESH_PER_SOURCE_CONCURRENCY)
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self._expired_at: Optional[float] = None
+
+    def _sources(self) -> Dict[str, object]:
+        return {source.name: source for source in self.scout.sources}
+
+    def _jitter(self, interval: float) -> float:
+        return interval * (1 + self.rng.uniform(-config.REFRESH_JITTER, config.REFRESH_JITTER))
+
+    def sync_targets(self) -> int:
+        """Create targets (due right away) for every saved query × enabled board and drop those no
+        longer wanted; returns the number of targets."""
+
+        now = self.clock()
+        targets: List[Tuple[str, str, str, float, float]] = []
+        for saved in list_saved_queries():
+            for name, source in self._sources().items():
+                for board in source.boards():
+                    targets.append((name, board, saved["query"], base_interval(name, board), now))
+        sync_refresh_targets(targets)
+        return len(targets)
+
+    def refresh_target(self, target) -> RefreshOutcome:
+        """Refresh one target and store its new schedule."""
+
+        source_name, board, query = target["source"], target["board"], target["query"]
+        outcome = RefreshOutcome(source_name, board, query)
+        base = base_interval(source_name, board)
+        limits = {row["query"]: row["limit_per_source"] for row in list_saved_queries()}
+        started = self.clock()
+        try:
+            source = self._sources()[source_name]
+            counts = self.scout.refresh_board(source, board, query, limits.get(query) or DEFAULT_LIMIT_PER_SOURCE)
+        except Exception as exc:
+            failures = (target["failures"] or 0) + 1
+            outcome.error = f"{type(exc).__name__}: {exc}"
+            outcome.next_due_at = started + self._jitter(retry_interval(base, failures))
+            update_refresh_target(
+                source_name, board, query, last_run_at=started, failures=failures, last_error=outcome.error, next_due_at=outcome.next_due_at
+            )
+            logger.warning("Refresh of %s/%s for %r failed: %s", source_name, board, query, exc)
+            return outcome
+        now = self.clock()
+        outcome.fetched, outcome.added, outcome.unchanged = counts["fetched"], counts["added"], counts["unchanged"]
+        outcome.changed = counts["fingerprint"] != target["fingerprint"]
+        interval = next_interval(target["interval_s"], base, outcome.changed)
+        outcome.next_due_at = now + self._jitter(interval)
+        update_refresh_target(
+            source_name,
+            board,
+            query,
+            interval_s=interval,
+            next_due_at=outcome.next_due_at,
+            last_run_at=started,
+            last_seen_at=now,
+            last_changed_at=now if outcome.changed else target["last_changed_at"],
+            fingerprint=counts["fingerprint"],
+            unchanged_runs=0 if outcome.changed else (target["unchanged_runs"] or 0) + 1,
+            failures=0,
+            last_error=None,
+            last_count=counts["fetched"],
+        )
+        logger.info(
+            "Refreshed %s/%s for %r: %s fetched, %s added, listing %s; next in %.0fs",
+            source_name, board, query, outcome.fetched, outcome.added, "changed" if outcome.changed else "unchanged", interval,
+        )
+        return outcome
+
+    def run_due(self) -> List[RefreshOutcome]:
+        """Refresh every due target, in due order, within the global and per-source limits."""
+
+        pending = list(due_refresh_targets(self.clock()))
+        outcomes: List[RefreshOutcome] = []
+        running: Dict[Future, str] = {}
+        per_source: Dict[str, int] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="refresh") as pool:
+            while pending or running:
+                for target in list(pending):
+                    if len(running) >= self.concurrency:
+                        break
+                    if per_source.get(target["source"], 0) >= self.per_source:
+                        continue
+                    pending.remove(target)
+                    per_source[target["source"]] = per_source.get(target["source"], 0) + 1
+                    running[pool.submit(self.refresh_target, target)] = target["source"]
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    per_source[running.pop(future)] -= 1
+                    outcomes.append(future.result())
+        return outcomes
+
+    def expire_if_due(self) -> Optional[Dict[str, int]]:
+        """Expire stale jobs (and VACUUM when worthwhile) once every ``JOB_EXPIRY_INTERVAL_S``,
+        after settling vector writes an interrupted run left pending."""
+
+        now = self.clock()
+        if config.JOB_EXPIRY_INTERVAL_S <= 0:
+            return None
+        if self._expired_at is not None and now - self._expired_at < config.JOB_EXPIRY_INTERVAL_S:
+            return None
+        self._expired_at = now
+        self.scout.reconcile_vectors()
+        counts = expire_jobs(self.scout.job_collection, now=now)
+        vacuum_sqlite()
+        return counts
+
+    def run_forever(self, stop: Optional[threading.Event] = None) -> None:
+        """Sync targets and run due ones until ``stop`` is set, sleeping until the next is due."""
+
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                self.sync_targets()
+                self.run_due()
+                self.expire_if_due()
+                upcoming = [row["next_due_at"] for row in list_refresh_targets() if row["next_due_at"] is not None]
+            except Exception:  # keep the daemon alive through a locked or unavailable database
+                logger.exception("Refresh cycle failed")
+                upcoming = []
+            wait_s = min([due - self.clock() for due in upcoming] + [config.REFRESH_POLL_S])
+            stop.wait(max(1.0, wait_s))
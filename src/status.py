@@ -0,0 +1,90 @@
+"""Sidebar status without per-rerun network calls.
+
+``StatusService.llm_health()`` answers from a cached provider health check and, once the
+result is older than ``STATUS_TTL_S``, starts a refresh in a background thread (one at a time)
+instead of probing inline. The check itself is ``check_provider`` (a model-free probe), keyed
+by provider and base URL so switching settings doesn't show the old provider's result.
+Resume/job totals come from ``COUNT(*)`` queries.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import config
+from .llm import check_provider, get_active_config
+from .storage.sqlite import count_jobs, count_resumes
+from .tools.job_sources import enabled_source_names
+
+
+@dataclass
+class ProviderHealth:
+    provider: str
+    base_url: str
+    ok: Optional[bool]  # None until the first check finishes
+    detail: str
+    checked_at: Optional[float] = None
+
+
+class StatusService:
+    def __init__(
+        self,
+        ttl_s: float = config.STATUS_TTL_S,
+        checker: Callable[..., Tuple[bool, str]] = check_provider,
+    ):
+        self.ttl_s = ttl_s
+        self._checker = checker
+        self._health: Dict[Tuple[str, str], ProviderHealth] = {}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+    def llm_health(self) -> ProviderHealth:
+        """Last known health of the active provider; refreshes in the background when stale."""
+
+        cfg = get_active_config()
+        key = (cfg.provider, cfg.base_url or "")
+        with self._lock:
+            health = self._health.get(key)
+            stale = health is None or health.checked_at is None or time.time() - health.checked_at >= self.ttl_s
+            start = stale and key not in self._refreshing
+            if start:
+                self._refreshing.add(key)
+        if start:
+            threading.Thread(target=self._refresh, args=(key, cfg), name="llm-status", daemon=True).start()
+        return health or ProviderHealth(cfg.provider, key[1], None, "Checking…")
+
+    def refresh(self) -> ProviderHealth:
+        """Run the health check now (e.g. from a "re-check" button)."""
+
+        cfg = get_active_config()
+        return self._refresh((cfg.provider, cfg.base_url or ""), cfg)
+
+    def _refresh(self, key: Tuple[str, str], cfg) -> ProviderHealth:
+        try:
+            ok, detail = self._checker(cfg)
+        except Exception as exc:  # a failing probe is a status, not an error
+            ok, detail = False, str(exc)
+        health = ProviderHealth(key[0], key[1], ok, detail, time.time())
+        with self._lock:
+            self._health[key] = health
+            self._refreshing.discard(key)
+        return health
+
+    def counts(self) -> Dict[str, int]:
+        return {"resumes": count_resumes(), "jobs": count_jobs()}
+
+    def sources(self) -> List[str]:
+        return enabled_source_names()
+
+
+_service: Optional[StatusService] = None
+_service_lock = threading.Lock()
+
+
+def get_status_service() -> StatusService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = StatusService()
+        return _service
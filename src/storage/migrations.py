@@ -0,0 +1,612 @@
+"""Versioned schema migrations for the SQLite store.
+
+``migrate()`` applies every migration newer than the highest row in ``schema_version``, in
+order; each step is idempotent (``IF NOT EXISTS``, column checks), so databases created before
+this framework upgrade cleanly from version 1. Schema steps are quick DDL. Migrations that must
+rewrite existing rows also have a backfill, which ``run_backfills()`` runs in short batches
+(each its own transaction, resumable from a stored rowid cursor) so a large database upgrades
+while the dashboard keeps reading. Backfills stop at the highest ``jobs`` rowid seen when the
+migration was applied: rows written after that already carry the new data.
+Run from the CLI with ``python scripts/migrate.py``.
+"""
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .. import config
+from ..models import Job
+from ..tools.dedupe import content_hash, job_signature, title_key
+from ..tools.parsing import posted_epoch
+from .sqlite import get_conn, write_job_signature
+
+logger = logging.getLogger(__name__)
+
+# Keyset pagination walks these in (sort column, job_id) order; the source index serves the
+# common "one source, newest first" view.
+JOB_INDEXES = {
+    "idx_jobs_added": "added_at, job_id",
+    "idx_jobs_posted": "COALESCE(posted_at, ''), job_id",
+    "idx_jobs_company": "company, job_id",
+    "idx_jobs_title": "title, job_id",
+    "idx_jobs_source_added": "source, added_at, job_id",
+}
+_FTS_COLUMNS = "title, company, location, description"
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    # Returns False when existing rows need no backfill after all.
+    apply: Callable[[sqlite3.Cursor], Optional[bool]]
+    # backfill(conn, after, until, batch_size) rewrites up to ``batch_size`` rows with
+    # after < rowid <= until and returns the last rowid seen, or None when there is nothing left.
+    backfill: Optional[Callable[[sqlite3.Connection, int, int, int], Optional[int]]] = None
+
+
+def _baseline(cur: sqlite3.Cursor) -> None:
+    """Tables and indexes as of the first versioned schema (formerly ``init_db``)."""
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS resumes (
+            resume_id TEXT PRIMARY KEY,
+            filename TEXT,
+            added_at TEXT
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            title TEXT,
+            company TEXT,
+            location TEXT,
+            url TEXT UNIQUE,
+            source TEXT,
+            posted_at TEXT,
+            description TEXT,
+            added_at TEXT
+        )
+        """
+    )
+    for name, columns in JOB_INDEXES.items():
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON jobs({columns})")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_runs (
+            run_id TEXT PRIMARY KEY,
+            query TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            added_count INTEGER,
+            source_summary TEXT
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS match_runs (
+            run_id TEXT PRIMARY KEY,
+            resume_id TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            top_k INTEGER,
+            notes TEXT
+        )
+        """
+    )
+    _ensure_column(cur, "match_runs", "rerank_status", "TEXT")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS match_results (
+            run_id TEXT,
+            job_id TEXT,
+            position INTEGER,
+            job_json TEXT,
+            match_json TEXT,
+            updated_at TEXT,
+            PRIMARY KEY (run_id, job_id)
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS run_spans (
+            run_id TEXT,
+            kind TEXT,
+            span_id INTEGER,
+            parent_id INTEGER,
+            name TEXT,
+            started_at REAL,
+            duration_ms REAL,
+            count INTEGER,
+            attrs TEXT,
+            PRIMARY KEY (run_id, span_id)
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_run_spans_kind_started ON run_spans(kind, started_at)")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_calls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts REAL,
+            run_id TEXT,
+            run_kind TEXT,
+            provider TEXT,
+            model TEXT,
+            endpoint TEXT,
+            operation TEXT,
+            prompt_tokens INTEGER,
+            cached_prompt_tokens INTEGER,
+            completion_tokens INTEGER,
+            queue_ms REAL,
+            load_ms REAL,
+            prompt_eval_ms REAL,
+            eval_ms REAL,
+            total_ms REAL,
+            gen_tokens_per_s REAL
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_run ON llm_calls(run_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_ts ON llm_calls(ts)")
+
+
+def _add_jobs_fts(cur: sqlite3.Cursor) -> Optional[bool]:
+    """Full-text index over the job text columns, kept in sync with ``jobs`` by triggers.
+
+    It is an external-content table keyed on ``jobs.rowid``; ``VACUUM`` may renumber those rowids,
+    so rebuild it (``INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild')``) after vacuuming. Databases
+    that already have the index (created before versioning) only get the narrower update trigger.
+    """
+
+    exists = cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'").fetchone()
+    if exists:
+        cur.execute("DROP TRIGGER IF EXISTS jobs_fts_au")
+        _create_fts_update_trigger(cur)
+        return False
+    cur.execute(
+        f"CREATE VIRTUAL TABLE jobs_fts USING fts5({_FTS_COLUMNS}, content='jobs', content_rowid='rowid')"
+    )
+    new_values = ", ".join(f"new.{col}" for col in _FTS_COLUMNS.split(", "))
+    old_values = ", ".join(f"old.{col}" for col in _FTS_COLUMNS.split(", "))
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, {_FTS_COLUMNS}) VALUES (new.rowid, {new_values});
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.rowid, {old_values});
+        END
+        """
+    )
+    _create_fts_update_trigger(cur)
+    return None
+
+
+def _create_fts_update_trigger(cur: sqlite3.Cursor) -> None:
+    # Only text edits touch the index; updates of bookkeeping columns (backfills, vector_state) don't.
+    new_values = ", ".join(f"new.{col}" for col in _FTS_COLUMNS.split(", "))
+    old_values = ", ".join(f"old.{col}" for col in _FTS_COLUMNS.split(", "))
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF {_FTS_COLUMNS} ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.rowid, {old_values});
+            INSERT INTO jobs_fts(rowid, {_FTS_COLUMNS}) VALUES (new.rowid, {new_values});
+        END
+        """
+    )
+
+
+def _backfill_jobs_fts(conn: sqlite3.Connection, after: int, until: int, batch_size: int) -> Optional[int]:
+    rows = conn.execute(
+        f"SELECT rowid, {_FTS_COLUMNS} FROM jobs WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?",
+        (after, until, batch_size),
+    ).fetchall()
+    if not rows:
+        return None
+    conn.executemany(f"INSERT INTO jobs_fts(rowid, {_FTS_COLUMNS}) VALUES (?, ?, ?, ?, ?)", rows)
+    return rows[-1][0]
+
+
+def _ensure_column(cur: sqlite3.Cursor, table: str, column: str, decl: str) -> None:
+    """Add ``column`` to an existing table created before the column was introduced."""
+
+    existing = {row[1] for row in cur.execute(f"PRAGMA table_info({table})")}
+    if column not in existing:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _add_posted_ts(cur: sqlite3.Cursor) -> None:
+    _ensure_column(cur, "jobs", "posted_ts", "REAL")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_posted_ts ON jobs(posted_ts, job_id)")
+
+
+def _backfill_posted_ts(conn: sqlite3.Connection, after: int, until: int, batch_size: int) -> Optional[int]:
+    rows = conn.execute(
+        "SELECT rowid, posted_at FROM jobs WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?", (after, until, batch_size)
+    ).fetchall()
+    if not rows:
+        return None
+    updates = [(posted_epoch(posted_at), rowid) for rowid, posted_at in rows if posted_at]
+    conn.executemany("UPDATE jobs SET posted_ts = ? WHERE rowid = ? AND posted_ts IS NULL", updates)
+    return rows[-1][0]
+
+
+def _add_content_hash(cur: sqlite3.Cursor) -> None:
+    _ensure_column(cur, "jobs", "content_hash", "TEXT")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_content_hash ON jobs(content_hash)")
+
+
+def _backfill_content_hash(conn: sqlite3.Connection, after: int, until: int, batch_size: int) -> Optional[int]:
+    rows = conn.execute(
+        "SELECT rowid, title, company, location, description FROM jobs WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?",
+        (after, until, batch_size),
+    ).fetchall()
+    if not rows:
+        return None
+    conn.executemany(
+        "UPDATE jobs SET content_hash = ? WHERE rowid = ? AND content_hash IS NULL",
+        [(content_hash(title or "", company or "", location or "", description or ""), rowid) for rowid, title, company, location, description in rows],
+    )
+    return rows[-1][0]
+
+
+def _add_vector_state(cur: sqlite3.Cursor) -> None:
+    # NULL = unknown (rows from before this column); "stored" / "failed" are set by job search.
+    _ensure_column(cur, "jobs", "vector_state", "TEXT")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_vector_state ON jobs(vector_state)")
+
+
+def _add_tasks(cur: sqlite3.Cursor) -> None:
+    """Persistent background task queue (see ``src/tasks.py``)."""
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id TEXT PRIMARY KEY,
+            kind TEXT,
+            params TEXT,
+            status TEXT,
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            created_at TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            worker TEXT,
+            heartbeat_at REAL,
+            attempts INTEGER DEFAULT 0
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_kind_created ON tasks(kind, created_at)")
+
+
+def _add_refresh_schedule(cur: sqlite3.Cursor) -> None:
+    """Saved queries and per (source, board, query) refresh state for ``src/refresh.py``."""
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS saved_queries (
+            query TEXT PRIMARY KEY,
+            limit_per_source INTEGER,
+            enabled INTEGER DEFAULT 1,
+            created_at TEXT
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS refresh_targets (
+            source TEXT,
+            board TEXT,
+            query TEXT,
+            interval_s REAL,
+            next_due_at REAL,
+            last_run_at REAL,
+            last_seen_at REAL,
+            last_changed_at REAL,
+            fingerprint TEXT,
+            unchanged_runs INTEGER DEFAULT 0,
+            failures INTEGER DEFAULT 0,
+            last_error TEXT,
+            last_count INTEGER,
+            PRIMARY KEY (source, board, query)
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_refresh_targets_due ON refresh_targets(next_due_at)")
+
+
+def _add_job_expiry(cur: sqlite3.Cursor) -> None:
+    """Last-seen tracking and tombstones for job expiry (see ``src/maintenance.py``)."""
+
+    _ensure_column(cur, "jobs", "last_seen_at", "REAL")
+    _ensure_column(cur, "jobs", "removed_at", "REAL")
+    _ensure_column(cur, "jobs", "removed_reason", "TEXT")
+    # Partial indexes: expiry sweeps only ever look at live jobs, tombstone purges only at removed ones.
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_live_last_seen ON jobs(last_seen_at) WHERE removed_at IS NULL")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_removed ON jobs(removed_at) WHERE removed_at IS NOT NULL")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS maintenance_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            operation TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            details TEXT
+        )
+        """
+    )
+
+
+def _backfill_last_seen(conn: sqlite3.Connection, after: int, until: int, batch_size: int) -> Optional[int]:
+    # Rows from before tracking count as last seen when they were added.
+    rows = conn.execute(
+        "SELECT rowid FROM jobs WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?", (after, until, batch_size)
+    ).fetchall()
+    if not rows:
+        return None
+    conn.execute(
+        """
+        UPDATE jobs SET last_seen_at = COALESCE((julianday(added_at) - 2440587.5) * 86400.0, strftime('%s', 'now'))
+        WHERE rowid > ? AND rowid <= ? AND last_seen_at IS NULL
+        """,
+        (after, rows[-1][0]),
+    )
+    return rows[-1][0]
+
+
+def _add_near_duplicates(cur: sqlite3.Cursor) -> None:
+    """MinHash signatures, their LSH buckets and alternate URLs of collapsed reposts
+    (see ``SignatureIndex.find`` in ``src/storage/sqlite.py``)."""
+
+    cur.execute("CREATE TABLE IF NOT EXISTS job_minhash (job_id TEXT PRIMARY KEY, title_key TEXT, signature BLOB)")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_lsh (
+            band INTEGER,
+            bucket INTEGER,
+            job_id TEXT,
+            PRIMARY KEY (band, bucket, job_id)
+        ) WITHOUT ROWID
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_job_lsh_job ON job_lsh(job_id)")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_alternates (
+            url TEXT PRIMARY KEY,
+            job_id TEXT,
+            canonical_id TEXT,
+            source TEXT,
+            similarity REAL,
+            first_seen_at REAL,
+            last_seen_at REAL
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_job_alternates_canonical ON job_alternates(canonical_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_job_alternates_job ON job_alternates(job_id)")
+
+
+def _backfill_minhash(conn: sqlite3.Connection, after: int, until: int, batch_size: int) -> Optional[int]:
+    # Indexes existing live jobs so new postings match them; duplicates already stored stay as they are.
+    rows = conn.execute(
+        """
+        SELECT rowid, job_id, title, company, description, removed_at FROM jobs
+        WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?
+        """,
+        (after, until, batch_size),
+    ).fetchall()
+    if not rows:
+        return None
+    for _rowid, job_id, title, company, description, removed_at in rows:
+        if removed_at is None:
+            job = Job(job_id=job_id, title=title or "", company=company or "", url="", source="", description=description or "")
+            write_job_signature(conn, job_id, title_key(job.title), job_signature(job))
+    return rows[-1][0]
+
+
+def _add_resume_hashes(cur: sqlite3.Cursor) -> None:
+    """Resumes keyed by file content (see ``ResumeIngestAgent``): the SHA-256 of the uploaded
+    file, the chunking and embedding model its vectors were built with, and a parsed-text cache.
+    Resumes ingested before this have no hash and are left as they are."""
+
+    _ensure_column(cur, "resumes", "file_hash", "TEXT")
+    _ensure_column(cur, "resumes", "chunking", "TEXT")
+    _ensure_column(cur, "resumes", "embed_model", "TEXT")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_resumes_file_hash ON resumes(file_hash) WHERE file_hash IS NOT NULL")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS resume_texts (
+            file_hash TEXT PRIMARY KEY,
+            parser TEXT,
+            text TEXT,
+            parsed_at REAL
+        )
+        """
+    )
+
+
+def _add_vector_collections(cur: sqlite3.Cursor) -> None:
+    """Chroma collections per embedding model (see ``src/vector_collections.py``): one ``active``
+    collection per kind serves reads and writes, a ``building`` one is filled by a re-embed
+    (``copied`` is its resume cursor), and ``retired`` ones are kept until dropped. Collections
+    that predate this are registered on first use."""
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vector_collections (
+            name TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            embed_model TEXT NOT NULL,
+            dim INTEGER,
+            status TEXT NOT NULL,
+            copied INTEGER NOT NULL DEFAULT 0,
+            total INTEGER,
+            created_at TEXT NOT NULL,
+            activated_at TEXT,
+            error TEXT
+        )
+        """
+    )
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_vector_collections_active ON vector_collections(kind) WHERE status = 'active'")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_vector_collections_building ON vector_collections(kind) WHERE status = 'building'")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "jobs_fts", _add_jobs_fts, _backfill_jobs_fts),
+    Migration(3, "jobs_posted_ts", _add_posted_ts, _backfill_posted_ts),
+    Migration(4, "jobs_content_hash", _add_content_hash, _backfill_content_hash),
+    Migration(5, "jobs_vector_state", _add_vector_state),
+    Migration(6, "tasks", _add_tasks),
+    Migration(7, "refresh_schedule", _add_refresh_schedule),
+    Migration(8, "job_expiry", _add_job_expiry, _backfill_last_seen),
+    Migration(9, "near_duplicates", _add_near_duplicates, _backfill_minhash),
+    Migration(10, "resume_hashes", _add_resume_hashes),
+    Migration(11, "vector_collections", _add_vector_collections),
+]
+
+
+def _ensure_version_table(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TEXT,
+            backfill_cursor INTEGER,
+            backfill_until INTEGER,
+            backfilled_at TEXT
+        )
+        """
+    )
+
+
+def current_version(conn: Optional[sqlite3.Connection] = None) -> int:
+    owned = conn is None
+    conn = conn or get_conn()
+    try:
+        _ensure_version_table(conn.cursor())
+        return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+    finally:
+        if owned:
+            conn.close()
+
+
+def migrate(target: Optional[int] = None) -> List[int]:
+    """Apply pending schema migrations up to ``target`` (default: latest); returns the versions applied."""
+
+    conn = get_conn()
+    try:
+        # WAL lets the dashboard keep reading while backfill batches write.
+        conn.execute("PRAGMA journal_mode=WAL")
+        cur = conn.cursor()
+        _ensure_version_table(cur)
+        conn.commit()
+        version = current_version(conn)
+        applied = []
+        for migration in MIGRATIONS:
+            if migration.version <= version or (target is not None and migration.version > target):
+                continue
+            # One transaction per step, so the backfill bound below can't miss or double-count rows
+            # written concurrently.
+            cur.execute("BEGIN IMMEDIATE")
+            needs_backfill = migration.apply(cur) is not False and migration.backfill is not None
+            until = cur.execute("SELECT COALESCE(MAX(rowid), 0) FROM jobs").fetchone()[0] if needs_backfill else 0
+            now = datetime.utcnow().isoformat()
+            cur.execute(
+                """
+                INSERT OR IGNORE INTO schema_version(version, name, applied_at, backfill_cursor, backfill_until, backfilled_at)
+                VALUES (?, ?, ?, 0, ?, ?)
+                """,
+                (migration.version, migration.name, now, until, None if needs_backfill else now),
+            )
+            conn.commit()
+            applied.append(migration.version)
+            logger.info("Applied schema migration %s (%s)", migration.version, migration.name)
+        return applied
+    finally:
+        conn.close()
+
+
+def run_backfills(batch_size: Optional[int] = None, pause_s: Optional[float] = None) -> Dict[int, int]:
+    """Finish the row backfills of applied migrations, one short transaction per batch.
+
+    Safe to interrupt and re-run (progress is kept in ``schema_version.backfill_cursor``) and to
+    run from several processes at once. Returns the number of batches run per migration.
+    """
+
+    batch_size = batch_size or config.MIGRATION_BATCH_SIZE
+    pause_s = config.MIGRATION_BATCH_PAUSE_S if pause_s is None else pause_s
+    by_version = {m.version: m for m in MIGRATIONS}
+    conn = get_conn()
+    batches: Dict[int, int] = {}
+    try:
+        pending = conn.execute(
+            "SELECT version, backfill_cursor, backfill_until FROM schema_version WHERE backfilled_at IS NULL ORDER BY version"
+        ).fetchall()
+        for version, cursor, until in pending:
+            migration = by_version.get(version)
+            if migration is None or migration.backfill is None:
+                continue
+            cursor = cursor or 0
+            batches[version] = 0
+            while True:
+                last = migration.backfill(conn, cursor, until or 0, batch_size)
+                if last is None:
+                    conn.execute(
+                        "UPDATE schema_version SET backfilled_at = ? WHERE version = ?",
+                        (datetime.utcnow().isoformat(), version),
+                    )
+                    conn.commit()
+                    break
+                cursor = last
+                conn.execute("UPDATE schema_version SET backfill_cursor = ? WHERE version = ?", (cursor, version))
+                conn.commit()
+                batches[version] += 1
+                if pause_s:
+                    time.sleep(pause_s)
+            logger.info("Backfill for schema migration %s (%s) finished after %s batches", version, migration.name, batches[version])
+        return batches
+    finally:
+        conn.close()
+
+
+def migration_status() -> List[Dict[str, object]]:
+    """Every known migration with when it was applied and whether its backfill is done."""
+
+    conn = get_conn()
+    try:
+        _ensure_version_table(conn.cursor())
+        rows = {row["version"]: row for row in conn.execute("SELECT * FROM schema_version")}
+    finally:
+        conn.close()
+    out = []
+    for migration in MIGRATIONS:
+        row = rows.get(migration.version)
+        out.append(
+            {
+                "version": migration.version,
+                "name": migration.name,
+                "applied_at": row["applied_at"] if row else None,
+                "backfilled_at": row["backfilled_at"] if row else None,
+                "backfill_cursor": row["backfill_cursor"] if row else None,
+            }
+        )
+    return out
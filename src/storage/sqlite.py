@@ -1,10 +1,22 @@
+import json
 import os
 import sqlite3
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..models import Job
+from ..tools.dedupe import content_hash, lsh_buckets, signature_from_bytes, signature_similarity
+from ..tools.parsing import posted_epoch
 from .. import config
 
+# Job browser sort keys; each has an (expression, job_id) index created by ``migrations.py``.
+JOB_SORTS = {
+    "added_at": "added_at",
+    "posted_at": "COALESCE(posted_at, '')",
+    "company": "company",
+    "title": "title",
+}
+
 
 def get_conn() -> sqlite3.Connection:
     os.makedirs(os.path.dirname(config.SQLITE_PATH), exist_ok=True)
@@ -13,66 +25,65 @@ def get_conn() -> sqlite3.Connection:
     return conn
 
 
-def init_db() -> None:
+def init_db(backfill: bool = True) -> None:
+    """Create or upgrade the schema (see ``migrations.py``); ``backfill=False`` leaves the batched
+    data backfills for ``run_backfills`` to finish in the background."""
+
+    from .migrations import migrate, run_backfills
+
+    migrate()
+    if backfill:
+        run_backfills()
+
+
+def insert_resume(
+    resume_id: str,
+    filename: str,
+    added_at: str,
+    file_hash: Optional[str] = None,
+    chunking: Optional[str] = None,
+    embed_model: Optional[str] = None,
+) -> None:
+    """Record a resume; re-ingesting one keeps its name and date and updates what its vectors
+    were built with."""
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS resumes (
-            resume_id TEXT PRIMARY KEY,
-            filename TEXT,
-            added_at TEXT
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS jobs (
-            job_id TEXT PRIMARY KEY,
-            title TEXT,
-            company TEXT,
-            location TEXT,
-            url TEXT UNIQUE,
-            source TEXT,
-            posted_at TEXT,
-            description TEXT,
-            added_at TEXT
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS job_runs (
-            run_id TEXT PRIMARY KEY,
-            query TEXT,
-            started_at TEXT,
-            finished_at TEXT,
-            added_count INTEGER,
-            source_summary TEXT
-        )
-        """
-    )
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS match_runs (
-            run_id TEXT PRIMARY KEY,
-            resume_id TEXT,
-            started_at TEXT,
-            finished_at TEXT,
-            top_k INTEGER,
-            notes TEXT
-        )
+    conn.execute(
         """
+        INSERT INTO resumes(resume_id, filename, added_at, file_hash, chunking, embed_model) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(resume_id) DO UPDATE SET
+            file_hash = COALESCE(excluded.file_hash, file_hash),
+            chunking = excluded.chunking,
+            embed_model = excluded.embed_model
+        """,
+        (resume_id, filename, added_at, file_hash, chunking, embed_model),
     )
     conn.commit()
     conn.close()
 
 
-def insert_resume(resume_id: str, filename: str, added_at: str) -> None:
+def get_resume_by_hash(file_hash: str) -> Optional[sqlite3.Row]:
+    conn = get_conn()
+    row = conn.execute(
+        "SELECT resume_id, filename, added_at, file_hash, chunking, embed_model FROM resumes WHERE file_hash = ?",
+        (file_hash,),
+    ).fetchone()
+    conn.close()
+    return row
+
+
+def get_parsed_text(file_hash: str, parser: str) -> Optional[str]:
+    """Text cached for a file by ``cache_parsed_text``, if it was extracted by the same parser."""
+    conn = get_conn()
+    row = conn.execute("SELECT text FROM resume_texts WHERE file_hash = ? AND parser = ?", (file_hash, parser)).fetchone()
+    conn.close()
+    return row["text"] if row else None
+
+
+def cache_parsed_text(file_hash: str, parser: str, text: str) -> None:
     conn = get_conn()
     conn.execute(
-        "INSERT OR IGNORE INTO resumes(resume_id, filename, added_at) VALUES (?, ?, ?)",
-        (resume_id, filename, added_at),
+        "INSERT OR REPLACE INTO resume_texts(file_hash, parser, text, parsed_at) VALUES (?, ?, ?, ?)",
+        (file_hash, parser, text, time.time()),
     )
     conn.commit()
     conn.close()
@@ -86,12 +97,22 @@ def list_resumes() -> List[sqlite3.Row]:
     return rows
 
 
-def insert_job(job: Job) -> None:
+def count_resumes() -> int:
+    conn = get_conn()
+    count = conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+    conn.close()
+    return count
+
+
+def insert_job(job: Job, vector_state: Optional[str] = None) -> None:
     conn = get_conn()
     conn.execute(
         """
-        INSERT OR IGNORE INTO jobs(job_id, title, company, location, url, source, posted_at, description, added_at)
-        VALUES(?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+        INSERT OR IGNORE INTO jobs(
+            job_id, title, company, location, url, source, posted_at, description, added_at, posted_ts, content_hash,
+            last_seen_at, vector_state
+        )
+        VALUES(?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), ?, ?, ?, ?)
         """,
         (
             job.job_id,
@@ -102,20 +123,65 @@ def insert_job(job: Job) -> None:
             job.source,
             job.posted_at,
             job.description,
+            posted_epoch(job.posted_at),
+            content_hash(job.title, job.company, job.location or "", job.description),
+            time.time(),
+            vector_state,
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def update_job_content(job: Job, vector_state: Optional[str] = None) -> None:
+    """Overwrite the text of a stored posting that changed at its source."""
+    conn = get_conn()
+    conn.execute(
+        """
+        UPDATE jobs SET title = ?, company = ?, location = ?, posted_at = ?, description = ?, posted_ts = ?, content_hash = ?,
+            vector_state = COALESCE(?, vector_state)
+        WHERE job_id = ?
+        """,
+        (
+            job.title,
+            job.company,
+            job.location,
+            job.posted_at,
+            job.description,
+            posted_epoch(job.posted_at),
+            content_hash(job.title, job.company, job.location or "", job.description),
+            vector_state,
+            job.job_id,
         ),
     )
     conn.commit()
     conn.close()
 
 
+def get_job_states(job_ids: List[str]) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """``{job_id: (content_hash, vector_state)}`` for the stored jobs among ``job_ids``."""
+    if not job_ids:
+        return {}
+    conn = get_conn()
+    states = {}
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start : start + 500]
+        rows = conn.execute(
+            f"SELECT job_id, content_hash, vector_state FROM jobs WHERE job_id IN ({', '.join('?' * len(chunk))})", chunk
+        ).fetchall()
+        states.update({row["job_id"]: (row["content_hash"], row["vector_state"]) for row in rows})
+    conn.close()
+    return states
+
+
 def list_jobs(limit: int = 200, filters: Optional[Dict[str, Any]] = None) -> List[sqlite3.Row]:
     filters = filters or {}
-    clauses: List[str] = []
+    clauses: List[str] = ["removed_at IS NULL"]
     values: List[Any] = []
     if "source" in filters:
         clauses.append("source = ?")
         values.append(filters["source"])
-    where_clause = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    where_clause = f"WHERE {' AND '.join(clauses)}"
     conn = get_conn()
     query = f"SELECT job_id, title, company, location, url, source, posted_at, added_at FROM jobs {where_clause} ORDER BY added_at DESC LIMIT ?"
     values.append(limit)
@@ -125,6 +191,354 @@ def list_jobs(limit: int = 200, filters: Optional[Dict[str, Any]] = None) -> Lis
     return rows
 
 
+def count_jobs(filters: Optional[Dict[str, Any]] = None) -> int:
+    """Live (not expired) jobs matching ``filters``."""
+    where_clause, values = _job_filters(filters or {})
+    conn = get_conn()
+    count = conn.execute(f"SELECT COUNT(*) FROM jobs {where_clause}", values).fetchone()[0]
+    conn.close()
+    return count
+
+
+def _fts_terms(text: str, column: Optional[str] = None) -> List[str]:
+    """Each word as a quoted prefix term, so user input can't inject FTS syntax."""
+
+    prefix = f"{column} : " if column else ""
+    return [prefix + '"' + word.replace('"', '""') + '"*' for word in text.split()]
+
+
+def _job_filters(filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """WHERE clause for the job browser: ``source``/``company`` (exact), ``posted_from``/``posted_to``
+    (ISO dates, ``posted_to`` exclusive), ``location`` and ``text`` (full-text, prefix match).
+    Expired (tombstoned) jobs are always left out."""
+
+    clauses: List[str] = ["removed_at IS NULL"]
+    values: List[Any] = []
+    for column in ("source", "company"):
+        if filters.get(column):
+            clauses.append(f"{column} = ?")
+            values.append(filters[column])
+    if filters.get("posted_from"):
+        clauses.append("posted_ts >= ?")
+        values.append(posted_epoch(filters["posted_from"]))
+    if filters.get("posted_to"):
+        clauses.append("posted_ts < ?")
+        values.append(posted_epoch(filters["posted_to"]))
+    terms = _fts_terms(filters.get("text") or "") + _fts_terms(filters.get("location") or "", "location")
+    if terms:
+        clauses.append("rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+        values.append(" AND ".join(terms))
+    return f"WHERE {' AND '.join(clauses)}", values
+
+
+def browse_jobs(
+    filters: Optional[Dict[str, Any]] = None,
+    sort: str = "added_at",
+    descending: bool = True,
+    after: Optional[Tuple[Any, str]] = None,
+    page_size: int = 50,
+) -> Tuple[List[sqlite3.Row], Optional[Tuple[Any, str]]]:
+    """One page of jobs using keyset pagination.
+
+    ``after`` is the cursor returned with the previous page (its last ``(sort value, job_id)``);
+    the next cursor is ``None`` on the last page. Only the listed columns are read, never the
+    description.
+    """
+
+    if sort not in JOB_SORTS:
+        raise ValueError(f"Unknown sort {sort!r}; expected one of {sorted(JOB_SORTS)}")
+    expr = JOB_SORTS[sort]
+    where_clause, values = _job_filters(filters or {})
+    if after is not None:
+        # Spelled out rather than as a row value so SQLite can seek the expression index too.
+        op = "<" if descending else ">"
+        keyset = f"{expr} {op}= ? AND ({expr} {op} ? OR job_id {op} ?)"
+        where_clause = f"{where_clause} AND {keyset}"
+        values.extend([after[0], after[0], after[1]])
+    direction = "DESC" if descending else "ASC"
+    conn = get_conn()
+    rows = conn.execute(
+        f"""
+        SELECT job_id, title, company, location, url, source, posted_at, added_at, {expr} AS sort_key
+        FROM jobs {where_clause}
+        ORDER BY {expr} {direction}, job_id {direction}
+        LIMIT ?
+        """,
+        [*values, page_size + 1],
+    ).fetchall()
+    conn.close()
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, (rows[-1]["sort_key"], rows[-1]["job_id"])
+
+
+def job_facets() -> Dict[str, List[str]]:
+    """Distinct sources and companies for the browser's filter widgets (both index-only scans)."""
+
+    conn = get_conn()
+    sources = [row[0] for row in conn.execute("SELECT DISTINCT source FROM jobs WHERE source IS NOT NULL ORDER BY source")]
+    companies = [row[0] for row in conn.execute("SELECT DISTINCT company FROM jobs WHERE company IS NOT NULL ORDER BY company")]
+    conn.close()
+    return {"sources": sources, "companies": companies}
+
+
+def set_vector_states(job_ids: List[str], state: str) -> None:
+    """Record whether each job's embedding made it into the vector store (``pending`` until its
+    batch is written, then ``stored``/``failed``)."""
+    if not job_ids:
+        return
+    conn = get_conn()
+    conn.executemany("UPDATE jobs SET vector_state = ? WHERE job_id = ?", [(state, job_id) for job_id in job_ids])
+    conn.commit()
+    conn.close()
+
+
+def mark_jobs_seen(job_ids: List[str], now: float, revive: bool = True) -> None:
+    """Record that these postings are still listed; expired ones come back to life unless ``revive``
+    is False (their text and vectors are gone, so only a re-stored posting may revive a job)."""
+    if not job_ids:
+        return
+    conn = get_conn()
+    if revive:
+        sql = "UPDATE jobs SET last_seen_at = ?, removed_at = NULL, removed_reason = NULL WHERE job_id = ?"
+    else:
+        sql = "UPDATE jobs SET last_seen_at = ? WHERE job_id = ? AND removed_at IS NULL"
+    conn.executemany(sql, [(now, job_id) for job_id in job_ids])
+    conn.commit()
+    conn.close()
+
+
+def expiry_candidates(missing_before: Optional[float], posted_before: Optional[float], limit: int) -> List[Tuple[str, str]]:
+    """Up to ``limit`` live jobs as ``(job_id, reason)``: ``missing`` when not seen since
+    ``missing_before``, ``ttl`` when posted (or, without a post date, added) before ``posted_before``."""
+
+    conn = get_conn()
+    found: Dict[str, str] = {}
+    if missing_before is not None:
+        rows = conn.execute(
+            "SELECT job_id FROM jobs WHERE removed_at IS NULL AND last_seen_at < ? LIMIT ?", (missing_before, limit)
+        ).fetchall()
+        found.update((row[0], "missing") for row in rows)
+    if posted_before is not None and len(found) < limit:
+        added_before = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(posted_before))
+        rows = conn.execute(
+            """
+            SELECT job_id FROM jobs WHERE removed_at IS NULL AND posted_ts < ?
+            UNION ALL
+            SELECT job_id FROM jobs WHERE removed_at IS NULL AND posted_ts IS NULL AND added_at < ?
+            LIMIT ?
+            """,
+            (posted_before, added_before, limit),
+        ).fetchall()
+        for row in rows:
+            if len(found) >= limit:
+                break
+            found.setdefault(row[0], "ttl")
+    conn.close()
+    return list(found.items())
+
+
+def tombstone_jobs(jobs: List[Tuple[str, str]], now: float) -> None:
+    """Mark ``(job_id, reason)`` jobs removed and queue their vectors for deletion. The row keeps its
+    ids and content hash (so a reappearing posting is recognized) but drops the description."""
+    conn = get_conn()
+    conn.executemany(
+        """
+        UPDATE jobs SET removed_at = ?, removed_reason = ?, vector_state = 'delete_pending', description = ''
+        WHERE job_id = ? AND removed_at IS NULL
+        """,
+        [(now, reason, job_id) for job_id, reason in jobs],
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_jobs(job_ids: List[str]) -> List[Job]:
+    """Stored postings among ``job_ids`` (their ``content_hash`` is not part of ``Job``; see ``get_job_states``)."""
+    jobs: List[Job] = []
+    conn = get_conn()
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start : start + 500]
+        rows = conn.execute(
+            f"""
+            SELECT job_id, title, company, location, url, source, posted_at, description FROM jobs
+            WHERE job_id IN ({', '.join('?' * len(chunk))})
+            """,
+            chunk,
+        ).fetchall()
+        jobs.extend(
+            Job(**{key: value if key in ("location", "posted_at") else value or "" for key, value in dict(row).items()}) for row in rows
+        )
+    conn.close()
+    return jobs
+
+
+def jobs_with_vector_state(state: str, limit: int) -> List[str]:
+    conn = get_conn()
+    rows = conn.execute("SELECT job_id FROM jobs WHERE vector_state = ? LIMIT ?", (state, limit)).fetchall()
+    conn.close()
+    return [row[0] for row in rows]
+
+
+def purge_tombstones(removed_before: float, limit: int) -> int:
+    """Delete up to ``limit`` tombstones removed before ``removed_before``; returns how many."""
+
+    conn = get_conn()
+    ids = [
+        row[0]
+        for row in conn.execute(
+            "SELECT job_id FROM jobs WHERE removed_at IS NOT NULL AND removed_at < ? AND vector_state = 'removed' LIMIT ?",
+            (removed_before, limit),
+        )
+    ]
+    placeholders = ", ".join("?" * len(ids))
+    if ids:
+        conn.execute(f"DELETE FROM job_lsh WHERE job_id IN ({placeholders})", ids)
+        conn.execute(f"DELETE FROM job_minhash WHERE job_id IN ({placeholders})", ids)
+        conn.execute(f"DELETE FROM job_alternates WHERE canonical_id IN ({placeholders})", ids)
+        conn.execute(f"DELETE FROM jobs WHERE job_id IN ({placeholders})", ids)
+    conn.commit()
+    conn.close()
+    return len(ids)
+
+
+def write_job_signature(conn: sqlite3.Connection, job_id: str, key: str, signature) -> None:
+    """Store a job's MinHash signature and LSH buckets on ``conn``, replacing earlier ones."""
+    conn.execute("DELETE FROM job_lsh WHERE job_id = ?", (job_id,))
+    conn.execute("INSERT OR REPLACE INTO job_minhash(job_id, title_key, signature) VALUES (?, ?, ?)", (job_id, key, signature.tobytes()))
+    conn.executemany(
+        "INSERT OR IGNORE INTO job_lsh(band, bucket, job_id) VALUES (?, ?, ?)",
+        [(band, bucket, job_id) for band, bucket in enumerate(lsh_buckets(signature))],
+    )
+
+
+class SignatureIndex:
+    """Near-duplicate lookups against the stored MinHash signatures, on one connection for a batch
+    of postings (a fresh connection would re-read the schema and start with a cold page cache)."""
+
+    def __enter__(self) -> "SignatureIndex":
+        self.conn = get_conn()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.conn.close()
+
+    def find(self, signature, key: str, threshold: float) -> Optional[Tuple[str, float]]:
+        """The live job most similar to ``signature`` with the same title key, as ``(job_id,
+        similarity)``, if its estimated similarity reaches ``threshold``. Candidates come from one
+        primary-key seek per LSH band, however many jobs are stored."""
+
+        buckets = [value for pair in enumerate(lsh_buckets(signature)) for value in pair]
+        per_band = "SELECT job_id FROM job_lsh WHERE band = ? AND bucket = ?"
+        rows = self.conn.execute(
+            f"""
+            SELECT m.job_id, m.signature FROM job_minhash m JOIN jobs j ON j.job_id = m.job_id
+            WHERE m.job_id IN ({' UNION '.join([per_band] * (len(buckets) // 2))})
+            AND m.title_key = ? AND j.removed_at IS NULL
+            """,
+            buckets + [key],
+        ).fetchall()
+        best: Optional[Tuple[str, float]] = None
+        for job_id, blob in rows:
+            similarity = signature_similarity(signature, signature_from_bytes(blob))
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (job_id, similarity)
+        return best
+
+    def add(self, job_id: str, key: str, signature) -> None:
+        """Make a stored job a near-duplicate candidate (and no longer anyone's alternate)."""
+        write_job_signature(self.conn, job_id, key, signature)
+        self.conn.execute("DELETE FROM job_alternates WHERE job_id = ?", (job_id,))
+        self.conn.commit()
+
+
+def alternate_canonicals(job_ids: List[str]) -> Dict[str, str]:
+    """``{job_id: canonical_id}`` for postings already collapsed into a live job."""
+    if not job_ids:
+        return {}
+    conn = get_conn()
+    found = {}
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start : start + 500]
+        rows = conn.execute(
+            f"""
+            SELECT a.job_id, a.canonical_id FROM job_alternates a JOIN jobs j ON j.job_id = a.canonical_id
+            WHERE a.job_id IN ({', '.join('?' * len(chunk))}) AND j.removed_at IS NULL
+            """,
+            chunk,
+        ).fetchall()
+        found.update({row[0]: row[1] for row in rows})
+    conn.close()
+    return found
+
+
+def record_job_alternates(alternates: List[Tuple[str, str, str, str, float]], now: float) -> None:
+    """Upsert ``(url, job_id, canonical_id, source, similarity)`` alternates of canonical jobs."""
+    if not alternates:
+        return
+    conn = get_conn()
+    conn.executemany(
+        """
+        INSERT INTO job_alternates(url, job_id, canonical_id, source, similarity, first_seen_at, last_seen_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            job_id = excluded.job_id, canonical_id = excluded.canonical_id, source = excluded.source,
+            similarity = COALESCE(excluded.similarity, similarity), last_seen_at = excluded.last_seen_at
+        """,
+        [(url, job_id, canonical_id, source, similarity, now, now) for url, job_id, canonical_id, source, similarity in alternates],
+    )
+    conn.commit()
+    conn.close()
+
+
+def alternate_urls(job_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Other listings of each canonical job: ``{job_id: [{"url", "source"}, ...]}``."""
+    if not job_ids:
+        return {}
+    conn = get_conn()
+    rows = conn.execute(
+        f"""
+        SELECT canonical_id, url, source FROM job_alternates WHERE canonical_id IN ({', '.join('?' * len(job_ids))})
+        ORDER BY first_seen_at
+        """,
+        list(job_ids),
+    ).fetchall()
+    conn.close()
+    found: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        found.setdefault(row[0], []).append({"url": row[1], "source": row[2]})
+    return found
+
+
+def job_storage_stats() -> Dict[str, int]:
+    conn = get_conn()
+    live = conn.execute("SELECT COUNT(*) FROM jobs WHERE removed_at IS NULL").fetchone()[0]
+    removed = conn.execute("SELECT COUNT(*) FROM jobs WHERE removed_at IS NOT NULL").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    conn.close()
+    return {"live_jobs": live, "tombstones": removed, "db_bytes": pages * page_size, "free_bytes": free * page_size}
+
+
+def log_maintenance(operation: str, started_at: str, finished_at: str, details: Dict[str, Any]) -> None:
+    conn = get_conn()
+    conn.execute(
+        "INSERT INTO maintenance_log(operation, started_at, finished_at, details) VALUES (?, ?, ?, ?)",
+        (operation, started_at, finished_at, json.dumps(details)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def list_maintenance(limit: int = 20) -> List[sqlite3.Row]:
+    conn = get_conn()
+    rows = conn.execute("SELECT * FROM maintenance_log ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    conn.close()
+    return rows
+
+
 def get_job(job_id: str) -> Optional[sqlite3.Row]:
     conn = get_conn()
     cur = conn.execute(
@@ -167,8 +581,14 @@ def log_match_run(
     conn = get_conn()
     conn.execute(
         """
-        INSERT OR REPLACE INTO match_runs(run_id, resume_id, started_at, finished_at, top_k, notes)
+        INSERT INTO match_runs(run_id, resume_id, started_at, finished_at, top_k, notes)
         VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(run_id) DO UPDATE SET
+            resume_id = excluded.resume_id,
+            started_at = excluded.started_at,
+            finished_at = excluded.finished_at,
+            top_k = excluded.top_k,
+            notes = excluded.notes
         """,
         (run_id, resume_id, started_at, finished_at, top_k, notes),
     )
@@ -176,11 +596,501 @@ def log_match_run(
     conn.close()
 
 
+def set_match_rerank_status(run_id: str, status: str) -> None:
+    """Record the LLM rerank state of a match run: pending, running, done, failed or skipped."""
+
+    conn = get_conn()
+    conn.execute(
+        "INSERT OR IGNORE INTO match_runs(run_id) VALUES (?)",
+        (run_id,),
+    )
+    conn.execute("UPDATE match_runs SET rerank_status = ? WHERE run_id = ?", (status, run_id))
+    conn.commit()
+    conn.close()
+
+
+def get_match_run(run_id: str) -> Optional[sqlite3.Row]:
+    conn = get_conn()
+    cur = conn.execute(
+        "SELECT run_id, resume_id, started_at, finished_at, top_k, notes, rerank_status FROM match_runs WHERE run_id = ?",
+        (run_id,),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+def save_match_results(run_id: str, jobs: List[Dict[str, Any]]) -> None:
+    """Persist the hybrid-ranked jobs of a run; LLM matches are filled in later."""
+
+    conn = get_conn()
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO match_results(run_id, job_id, position, job_json, match_json, updated_at)
+        VALUES (?, ?, ?, ?, ?, datetime('now'))
+        """,
+        [
+            (
+                run_id,
+                job["job_id"],
+                position,
+                json.dumps({k: v for k, v in job.items() if k != "match"}),
+                json.dumps(job["match"]) if job.get("match") else None,
+            )
+            for position, job in enumerate(jobs)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def update_match_scores(run_id: str, matches: Dict[str, Dict[str, Any]]) -> None:
+    conn = get_conn()
+    conn.executemany(
+        "UPDATE match_results SET match_json = ?, updated_at = datetime('now') WHERE run_id = ? AND job_id = ?",
+        [(json.dumps(match), run_id, job_id) for job_id, match in matches.items()],
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_match_results(run_id: str) -> List[Dict[str, Any]]:
+    """Jobs of a run in hybrid order, with ``match`` set for those the LLM has scored so far."""
+
+    conn = get_conn()
+    cur = conn.execute(
+        "SELECT job_json, match_json FROM match_results WHERE run_id = ? ORDER BY position",
+        (run_id,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    jobs = []
+    for row in rows:
+        job = json.loads(row["job_json"])
+        if row["match_json"]:
+            job["match"] = json.loads(row["match_json"])
+        jobs.append(job)
+    return jobs
+
+
+def insert_spans(rows: List[tuple]) -> None:
+    """Upsert spans as (run_id, kind, span_id, parent_id, name, started_at, duration_ms, count, attrs)."""
+
+    conn = get_conn()
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO run_spans(run_id, kind, span_id, parent_id, name, started_at, duration_ms, count, attrs)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_run_spans(run_id: str) -> List[sqlite3.Row]:
+    conn = get_conn()
+    cur = conn.execute(
+        "SELECT run_id, kind, span_id, parent_id, name, started_at, duration_ms, count, attrs FROM run_spans WHERE run_id = ? ORDER BY span_id",
+        (run_id,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def list_traced_runs(limit: int = 50) -> List[sqlite3.Row]:
+    """Most recent traced runs: run_id, kind, start time and root span duration."""
+
+    conn = get_conn()
+    cur = conn.execute(
+        """
+        SELECT run_id, kind, MIN(started_at) AS started_at,
+               SUM(CASE WHEN parent_id IS NULL THEN duration_ms ELSE 0 END) AS duration_ms
+        FROM run_spans GROUP BY run_id, kind ORDER BY started_at DESC LIMIT ?
+        """,
+        (limit,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def recent_stage_spans(kind: str, limit_runs: int = 50) -> List[sqlite3.Row]:
+    """Spans of the ``limit_runs`` most recent runs of ``kind`` (for percentile trends)."""
+
+    conn = get_conn()
+    cur = conn.execute(
+        """
+        SELECT run_id, kind, name, parent_id, duration_ms FROM run_spans
+        WHERE kind = ? AND run_id IN (
+            SELECT run_id FROM run_spans WHERE kind = ? GROUP BY run_id ORDER BY MIN(started_at) DESC LIMIT ?
+        )
+        """,
+        (kind, kind, limit_runs),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def insert_llm_calls(rows: List[tuple]) -> None:
+    conn = get_conn()
+    conn.executemany(
+        """
+        INSERT INTO llm_calls(
+            ts, run_id, run_kind, provider, model, endpoint, operation, prompt_tokens, cached_prompt_tokens,
+            completion_tokens, queue_ms, load_ms, prompt_eval_ms, eval_ms, total_ms, gen_tokens_per_s
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+_LLM_CALL_AGGREGATES = """
+    COUNT(*) AS calls,
+    SUM(prompt_tokens) AS prompt_tokens,
+    SUM(cached_prompt_tokens) AS cached_prompt_tokens,
+    SUM(completion_tokens) AS completion_tokens,
+    ROUND(AVG(queue_ms), 1) AS avg_queue_ms,
+    ROUND(SUM(load_ms), 1) AS load_ms,
+    ROUND(AVG(total_ms), 1) AS avg_total_ms,
+    ROUND(SUM(completion_tokens) * 1000.0 / NULLIF(SUM(CASE WHEN completion_tokens THEN eval_ms END), 0), 1)
+        AS gen_tokens_per_s
+"""
+
+
+def llm_usage_by_model(since_ts: float = 0.0) -> List[sqlite3.Row]:
+    """Token, queue, load and generation-rate aggregates per provider/model/operation."""
+
+    conn = get_conn()
+    cur = conn.execute(
+        f"""
+        SELECT provider, model, operation, {_LLM_CALL_AGGREGATES}
+        FROM llm_calls WHERE ts >= ? GROUP BY provider, model, operation ORDER BY calls DESC
+        """,
+        (since_ts,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def llm_usage_by_run(limit: int = 20) -> List[sqlite3.Row]:
+    conn = get_conn()
+    cur = conn.execute(
+        f"""
+        SELECT run_id, run_kind, model, operation, MIN(ts) AS started_ts, {_LLM_CALL_AGGREGATES}
+        FROM llm_calls WHERE run_id IS NOT NULL
+        GROUP BY run_id, run_kind, model, operation ORDER BY started_ts DESC LIMIT ?
+        """,
+        (limit,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def _task_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    task = dict(row)
+    for key in ("params", "progress", "result"):
+        task[key] = json.loads(task[key]) if task[key] else None
+    return task
+
+
+def insert_task(task_id: str, kind: str, params: Dict[str, Any], created_at: str) -> None:
+    conn = get_conn()
+    conn.execute(
+        "INSERT INTO tasks(task_id, kind, params, status, created_at, attempts) VALUES (?, ?, ?, 'queued', ?, 0)",
+        (task_id, kind, json.dumps(params), created_at),
+    )
+    conn.commit()
+    conn.close()
+
+
+def claim_task(worker: str, started_at: str, now: float) -> Optional[Dict[str, Any]]:
+    """Mark the oldest queued task as running for ``worker`` and return it (None if the queue is empty)."""
+
+    conn = get_conn()
+    try:
+        # Take the write lock before reading so two workers can't claim the same task.
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT task_id FROM tasks WHERE status = 'queued' ORDER BY created_at, rowid LIMIT 1"
+        ).fetchone()
+        if row is None:
+            conn.rollback()
+            return None
+        conn.execute(
+            """
+            UPDATE tasks SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1
+            WHERE task_id = ?
+            """,
+            (worker, started_at, now, row["task_id"]),
+        )
+        task = conn.execute("SELECT * FROM tasks WHERE task_id = ?", (row["task_id"],)).fetchone()
+        conn.commit()
+        return _task_dict(task)
+    finally:
+        conn.close()
+
+
+def set_task_progress(task_id: str, progress: Dict[str, Any], now: float) -> None:
+    conn = get_conn()
+    conn.execute(
+        "UPDATE tasks SET progress = ?, heartbeat_at = ? WHERE task_id = ? AND status = 'running'",
+        (json.dumps(progress), now, task_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+def touch_tasks(task_ids: List[str], now: float) -> None:
+    """Refresh the heartbeat of running tasks so they aren't taken for abandoned."""
+    if not task_ids:
+        return
+    conn = get_conn()
+    conn.executemany(
+        "UPDATE tasks SET heartbeat_at = ? WHERE task_id = ? AND status = 'running'", [(now, task_id) for task_id in task_ids]
+    )
+    conn.commit()
+    conn.close()
+
+
+def finish_task(
+    task_id: str, status: str, finished_at: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None
+) -> None:
+    conn = get_conn()
+    conn.execute(
+        "UPDATE tasks SET status = ?, finished_at = ?, result = ?, error = ? WHERE task_id = ?",
+        (status, finished_at, json.dumps(result) if result is not None else None, error, task_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+def requeue_stale_tasks(stale_before: float, max_attempts: int, finished_at: str) -> int:
+    """Requeue running tasks whose heartbeat stopped before ``stale_before`` (their worker died);
+    tasks that already had ``max_attempts`` tries fail instead. Returns how many were touched."""
+
+    conn = get_conn()
+    cur = conn.execute(
+        "UPDATE tasks SET status = 'queued', worker = NULL WHERE status = 'running' AND heartbeat_at < ? AND attempts < ?",
+        (stale_before, max_attempts),
+    )
+    requeued = cur.rowcount
+    cur = conn.execute(
+        """
+        UPDATE tasks SET status = 'failed', finished_at = ?, error = 'worker stopped responding'
+        WHERE status = 'running' AND heartbeat_at < ?
+        """,
+        (finished_at, stale_before),
+    )
+    conn.commit()
+    conn.close()
+    return requeued + cur.rowcount
+
+
+def get_task(task_id: str) -> Optional[Dict[str, Any]]:
+    conn = get_conn()
+    row = conn.execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+    conn.close()
+    return _task_dict(row) if row else None
+
+
+def list_tasks(kind: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Most recent tasks first, optionally of one kind."""
+
+    conn = get_conn()
+    if kind:
+        rows = conn.execute(
+            "SELECT * FROM tasks WHERE kind = ? ORDER BY created_at DESC, rowid DESC LIMIT ?", (kind, limit)
+        ).fetchall()
+    else:
+        rows = conn.execute("SELECT * FROM tasks ORDER BY created_at DESC, rowid DESC LIMIT ?", (limit,)).fetchall()
+    conn.close()
+    return [_task_dict(row) for row in rows]
+
+
+def save_query(query: str, limit_per_source: int, created_at: str) -> None:
+    conn = get_conn()
+    conn.execute(
+        """
+        INSERT INTO saved_queries(query, limit_per_source, enabled, created_at) VALUES (?, ?, 1, ?)
+        ON CONFLICT(query) DO UPDATE SET limit_per_source = excluded.limit_per_source, enabled = 1
+        """,
+        (query, limit_per_source, created_at),
+    )
+    conn.commit()
+    conn.close()
+
+
+def delete_saved_query(query: str) -> None:
+    conn = get_conn()
+    conn.execute("DELETE FROM saved_queries WHERE query = ?", (query,))
+    conn.execute("DELETE FROM refresh_targets WHERE query = ?", (query,))
+    conn.commit()
+    conn.close()
+
+
+def list_saved_queries() -> List[sqlite3.Row]:
+    conn = get_conn()
+    rows = conn.execute(
+        "SELECT query, limit_per_source, enabled, created_at FROM saved_queries WHERE enabled = 1 ORDER BY created_at"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def list_refresh_targets() -> List[sqlite3.Row]:
+    conn = get_conn()
+    rows = conn.execute("SELECT * FROM refresh_targets ORDER BY next_due_at").fetchall()
+    conn.close()
+    return rows
+
+
+def sync_refresh_targets(targets: List[Tuple[str, str, str, float, float]]) -> None:
+    """Make ``refresh_targets`` hold exactly the given (source, board, query, interval_s, next_due_at)
+    keys; existing rows keep their schedule and history."""
+
+    conn = get_conn()
+    conn.executemany(
+        "INSERT OR IGNORE INTO refresh_targets(source, board, query, interval_s, next_due_at) VALUES (?, ?, ?, ?, ?)",
+        targets,
+    )
+    keep = {target[:3] for target in targets}
+    stale = [tuple(row) for row in conn.execute("SELECT source, board, query FROM refresh_targets") if tuple(row) not in keep]
+    conn.executemany("DELETE FROM refresh_targets WHERE source = ? AND board = ? AND query = ?", stale)
+    conn.commit()
+    conn.close()
+
+
+def due_refresh_targets(now: float) -> List[sqlite3.Row]:
+    conn = get_conn()
+    rows = conn.execute("SELECT * FROM refresh_targets WHERE next_due_at <= ? ORDER BY next_due_at", (now,)).fetchall()
+    conn.close()
+    return rows
+
+
+def update_refresh_target(source: str, board: str, query: str, **fields: Any) -> None:
+    if not fields:
+        return
+    conn = get_conn()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    conn.execute(
+        f"UPDATE refresh_targets SET {assignments} WHERE source = ? AND board = ? AND query = ?",
+        [*fields.values(), source, board, query],
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_vector_collection(kind: str, status: str = "active") -> Optional[Dict[str, Any]]:
+    """The ``active`` (or ``building``) vector collection of ``kind`` (``jobs``/``resumes``)."""
+    conn = get_conn()
+    row = conn.execute(
+        "SELECT * FROM vector_collections WHERE kind = ? AND status = ? ORDER BY created_at DESC LIMIT 1", (kind, status)
+    ).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def list_vector_collections(kind: Optional[str] = None) -> List[Dict[str, Any]]:
+    conn = get_conn()
+    if kind:
+        rows = conn.execute("SELECT * FROM vector_collections WHERE kind = ? ORDER BY created_at", (kind,)).fetchall()
+    else:
+        rows = conn.execute("SELECT * FROM vector_collections ORDER BY kind, created_at").fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+def register_vector_collection(
+    name: str, kind: str, embed_model: str, status: str, created_at: str, dim: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """Record a collection (a no-op if the name is taken, or the kind already has an ``active``
+    or ``building`` one); returns the kind's collection with ``status``."""
+    conn = get_conn()
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO vector_collections(name, kind, embed_model, dim, status, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (name, kind, embed_model, dim, status, created_at),
+    )
+    conn.commit()
+    conn.close()
+    return get_vector_collection(kind, status)
+
+
+def set_vector_collection_progress(
+    name: str,
+    copied: Optional[int] = None,
+    total: Optional[int] = None,
+    dim: Optional[int] = None,
+    error: Optional[str] = None,
+) -> None:
+    conn = get_conn()
+    conn.execute(
+        """
+        UPDATE vector_collections
+        SET copied = COALESCE(?, copied), total = COALESCE(?, total), dim = COALESCE(?, dim), error = ?
+        WHERE name = ?
+        """,
+        (copied, total, dim, error, name),
+    )
+    conn.commit()
+    conn.close()
+
+
+def activate_vector_collection(name: str, activated_at: str) -> None:
+    """Make ``name`` the active collection of its kind and retire the previous one, in one
+    transaction: readers see either the old or the new collection, never neither."""
+    conn = get_conn()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT kind FROM vector_collections WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        conn.execute("UPDATE vector_collections SET status = 'retired' WHERE kind = ? AND status = 'active'", (row["kind"],))
+        conn.execute(
+            "UPDATE vector_collections SET status = 'active', activated_at = ?, error = NULL WHERE name = ?", (activated_at, name)
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def delete_vector_collection(name: str) -> None:
+    conn = get_conn()
+    conn.execute("DELETE FROM vector_collections WHERE name = ?", (name,))
+    conn.commit()
+    conn.close()
+
+
+def relabel_resume_embed_model(old: str, new: str) -> None:
+    """After resume vectors were re-embedded, record the model they are built with now."""
+    conn = get_conn()
+    conn.execute("UPDATE resumes SET embed_model = ? WHERE embed_model = ?", (new, old))
+    conn.commit()
+    conn.close()
+
+
 def wipe_jobs() -> None:
-    """Delete all jobs and job run logs."""
+    """Delete all jobs, their near-duplicate index and alternates, and job run logs."""
     conn = get_conn()
+    conn.execute("DELETE FROM job_lsh")
+    conn.execute("DELETE FROM job_minhash")
+    conn.execute("DELETE FROM job_alternates")
     conn.execute("DELETE FROM jobs")
     conn.execute("DELETE FROM job_runs")
+    conn.execute("DELETE FROM run_spans WHERE kind = 'job_search'")
     conn.commit()
     conn.close()
 
@@ -189,6 +1099,9 @@ def wipe_resumes() -> None:
     """Delete all resumes and match run logs."""
     conn = get_conn()
     conn.execute("DELETE FROM resumes")
+    conn.execute("DELETE FROM resume_texts")
     conn.execute("DELETE FROM match_runs")
+    conn.execute("DELETE FROM match_results")
+    conn.execute("DELETE FROM run_spans WHERE kind IN ('resume_ingest', 'rank')")
     conn.commit()
     conn.close()
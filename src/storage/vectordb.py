@@ -1,26 +1,232 @@
-import chromadb
-from chromadb.config import Settings
-from typing import Any, Dict, List, Optional
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .. import config
+
+logger = logging.getLogger(__name__)
+
+# chromadb takes ~0.6 s to import; it is loaded by the first client opened, not by importing this.
 
 
 def get_chroma_client(persist_dir: str):
+    import chromadb
+    from chromadb.config import Settings
+
     return chromadb.PersistentClient(path=persist_dir, settings=Settings(allow_reset=True, anonymized_telemetry=False))
 
 
+SPACES = ("cosine", "l2", "ip")
+
+
+def index_metadata(
+    space: Optional[str] = None,
+    m: Optional[int] = None,
+    construction_ef: Optional[int] = None,
+    search_ef: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Chroma ``hnsw:*`` collection metadata; unset values fall back to ``VECTOR_SPACE`` and the
+    ``HNSW_*`` config, then to Chroma's defaults (see ``src/vector_index.py``)."""
+
+    space = space or config.VECTOR_SPACE
+    if space not in SPACES:
+        raise ValueError(f"Unknown vector space {space!r}; expected one of {', '.join(SPACES)}")
+    metadata: Dict[str, Any] = {"hnsw:space": space}
+    for key, value in (
+        ("hnsw:M", m or config.HNSW_M),
+        ("hnsw:construction_ef", construction_ef or config.HNSW_CONSTRUCTION_EF),
+        ("hnsw:search_ef", search_ef or config.HNSW_SEARCH_EF),
+    ):
+        if value:
+            metadata[key] = int(value)
+    return metadata
+
+
 def get_or_create_collection(client, name: str):
-    return client.get_or_create_collection(name=name)
+    # The index settings only apply when the collection is created; an existing one keeps its own.
+    return client.get_or_create_collection(name=name, metadata=index_metadata())
+
+
+# How often a ``LazyCollection`` checks which collection of its kind is active.
+POINTER_CHECK_S = 2.0
+
+
+class LazyCollection:
+    """Stands in for the active Chroma collection of a kind (``jobs``/``resumes``, see
+    ``src/vector_collections.py``) and opens the client on first use, so pages and CLI paths
+    that never touch vectors don't pay for chromadb. After an embedding-model migration switches
+    the active collection, it follows within ``POINTER_CHECK_S``."""
+
+    def __init__(self, persist_dir: str, name: str):
+        self.persist_dir = persist_dir
+        self.kind = name
+        self.collection_name = name
+        self._collection = None
+        self._record: Optional[Dict[str, Any]] = None
+        self._client = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def opened(self) -> bool:
+        return self._collection is not None
+
+    @property
+    def embed_model_key(self) -> str:
+        """``provider:model`` the vectors of the active collection are embedded with."""
+        self.resolve()
+        return self._record["embed_model"]
+
+    def resolve(self):
+        if self._collection is None or time.monotonic() - self._checked_at >= POINTER_CHECK_S:
+            with self._lock:
+                if self._collection is None or time.monotonic() - self._checked_at >= POINTER_CHECK_S:
+                    from ..vector_collections import active_collection
+
+                    record = active_collection(self.kind)
+                    if self._collection is None or record["name"] != self.collection_name:
+                        if self._client is None:
+                            self._client = get_chroma_client(self.persist_dir)
+                        self._collection = get_or_create_collection(self._client, record["name"])
+                        self.collection_name = record["name"]
+                    self._record = record
+                    self._checked_at = time.monotonic()
+        return self._collection
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+
+def lazy_collection(persist_dir: str, name: str) -> LazyCollection:
+    return LazyCollection(persist_dir, name)
+
+
+def collection_model_key(collection) -> Optional[str]:
+    """``provider:model`` a collection's vectors are embedded with; None for a plain Chroma
+    collection, which uses the configured model."""
+    return collection.embed_model_key if isinstance(collection, LazyCollection) else None
+
+
+def collection_embed_model(collection) -> Optional[str]:
+    """Embedding model to embed queries and documents for ``collection`` with (None: configured)."""
+    key = collection_model_key(collection)
+    return key.split(":", 1)[-1] if key else None
 
 
 def add_documents(collection, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]], embeddings: List[List[float]]):
     collection.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
 
 
+def upsert_documents(collection, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]], embeddings: List[List[float]]):
+    collection.upsert(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+
+
+class VectorWriter:
+    """Buffers ``(id, document, metadata, embedding)`` records and upserts them in batches: one
+    Chroma write (and HNSW update) per ``batch_size`` records, or once ``flush_interval_s`` has
+    passed since the oldest buffered record (checked as records arrive; ``flush``/``close`` write
+    the rest). A record buffered again before its flush replaces the earlier one.
+
+    ``on_flush(ids)`` runs after a batch lands and ``on_error(ids, exc)`` after it fails, so the
+    caller can record the outcome next to its own rows; a failed batch is logged and dropped.
+    Use as a context manager to flush on exit.
+    """
+
+    def __init__(
+        self,
+        collection,
+        batch_size: Optional[int] = None,
+        flush_interval_s: Optional[float] = None,
+        on_flush: Optional[Callable[[List[str]], None]] = None,
+        on_error: Optional[Callable[[List[str], Exception], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.collection = collection
+        self.batch_size = max(1, batch_size or config.VECTOR_WRITE_BATCH)
+        self.flush_interval_s = config.VECTOR_WRITE_FLUSH_S if flush_interval_s is None else flush_interval_s
+        self.on_flush = on_flush
+        self.on_error = on_error
+        self.clock = clock
+        self.written = 0
+        self.failed = 0
+        self._buffer: Dict[str, Tuple[str, Dict[str, Any], List[float]]] = {}
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def add(self, id: str, document: str, metadata: Dict[str, Any], embedding: List[float]) -> None:
+        with self._lock:
+            if not self._buffer:
+                self._oldest = self.clock()
+            self._buffer[id] = (document, metadata, embedding)
+            due = len(self._buffer) >= self.batch_size or self.clock() - self._oldest >= self.flush_interval_s
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything buffered; returns the number of records written."""
+
+        with self._lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer, self._oldest = self._buffer, {}, None
+            ids = list(batch)
+            try:
+                upsert_documents(
+                    self.collection,
+                    ids=ids,
+                    documents=[batch[key][0] for key in ids],
+                    metadatas=[batch[key][1] for key in ids],
+                    embeddings=[batch[key][2] for key in ids],
+                )
+            except Exception as exc:
+                self.failed += len(ids)
+                logger.warning("Vector write of %s records failed: %s", len(ids), exc)
+                if self.on_error:
+                    self.on_error(ids, exc)
+                return 0
+            self.written += len(ids)
+        if self.on_flush:
+            self.on_flush(ids)
+        return len(ids)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "VectorWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
 def query(collection, query_embedding: List[float], n_results: int, where_filter: Optional[Dict[str, Any]] = None):
     return collection.query(query_embeddings=[query_embedding], n_results=n_results, where=where_filter)
 
 
-def get(collection, where_filter: Optional[Dict[str, Any]] = None, limit: Optional[int] = None):
-    return collection.get(where=where_filter, limit=limit)
+def get(
+    collection,
+    where_filter: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+    include: Optional[List[str]] = None,
+    ids: Optional[List[str]] = None,
+):
+    kwargs: Dict[str, Any] = {"where": where_filter, "limit": limit}
+    if ids is not None:
+        kwargs["ids"] = ids
+    if include is not None:
+        kwargs["include"] = include
+    return collection.get(**kwargs)
+
+
+def delete(collection, ids: List[str]) -> None:
+    if ids:
+        collection.delete(ids=ids)
 
 
 def clear_collection(collection) -> None:
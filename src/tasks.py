@@ -0,0 +1,209 @@
+"""Persistent background tasks (job search, resume ingest, ranking, re-embedding).
+
+Pages ``enqueue()`` a task into the SQLite ``tasks`` table and poll it with ``get_task()``;
+a ``TaskWorker`` claims queued tasks and runs them on ``TASK_WORKERS`` threads, either inside
+the Streamlit server process (``TASK_INPROCESS_WORKER``) or as its own process
+(``python scripts/worker.py``). Handlers report progress, which is written to the task row at
+most every ``PROGRESS_INTERVAL_S``; results and errors stay on the row, so a page that
+reconnects finds them again. Running tasks carry a heartbeat; a task whose worker stops
+beating for ``TASK_STALE_S`` is requeued (or failed after ``TASK_MAX_ATTEMPTS`` tries).
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from . import config
+from .storage.sqlite import (
+    claim_task,
+    finish_task,
+    get_task,
+    insert_task,
+    list_tasks,
+    requeue_stale_tasks,
+    set_task_progress,
+    touch_tasks,
+)
+
+logger = logging.getLogger(__name__)
+
+TASK_KINDS = ("run_search", "ingest", "rank", "reembed")
+PROGRESS_INTERVAL_S = 0.5
+
+# handler(params, report_progress) -> JSON-serializable result
+Handler = Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Dict[str, Any]]
+
+__all__ = ["TASK_KINDS", "TaskWorker", "agent_handlers", "enqueue", "get_task", "list_tasks"]
+
+
+def enqueue(kind: str, params: Dict[str, Any]) -> str:
+    """Queue a task and return its id."""
+
+    if kind not in TASK_KINDS:
+        raise ValueError(f"Unknown task kind: {kind}")
+    task_id = str(uuid.uuid4())
+    insert_task(task_id, kind, params, datetime.utcnow().isoformat())
+    return task_id
+
+
+def agent_handlers(jobs_collection, resumes_collection) -> Dict[str, Handler]:
+    """Task handlers backed by the agents, sharing one set of agents per worker."""
+
+    from .agents.job_scout import JobScoutAgent
+    from .agents.match_rank import MatchRankAgent
+    from .agents.resume_ingest import ResumeIngestAgent
+
+    scout = JobScoutAgent(jobs_collection)
+    ingest_agent = ResumeIngestAgent(resumes_collection)
+    ranker = MatchRankAgent(resumes_collection, jobs_collection)
+
+    def run_search(params: Dict[str, Any], progress: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        summary = scout.run_search(params["query"], limit_per_source=params.get("limit_per_source", 50), on_progress=progress)
+        return {"summary": summary, "added": sum(summary.values())}
+
+    def ingest(params: Dict[str, Any], progress: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        resume_id = ingest_agent.ingest(params["path"], display_name=params.get("filename"), on_progress=progress)
+        return {"resume_id": resume_id}
+
+    def rank(params: Dict[str, Any], progress: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        # With a deadline the task finishes with the hybrid ranking; LLM scores keep landing in
+        # ``match_results`` for the run, where the page polls them.
+        progress({"stage": "rank"})
+        jobs = ranker.rank(
+            params["resume_id"],
+            top_k=params.get("top_k", 25),
+            use_llm_rerank=params.get("use_llm_rerank", True),
+            deadline_s=params.get("deadline_s"),
+        )
+        pending = sum(1 for job in jobs if job.get("llm_pending"))
+        progress({"stage": "rerank" if pending else "done", "jobs": len(jobs), "pending": pending})
+        return {"run_id": jobs[0]["run_id"] if jobs else None, "jobs": len(jobs)}
+
+    def reembed(params: Dict[str, Any], progress: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        # Resumable: a retried task continues the building collection from its cursor.
+        from .vector_collections import migrate_collection
+
+        return migrate_collection(params["kind"], model=params.get("model"), on_progress=progress)
+
+    return {"run_search": run_search, "ingest": ingest, "rank": rank, "reembed": reembed}
+
+
+class _ProgressReporter:
+    """Writes the latest progress of a task, throttled to one write per ``interval_s``."""
+
+    def __init__(self, task_id: str, interval_s: Optional[float] = None):
+        self.task_id = task_id
+        self.interval_s = PROGRESS_INTERVAL_S if interval_s is None else interval_s
+        self._latest: Optional[Dict[str, Any]] = None
+        self._written_at = 0.0
+        self._dirty = False
+
+    def __call__(self, progress: Dict[str, Any]) -> None:
+        self._latest = progress
+        self._dirty = True
+        now = time.time()
+        if now - self._written_at >= self.interval_s:
+            self.flush(now)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        if not self._dirty:
+            return
+        now = now or time.time()
+        set_task_progress(self.task_id, self._latest or {}, now)
+        self._written_at = now
+        self._dirty = False
+
+
+class TaskWorker:
+    def __init__(
+        self,
+        handlers: Dict[str, Handler],
+        parallelism: Optional[int] = None,
+        poll_s: Optional[float] = None,
+        name: Optional[str] = None,
+    ):
+        self.handlers = handlers
+        self.parallelism = max(1, parallelism or config.TASK_WORKERS)
+        self.poll_s = config.TASK_POLL_S if poll_s is None else poll_s
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+        self._running: set = set()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "TaskWorker":
+        """Run the worker loops and the heartbeat on daemon threads."""
+
+        for idx in range(self.parallelism):
+            thread = threading.Thread(target=self._loop, name=f"task-worker-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="task-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        logger.info("Task worker %s started with %s threads", self.name, self.parallelism)
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_once(self) -> bool:
+        """Claim and run one queued task; False when the queue was empty."""
+
+        requeue_stale_tasks(time.time() - config.TASK_STALE_S, config.TASK_MAX_ATTEMPTS, datetime.utcnow().isoformat())
+        task = claim_task(self.name, datetime.utcnow().isoformat(), time.time())
+        if task is None:
+            return False
+        self._run(task)
+        return True
+
+    def _run(self, task: Dict[str, Any]) -> None:
+        task_id = task["task_id"]
+        handler = self.handlers.get(task["kind"])
+        if handler is None:
+            finish_task(task_id, "failed", datetime.utcnow().isoformat(), error=f"No handler for {task['kind']}")
+            return
+        with self._lock:
+            self._running.add(task_id)
+        reporter = _ProgressReporter(task_id)
+        logger.info("Task %s (%s) started on %s", task_id, task["kind"], self.name)
+        try:
+            result = handler(task["params"] or {}, reporter)
+        except Exception as exc:
+            reporter.flush()
+            logger.exception("Task %s (%s) failed", task_id, task["kind"])
+            finish_task(task_id, "failed", datetime.utcnow().isoformat(), error=f"{type(exc).__name__}: {exc}")
+        else:
+            reporter.flush()
+            finish_task(task_id, "done", datetime.utcnow().isoformat(), result=result)
+            logger.info("Task %s (%s) done", task_id, task["kind"])
+        finally:
+            with self._lock:
+                self._running.discard(task_id)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                worked = self.run_once()
+            except Exception:  # e.g. the database is locked or not migrated yet; try again later
+                logger.exception("Task worker %s loop error", self.name)
+                worked = False
+            if not worked:
+                self._stop.wait(self.poll_s)
+
+    def _heartbeat(self) -> None:
+        interval = max(0.1, config.TASK_STALE_S / 4)
+        while not self._stop.wait(interval):
+            with self._lock:
+                running = list(self._running)
+            try:
+                touch_tasks(running, time.time())
+            except Exception:
+                logger.exception("Task heartbeat failed")
@@ -1,7 +1,13 @@
 from typing import List
 
+MAX_CHARS = 1200
+OVERLAP = 150
+# Stored with each resume's vectors; change it whenever chunk_text's output changes so stored
+# resumes are re-chunked on their next ingest.
+CHUNKING_KEY = f"chars-v1:{MAX_CHARS}:{OVERLAP}"
 
-def chunk_text(text: str, max_chars: int = 1200, overlap: int = 150) -> List[str]:
+
+def chunk_text(text: str, max_chars: int = MAX_CHARS, overlap: int = OVERLAP) -> List[str]:
     cleaned = "\n".join(line.strip() for line in text.strip().splitlines())
     cleaned = "\n".join([line for line in cleaned.splitlines() if line.strip()])
     chunks: List[str] = []
@@ -1,14 +1,38 @@
+import functools
 import hashlib
+import re
+import zlib
+from typing import TYPE_CHECKING, List, Set, Tuple
 from urllib.parse import urlparse
 
 from ..models import Job
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# Near-duplicate detection: MinHash over word shingles, banded for LSH. 16 bands of 8 rows put
+# pairs with Jaccard similarity 0.8 in a shared bucket ~95% of the time and pairs at 0.5 ~6%.
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 16
+SHINGLE_WORDS = 3
+_ROWS_PER_BAND = MINHASH_PERMUTATIONS // LSH_BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"[a-z0-9]+")
+# Title words that differ between boards for the same role.
+_TITLE_NOISE = {"remote", "hybrid", "onsite", "on", "site", "us", "usa", "eu", "uk", "anywhere", "fully", "f", "m", "d", "x", "w"}
+
 
 def stable_job_id(title: str, company: str, location: str, url: str) -> str:
     norm = f"{title.lower().strip()}|{company.lower().strip()}|{(location or '').lower().strip()}|{normalize_url(url)}"
     return hashlib.sha256(norm.encode("utf-8")).hexdigest()
 
 
+def content_hash(title: str, company: str, location: str, description: str) -> str:
+    """Hash of the posting's text, whitespace/case-insensitive; the same posting under another URL hashes the same."""
+    norm = "|".join(" ".join((part or "").lower().split()) for part in (title, company, location, description))
+    return hashlib.sha256(norm.encode("utf-8")).hexdigest()
+
+
 def normalize_url(url: str) -> str:
     parsed = urlparse(url)
     return parsed._replace(query="", fragment="").geturl()
@@ -20,3 +44,70 @@ def is_duplicate(existing_urls_set: set, job: Job) -> bool:
         return True
     existing_urls_set.add(norm_url)
     return False
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall((text or "").lower())
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> Set[str]:
+    words = _words(text)
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+@functools.lru_cache(maxsize=1)
+def _permutations() -> Tuple["np.ndarray", "np.ndarray"]:
+    # numpy is imported on the first signature rather than with the storage layer.
+    import numpy as np
+
+    rng = np.random.RandomState(20240601)  # fixed: stored signatures must stay comparable
+    return (
+        rng.randint(1, 1 << 32, size=MINHASH_PERMUTATIONS, dtype=np.uint64),
+        rng.randint(0, 1 << 32, size=MINHASH_PERMUTATIONS, dtype=np.uint64),
+    )
+
+
+def minhash_signature(text: str) -> "np.ndarray":
+    """MinHash signature (``MINHASH_PERMUTATIONS`` uint32 values) of the word shingles of ``text``."""
+    import numpy as np
+
+    perm_a, perm_b = _permutations()
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles(text)), dtype=np.uint64)
+    if hashes.size == 0:
+        hashes = np.zeros(1, dtype=np.uint64)
+    # Universal hashing a*x + b mod p; the uint64 products wrap, which still mixes well.
+    permuted = (np.outer(hashes, perm_a) + perm_b) % np.uint64(_MERSENNE_PRIME)
+    return (permuted & np.uint64(0xFFFFFFFF)).min(axis=0).astype(np.uint32)
+
+
+def job_signature(job: Job) -> "np.ndarray":
+    return minhash_signature(f"{job.title} {job.company} {job.description}")
+
+
+def signature_from_bytes(blob: bytes) -> "np.ndarray":
+    import numpy as np
+
+    return np.frombuffer(blob, dtype=np.uint32)
+
+
+def lsh_buckets(signature: "np.ndarray") -> List[int]:
+    """One signed 64-bit bucket key per band (SQLite INTEGER), band index mixed in."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        chunk = signature[band * _ROWS_PER_BAND : (band + 1) * _ROWS_PER_BAND].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8, person=band.to_bytes(2, "little")).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def signature_similarity(a: "np.ndarray", b: "np.ndarray") -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float((a == b).sum()) / len(a)
+
+
+def title_key(title: str) -> str:
+    """Normalized title words; near-duplicates must share it, so a company's roles built on one
+    description template (e.g. Data Engineer / Senior Data Engineer) stay apart."""
+    return " ".join(sorted(set(_words(title)) - _TITLE_NOISE))
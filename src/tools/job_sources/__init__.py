@@ -23,3 +23,9 @@ def get_sources_from_env() -> List:
         if cls:
             sources.append(cls())
     return sources
+
+
+def enabled_source_names() -> List[str]:
+    """Names of the configured sources, without instantiating them."""
+
+    return [name for name in JOB_SOURCES if name in SOURCE_MAP]
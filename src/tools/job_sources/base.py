@@ -10,3 +10,11 @@ class BaseJobSource(ABC):
     @abstractmethod
     def search(self, query: str, limit: int = 50) -> List[Job]:
         raise NotImplementedError
+
+    def boards(self) -> List[str]:
+        """Parts of the source that can be fetched (and scheduled) on their own, e.g. company boards."""
+        return [self.name]
+
+    def search_board(self, _board: str, query: str, limit: int = 50) -> List[Job]:
+        """Search one board; unlike ``search`` this raises when the fetch fails."""
+        return self.search(query, limit)
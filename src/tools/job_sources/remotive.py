@@ -2,12 +2,11 @@ import logging
 from datetime import datetime
 from typing import List
 
-import requests
-
 from ...config import REMOTIVE_CATEGORY
 from ...models import Job
-from .base import BaseJobSource
 from ..dedupe import stable_job_id
+from .base import BaseJobSource
+from .transport import http_get
 
 logger = logging.getLogger(__name__)
 
@@ -16,16 +15,19 @@ class RemotiveSource(BaseJobSource):
     name = "remotive"
 
     def search(self, query: str, limit: int = 50) -> List[Job]:
-        params = {"search": query}
-        if REMOTIVE_CATEGORY:
-            params["category"] = REMOTIVE_CATEGORY
         try:
-            resp = requests.get("https://remotive.com/api/remote-jobs", params=params, timeout=15)
-            resp.raise_for_status()
-            data = resp.json().get("jobs", [])
+            return self.search_board(self.name, query, limit)
         except Exception as exc:  # pragma: no cover - network
             logger.warning("Remotive fetch failed: %s", exc)
             return []
+
+    def search_board(self, _board: str, query: str, limit: int = 50) -> List[Job]:
+        params = {"search": query}
+        if REMOTIVE_CATEGORY:
+            params["category"] = REMOTIVE_CATEGORY
+        resp = http_get(self.name, "https://remotive.com/api/remote-jobs", params=params, timeout=15)
+        resp.raise_for_status()
+        data = resp.json().get("jobs", [])
         jobs: List[Job] = []
         for entry in data[:limit]:
             desc = entry.get("description", "")
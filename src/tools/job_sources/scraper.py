@@ -5,15 +5,17 @@ from html.parser import HTMLParser
 from typing import List, Optional, Sequence
 from urllib.parse import urljoin, urlparse
 
-import requests
-
 from ...models import Job
-from ..parsing import strip_html
 from ..dedupe import stable_job_id
+from ..parsing import strip_html
 from .base import BaseJobSource
+from .transport import http_get, http_post
 
 logger = logging.getLogger(__name__)
 
+# Providers share the scraper's cassette when source traffic is recorded/replayed.
+SOURCE_NAME = "scraper"
+
 
 @dataclass
 class ProviderConfig:
@@ -58,7 +60,7 @@ class SimpleHTMLProvider(BaseProvider):
     def fetch_jobs(self, keywords: Sequence[str], limit: Optional[int] = None) -> List[ScrapedJob]:  # pragma: no cover - network
         query = "+".join(keywords)
         url = self.search_url_template.format(query=query)
-        resp = requests.get(url, timeout=20)
+        resp = http_get(SOURCE_NAME, url, timeout=20)
         resp.raise_for_status()
 
         class _AnchorCollector(HTMLParser):
@@ -139,7 +141,7 @@ class WorkdayProvider(BaseProvider):
         search_text = " ".join(keywords)
         api_url = f"https://{self.host}/wday/cxs/{self.tenant}/{self.site}/jobs"
         payload = {"limit": limit or 50, "offset": 0, "searchText": search_text}
-        resp = requests.post(api_url, json=payload, timeout=20)
+        resp = http_post(SOURCE_NAME, api_url, json=payload, timeout=20)
         resp.raise_for_status()
         data = resp.json()
 
@@ -170,7 +172,7 @@ class GreenhouseProvider(BaseProvider):
 
     def fetch_jobs(self, keywords: Sequence[str], limit: Optional[int] = None) -> List[ScrapedJob]:  # pragma: no cover - network
         url = f"https://boards-api.greenhouse.io/v1/boards/{self.config.board_id}/jobs?content=true"
-        resp = requests.get(url, timeout=20)
+        resp = http_get(SOURCE_NAME, url, timeout=20)
         resp.raise_for_status()
         payload = resp.json()
         results: List[ScrapedJob] = []
@@ -197,7 +199,7 @@ class AshbyProvider(BaseProvider):
 
     def fetch_jobs(self, keywords: Sequence[str], limit: Optional[int] = None) -> List[ScrapedJob]:  # pragma: no cover - network
         api_url = f"https://jobs.ashbyhq.com/api/postings/{self.config.board_id}?markdown=true"
-        resp = requests.get(api_url, timeout=20)
+        resp = http_get(SOURCE_NAME, api_url, timeout=20)
         resp.raise_for_status()
         data = resp.json()
         results: List[ScrapedJob] = []
@@ -313,11 +315,14 @@ def default_providers() -> List[BaseProvider]:
 
 
 class ScraperSource(BaseJobSource):
-    name = "scraper"
+    name = SOURCE_NAME
 
     def __init__(self, providers: Optional[List[BaseProvider]] = None):
         self.providers = providers or default_providers()
 
+    def boards(self) -> List[str]:
+        return [provider.company for provider in self.providers]
+
     def search(self, query: str, limit: int = 50) -> List[Job]:  # pragma: no cover - network
         keywords = keywords_from_query(query)
         results: List[Job] = []
@@ -337,17 +342,26 @@ class ScraperSource(BaseJobSource):
                 if posting.url in seen_urls:
                     continue
                 seen_urls.add(posting.url)
-                job_id = stable_job_id(posting.title, posting.company, posting.location, posting.url)
-                results.append(
-                    Job(
-                job_id=str(job_id),
-                title=posting.title,
-                company=posting.company,
-                location=posting.location or None,
-                url=posting.url,
-                source=f"{self.name}:{getattr(provider, 'provider', '')}",
-                posted_at=datetime.utcnow().isoformat(),
-                description=strip_html(posting.description),
-                    )
-                )
+                results.append(self._to_job(provider, posting))
         return results
+
+    def search_board(self, board: str, query: str, limit: int = 50) -> List[Job]:  # pragma: no cover - network
+        provider = next((p for p in self.providers if p.company == board), None)
+        if provider is None:
+            raise KeyError(f"Unknown scraper board: {board}")
+        postings = provider.fetch_jobs(keywords_from_query(query), limit=limit)
+        unique = {posting.url: posting for posting in postings[:limit]}
+        return [self._to_job(provider, posting) for posting in unique.values()]
+
+    def _to_job(self, provider: BaseProvider, posting: ScrapedJob) -> Job:
+        job_id = stable_job_id(posting.title, posting.company, posting.location, posting.url)
+        return Job(
+            job_id=str(job_id),
+            title=posting.title,
+            company=posting.company,
+            location=posting.location or None,
+            url=posting.url,
+            source=f"{self.name}:{getattr(provider, 'provider', '')}",
+            posted_at=datetime.utcnow().isoformat(),
+            description=strip_html(posting.description),
+        )
@@ -0,0 +1,186 @@
+"""HTTP seam for the job sources, with record/replay cassettes for offline runs.
+
+Every source fetches through ``http_get``/``http_post`` (one pooled ``requests`` session). With
+``JOB_SOURCE_CASSETTES=record`` each exchange is also appended to a gzip JSON-lines cassette per
+source under ``JOB_SOURCE_CASSETTE_DIR`` (``<source>.jsonl.gz``); with ``replay`` the cassettes
+are served instead of the network, sleeping for the recorded latency times
+``JOB_SOURCE_REPLAY_LATENCY_SCALE`` (0 = as fast as possible). A replayed request that was never
+recorded raises ``CassetteMiss``, which sources treat like any other fetch failure.
+"""
+
+import base64
+import contextlib
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from ... import config
+
+MODES = ("", "record", "replay")
+# Headers that describe the raw wire body; replayed bodies are already decoded.
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie", "connection"}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_lock = threading.Lock()
+_mode = config.JOB_SOURCE_CASSETTES
+_directory = config.JOB_SOURCE_CASSETTE_DIR
+_latency_scale = config.JOB_SOURCE_REPLAY_LATENCY_SCALE
+_recording: set = set()
+_tapes: Dict[str, Dict[Tuple[str, str, str], Deque[dict]]] = {}
+
+
+class CassetteMiss(requests.ConnectionError):
+    """A replayed request has no recorded exchange."""
+
+
+def set_cassette_mode(mode: str, directory: Optional[str] = None, latency_scale: Optional[float] = None) -> None:
+    """Switch between live (``""``), ``record`` and ``replay`` for this process."""
+
+    global _mode, _directory, _latency_scale
+    if mode not in MODES:
+        raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {MODES}")
+    with _lock:
+        _mode = mode
+        if directory is not None:
+            _directory = directory
+        if latency_scale is not None:
+            _latency_scale = latency_scale
+        _recording.clear()
+        _tapes.clear()
+
+
+def cassette_mode() -> str:
+    return _mode
+
+
+@contextlib.contextmanager
+def use_cassettes(mode: str, directory: str, latency_scale: float = 1.0) -> Iterator[None]:
+    """Record or replay source traffic for the enclosed block, then restore the previous mode."""
+
+    previous = (_mode, _directory, _latency_scale)
+    set_cassette_mode(mode, directory, latency_scale)
+    try:
+        yield
+    finally:
+        set_cassette_mode(*previous)
+
+
+def cassette_path(source: str, directory: Optional[str] = None) -> Path:
+    return Path(directory or _directory) / f"{source}.jsonl.gz"
+
+
+def get_session() -> requests.Session:
+    """Process-wide session so sources reuse keep-alive connections to the same boards."""
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def http_get(source: str, url: str, **kwargs: Any) -> requests.Response:
+    return _request(source, "GET", url, **kwargs)
+
+
+def http_post(source: str, url: str, **kwargs: Any) -> requests.Response:
+    return _request(source, "POST", url, **kwargs)
+
+
+def _key(method: str, url: str, params: Any = None, json_body: Any = None, data: Any = None) -> Tuple[str, str, str]:
+    full_url = requests.Request(method, url, params=params).prepare().url
+    if json_body is not None:
+        body = json.dumps(json_body, sort_keys=True).encode("utf-8")
+    elif isinstance(data, str):
+        body = data.encode("utf-8")
+    else:
+        body = data or b""
+    return method, full_url, hashlib.sha1(body).hexdigest() if body else ""
+
+
+def _request(source: str, method: str, url: str, **kwargs: Any) -> requests.Response:
+    mode = _mode
+    if mode == "replay":
+        return _replay(source, method, url, **kwargs)
+    started = time.perf_counter()
+    resp = get_session().request(method, url, **kwargs)
+    if mode == "record":
+        _record(source, method, url, resp, time.perf_counter() - started, **kwargs)
+    return resp
+
+
+def _record(source: str, method: str, url: str, resp: requests.Response, elapsed: float, **kwargs: Any) -> None:
+    _, full_url, body_sha = _key(method, url, kwargs.get("params"), kwargs.get("json"), kwargs.get("data"))
+    entry = {
+        "method": method,
+        "url": full_url,
+        "body_sha1": body_sha,
+        "status": resp.status_code,
+        "reason": resp.reason,
+        "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS},
+        "encoding": resp.encoding,
+        "content_b64": base64.b64encode(resp.content).decode("ascii"),
+        "elapsed_s": round(elapsed, 4),
+        "recorded_at": time.time(),
+    }
+    path = cassette_path(source)
+    with _lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The first exchange of a recording session starts a fresh cassette; later ones append
+        # (a multi-member gzip file still reads back as one stream).
+        file_mode = "ab" if source in _recording else "wb"
+        _recording.add(source)
+        with gzip.open(path, file_mode) as fh:
+            fh.write((json.dumps(entry) + "\n").encode("utf-8"))
+
+
+def load_cassette(source: str, directory: Optional[str] = None) -> Dict[Tuple[str, str, str], Deque[dict]]:
+    """Recorded exchanges of ``source`` keyed by (method, url, body hash), in recording order."""
+
+    tape: Dict[Tuple[str, str, str], Deque[dict]] = {}
+    path = cassette_path(source, directory)
+    if not path.exists():
+        return tape
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                entry = json.loads(line)
+                tape.setdefault((entry["method"], entry["url"], entry.get("body_sha1", "")), deque()).append(entry)
+    return tape
+
+
+def _replay(source: str, method: str, url: str, **kwargs: Any) -> requests.Response:
+    key = _key(method, url, kwargs.get("params"), kwargs.get("json"), kwargs.get("data"))
+    with _lock:
+        tape = _tapes.get(source)
+        if tape is None:
+            tape = _tapes[source] = load_cassette(source)
+        entries = tape.get(key)
+        if not entries:
+            raise CassetteMiss(f"No recorded {method} {key[1]} in {cassette_path(source)}")
+        # Repeated requests get the recordings in order; the last one keeps answering after that.
+        entry = entries.popleft() if len(entries) > 1 else entries[0]
+    if _latency_scale > 0:
+        time.sleep(entry.get("elapsed_s", 0.0) * _latency_scale)
+    resp = requests.Response()
+    resp.status_code = entry["status"]
+    resp.reason = entry.get("reason") or ""
+    resp.headers = CaseInsensitiveDict(entry.get("headers") or {})
+    resp.encoding = entry.get("encoding")
+    resp.url = entry["url"]
+    resp._content = base64.b64decode(entry["content_b64"])
+    return resp
@@ -1,26 +1,62 @@
+import hashlib
 import re
+from datetime import UTC, datetime
 from html.parser import HTMLParser
 from pathlib import Path
+from typing import Optional
 
-import pypdf
-from docx import Document
+# pypdf and python-docx are imported where a file is read: job sources and the UI only need the
+# HTML/date helpers here, and importing both costs ~120 ms at startup.
+
+# Cached resume text is keyed by file hash and this; bump it when extraction output changes.
+PARSER_VERSION = "1"
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's bytes, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def pdf_page_count(path: str) -> int:
+    import pypdf
+
+    return len(pypdf.PdfReader(str(path)).pages)
+
+
+def extract_pdf_pages(path: str, start: int = 0, stop: Optional[int] = None) -> str:
+    """Raw text of pages ``start``..``stop`` (exclusive) of a PDF. Page ranges of one file can be
+    extracted in parallel, joined with newlines and passed through ``normalize_text``."""
+    import pypdf
+
+    reader = pypdf.PdfReader(str(path))
+    pages = reader.pages[start:stop]
+    return "\n".join(page.extract_text() or "" for page in pages)
+
+
+def normalize_text(text: str) -> str:
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
 
 
 def extract_text(path: str) -> str:
     file_path = Path(path)
     suffix = file_path.suffix.lower()
     if suffix == ".pdf":
-        reader = pypdf.PdfReader(str(file_path))
-        text = "\n".join(page.extract_text() or "" for page in reader.pages)
+        text = extract_pdf_pages(str(file_path))
     elif suffix in {".docx", ".doc"}:
+        from docx import Document
+
         doc = Document(str(file_path))
         text = "\n".join(p.text for p in doc.paragraphs)
     elif suffix in {".txt"}:
         text = file_path.read_text(encoding="utf-8")
     else:
         raise ValueError(f"Unsupported file type: {suffix}")
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+    return normalize_text(text)
 
 
 def strip_html(text: str) -> str:
@@ -42,3 +78,20 @@ def strip_html(text: str) -> str:
     cleaned = " ".join(chunk.strip() for chunk in parser.chunks if chunk.strip())
     cleaned = re.sub(r"\s{2,}", " ", cleaned)
     return cleaned.strip()
+
+
+def posted_epoch(posted_at: Optional[str]) -> Optional[float]:
+    """Normalize a source's ``posted_at`` (ISO 8601 with or without offset, or epoch s/ms) to UTC epoch seconds."""
+    if not posted_at:
+        return None
+    value = str(posted_at).strip()
+    if value.isdigit():
+        number = int(value)
+        return number / 1000 if number > 10**11 else float(number)
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
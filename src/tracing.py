@@ -0,0 +1,136 @@
+"""Lightweight per-stage timing spans for job search, resume ingest and ranking runs.
+
+A ``Tracer`` collects nested spans for one run and writes them to the ``run_spans`` table.
+Per-item stages inside loops (embedding each job, storing each vector) use ``aggregate=True``
+so a run stores one row per stage with a call count instead of one row per item.
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    span_id: int
+    parent_id: Optional[int]
+    name: str
+    started_at: float
+    duration_s: float = 0.0
+    count: int = 0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+_current_span: contextvars.ContextVar[Optional[Tuple["Tracer", int]]] = contextvars.ContextVar(
+    "trace_span", default=None
+)
+
+
+def current_run() -> Optional[Tuple[str, str]]:
+    """``(run_id, kind)`` of the run whose span encloses the caller, if any."""
+
+    current = _current_span.get()
+    return (current[0].run_id, current[0].kind) if current else None
+
+
+class Tracer:
+    def __init__(self, run_id: str, kind: str):
+        self.run_id = run_id
+        self.kind = kind
+        self.spans: List[Span] = []
+        self._aggregates: Dict[Tuple[Optional[int], str, str], Span] = {}
+        self._lock = threading.Lock()
+
+    def _parent_id(self) -> Optional[int]:
+        current = _current_span.get()
+        return current[1] if current and current[0] is self else None
+
+    @contextlib.contextmanager
+    def span(self, name: str, aggregate: bool = False, **attrs: Any) -> Iterator[Span]:
+        """Time the block as a child of the enclosing span of this tracer."""
+
+        parent_id = self._parent_id()
+        with self._lock:
+            key = (parent_id, name, json.dumps(attrs, sort_keys=True, default=str))
+            span = self._aggregates.get(key) if aggregate else None
+            if span is None:
+                span = Span(len(self.spans) + 1, parent_id, name, time.time(), attrs=dict(attrs))
+                self.spans.append(span)
+                if aggregate:
+                    self._aggregates[key] = span
+        token = _current_span.set((self, span.span_id))
+        started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_span.reset(token)
+            with self._lock:
+                span.duration_s += elapsed
+                span.count += 1
+
+    def flush(self) -> None:
+        """Write (or rewrite) every span of the run; safe to call again as later stages finish."""
+
+        from .storage.sqlite import insert_spans
+
+        with self._lock:
+            pending = [span for span in self.spans if span.count]
+        if not pending:
+            return
+        try:
+            insert_spans(
+                [
+                    (
+                        self.run_id,
+                        self.kind,
+                        span.span_id,
+                        span.parent_id,
+                        span.name,
+                        span.started_at,
+                        span.duration_s * 1000,
+                        span.count,
+                        json.dumps(span.attrs, default=str) if span.attrs else None,
+                    )
+                    for span in pending
+                ]
+            )
+        except Exception as exc:  # tracing must never break a run
+            logger.warning("Could not persist %s spans for run %s: %s", len(pending), self.run_id, exc)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def stage_percentiles(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """p50/p95 of each stage's per-run total duration across the runs in ``rows``."""
+
+    per_run: Dict[Tuple[str, str], Dict[str, float]] = {}
+    for row in rows:
+        stage = per_run.setdefault((row["kind"], row["name"]), {})
+        stage[row["run_id"]] = stage.get(row["run_id"], 0.0) + row["duration_ms"]
+    out = []
+    for (kind, name), totals in sorted(per_run.items()):
+        values = list(totals.values())
+        out.append(
+            {
+                "kind": kind,
+                "stage": name,
+                "runs": len(values),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+            }
+        )
+    return out
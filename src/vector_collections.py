@@ -0,0 +1,245 @@
+"""Vector collections versioned by embedding model.
+
+Vectors from different embedding models can't be compared, so each model gets its own Chroma
+collection (e.g. ``jobs-ollama-nomic-embed-text-<hash>``), recorded in the SQLite
+``vector_collections`` table with its model and dimension. One collection per kind (``jobs``,
+``resumes``) is ``active``: ``LazyCollection`` follows it and the agents embed queries and new
+documents with its model, so changing the embedding model setting alone changes nothing stored.
+
+``migrate_collection`` moves a kind to another model while the app keeps serving: it re-embeds
+the documents stored next to the active vectors (cleaned job text, resume chunks) into a
+``building`` collection in batches, recording a cursor so an interrupted run resumes where it
+stopped, catches up with writes made meanwhile, then switches the active collection in one
+transaction. Until then ranking uses the old collection and model. Collections created before
+this are registered as active with the embedding model configured when they are first opened.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from . import config
+from .llm import PRIORITY_BULK, aembed_many, get_active_config, llm_priority
+from .llm.http import aclose_async_session
+from .storage import vectordb
+from .storage.sqlite import (
+    activate_vector_collection,
+    delete_vector_collection,
+    get_vector_collection,
+    list_vector_collections,
+    register_vector_collection,
+    relabel_resume_embed_model,
+    set_vector_collection_progress,
+)
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("jobs", "resumes")
+
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+
+def persist_dir(kind: str) -> str:
+    if kind not in KINDS:
+        raise ValueError(f"Unknown vector collection kind: {kind}")
+    return config.VDB_JOBS_DIR if kind == "jobs" else config.VDB_RESUMES_DIR
+
+
+def embed_model_key() -> str:
+    """The provider and embedding model configured now, e.g. ``ollama:nomic-embed-text``."""
+
+    cfg = get_active_config()
+    return f"{cfg.provider}:{cfg.embed_model}"
+
+
+def model_name(key: str) -> str:
+    return key.split(":", 1)[-1]
+
+
+def collection_name(kind: str, key: str) -> str:
+    """Chroma name of the ``kind`` collection for embedding model ``key``."""
+
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", key).strip("-")[:40].strip("-")
+    return f"{kind}-{slug}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}"
+
+
+def active_collection(kind: str) -> Dict[str, Any]:
+    """Registry row of the active collection of ``kind``, registering a pre-versioning one."""
+
+    record = get_vector_collection(kind)
+    if record is None:
+        record = register_vector_collection(kind, kind, embed_model_key(), "active", datetime.utcnow().isoformat())
+    return record
+
+
+def embed_documents(texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+    """Embed stored documents in concurrent batches at bulk priority."""
+
+    async def _run() -> List[List[float]]:
+        try:
+            return await aembed_many(texts, model=model, concurrency=config.INGEST_EMBED_CONCURRENCY)
+        finally:
+            await aclose_async_session()
+
+    with llm_priority(PRIORITY_BULK):
+        return asyncio.run(_run())
+
+
+def migrate_collection(
+    kind: str,
+    model: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    embed: Optional[EmbedFn] = None,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    grace_s: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Re-embed the active ``kind`` collection with embedding model ``model`` (``provider:model``,
+    default: the configured one) into a new collection and make that the active one.
+
+    Safe to interrupt and run again: a ``building`` collection for the same model is resumed from
+    its cursor (one for another model is dropped). After the switch it waits ``grace_s`` for
+    other processes to notice (``vectordb.POINTER_CHECK_S``) and copies records they still added
+    to the old collection; the new collection is live by then, so nothing in it is deleted or
+    overwritten. ``on_progress`` receives ``{"kind", "stage", "copied", "total"}``.
+    Returns ``{"kind", "collection", "embed_model", "copied", "synced", "switched"}``."""
+
+    key = model or embed_model_key()
+    batch_size = max(1, batch_size or config.INGEST_EMBED_BATCH)
+    embed = embed or (lambda texts: embed_documents(texts, model_name(key)))
+    grace_s = vectordb.POINTER_CHECK_S + 1.0 if grace_s is None else grace_s
+    source_record = active_collection(kind)
+    result = {"kind": kind, "collection": source_record["name"], "embed_model": key, "copied": 0, "synced": 0, "switched": False}
+    if source_record["embed_model"] == key:
+        logger.info("Vector collection %s is already embedded with %s", source_record["name"], key)
+        return result
+
+    client = vectordb.get_chroma_client(persist_dir(kind))
+    record = _start_building(client, kind, key)
+    source = vectordb.get_or_create_collection(client, source_record["name"])
+    target = vectordb.get_or_create_collection(client, record["name"])
+    result["collection"] = record["name"]
+    copied = record["copied"]
+    progress = {"kind": kind, "stage": "copy", "copied": copied, "total": source.count()}
+
+    def _report(**changes: Any) -> None:
+        progress.update(changes)
+        if on_progress:
+            on_progress(dict(progress))
+
+    try:
+        _report()
+        while True:
+            page = source.get(include=["documents", "metadatas"], limit=batch_size, offset=copied)
+            if not page["ids"]:
+                break
+            dim = _write(target, page["ids"], page["documents"], page["metadatas"], embed, key)
+            copied += len(page["ids"])
+            set_vector_collection_progress(record["name"], copied=copied, total=progress["total"], dim=dim)
+            _report(copied=copied)
+        _report(stage="sync")
+        result["synced"] = _sync(source, target, embed, key, batch_size)
+        activate_vector_collection(record["name"], datetime.utcnow().isoformat())
+        if kind == "resumes":
+            relabel_resume_embed_model(source_record["embed_model"], key)
+        result["switched"] = True
+        logger.info("Switched %s vectors from %s to %s", kind, source_record["name"], record["name"])
+        if grace_s:
+            _report(stage="grace")
+            time.sleep(grace_s)
+            result["synced"] += _sync(source, target, embed, key, batch_size, additive=True)
+    except Exception as exc:
+        if not result["switched"]:
+            set_vector_collection_progress(record["name"], copied=copied, error=str(exc)[:500])
+        raise
+    result["copied"] = copied
+    _report(stage="done")
+    return result
+
+
+def drop_retired(kind: Optional[str] = None) -> List[str]:
+    """Delete retired collections (kept after a migration for rollback); returns their names."""
+
+    dropped = []
+    for record in list_vector_collections(kind):
+        if record["status"] != "retired":
+            continue
+        _drop(vectordb.get_chroma_client(persist_dir(record["kind"])), record["name"])
+        dropped.append(record["name"])
+    return dropped
+
+
+def _drop(client, name: str) -> None:
+    with contextlib.suppress(Exception):  # never created, or already gone
+        client.delete_collection(name)
+    delete_vector_collection(name)
+
+
+def _start_building(client, kind: str, key: str) -> Dict[str, Any]:
+    name = collection_name(kind, key)
+    building = get_vector_collection(kind, "building")
+    if building and building["name"] != name:
+        logger.info("Dropping unfinished vector collection %s (%s)", building["name"], building["embed_model"])
+        _drop(client, building["name"])
+        building = None
+    if building is None:
+        for record in list_vector_collections(kind):
+            if record["name"] == name:  # retired earlier: its vectors are out of date
+                _drop(client, name)
+        building = register_vector_collection(name, kind, key, "building", datetime.utcnow().isoformat())
+        if building is None or building["name"] != name:
+            raise RuntimeError(f"Another {kind} vector migration is in progress")
+    else:
+        logger.info("Resuming vector collection %s at %s of %s", name, building["copied"], building["total"])
+    return building
+
+
+def _write(target, ids: List[str], documents: List[Optional[str]], metadatas: List[Optional[Dict[str, Any]]], embed: EmbedFn, key: str) -> Optional[int]:
+    records = [(id_, doc, {**(meta or {}), "embed_model": key}) for id_, doc, meta in zip(ids, documents, metadatas, strict=True) if doc]
+    if not records:
+        return None
+    vectors = embed([doc for _id, doc, _meta in records])
+    vectordb.upsert_documents(
+        target,
+        ids=[id_ for id_, _doc, _meta in records],
+        documents=[doc for _id, doc, _meta in records],
+        metadatas=[meta for _id, _doc, meta in records],
+        embeddings=vectors,
+    )
+    return len(vectors[0]) if len(vectors) else None
+
+
+def _fingerprints(collection, batch_size: int) -> Dict[str, str]:
+    # Jobs carry the hash of their text; resume chunks are compared by their text.
+    out: Dict[str, str] = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+        if not page["ids"]:
+            return out
+        for id_, doc, meta in zip(page["ids"], page["documents"], page["metadatas"], strict=True):
+            out[id_] = (meta or {}).get("content_hash") or hashlib.sha1((doc or "").encode("utf-8")).hexdigest()
+        offset += len(page["ids"])
+
+
+def _sync(source, target, embed: EmbedFn, key: str, batch_size: int, additive: bool = False) -> int:
+    """Make ``target`` hold the ids and texts of ``source``; returns the records changed. With
+    ``additive``, only ids ``target`` lacks are copied (for a target that already takes writes)."""
+
+    want = _fingerprints(source, batch_size)
+    have = _fingerprints(target, batch_size)
+    if additive:
+        stale = []
+        missing = [id_ for id_ in want if id_ not in have]
+    else:
+        stale = [id_ for id_ in have if id_ not in want]
+        missing = [id_ for id_, fingerprint in want.items() if have.get(id_) != fingerprint]
+    vectordb.delete(target, stale)
+    for start in range(0, len(missing), batch_size):
+        page = source.get(ids=missing[start : start + batch_size], include=["documents", "metadatas"])
+        _write(target, page["ids"], page["documents"], page["metadatas"], embed, key)
+    return len(stale) + len(missing)
@@ -0,0 +1,165 @@
+"""Vector index settings, inspection and tuning.
+
+Chroma builds one HNSW index per collection. Its distance space and graph parameters are fixed
+when the collection is created (``search_ef`` can be changed later): ``M`` neighbors per node,
+``construction_ef`` candidates while inserting and ``search_ef`` candidates per query. Larger
+values raise recall and cost build time, memory and query latency. New collections get
+``VECTOR_SPACE`` (cosine, which ``distance_to_score`` assumes) and any ``HNSW_*`` overrides;
+existing ones keep what they were built with until ``rebuild_collection`` rebuilds them.
+
+``sweep`` measures the trade-off on a deployment's own vectors: it builds throwaway indexes for
+each parameter combination and compares their top-k results with an exact brute-force search.
+Run it with ``python scripts/vector_admin.py sweep``.
+"""
+
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .storage import vectordb
+from .storage.vectordb import index_metadata
+
+
+def collection_stats(collection) -> Dict[str, Any]:
+    """Name, vector count, dimension and index settings of a collection."""
+
+    hnsw = dict((getattr(collection, "configuration", None) or {}).get("hnsw") or {})
+    metadata = collection.metadata or {}
+    sample = collection.get(limit=1, include=["embeddings"])
+    embeddings = sample.get("embeddings")
+    return {
+        "name": collection.name,
+        "count": collection.count(),
+        "dim": len(embeddings[0]) if embeddings is not None and len(embeddings) else None,
+        "space": hnsw.get("space") or metadata.get("hnsw:space", "l2"),
+        "M": hnsw.get("max_neighbors") or metadata.get("hnsw:M"),
+        "construction_ef": hnsw.get("ef_construction") or metadata.get("hnsw:construction_ef"),
+        "search_ef": hnsw.get("ef_search") or metadata.get("hnsw:search_ef"),
+    }
+
+
+def current_index_metadata(collection) -> Dict[str, Any]:
+    """``hnsw:*`` metadata reproducing a collection's index settings."""
+
+    stats = collection_stats(collection)
+    return index_metadata(stats["space"], stats["M"], stats["construction_ef"], stats["search_ef"])
+
+
+def load_vectors(collection, batch_size: int = 1000, limit: Optional[int] = None):
+    """``(ids, float32 matrix)`` of a collection's vectors, read in pages."""
+
+    import numpy as np
+
+    ids: List[str] = []
+    rows: List[Any] = []
+    while limit is None or len(ids) < limit:
+        size = batch_size if limit is None else min(batch_size, limit - len(ids))
+        page = collection.get(include=["embeddings"], limit=size, offset=len(ids))
+        if not page["ids"]:
+            break
+        ids.extend(page["ids"])
+        rows.extend(page["embeddings"])
+    return ids, np.asarray(rows, dtype=np.float32).reshape(len(ids), -1)
+
+
+def exact_neighbors(vectors, queries, k: int, space: str = "cosine"):
+    """Indices of the ``k`` nearest rows of ``vectors`` to each query, by brute force."""
+
+    import numpy as np
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    if space == "cosine":
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        distances = -queries @ vectors.T
+    elif space == "ip":
+        distances = -queries @ vectors.T
+    else:
+        distances = (queries**2).sum(axis=1, keepdims=True) - 2 * queries @ vectors.T + (vectors**2).sum(axis=1)
+    k = min(k, len(vectors))
+    nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(distances, nearest, axis=1).argsort(axis=1)
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def recall_at_k(found: Sequence[Sequence[str]], expected: Sequence[Sequence[str]]) -> float:
+    """Share of the exact top-k ids that the index returned, over all queries."""
+
+    hits = sum(len(set(got) & set(want)) for got, want in zip(found, expected, strict=True))
+    total = sum(len(want) for want in expected)
+    return hits / total if total else 1.0
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def sweep(
+    ids: List[str],
+    vectors,
+    queries,
+    space: str = "cosine",
+    ms: Iterable[int] = (16,),
+    construction_efs: Iterable[int] = (100,),
+    search_efs: Iterable[int] = (10, 50, 100),
+    k: int = 10,
+    batch_size: int = 1000,
+) -> List[Dict[str, Any]]:
+    """Build a scratch index per (``M``, ``construction_ef``) from ``vectors`` and query it with
+    ``queries`` at every ``search_ef``. Returns one row per combination with build seconds,
+    query latency (p50/p95 ms) and recall@k against exact search."""
+
+    import numpy as np
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    expected = [[ids[i] for i in row] for row in exact_neighbors(vectors, queries, k, space)]
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="ljd-sweep-") as scratch:
+        client = vectordb.get_chroma_client(scratch)
+        for m in ms:
+            for construction_ef in construction_efs:
+                name = f"sweep-m{m}-c{construction_ef}"
+                collection = client.create_collection(name, metadata=index_metadata(space, m, construction_ef, max(search_efs)))
+                started = time.perf_counter()
+                for start in range(0, len(ids), batch_size):
+                    collection.add(ids=ids[start : start + batch_size], embeddings=vectors[start : start + batch_size])
+                build_s = time.perf_counter() - started
+                for search_ef in search_efs:
+                    collection = _with_search_ef(client, collection, name, search_ef, space, m, construction_ef, ids, vectors, batch_size)
+                    latencies, found = [], []
+                    for query in queries:
+                        started = time.perf_counter()
+                        result = collection.query(query_embeddings=[query], n_results=k, include=[])
+                        latencies.append(time.perf_counter() - started)
+                        found.append(result["ids"][0])
+                    results.append(
+                        {
+                            "space": space,
+                            "M": m,
+                            "construction_ef": construction_ef,
+                            "search_ef": search_ef,
+                            "build_s": round(build_s, 2),
+                            "p50_ms": round(statistics.median(latencies) * 1000, 3),
+                            "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+                            f"recall@{k}": round(recall_at_k(found, expected), 4),
+                        }
+                    )
+                client.delete_collection(name)
+    return results
+
+
+def _with_search_ef(client, collection, name, search_ef, space, m, construction_ef, ids, vectors, batch_size):
+    # Newer Chroma can change ef_search in place; older versions need the index rebuilt.
+    try:
+        collection.modify(configuration={"hnsw": {"ef_search": search_ef}})
+        return client.get_collection(name)
+    except Exception:
+        client.delete_collection(name)
+        collection = client.create_collection(name, metadata=index_metadata(space, m, construction_ef, search_ef))
+        for start in range(0, len(ids), batch_size):
+            collection.add(ids=ids[start : start + batch_size], embeddings=vectors[start : start + batch_size])
+        return collection
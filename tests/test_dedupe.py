@@ -1,4 +1,4 @@
-from src.tools.dedupe import stable_job_id, normalize_url, is_duplicate
+from src.tools.dedupe import content_hash, stable_job_id, normalize_url, is_duplicate
 from src.models import Job
 
 
@@ -18,3 +18,75 @@ def test_is_duplicate():
     seen = set()
     assert not is_duplicate(seen, j)
     assert is_duplicate(seen, j)
+
+
+def test_content_hash_ignores_case_and_whitespace():
+    assert content_hash("Data  Engineer", "Acme", "Remote", "Build\npipelines") == content_hash("data engineer", "ACME", "remote ", "build pipelines")
+    assert content_hash("Data Engineer", "Acme", "Remote", "a") != content_hash("Data Engineer", "Acme", "Remote", "b")
+
+
+def test_minhash_estimates_shingle_overlap():
+    from src.tools.dedupe import minhash_signature, signature_similarity, title_key
+
+    base = " ".join(f"word{i}" for i in range(200))
+    same = signature_similarity(minhash_signature(base), minhash_signature(base.upper()))
+    near = signature_similarity(minhash_signature(base), minhash_signature(base + " apply via lever today"))
+    far = signature_similarity(minhash_signature(base), minhash_signature(" ".join(f"other{i}" for i in range(200))))
+    assert same == 1.0 and near > 0.9 and far < 0.1
+    assert title_key("Senior Data Engineer (Remote - US)") == title_key("senior data engineer") != title_key("Data Engineer")
+
+
+def test_reposts_collapse_into_canonical_job(tmp_path, monkeypatch):
+    import contextlib
+
+    import src.config as config
+    from src.agents.job_scout import JobScoutAgent
+    from src.storage.sqlite import alternate_urls, count_jobs, init_db, wipe_jobs
+
+    class _Tracer:
+        def span(self, *_args, **_kwargs):
+            return contextlib.nullcontext()
+
+    class _Collection:
+        def __init__(self):
+            self.ids = []
+
+        def upsert(self, ids, **_fields):
+            self.ids.extend(ids)
+
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    monkeypatch.setattr(config, "NEAR_DUP_THRESHOLD", 0.8)
+    monkeypatch.setattr("src.agents.job_scout.embed", lambda *_args, **_kwargs: [0.1, 0.2])
+    init_db()
+    scout = JobScoutAgent(_Collection())
+    body = " ".join(f"we build pipeline{i} with spark and airflow" for i in range(40))
+
+    def _job(source, url, title="Data Engineer", extra=""):
+        return Job(job_id="", title=title, company="Acme", url=url, source=source, description=f"<p>{body}</p>{extra}")
+
+    counts = {}
+    scout._store_jobs(
+        [
+            _job("greenhouse", "https://boards.greenhouse.io/acme/1"),
+            _job("remotive", "https://remotive.com/acme-data-engineer", extra="<p>Apply via Remotive</p>"),
+            _job("scraper", "https://acme.example/careers/de", title="Data Engineer (Remote)"),
+            _job("lever", "https://jobs.lever.co/acme/2", title="Senior Data Engineer"),
+        ],
+        _Tracer(),
+        set(),
+        counts,
+    )
+    assert counts["added"] == 2 and counts["duplicates"] == 2 and count_jobs() == 2
+    canonical = scout.job_collection.ids[0]
+    assert sorted(alt["source"] for alt in alternate_urls([canonical])[canonical]) == ["remotive", "scraper"]
+
+    counts = {}
+    scout._store_jobs([_job("remotive", "https://remotive.com/acme-data-engineer", extra="<p>Apply via Remotive</p>")], _Tracer(), set(), counts)
+    assert counts["duplicates"] == 1 and len(scout.job_collection.ids) == 2
+
+    # After a wipe the signatures are gone too, so a repost is stored again instead of collapsing.
+    wipe_jobs()
+    assert alternate_urls([canonical]) == {}
+    counts = {}
+    scout._store_jobs([_job("remotive", "https://remotive.com/acme-data-engineer", extra="<p>Apply via Remotive</p>")], _Tracer(), set(), counts)
+    assert counts["added"] == 1 and count_jobs() == 1
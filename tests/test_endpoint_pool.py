@@ -0,0 +1,85 @@
+import pytest
+
+from src.llm.endpoints import EndpointPool, parse_base_urls, prompt_affinity
+from src.llm.ollama_client import OllamaError, OllamaUnavailableError
+
+
+def _pool(urls, **kwargs):
+    kwargs.setdefault("probe", lambda _url: set())
+    return EndpointPool(urls, **kwargs)
+
+
+def test_parse_base_urls_splits_and_trims():
+    assert parse_base_urls(" http://a:11434/, http://b:11434 ,") == ["http://a:11434", "http://b:11434"]
+
+
+def test_least_outstanding_spreads_concurrent_calls():
+    pool = _pool(["http://a", "http://b", "http://c"])
+    picked = [pool._pick(None, set()).url for _ in range(3)]
+    assert sorted(picked) == ["http://a", "http://b", "http://c"]
+
+
+def test_prefers_endpoint_with_model_loaded():
+    pool = _pool(["http://a", "http://b"])
+    pool.endpoints[1].loaded_models.add("llama3.1")
+    assert pool.call("llama3.1", lambda url: url) == "http://b"
+    assert pool.call("other-model", lambda url: url) == "http://a"
+
+
+def test_unreachable_endpoint_fails_over_and_is_marked_down(monkeypatch):
+    pool = _pool(["http://a", "http://b"])
+    monkeypatch.setattr(pool, "_ensure_health_thread", lambda: None)
+
+    def call(url):
+        if url == "http://a":
+            raise OllamaUnavailableError("down")
+        return url
+
+    assert pool.call(None, call) == "http://b"
+    stats = {row["url"]: row for row in pool.stats()}
+    assert stats["http://a"]["healthy"] is False
+    assert stats["http://a"]["failures"] == 1
+    assert all(row["outstanding"] == 0 for row in stats.values())
+    # Down endpoints are skipped until a health check brings them back.
+    assert pool.call(None, lambda url: url) == "http://b"
+
+
+def test_request_errors_do_not_mark_endpoint_down():
+    pool = _pool(["http://a"])
+
+    def call(_url):
+        raise OllamaError("model not found")
+
+    with pytest.raises(OllamaError):
+        pool.call("missing", call)
+    assert pool.stats()[0]["healthy"] is True
+
+
+def test_health_check_restores_endpoint_with_loaded_models(monkeypatch):
+    answers = {"http://a": None}
+    pool = _pool(["http://a"], probe=lambda url: answers[url])
+    monkeypatch.setattr(pool, "_ensure_health_thread", lambda: None)
+
+    with pytest.raises(OllamaUnavailableError):
+        pool.call(None, lambda _url: (_ for _ in ()).throw(OllamaUnavailableError("down")))
+    with pytest.raises(OllamaUnavailableError):
+        pool.call(None, lambda url: url)
+
+    pool.check_health()
+    assert pool.stats()[0]["healthy"] is False
+    answers["http://a"] = {"nomic-embed-text"}
+    pool.check_health()
+    row = pool.stats()[0]
+    assert row["healthy"] is True
+    assert row["loaded_models"] == ["nomic-embed-text"]
+
+
+def test_prompt_affinity_returns_to_the_same_endpoint():
+    pool = _pool(["http://a", "http://b"])
+    with prompt_affinity("resume-1"):
+        pool.endpoints[0].outstanding = 2  # busy, so the first call goes to b
+        assert pool.call(None, lambda url: url) == "http://b"
+        pool.endpoints[0].outstanding = 0
+        pool.endpoints[0].ewma_latency_s, pool.endpoints[1].ewma_latency_s = 0.1, 1.0
+        assert pool.call(None, lambda url: url) == "http://b"
+    assert pool.call(None, lambda url: url) == "http://a"
@@ -0,0 +1,120 @@
+import base64
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.tools.job_sources import transport
+from src.tools.job_sources.remotive import RemotiveSource
+from src.tools.job_sources.transport import CassetteMiss, http_get, http_post, use_cassettes
+
+
+@pytest.fixture
+def board():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, payload):
+            time.sleep(0.05)
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            hits.append(self.path)
+            self._reply({"path": self.path, "hit": len(hits)})
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            hits.append(self.path)
+            self._reply({"echo": body})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_record_then_replay_offline(board, tmp_path):
+    url, hits = board
+    with use_cassettes("record", str(tmp_path)):
+        first = http_get("greenhouse", f"{url}/jobs", params={"q": "python"}, timeout=5).json()
+        second = http_get("greenhouse", f"{url}/jobs", params={"q": "python"}, timeout=5).json()
+        posted = http_post("greenhouse", f"{url}/search", json={"searchText": "python", "limit": 5}, timeout=5).json()
+    assert transport.cassette_mode() == ""
+    assert len(hits) == 3
+    assert (tmp_path / "greenhouse.jsonl.gz").exists()
+
+    with use_cassettes("replay", str(tmp_path), latency_scale=0):
+        started = time.perf_counter()
+        assert http_get("greenhouse", f"{url}/jobs", params={"q": "python"}).json() == first
+        assert http_get("greenhouse", f"{url}/jobs", params={"q": "python"}).json() == second
+        # The last recording keeps answering repeated requests.
+        assert http_get("greenhouse", f"{url}/jobs", params={"q": "python"}).json() == second
+        assert http_post("greenhouse", f"{url}/search", json={"limit": 5, "searchText": "python"}).json() == posted
+        assert time.perf_counter() - started < 0.05
+        with pytest.raises(CassetteMiss):
+            http_post("greenhouse", f"{url}/search", json={"searchText": "java", "limit": 5})
+        with pytest.raises(CassetteMiss):
+            http_get("lever", f"{url}/jobs", params={"q": "python"})
+    assert len(hits) == 3
+
+    with use_cassettes("replay", str(tmp_path), latency_scale=1.0):
+        started = time.perf_counter()
+        http_get("greenhouse", f"{url}/jobs", params={"q": "python"})
+        assert time.perf_counter() - started >= 0.04
+
+
+def test_recording_restarts_cassette(board, tmp_path):
+    url, _hits = board
+    for _ in range(2):
+        with use_cassettes("record", str(tmp_path)):
+            http_get("lever", f"{url}/a")
+            http_get("lever", f"{url}/b")
+    tape = transport.load_cassette("lever", str(tmp_path))
+    assert sum(len(entries) for entries in tape.values()) == 2
+
+
+def test_source_parses_replayed_cassette(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.tools.job_sources.remotive.REMOTIVE_CATEGORY", "")
+    payload = {
+        "jobs": [
+            {
+                "id": 7,
+                "title": "Data Engineer",
+                "company_name": "Acme",
+                "candidate_required_location": "Remote",
+                "url": "https://remotive.com/jobs/7",
+                "publication_date": "2026-01-02T00:00:00",
+                "description": "<p>Spark and SQL</p>",
+            }
+        ]
+    }
+    entry = {
+        "method": "GET",
+        "url": "https://remotive.com/api/remote-jobs?search=data+engineer",
+        "body_sha1": "",
+        "status": 200,
+        "headers": {"Content-Type": "application/json"},
+        "encoding": "utf-8",
+        "content_b64": base64.b64encode(json.dumps(payload).encode("utf-8")).decode("ascii"),
+        "elapsed_s": 0.2,
+    }
+    with gzip.open(tmp_path / "remotive.jsonl.gz", "wt", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry) + "\n")
+
+    with use_cassettes("replay", str(tmp_path), latency_scale=0):
+        jobs = RemotiveSource().search("data engineer", limit=10)
+        missed = RemotiveSource().search("rust", limit=10)
+    assert [(job.job_id, job.title, job.company, job.source) for job in jobs] == [("7", "Data Engineer", "Acme", "remotive")]
+    assert missed == []
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import pytest
+
+import src.config as config
+from src.llm import client, http, ollama_client
+from src.llm.scheduler import LLMScheduler
+
+
+@pytest.fixture
+def fresh_scheduler(monkeypatch):
+    scheduler = LLMScheduler(embed_concurrency=8, failure_types=(client.LLMProviderError, ollama_client.OllamaError))
+    monkeypatch.setattr(client, "get_scheduler", lambda: scheduler)
+    monkeypatch.setattr(config, "LLM_METRICS", False)
+    return scheduler
+
+
+@pytest.fixture
+def stand_in():
+    """Tiny local server; tests set ``server.reply`` to map a request body to a JSON reply."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):  # noqa: N802 - http.server naming
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            self.server.requests.append(body)
+            data = json.dumps(self.server.reply(body)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *_args):
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+def _run(coro_factory):
+    async def _main():
+        try:
+            return await coro_factory()
+        finally:
+            await http.aclose_async_session()
+
+    return asyncio.run(_main())
+
+
+def test_aembed_many_preserves_order_for_ollama(monkeypatch, fresh_scheduler, stand_in):
+    base_url = f"http://127.0.0.1:{stand_in.server_port}"
+    monkeypatch.setattr(client, "_runtime_config", client.LLMConfig(provider="ollama", base_url=base_url))
+    stand_in.reply = lambda body: {"embedding": [float(len(body["prompt"]))]}
+
+    texts = ["a", "bbb", "cc", "dddd"]
+    vectors = _run(lambda: client.aembed_many(texts, concurrency=4))
+
+    assert vectors == [[1.0], [3.0], [2.0], [4.0]]
+    assert len(fresh_scheduler.recent_stats()) == len(texts)
+
+
+@pytest.mark.usefixtures("fresh_scheduler")
+def test_aembed_many_batches_openai_inputs(monkeypatch, stand_in):
+    base_url = f"http://127.0.0.1:{stand_in.server_port}/v1"
+    monkeypatch.setattr(
+        client, "_runtime_config", client.LLMConfig(provider="openai", base_url=base_url, api_key="k")
+    )
+    stand_in.reply = lambda body: {
+        "data": [{"index": i, "embedding": [float(len(t))]} for i, t in reversed(list(enumerate(body["input"])))]
+    }
+
+    vectors = _run(lambda: client.aembed_many(["a", "bb", "ccc"], batch_size=2))
+
+    assert vectors == [[1.0], [2.0], [3.0]]
+    assert sorted(len(req["input"]) for req in stand_in.requests) == [1, 2]
+
+
+@pytest.mark.usefixtures("fresh_scheduler")
+def test_sync_and_async_chat_share_payloads(monkeypatch, stand_in):
+    base_url = f"http://127.0.0.1:{stand_in.server_port}"
+    monkeypatch.setattr(client, "_runtime_config", client.LLMConfig(provider="ollama", base_url=base_url))
+    stand_in.reply = lambda _body: {"message": {"content": "ok"}}
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert client.chat(messages, format="json") == "ok"
+    assert _run(lambda: client.achat(messages, format="json")) == "ok"
+    assert stand_in.requests[0] == stand_in.requests[1]
+
+
+class _FlakySession:
+    """Stands in for ``aiohttp.ClientSession``: fails to connect ``failures`` times, then answers."""
+
+    def __init__(self, failures, reply):
+        self.failures = failures
+        self.reply = reply
+        self.attempts = 0
+        self.closed = False
+
+    def post(self, *_args, **_kwargs):
+        session = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                session.attempts += 1
+                if session.attempts <= session.failures:
+                    raise aiohttp.ClientConnectionError("refused")
+                return self
+
+            async def __aexit__(self, *_exc):
+                return False
+
+            status = 200
+
+            async def json(self, **_kwargs):
+                return session.reply
+
+        return _Ctx()
+
+    async def close(self):
+        self.closed = True
+
+
+def _run_with_session(session, coro_factory):
+    async def _main():
+        http._async_sessions[asyncio.get_running_loop()] = session
+        return await coro_factory()
+
+    return asyncio.run(_main())
+
+
+def _no_sleep(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(ollama_client.asyncio, "sleep", fake_sleep)
+    return sleeps
+
+
+def test_async_ollama_retries_like_sync_client(monkeypatch):
+    sleeps = _no_sleep(monkeypatch)
+    session = _FlakySession(failures=2, reply={"message": {"content": "hi"}})
+
+    reply = _run_with_session(
+        session, lambda: ollama_client.achat([{"role": "user", "content": "x"}], base_url="http://fake")
+    )
+
+    assert reply == "hi"
+    assert session.attempts == 3
+    assert sleeps == [1.5, 1.5]
+
+
+def test_async_ollama_gives_up_after_retries(monkeypatch):
+    _no_sleep(monkeypatch)
+    session = _FlakySession(failures=10, reply={})
+
+    with pytest.raises(ollama_client.OllamaError):
+        _run_with_session(session, lambda: ollama_client.aembed("x", base_url="http://fake"))
+    assert session.attempts == 3
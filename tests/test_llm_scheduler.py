@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+from src.llm.scheduler import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMScheduler,
+    TokenBucket,
+    llm_priority,
+)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for scheduler state"
+        time.sleep(0.001)
+
+
+def test_interactive_calls_jump_ahead_of_queued_bulk_calls():
+    scheduler = LLMScheduler(embed_concurrency=1)
+    lane = scheduler._lane(("ollama", "http://h", "embed"))
+    gate = threading.Event()
+    order = []
+
+    holder = threading.Thread(
+        target=lambda: scheduler.run("ollama", "http://h", "embed", lambda: gate.wait(timeout=5)),
+        daemon=True,
+    )
+    holder.start()
+    _wait_for(lambda: lane.in_flight == 1)
+
+    def submit(name, priority):
+        scheduler.run("ollama", "http://h", "embed", lambda: order.append(name), priority=priority)
+
+    threads = [
+        threading.Thread(target=submit, args=(f"bulk-{i}", PRIORITY_BULK), daemon=True) for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: len(lane.waiters) == 3)
+    interactive = threading.Thread(target=submit, args=("interactive", PRIORITY_INTERACTIVE), daemon=True)
+    interactive.start()
+    _wait_for(lambda: len(lane.waiters) == 4)
+    gate.set()
+    for thread in [holder, interactive, *threads]:
+        thread.join(timeout=5)
+
+    assert not any(t.is_alive() for t in [holder, interactive, *threads])
+    assert order[0] == "interactive"
+    assert sorted(order[1:]) == ["bulk-0", "bulk-1", "bulk-2"]
+    assert lane.in_flight == 0
+
+
+def test_priority_context_applies_to_calls():
+    scheduler = LLMScheduler()
+    with llm_priority(PRIORITY_INTERACTIVE):
+        scheduler.run("ollama", "http://h", "chat", lambda: None)
+    scheduler.run("ollama", "http://h", "chat", lambda: None)
+
+    stats = scheduler.recent_stats()
+    assert [s.priority for s in stats] == [PRIORITY_INTERACTIVE, PRIORITY_BULK]
+    assert all(s.queue_wait_s >= 0 and s.service_s >= 0 for s in stats)
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    scheduler = LLMScheduler(breaker_threshold=2, breaker_cooldown_s=60, failure_types=(ValueError,))
+    calls = {"count": 0}
+
+    def failing():
+        calls["count"] += 1
+        raise ValueError("down")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            scheduler.run("ollama", "http://h", "embed", failing)
+    with pytest.raises(CircuitOpenError):
+        scheduler.run("ollama", "http://h", "embed", failing)
+    assert calls["count"] == 2
+
+
+def test_breaker_half_open_allows_single_trial():
+    now = {"t": 0.0}
+    breaker = CircuitBreaker(threshold=1, cooldown_s=10, clock=lambda: now["t"])
+    breaker.record_failure()
+    assert not breaker.allow()
+    now["t"] = 11
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_half_open_trial_with_unexpected_error_does_not_wedge_breaker():
+    scheduler = LLMScheduler(breaker_threshold=1, breaker_cooldown_s=0, failure_types=(ValueError,))
+    with pytest.raises(ValueError):
+        scheduler.run("ollama", "http://h", "embed", lambda: (_ for _ in ()).throw(ValueError("down")))
+
+    def bad_payload():
+        return {}["embedding"]
+
+    with pytest.raises(KeyError):
+        scheduler.run("ollama", "http://h", "embed", bad_payload)
+    assert scheduler.run("ollama", "http://h", "embed", lambda: "ok") == "ok"
+    assert scheduler.breaker("ollama", "http://h").state == "closed"
+
+
+def test_token_bucket_reports_wait_once_burst_is_spent():
+    now = {"t": 0.0}
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now["t"])
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    now["t"] = 1.0
+    assert bucket.reserve() == 0.0
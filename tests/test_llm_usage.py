@@ -0,0 +1,78 @@
+import pytest
+
+import src.config as config
+import src.llm.usage as usage_module
+from src.llm.scheduler import LLMScheduler
+from src.llm.usage import (
+    UsageStore,
+    capture_usage,
+    record_usage,
+    usage_from_ollama,
+    usage_from_openai,
+)
+from src.storage.sqlite import init_db, llm_usage_by_model, llm_usage_by_run
+from src.tracing import Tracer
+
+
+def test_usage_from_ollama_converts_durations():
+    data = {
+        "prompt_eval_count": 12,
+        "prompt_eval_duration": 30_000_000,
+        "eval_count": 40,
+        "eval_duration": 2_000_000_000,
+        "load_duration": 5_000_000,
+        "total_duration": 2_100_000_000,
+    }
+    usage = usage_from_ollama("http://a", "llama3.1", "chat", data)
+
+    assert usage.prompt_tokens == 12
+    assert usage.prompt_eval_s == pytest.approx(0.03)
+    assert usage.gen_tokens_per_s == pytest.approx(20)
+    assert usage.cached_prompt_tokens is None
+
+
+def test_usage_from_openai_reads_cached_tokens():
+    data = {
+        "model": "gpt-4o-mini-2024",
+        "usage": {"prompt_tokens": 2000, "completion_tokens": 50, "prompt_tokens_details": {"cached_tokens": 1792}},
+    }
+    usage = usage_from_openai("https://api", "gpt-4o-mini", "chat", data)
+
+    assert usage.model == "gpt-4o-mini-2024"
+    assert (usage.prompt_tokens, usage.cached_prompt_tokens, usage.completion_tokens) == (2000, 1792, 50)
+
+
+def test_capture_usage_nests_and_stops_after_block(monkeypatch):
+    monkeypatch.setattr(config, "LLM_METRICS", False)
+    usage = usage_from_ollama("http://a", "m", "embed", {})
+    with capture_usage() as outer:
+        record_usage(usage)
+        with capture_usage() as inner:
+            record_usage(usage)
+    record_usage(usage)
+
+    assert len(outer) == 2
+    assert len(inner) == 1
+
+
+def test_recorded_usage_carries_queue_wait_run_and_reaches_the_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    monkeypatch.setattr(config, "LLM_METRICS", True)
+    init_db()
+    store = UsageStore(flush_interval_s=60)
+    monkeypatch.setattr(usage_module, "get_usage_store", lambda: store)
+    scheduler = LLMScheduler()
+    tracer = Tracer("run-1", "rank")
+    reply = {"prompt_eval_count": 100, "eval_count": 20, "eval_duration": 1_000_000_000, "load_duration": 0}
+
+    with tracer.span("rerank"), capture_usage() as calls:
+        for _ in range(2):
+            scheduler.run("ollama", "http://a", "chat", lambda: record_usage(usage_from_ollama("http://a", "m", "chat", reply)))
+    store.flush()
+
+    assert calls[0].run_id == "run-1" and calls[0].queue_s is not None
+    by_model = llm_usage_by_model()[0]
+    assert (by_model["model"], by_model["calls"], by_model["prompt_tokens"]) == ("m", 2, 200)
+    assert by_model["gen_tokens_per_s"] == 20.0
+    by_run = llm_usage_by_run()[0]
+    assert (by_run["run_id"], by_run["run_kind"], by_run["completion_tokens"]) == ("run-1", "rank", 40)
@@ -0,0 +1,156 @@
+import contextlib
+import time
+
+import pytest
+
+import src.config as config
+from src.agents.job_scout import JobScoutAgent
+from src.maintenance import (
+    expire_jobs,
+    rebuild_collection,
+    vacuum_sqlite,
+    vectors_deleted_since_rebuild,
+)
+from src.models import Job
+from src.storage.sqlite import (
+    browse_jobs,
+    count_jobs,
+    get_conn,
+    get_job,
+    init_db,
+    job_storage_stats,
+)
+from src.storage.vectordb import get_chroma_client, get_or_create_collection
+
+DAY = 86400.0
+
+
+class _Collection:
+    def __init__(self):
+        self.ids = set()
+        self.delete_batches = []
+
+    def add(self, ids, **_fields):
+        self.ids.update(ids)
+
+    def upsert(self, ids, **_fields):
+        self.ids.update(ids)
+
+    def delete(self, ids):
+        self.delete_batches.append(list(ids))
+        self.ids.difference_update(ids)
+
+
+@pytest.fixture
+def scout(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    monkeypatch.setattr(config, "JOB_MISSING_AFTER_S", 14 * DAY)
+    monkeypatch.setattr(config, "JOB_TTL_S", 60 * DAY)
+    monkeypatch.setattr(config, "JOB_TOMBSTONE_RETENTION_S", 180 * DAY)
+    monkeypatch.setattr("src.agents.job_scout.embed", lambda *_args, **_kwargs: [0.1, 0.2])
+    init_db()
+    agent = JobScoutAgent(_Collection())
+    agent.sources = []
+    return agent
+
+
+def _jobs(*ids, posted_at=None):
+    return [
+        Job(job_id=job_id, title=f"python {job_id}", company="acme", url=f"https://acme/{job_id}", source="test",
+            description=f"airflow pipelines {job_id}", posted_at=posted_at)
+        for job_id in ids
+    ]
+
+
+def _row(job_id):
+    conn = get_conn()
+    row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+    conn.close()
+    return row
+
+
+def _store(agent, jobs):
+    agent._store_jobs(jobs, _NoTracer(), set(), {})
+
+
+class _NoTracer:
+    def span(self, *_args, **_kwargs):
+        return contextlib.nullcontext()
+
+
+def test_unseen_jobs_expire_in_batches_and_come_back(scout):
+    now = time.time()
+    _store(scout, _jobs(*(f"j{i}" for i in range(5))))
+    _store(scout, _jobs("j0"))
+    conn = get_conn()
+    conn.execute("UPDATE jobs SET last_seen_at = ? WHERE job_id != 'j0'", (now - 20 * DAY,))
+    conn.commit()
+    conn.close()
+
+    counts = expire_jobs(scout.job_collection, now=now, batch_size=2, dry_run=True)
+    assert counts["missing"] == 4 and scout.job_collection.delete_batches == []
+
+    counts = expire_jobs(scout.job_collection, now=now, batch_size=2)
+    assert counts == {"missing": 4, "ttl": 0, "vectors_deleted": 4, "purged": 0}
+    assert [len(batch) for batch in scout.job_collection.delete_batches] == [2, 2]
+    assert scout.job_collection.ids == {"j0"}
+    assert count_jobs() == 1 and [row["job_id"] for row in browse_jobs({"text": "airflow"})[0]] == ["j0"]
+    tombstone = _row("j1")
+    assert tombstone["removed_reason"] == "missing" and tombstone["description"] == ""
+
+    _store(scout, _jobs("j1"))
+    assert count_jobs() == 2 and "j1" in scout.job_collection.ids
+    assert get_job("j1")["description"] == "airflow pipelines j1"
+    assert expire_jobs(scout.job_collection, now=now)["missing"] == 0
+
+
+def test_old_postings_expire_and_tombstones_are_purged(scout):
+    now = time.time()
+    old = time.strftime("%Y-%m-%d", time.gmtime(now - 90 * DAY))
+    _store(scout, _jobs("fresh"))
+    conn = get_conn()
+    conn.execute("UPDATE jobs SET posted_ts = ? WHERE job_id = 'fresh'", (now - 61 * DAY,))
+    conn.commit()
+    conn.close()
+    _store(scout, _jobs("stale", posted_at=old))
+    assert get_job("stale") is None  # already past the TTL when fetched
+
+    assert expire_jobs(scout.job_collection, now=now)["ttl"] == 1
+    assert _row("fresh")["removed_reason"] == "ttl"
+    assert expire_jobs(scout.job_collection, now=now + 181 * DAY)["purged"] == 1
+    assert get_job("fresh") is None
+
+
+def test_vacuum_reclaims_space_and_keeps_search_working(scout):
+    _store(scout, [Job(job_id=f"j{i}", title=f"data engineer {i}", company="acme", url=f"https://acme/{i}", source="test",
+                       description="spark " * 500 + str(i)) for i in range(200)])
+    conn = get_conn()
+    conn.execute("UPDATE jobs SET last_seen_at = 0 WHERE job_id != 'j7'")
+    conn.commit()
+    conn.close()
+    expire_jobs(scout.job_collection, now=time.time() - 181 * DAY)
+    assert expire_jobs(scout.job_collection, now=time.time())["purged"] == 199
+    before = job_storage_stats()
+    assert before["free_bytes"] > 0
+
+    result = vacuum_sqlite(min_free_ratio=0.1)
+    assert result["vacuumed"] and result["bytes_after"] < result["bytes_before"]
+    assert job_storage_stats()["free_bytes"] < before["free_bytes"]
+    assert [row["job_id"] for row in browse_jobs({"text": "spark"})[0]] == ["j7"]
+    assert vacuum_sqlite(min_free_ratio=0.5)["vacuumed"] is False
+
+
+def test_rebuild_collection_keeps_live_vectors(scout, tmp_path):
+    client = get_chroma_client(str(tmp_path / "chroma"))
+    collection = get_or_create_collection(client, "jobs")
+    collection.add(ids=[f"j{i}" for i in range(30)], embeddings=[[float(i), 1.0] for i in range(30)],
+                   documents=[f"doc {i}" for i in range(30)], metadatas=[{"n": i} for i in range(30)])
+    collection.delete(ids=[f"j{i}" for i in range(20)])
+    scout.job_collection = collection
+    expire_jobs(collection, now=time.time())  # logs nothing: nothing is stale
+
+    rebuilt = rebuild_collection(client, "jobs", batch_size=4)
+    assert rebuilt.count() == 10 and sorted(rebuilt.get()["ids"]) == sorted(f"j{i}" for i in range(20, 30))
+    assert rebuilt.get(ids=["j25"], include=["metadatas"])["metadatas"] == [{"n": 25}]
+    assert [c.name for c in client.list_collections()] == ["jobs"]
+    assert vectors_deleted_since_rebuild() == 0
@@ -1,4 +1,10 @@
+import json
+import threading
+import time
+
+import src.config as config
 from src.agents.match_rank import MatchRankAgent
+from src.storage.sqlite import init_db
 
 
 def test_parse_llm_json_extracts_embedded_array():
@@ -104,3 +110,94 @@ def test_llm_rerank_fills_missing_with_hybrid(monkeypatch):
     assert result["job-keep"]["score_0_to_100"] == 70
     assert result["job-miss"]["score_0_to_100"] == 55
     assert "Filled from hybrid score" in result["job-miss"]["short_reason"]
+
+
+def test_llm_rerank_batches_share_a_stable_prefix(monkeypatch):
+    agent = MatchRankAgent(None, None)
+    agent.llm_batch_size = 2
+    sent = []
+
+    def fake_chat(messages, **_kwargs):
+        sent.append(messages)
+        jobs = json.loads(messages[-1]["content"].split("\n\n")[0])["jobs"]
+        # Drop the last job of each first attempt so the retry path runs too.
+        keep = jobs if len(sent) > 1 and len(jobs) == 1 else jobs[:-1] or jobs
+        return json.dumps([{"job_id": job["job_id"], "score_0_to_100": 50} for job in keep])
+
+    monkeypatch.setattr("src.agents.match_rank.chat", fake_chat)
+    jobs = [{"job_id": f"job-{i}", "description": "desc"} for i in range(5)]
+
+    result = agent._llm_rerank("resume text", jobs)
+
+    assert sorted(result) == [f"job-{i}" for i in range(5)]
+    assert all(messages[:2] == sent[0][:2] for messages in sent)
+    assert "resume text" in sent[0][1]["content"]
+    assert all("resume text" not in messages[-1]["content"] for messages in sent)
+    # Retries only resend the dropped job.
+    retried = [json.loads(m[-1]["content"].split("\n\n")[0])["jobs"] for m in sent if "\n\n" in m[-1]["content"]]
+    assert retried and all(len(batch) == 1 for batch in retried)
+
+
+def _stub_retrieval(monkeypatch, n_jobs=3):
+    monkeypatch.setattr("src.agents.match_rank.vectordb.get", lambda *_a, **_k: {"documents": ["python resume"]})
+    monkeypatch.setattr(
+        "src.agents.match_rank.vectordb.query",
+        lambda *_a, **_k: {
+            "ids": [[f"job-{i}" for i in range(n_jobs)]],
+            "metadatas": [[{"title": f"t{i}", "description": "python role"} for i in range(n_jobs)]],
+            "distances": [[0.1 * (i + 1) for i in range(n_jobs)]],
+            "documents": [["python role"] * n_jobs],
+        },
+    )
+    monkeypatch.setattr("src.agents.match_rank.embed", lambda *_args, **_kwargs: [0.1, 0.2])
+    monkeypatch.setattr("src.agents.match_rank.get_residency_manager", lambda: type("R", (), {"prewarm": lambda *_a: None})())
+
+
+def test_rank_with_deadline_returns_hybrid_and_backfills(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    _stub_retrieval(monkeypatch)
+    release = threading.Event()
+
+    def slow_chat(messages, **_kwargs):
+        release.wait(5)
+        jobs = json.loads(messages[-1]["content"])["jobs"]
+        return json.dumps([{"job_id": job["job_id"], "score_0_to_100": 90 - i} for i, job in enumerate(jobs)])
+
+    monkeypatch.setattr("src.agents.match_rank.chat", slow_chat)
+    agent = MatchRankAgent(None, None)
+
+    started = time.monotonic()
+    results = agent.rank("r1", top_k=3, deadline_s=0.1)
+    assert time.monotonic() - started < 2
+    assert [job["job_id"] for job in results] == ["job-0", "job-1", "job-2"]
+    assert all(job["llm_pending"] and "match" not in job for job in results)
+    run_id = results[0]["run_id"]
+    assert agent.fetch_results(run_id)[1] in {"pending", "running"}
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while agent.fetch_results(run_id)[1] != "done" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    jobs, status = agent.fetch_results(run_id)
+    assert status == "done"
+    assert [job["match"]["score_0_to_100"] for job in jobs] == [90, 89, 88]
+
+
+def test_rank_without_deadline_persists_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    _stub_retrieval(monkeypatch, n_jobs=2)
+    monkeypatch.setattr(
+        "src.agents.match_rank.chat",
+        lambda _messages, **_kwargs: '[{"job_id": "job-1", "score_0_to_100": 95}]',
+    )
+    agent = MatchRankAgent(None, None)
+
+    results = agent.rank("r1", top_k=2)
+
+    assert results[0]["job_id"] == "job-1"
+    assert not any(job.get("llm_pending") for job in results)
+    stored, status = agent.fetch_results(results[0]["run_id"])
+    assert status == "done"
+    assert [job["job_id"] for job in stored] == ["job-1", "job-0"]
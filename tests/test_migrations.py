@@ -0,0 +1,103 @@
+import sqlite3
+
+import pytest
+
+import src.config as config
+from src.models import Job
+from src.storage import migrations
+from src.storage.migrations import (
+    MIGRATIONS,
+    current_version,
+    migrate,
+    migration_status,
+    run_backfills,
+)
+from src.storage.sqlite import browse_jobs, get_conn, init_db, insert_job
+
+LATEST = MIGRATIONS[-1].version
+
+
+def _legacy_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (job_id TEXT PRIMARY KEY, title TEXT, company TEXT, location TEXT, url TEXT UNIQUE, source TEXT, posted_at TEXT, description TEXT, added_at TEXT)"
+    )
+    conn.executemany("INSERT INTO jobs VALUES (?, 'Engineer', 'Acme', 'Remote', ?, 's', ?, 'python', '2025-01-01')", rows)
+    conn.commit()
+    conn.close()
+
+
+def _jobs(path):
+    conn = sqlite3.connect(path)
+    rows = {row[0]: row[1:] for row in conn.execute("SELECT job_id, posted_ts, content_hash, vector_state FROM jobs")}
+    conn.close()
+    return rows
+
+
+def test_fresh_database_is_at_latest_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    init_db()
+    assert current_version() == LATEST
+    assert all(row["backfilled_at"] for row in migration_status())
+
+    insert_job(Job(job_id="j1", title="t", company="c", url="u", source="s", posted_at="2026-01-01T00:00:00Z", description="d"))
+    posted_ts, content_hash, vector_state = _jobs(tmp_path / "app.db")["j1"]
+    assert posted_ts == 1767225600.0
+    assert content_hash and vector_state is None
+
+
+def test_legacy_database_upgrades_with_batched_backfills(tmp_path, monkeypatch):
+    db_path = tmp_path / "old.db"
+    monkeypatch.setattr(config, "SQLITE_PATH", str(db_path))
+    _legacy_db(
+        db_path,
+        [
+            ("a", "u1", "2026-01-01T00:00:00"),
+            ("b", "u2", "2026-01-01T02:00:00+02:00"),
+            ("c", "u3", "1767225600000"),
+            ("d", "u4", "not a date"),
+            ("e", "u5", None),
+        ],
+    )
+
+    assert migrate() == [m.version for m in MIGRATIONS]
+    assert {row["version"]: bool(row["backfilled_at"]) for row in migration_status()} == {1: True, 2: False, 3: False, 4: False, 5: True, 6: True, 7: True, 8: False, 9: False, 10: True, 11: True}
+    insert_job(Job(job_id="new", title="t", company="c", url="u6", source="s", posted_at=None, description="python"))
+    assert run_backfills(batch_size=2, pause_s=0) == {2: 3, 3: 3, 4: 3, 8: 3, 9: 3}
+    assert len(browse_jobs({"text": "python"})[0]) == 6
+    conn = get_conn()
+    assert conn.execute("SELECT COUNT(*) FROM jobs_fts WHERE jobs_fts MATCH 'python'").fetchone()[0] == 6  # no double indexing
+    conn.close()
+    jobs = _jobs(db_path)
+    assert jobs["new"][1]
+    assert [jobs[key][0] for key in "abcde"] == [1767225600.0, 1767225600.0, 1767225600.0, None, None]
+    assert len({jobs[key][1] for key in "abcde"}) == 1  # same posting text, same hash
+    conn = get_conn()
+    assert conn.execute("SELECT COUNT(*) FROM jobs WHERE last_seen_at = 1735689600.0").fetchone()[0] == 5  # added_at
+    assert conn.execute("SELECT COUNT(DISTINCT job_id) FROM job_lsh").fetchone()[0] == 5
+    conn.close()
+
+    assert migrate() == []
+    assert run_backfills() == {}
+
+
+def test_interrupted_backfill_resumes_from_cursor(tmp_path, monkeypatch):
+    db_path = tmp_path / "old.db"
+    monkeypatch.setattr(config, "SQLITE_PATH", str(db_path))
+    _legacy_db(db_path, [(f"j{i}", f"u{i}", "2026-01-01T00:00:00") for i in range(10)])
+    migrate()
+
+    def _interrupt(_seconds):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(migrations.time, "sleep", _interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        run_backfills(batch_size=4, pause_s=1)
+    conn = get_conn()
+    cursor = conn.execute("SELECT backfill_cursor FROM schema_version WHERE version = 2").fetchone()[0]
+    conn.close()
+    assert cursor == 4
+
+    assert run_backfills(batch_size=4, pause_s=0) == {2: 2, 3: 3, 4: 3, 8: 3, 9: 3}
+    assert all(row[0] == 1767225600.0 and row[1] for row in _jobs(db_path).values())
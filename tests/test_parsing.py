@@ -1,6 +1,15 @@
-from src.tools.parsing import strip_html
+from src.tools.parsing import posted_epoch, strip_html
 
 
 def test_strip_html_basic():
     html = "<div>Hello <b>World</b><br/>New line</div>"
     assert strip_html(html) == "Hello World New line"
+
+
+def test_posted_epoch_formats():
+    assert posted_epoch("2026-01-01T00:00:00") == 1767225600.0
+    assert posted_epoch("2026-01-01T00:00:00Z") == 1767225600.0
+    assert posted_epoch("2025-12-31T19:00:00-05:00") == 1767225600.0
+    assert posted_epoch("1767225600000") == posted_epoch("1767225600") == 1767225600.0
+    assert posted_epoch("yesterday") is None
+    assert posted_epoch(None) is None
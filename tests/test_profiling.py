@@ -0,0 +1,95 @@
+import json
+import threading
+import tracemalloc
+
+import src.config as config
+from src import profiling
+
+
+def _work():
+    return sorted(str(i) for i in range(2000))
+
+
+def test_disabled_profiling_is_a_noop(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "_enabled", False)
+
+    assert profiling.profile_run("r1", "rank") is profiling.profile_run("r2", "rank")
+    with profiling.profile_run("r1", "rank"):
+        _work()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_saves_hot_functions_and_allocations(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path))
+    profiling.set_profiling(True, trace_memory=True)
+    try:
+        # Nested runs are not profiled separately.
+        with profiling.profile_run("run-1", "rank"), profiling.profile_run("nested", "rank"):
+            _work()
+    finally:
+        profiling.set_profiling(False, trace_memory=False)
+
+    profiles = profiling.list_profiles()
+    assert [p["run_id"] for p in profiles] == ["run-1"]
+    summary = profiles[0]
+    assert any("_work" in row["function"] for row in summary["hot_functions"])
+    assert summary["allocations"]
+    assert (tmp_path / summary["prof_file"]).exists()
+
+
+def test_overlapping_runs_share_tracemalloc(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path))
+    profiling.set_profiling(True, trace_memory=True)
+    a_started, a_done = threading.Event(), threading.Event()
+    errors = []
+
+    def _run_a():
+        try:
+            with profiling.profile_run("run-a", "rank"):
+                a_started.set()
+                _work()
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            a_done.set()
+
+    def _run_b():
+        try:
+            a_started.wait(5)
+            with profiling.profile_run("run-b", "rank"):
+                a_done.wait(5)  # run A finishes while B is still tracing
+                _work()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_run_a), threading.Thread(target=_run_b)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+    finally:
+        profiling.set_profiling(False, trace_memory=False)
+
+    assert errors == []
+    assert {p["run_id"] for p in profiling.list_profiles()} == {"run-a", "run-b"}
+    assert not tracemalloc.is_tracing()
+
+
+def test_retention_keeps_newest_profiles(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "PROFILE_RETENTION", 2)
+    profiling.set_profiling(True, trace_memory=False)
+    try:
+        for i in range(4):
+            with profiling.profile_run(f"run-{i}", "job_search"):
+                _work()
+    finally:
+        profiling.set_profiling(False)
+
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert len(list(tmp_path.glob("*.prof"))) == 2
+    kept = {json.loads(p.read_text())["run_id"] for p in tmp_path.glob("*.json")}
+    assert kept == {"run-2", "run-3"}
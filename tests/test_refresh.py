@@ -0,0 +1,181 @@
+import random
+import threading
+import time
+
+import pytest
+
+import src.config as config
+from src.agents.job_scout import JobScoutAgent
+from src.models import Job
+from src.refresh import (
+    RefreshScheduler,
+    add_saved_query,
+    base_interval,
+    next_interval,
+    remove_saved_query,
+    retry_interval,
+)
+from src.storage.sqlite import init_db, list_refresh_targets
+from src.tools.job_sources.base import BaseJobSource
+
+
+class _Boards(BaseJobSource):
+    name = "boards"
+
+    def __init__(self, listings, delay_s=0.0):
+        self.listings = listings
+        self.delay_s = delay_s
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def search(self, _query, _limit=50):
+        return []
+
+    def boards(self):
+        return list(self.listings)
+
+    def search_board(self, board, _query, _limit=50):
+        with self._lock:
+            self.calls.append(board)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay_s)
+            listing = self.listings[board]
+            if isinstance(listing, Exception):
+                raise listing
+            return [
+                Job(job_id=f"{board}-{i}", title=title, company=board, url=f"https://{board}/{i}", source=self.name, description=title)
+                for i, title in enumerate(listing)
+            ]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class _Collection:
+    def __init__(self):
+        self.writes = []
+
+    def add(self, ids, **_fields):
+        self.writes.extend(ids)
+
+    def upsert(self, ids, **_fields):
+        self.writes.extend(ids)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    monkeypatch.setattr(config, "REFRESH_INTERVAL_S", 3600)
+    monkeypatch.setattr(config, "REFRESH_INTERVALS", {"boards:hot": 600})
+    monkeypatch.setattr(config, "REFRESH_MAX_INTERVAL_S", 4 * 3600)
+    monkeypatch.setattr(config, "REFRESH_BACKOFF", 2.0)
+    monkeypatch.setattr(config, "REFRESH_JITTER", 0.1)
+    monkeypatch.setattr("src.agents.job_scout.embed", lambda *_args, **_kwargs: [0.1, 0.2])
+    init_db()
+
+
+def _scheduler(source, clock, **kwargs):
+    scout = JobScoutAgent(_Collection())
+    scout.sources = [source]
+    return RefreshScheduler(scout, rng=random.Random(0), clock=clock, **kwargs)
+
+
+def _targets():
+    return {(row["board"], row["query"]): row for row in list_refresh_targets()}
+
+
+@pytest.mark.usefixtures("db")
+def test_interval_helpers():
+    assert base_interval("boards", "hot") == 600
+    assert base_interval("boards", "cold") == 3600
+    assert next_interval(None, 3600, changed=False) == 3600
+    assert next_interval(3600, 3600, changed=False) == 7200
+    assert next_interval(4 * 3600, 3600, changed=False) == 4 * 3600
+    assert next_interval(4 * 3600, 3600, changed=True) == 3600
+    assert [retry_interval(3600, n) for n in (1, 2, 3, 5)] == [300, 600, 1200, 3600]
+
+
+@pytest.mark.usefixtures("db")
+def test_unchanged_boards_back_off_and_changes_reset():
+    clock = _Clock()
+    source = _Boards({"hot": ["python dev"], "cold": ["python lead"]})
+    scheduler = _scheduler(source, clock)
+    add_saved_query("python", 10)
+    assert scheduler.sync_targets() == 2
+
+    first = scheduler.run_due()
+    assert sorted(o.board for o in first) == ["cold", "hot"] and all(o.changed and o.added == 1 for o in first)
+    writes = len(scheduler.scout.job_collection.writes)
+
+    clock.now += 3600 * 1.2
+    second = {o.board: o for o in scheduler.run_due()}
+    assert not second["cold"].changed and second["cold"].unchanged == 1 and second["cold"].added == 0
+    assert len(scheduler.scout.job_collection.writes) == writes  # nothing re-embedded
+    targets = _targets()
+    assert targets[("cold", "python")]["interval_s"] == 7200 and targets[("cold", "python")]["unchanged_runs"] == 1
+    assert targets[("hot", "python")]["interval_s"] == 1200
+    next_due = targets[("cold", "python")]["next_due_at"]
+    assert clock.now + 7200 * 0.9 <= next_due <= clock.now + 7200 * 1.1
+
+    source.listings["hot"] = ["python dev", "python intern"]
+    clock.now += 1200 * 1.2
+    (third,) = scheduler.run_due()
+    assert third.board == "hot" and third.changed and third.added == 1 and third.unchanged == 1
+    hot = _targets()[("hot", "python")]
+    assert hot["interval_s"] == 600 and hot["last_changed_at"] == clock.now and hot["last_seen_at"] == clock.now
+
+
+@pytest.mark.usefixtures("db")
+def test_failures_retry_sooner_and_keep_last_seen():
+    clock = _Clock()
+    source = _Boards({"hot": ["python dev"]})
+    scheduler = _scheduler(source, clock)
+    add_saved_query("python")
+    scheduler.sync_targets()
+    scheduler.run_due()
+    seen = _targets()[("hot", "python")]["last_seen_at"]
+
+    source.listings["hot"] = RuntimeError("502 from board")
+    clock.now += 1000
+    (outcome,) = scheduler.run_due()
+    assert "502" in outcome.error
+    target = _targets()[("hot", "python")]
+    assert target["failures"] == 1 and target["last_seen_at"] == seen and "502" in target["last_error"]
+    assert target["next_due_at"] <= clock.now + 300 * 1.1
+
+
+@pytest.mark.usefixtures("db")
+def test_boards_run_in_parallel_within_limits():
+    source = _Boards({f"b{i}": ["python"] for i in range(8)}, delay_s=0.05)
+    scheduler = _scheduler(source, time.time, concurrency=4, per_source_concurrency=3)
+    add_saved_query("python")
+    scheduler.sync_targets()
+    started = time.perf_counter()
+    assert len(scheduler.run_due()) == 8
+    assert time.perf_counter() - started < 8 * 0.05
+    assert source.peak == 3
+
+
+@pytest.mark.usefixtures("db")
+def test_removed_queries_and_boards_drop_their_targets():
+    source = _Boards({"hot": ["python"], "cold": ["python"]})
+    scheduler = _scheduler(source, _Clock())
+    add_saved_query("python")
+    add_saved_query("rust")
+    assert scheduler.sync_targets() == 4
+    remove_saved_query("rust")
+    del source.listings["cold"]
+    assert scheduler.sync_targets() == 1
+    assert list(_targets()) == [("hot", "python")]
@@ -0,0 +1,58 @@
+import pytest
+
+from src.llm import client
+from src.llm.residency import ResidencyManager, keep_alive_seconds, keep_alive_value
+
+
+def test_keep_alive_parsing():
+    assert keep_alive_value("30m") == "30m"
+    assert keep_alive_value("-1") == -1
+    assert keep_alive_value("") is None
+    assert keep_alive_seconds("30m") == 1800
+    assert keep_alive_seconds("90s") == 90
+    assert keep_alive_seconds(-1) == float("inf")
+
+
+def test_observe_separates_load_from_inference():
+    now = {"t": 0.0}
+    manager = ResidencyManager(keep_alive={"chat": "5m"}, clock=lambda: now["t"])
+    manager.observe("http://a", "llama3.1", "chat", {"load_duration": 4_000_000_000, "total_duration": 5_000_000_000})
+    manager.observe("http://a", "llama3.1", "chat", {"load_duration": 5_000_000, "total_duration": 1_005_000_000})
+
+    row = manager.stats()[0]
+    assert row["loads"] == 1
+    assert row["last_load_ms"] == 4000
+    assert row["calls"] == 2
+    assert row["inference_p95_ms"] == 1000
+    assert manager.is_warm("http://a", "llama3.1", "chat")
+    now["t"] = 301
+    assert not manager.is_warm("http://a", "llama3.1", "chat")
+
+
+def test_load_sends_keep_alive_and_records_load_time():
+    sent = []
+
+    def fake_post(url, payload):
+        sent.append((url, payload))
+        return {"load_duration": 2_500_000_000}
+
+    manager = ResidencyManager(keep_alive={"embed": "30m", "chat": "-1"}, post=fake_post)
+    assert manager.load("http://a", "llama3.1", "chat") == pytest.approx(2.5)
+    manager.load("http://a", "nomic-embed-text", "embed")
+
+    assert sent[0] == ("http://a/api/chat", {"model": "llama3.1", "messages": [], "stream": False, "keep_alive": -1})
+    assert sent[1] == ("http://a/api/embed", {"model": "nomic-embed-text", "input": [], "keep_alive": "30m"})
+    assert manager.is_warm("http://a", "llama3.1", "chat")
+
+
+def test_prewarm_skips_models_that_are_already_warm(monkeypatch):
+    sent = []
+    manager = ResidencyManager(keep_alive={"embed": "30m", "chat": "15m"}, post=lambda url, _payload: sent.append(url) or {})
+    monkeypatch.setattr(client, "_runtime_config", client.LLMConfig(provider="ollama", base_url="http://a,http://b"))
+    manager.observe("http://a", client.get_active_config().model, "chat", {})
+
+    thread = manager.prewarm("chat")
+    thread.join(timeout=5)
+
+    assert sent == ["http://b/api/chat"]
+    assert manager.prewarm("chat") is None
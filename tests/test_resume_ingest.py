@@ -0,0 +1,176 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+import src.config as config
+from src.agents import resume_ingest
+from src.agents.resume_ingest import ResumeIngestAgent, parse_files, resume_paths
+from src.llm import clear_runtime_llm_config, set_runtime_llm_config
+from src.storage.sqlite import get_parsed_text, init_db, list_resumes
+from src.tools.chunking import chunk_text
+from src.tools.parsing import PARSER_VERSION, extract_text, file_hash
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from corpus import simple_pdf, write_resume_files  # noqa: E402
+
+
+class _Collection:
+    def __init__(self):
+        self.records = {}
+
+    @property
+    def ids(self):
+        return list(self.records)
+
+    def upsert(self, ids, documents, metadatas, embeddings):
+        assert len(ids) == len(documents) == len(embeddings)
+        self.records.update(zip(ids, zip(documents, metadatas, embeddings, strict=True), strict=True))
+
+    def get(self, where=None, **_kwargs):
+        rows = [(key, *record) for key, record in self.records.items() if record[1]["resume_id"] == where["resume_id"]]
+        return {
+            "ids": [row[0] for row in rows],
+            "documents": [row[1] for row in rows],
+            "metadatas": [row[2] for row in rows],
+            "embeddings": [row[3] for row in rows],
+        }
+
+    def delete(self, ids):
+        for key in ids:
+            del self.records[key]
+
+
+@pytest.fixture
+def resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    folder = tmp_path / "resumes"
+    write_resume_files(folder / "nested", 6, lines_per_page=8)
+    (folder / "broken.pdf").write_bytes(b"not a pdf")
+    (folder / "empty.txt").write_text("   ")
+    (folder / "notes.md").write_text("ignored")
+    return folder
+
+
+def test_long_pdfs_parse_page_parallel_like_serial(tmp_path):
+    path = tmp_path / "long.pdf"
+    path.write_bytes(simple_pdf([f"page {i}\npython and spark" for i in range(11)]))
+    ((_, text, error),) = list(parse_files([str(path)], workers=2, pages_per_task=3))
+    assert error is None and text == extract_text(str(path))
+    assert text.count("python and spark") == 11
+
+
+def test_ingest_many_batches_embeddings_and_reports_failures(resumes, monkeypatch):
+    calls = []
+
+    async def _fake_embed_many(texts, **_kwargs):
+        calls.append(len(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    monkeypatch.setattr(resume_ingest, "aembed_many", _fake_embed_many)
+    paths = resume_paths(str(resumes))
+    assert len(paths) == 8 and not any(path.endswith(".md") for path in paths)
+    assert resume_paths(str(resumes / "nested" / "*.pdf")) == [p for p in paths if p.endswith(".pdf") and "nested" in p]
+
+    progress = []
+    agent = ResumeIngestAgent(_Collection())
+    result = agent.ingest_many(paths, workers=2, embed_batch=10, on_progress=progress.append)
+
+    assert len(result.ingested) == 6 and len(list_resumes()) == 6
+    failed = {Path(entry["path"]).name: entry["error"] for entry in result.failed}
+    assert set(failed) == {"broken.pdf", "empty.txt"} and "empty" in failed["empty.txt"]
+    chunks = sum(entry["chunks"] for entry in result.ingested)
+    assert sum(calls) == chunks == len(agent.resume_collection.ids)
+    assert len(calls) < 6  # several files per embedding round
+    assert progress[-1] == {"files": 8, "parsed": 8, "ingested": 6, "skipped": 0, "failed": 2}
+    assert result.resumes_per_min > 0 and {"parse", "embed", "store"} <= set(result.stages)
+
+
+def test_embedding_failure_fails_only_that_round(resumes, monkeypatch):
+    async def _flaky_embed_many(texts, **_kwargs):
+        if any("Candidate 1" in text for text in texts):
+            raise RuntimeError("embedding host down")
+        return [[0.0, 1.0] for _ in texts]
+
+    monkeypatch.setattr(resume_ingest, "aembed_many", _flaky_embed_many)
+    paths = resume_paths(str(resumes / "nested"))
+    result = ResumeIngestAgent(_Collection()).ingest_many(paths, workers=1, embed_batch=1)
+    assert [Path(entry["path"]).name for entry in result.failed] == ["resume-0001.docx"]
+    assert len(result.ingested) == 5
+
+
+def _no_parse(path):
+    raise AssertionError(f"{path} parsed again")
+
+
+def test_reupload_resolves_to_existing_resume(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    embedded = []
+    monkeypatch.setattr(resume_ingest, "embed", lambda text, **_kwargs: embedded.append(text) or [float(len(text)), 1.0])
+    first = tmp_path / "a" / "cv.txt"
+    first.parent.mkdir()
+    first.write_text("Python engineer\nspark and airflow pipelines\n" + "".join(f"built pipeline {i}\n" for i in range(200)))
+    agent = ResumeIngestAgent(_Collection())
+    resume_id = agent.ingest(str(first))
+    assert resume_id == file_hash(str(first))[:32] and get_parsed_text(file_hash(str(first)), PARSER_VERSION)
+    chunks = len(agent.resume_collection.ids)
+    assert len(embedded) == chunks > 1
+
+    copy = tmp_path / "b" / "renamed.txt"
+    copy.parent.mkdir()
+    copy.write_bytes(first.read_bytes())
+    monkeypatch.setattr(resume_ingest, "extract_text", _no_parse)
+    assert agent.ingest(str(copy), display_name="renamed.txt") == resume_id
+    assert len(embedded) == chunks and len(agent.resume_collection.ids) == chunks
+    assert [row["filename"] for row in list_resumes()] == ["cv.txt"]
+
+    # New chunking: the text comes from the cache, chunks that did not change keep their vectors.
+    embedded.clear()
+    monkeypatch.setattr(resume_ingest, "CHUNKING_KEY", "lines-v1")
+    monkeypatch.setattr(resume_ingest, "chunk_text", lambda text: chunk_text(text)[:1] + text.splitlines()[:2])
+    assert agent.ingest(str(copy)) == resume_id
+    assert embedded == ["Python engineer", "spark and airflow pipelines"]
+    assert sorted(agent.resume_collection.ids) == [f"{resume_id}:{i}" for i in range(3)]
+    assert agent.ingest(str(copy)) == resume_id and len(embedded) == 2
+
+    # New embedding model: every chunk is embedded again.
+    set_runtime_llm_config(provider="ollama", embed_model="other-embed")
+    try:
+        assert agent.ingest(str(copy)) == resume_id
+    finally:
+        clear_runtime_llm_config()
+    assert len(embedded) == 2 + 3
+    assert {meta["embed_model"] for _doc, meta, _vector in agent.resume_collection.records.values()} == {"ollama:other-embed"}
+
+
+def test_ingest_many_skips_known_files_and_shares_copies(resumes, monkeypatch):
+    calls = []
+
+    async def _fake_embed_many(texts, **_kwargs):
+        calls.extend(texts)
+        return [[0.0, 1.0] for _ in texts]
+
+    monkeypatch.setattr(resume_ingest, "aembed_many", _fake_embed_many)
+    nested = resumes / "nested"
+    (nested / "zz-copy.txt").write_bytes((nested / "resume-0002.txt").read_bytes())
+    paths = resume_paths(str(nested))
+    agent = ResumeIngestAgent(_Collection())
+    result = agent.ingest_many(paths, workers=1)
+    by_name = {Path(entry["path"]).name: entry for entry in result.files}
+    assert len(result.ingested) == 6 and len(list_resumes()) == 6
+    assert by_name["zz-copy.txt"]["skipped"] and by_name["zz-copy.txt"]["resume_id"] == by_name["resume-0002.txt"]["resume_id"]
+    stored = len(agent.resume_collection.ids)
+
+    calls.clear()
+    monkeypatch.setattr(resume_ingest, "extract_text", _no_parse)
+    again = agent.ingest_many(paths, workers=1)
+    assert not again.ingested and not again.failed and len(again.skipped) == 7
+    assert calls == [] and len(agent.resume_collection.ids) == stored
+
+    # After a chunking change the batch re-chunks from cached text without parsing.
+    monkeypatch.setattr(resume_ingest, "CHUNKING_KEY", "changed")
+    rechunked = agent.ingest_many(paths, workers=1)
+    assert len(rechunked.ingested) == 6 and calls == [] and len(list_resumes()) == 6
@@ -1,7 +1,9 @@
 import os
+import sqlite3
 import tempfile
 
 from src.storage.sqlite import init_db, insert_resume, list_resumes, insert_job, list_jobs
+from src.storage.sqlite import browse_jobs, count_jobs, get_match_run, log_match_run, set_match_rerank_status
 from src.models import Job
 import src.config as config
 
@@ -18,3 +20,83 @@ def test_init_and_insert(tmp_path, monkeypatch):
     insert_job(job)
     jobs = list_jobs()
     assert jobs[0]["job_id"] == "j1"
+
+
+def test_init_db_adds_rerank_status_to_existing_match_runs(tmp_path, monkeypatch):
+    db_path = tmp_path / "old.db"
+    monkeypatch.setattr(config, "SQLITE_PATH", str(db_path))
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE match_runs (run_id TEXT PRIMARY KEY, resume_id TEXT, started_at TEXT, finished_at TEXT, top_k INTEGER, notes TEXT)")
+    conn.execute("INSERT INTO match_runs VALUES ('m1', 'r1', 's', 'f', 5, 'llm')")
+    conn.commit()
+    conn.close()
+
+    init_db()
+    set_match_rerank_status("m1", "done")
+    log_match_run("m1", "r1", "s", "f2", 5, "llm")
+
+    row = get_match_run("m1")
+    assert (row["finished_at"], row["rerank_status"]) == ("f2", "done")
+
+
+def _browse_all(**kwargs):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = browse_jobs(after=cursor, page_size=3, **kwargs)
+        seen.extend(row["job_id"] for row in rows)
+        if cursor is None:
+            return seen
+
+
+def test_browse_jobs_keyset_pages_and_filters(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "browse.db"))
+    init_db()
+    specs = [
+        ("j1", "Data Engineer", "Acme", "Berlin, DE", "lever", "2026-01-05T00:00:00", "kafka pipelines"),
+        ("j2", "Designer", "Globex", "Remote", "remotive", None, "figma"),
+        ("j3", "Backend Engineer", "Acme", "Remote - EU", "lever", "2026-02-01T10:00:00", "python services"),
+        ("j4", "Data Scientist", "Initech", "London, UK", "greenhouse", "2026-01-20T00:00:00", "python statistics"),
+        ("j5", "Platform Engineer", "Globex", "Berlin, DE", "remotive", "2026-01-05T00:00:00", "kubernetes"),
+        ("j6", "Analyst", "Acme", "Remote", "lever", "2025-12-30T00:00:00", "sql dashboards"),
+        ("j7", "Pythonista", "Hooli", "Remote", "greenhouse", "2026-03-01T00:00:00", "everything"),
+    ]
+    for job_id, title, company, location, source, posted_at, desc in specs:
+        insert_job(Job(job_id=job_id, title=title, company=company, location=location, url=f"https://x/{job_id}", source=source, posted_at=posted_at, description=desc))
+
+    for sort in ("added_at", "posted_at", "company", "title"):
+        for descending in (True, False):
+            ids = _browse_all(sort=sort, descending=descending)
+            assert sorted(ids) == sorted(spec[0] for spec in specs)
+    assert _browse_all(sort="title", descending=False) == ["j6", "j3", "j1", "j4", "j2", "j5", "j7"]
+    assert _browse_all(sort="posted_at", descending=True)[-1] == "j2"  # undated jobs sort last
+
+    assert set(_browse_all(filters={"source": "lever"})) == {"j1", "j3", "j6"}
+    assert set(_browse_all(filters={"company": "Globex", "location": "berlin"})) == {"j5"}
+    assert set(_browse_all(filters={"text": "pyth"})) == {"j3", "j4", "j7"}
+    assert set(_browse_all(filters={"text": 'python "services'})) == {"j3"}
+    assert set(_browse_all(filters={"posted_from": "2026-01-05", "posted_to": "2026-02-01"})) == {"j1", "j4", "j5"}
+    assert count_jobs({"text": "pyth", "source": "greenhouse"}) == 2
+
+    conn = sqlite3.connect(tmp_path / "browse.db")
+    conn.execute("UPDATE jobs SET description = 'rust' WHERE job_id = 'j3'")
+    conn.execute("DELETE FROM jobs WHERE job_id = 'j4'")
+    conn.commit()
+    conn.close()
+    assert set(_browse_all(filters={"text": "python"})) == {"j7"}
+    assert set(_browse_all(filters={"text": "rust"})) == {"j3"}
+
+
+def test_init_db_indexes_existing_jobs_for_full_text(tmp_path, monkeypatch):
+    db_path = tmp_path / "old.db"
+    monkeypatch.setattr(config, "SQLITE_PATH", str(db_path))
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE jobs (job_id TEXT PRIMARY KEY, title TEXT, company TEXT, location TEXT, url TEXT UNIQUE, source TEXT, posted_at TEXT, description TEXT, added_at TEXT)"
+    )
+    conn.execute("INSERT INTO jobs VALUES ('old', 'Data Engineer', 'Acme', 'Remote', 'u', 's', NULL, 'airflow', '2025-01-01')")
+    conn.commit()
+    conn.close()
+
+    init_db()
+    init_db()
+    assert [row["job_id"] for row in browse_jobs({"text": "airflow"})[0]] == ["old"]
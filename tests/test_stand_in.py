@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+import src.config as config
+from src.agents.match_rank import MatchRankAgent
+from src.llm import client, ollama_client
+from src.llm.scheduler import LLMScheduler
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from stand_in import hash_embedding, start_stand_in  # noqa: E402
+
+
+@pytest.fixture
+def llm_env(monkeypatch):
+    scheduler = LLMScheduler(failure_types=(client.LLMProviderError, ollama_client.OllamaError))
+    monkeypatch.setattr(client, "get_scheduler", lambda: scheduler)
+    monkeypatch.setattr(config, "LLM_METRICS", False)
+
+    def _use(provider, server):
+        base_url = server.url + "/v1" if provider == "openai" else server.url
+        monkeypatch.setattr(client, "_runtime_config", client.LLMConfig(provider=provider, base_url=base_url, api_key="x"))
+
+    return _use
+
+
+@pytest.mark.parametrize("provider", ["ollama", "openai"])
+def test_stand_in_embeds_deterministically_and_reranks(llm_env, provider):
+    server = start_stand_in(dim=16)
+    try:
+        llm_env(provider, server)
+        assert client.embed("python data engineer") == pytest.approx(hash_embedding("python data engineer", 16))
+
+        jobs = [
+            {"job_id": "job-1", "title": "Data Engineer", "description": "python spark pipelines"},
+            {"job_id": "job-2", "title": "Designer", "description": "figma branding"},
+        ]
+        first = MatchRankAgent(None, None)._llm_rerank("python spark engineer", jobs)
+        second = MatchRankAgent(None, None)._llm_rerank("python spark engineer", jobs)
+    finally:
+        server.shutdown()
+
+    assert sorted(first) == ["job-1", "job-2"]
+    assert first == second
+    assert 0 <= first["job-1"]["score_0_to_100"] <= 100
+    assert "python" in first["job-1"]["strengths"]
+
+
+def test_stand_in_failure_rate_surfaces_as_errors(llm_env):
+    server = start_stand_in(failure_rate=1.0)
+    try:
+        llm_env("openai", server)
+        with pytest.raises(client.LLMProviderError):
+            client.embed("anything")
+    finally:
+        server.shutdown()
+    assert server.state.failures == 1
+
+
+@pytest.mark.parametrize("provider", ["ollama", "openai"])
+def test_check_provider_probes_without_model_calls(llm_env, provider):
+    server = start_stand_in()
+    try:
+        llm_env(provider, server)
+        ok, _detail = client.check_provider(timeout=2)
+    finally:
+        server.shutdown()
+    assert ok
+    assert not any(path.startswith(("/api/embed", "/api/chat", "/v1/embeddings", "/v1/chat")) for path in server.state.requests)
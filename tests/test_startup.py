@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import src.config as config
+from src.storage.sqlite import init_db
+from src.storage.vectordb import lazy_collection
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("chromadb", "pypdf", "docx", "aiohttp", "numpy")
+
+
+def _loaded_after(code: str):
+    probe = f"import sys\n{code}\nprint('loaded:' + ','.join(name for name in {HEAVY!r} if name in sys.modules))"
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return [name for name in proc.stdout.rsplit("loaded:", 1)[1].strip().split(",") if name]
+
+
+def test_app_stack_imports_without_heavy_dependencies():
+    code = "import src.agents.match_rank, src.agents.job_scout, src.agents.resume_ingest, src.tasks, src.status, src.storage.migrations, src.storage.vectordb"
+    assert _loaded_after(code) == []
+
+
+def test_script_help_imports_without_heavy_dependencies():
+    code = (
+        "import runpy\n"
+        "sys.argv = ['scripts/match.py', '--help']\n"
+        "try:\n"
+        "    runpy.run_path('scripts/match.py', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+    assert _loaded_after(code) == []
+
+
+def test_lazy_collection_opens_on_first_use(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    collection = lazy_collection(str(tmp_path / "vdb"), "jobs")
+    assert not collection.opened and not (tmp_path / "vdb").exists()
+    collection.add(ids=["a"], documents=["python"], metadatas=[{"k": 1}], embeddings=[[0.0, 1.0]])
+    assert collection.opened and collection.count() == 1 and collection.name == "jobs"
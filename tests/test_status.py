@@ -0,0 +1,67 @@
+import threading
+import time
+
+import src.config as config
+from src.llm import clear_runtime_llm_config, set_runtime_llm_config
+from src.models import Job
+from src.status import StatusService
+from src.storage.sqlite import init_db, insert_job, insert_resume
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_llm_health_is_cached_and_refreshed_in_background():
+    set_runtime_llm_config(provider="ollama", base_url="http://stub:11434")
+    calls = []
+    release = threading.Event()
+
+    def checker(cfg):
+        calls.append(cfg.base_url)
+        release.wait(2)
+        return True, "Ollama reachable"
+
+    service = StatusService(ttl_s=60, checker=checker)
+    try:
+        started = time.perf_counter()
+        first = service.llm_health()
+        assert time.perf_counter() - started < 0.5
+        assert first.ok is None
+        assert service.llm_health().ok is None  # one refresh in flight, not two
+        release.set()
+        assert _wait_for(lambda: service.llm_health().ok is True)
+        for _ in range(5):
+            service.llm_health()
+        assert calls == ["http://stub:11434"]
+
+        service.ttl_s = 0
+        service.llm_health()
+        assert _wait_for(lambda: len(calls) == 2)
+
+        set_runtime_llm_config(provider="ollama", base_url="http://other:11434")
+        assert service.llm_health().ok is None
+    finally:
+        release.set()
+        clear_runtime_llm_config()
+
+
+def test_failed_probe_is_reported():
+    def checker(_cfg):
+        raise OSError("boom")
+
+    service = StatusService(ttl_s=60, checker=checker)
+    health = service.refresh()
+    assert (health.ok, health.detail) == (False, "boom")
+
+
+def test_counts_beyond_list_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    for i in range(250):
+        insert_job(Job(job_id=f"j{i}", title="t", company="c", location=None, url=f"u{i}", source="s", posted_at=None, description="d"))
+    insert_resume("r1", "file.pdf", "now")
+    assert StatusService(checker=lambda _cfg: (True, "")).counts() == {"resumes": 1, "jobs": 250}
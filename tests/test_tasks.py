@@ -0,0 +1,163 @@
+import threading
+import time
+
+import pytest
+
+import src.config as config
+from src import tasks
+from src.models import Job
+from src.storage.sqlite import claim_task, get_conn, init_db
+from src.tasks import TaskWorker, enqueue, get_task, list_tasks
+from src.tools.job_sources.base import BaseJobSource
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+
+
+@pytest.mark.usefixtures("db")
+def test_worker_runs_tasks_in_order_and_keeps_results():
+    seen = []
+
+    def echo(params, progress):
+        progress({"step": 1})
+        seen.append(params["n"])
+        return {"double": params["n"] * 2}
+
+    def boom(_params, progress):
+        progress({"step": "before"})
+        raise RuntimeError("source down")
+
+    first = enqueue("run_search", {"n": 1})
+    second = enqueue("ingest", {"n": 2})
+    failing = enqueue("rank", {})
+    worker = TaskWorker({"run_search": echo, "ingest": echo, "rank": boom}, parallelism=1)
+    while worker.run_once():
+        pass
+
+    assert seen == [1, 2]
+    done = get_task(first)
+    assert done["status"] == "done" and done["result"] == {"double": 2} and done["progress"] == {"step": 1}
+    assert done["attempts"] == 1 and done["worker"] == worker.name
+    assert get_task(second)["result"] == {"double": 4}
+    failed = get_task(failing)
+    assert failed["status"] == "failed" and "source down" in failed["error"] and failed["progress"] == {"step": "before"}
+    assert [task["task_id"] for task in list_tasks()] == [failing, second, first]
+    assert [task["task_id"] for task in list_tasks(kind="ingest")] == [second]
+    with pytest.raises(ValueError):
+        enqueue("unknown", {})
+
+
+@pytest.mark.usefixtures("db")
+def test_concurrent_claims_never_share_a_task():
+    ids = {enqueue("rank", {"i": i}) for i in range(40)}
+    claimed, errors = [], []
+
+    def claim_all(name):
+        try:
+            while True:
+                task = claim_task(name, "now", time.time())
+                if task is None:
+                    return
+                claimed.append(task["task_id"])
+        except Exception as exc:  # pragma: no cover - surfaced by the assert below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=claim_all, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert sorted(claimed) == sorted(ids)
+
+
+@pytest.mark.usefixtures("db")
+def test_stale_running_task_is_requeued_then_failed(monkeypatch):
+    monkeypatch.setattr(config, "TASK_STALE_S", 60)
+    monkeypatch.setattr(config, "TASK_MAX_ATTEMPTS", 2)
+    task_id = enqueue("rank", {})
+
+    def _abandon():
+        # A worker claims the task and dies without finishing or heartbeating.
+        assert claim_task("dead", "then", time.time() - 3600)["task_id"] == task_id
+
+    _abandon()
+    worker = TaskWorker({"rank": lambda _params, _progress: {"ok": True}}, parallelism=1)
+    assert worker.run_once()
+    assert get_task(task_id)["status"] == "done" and get_task(task_id)["attempts"] == 2
+
+    other = enqueue("rank", {})
+    conn = get_conn()
+    conn.execute("UPDATE tasks SET status = 'running', attempts = 2, heartbeat_at = 0 WHERE task_id = ?", (other,))
+    conn.commit()
+    conn.close()
+    assert not worker.run_once()
+    assert get_task(other)["status"] == "failed" and get_task(other)["error"] == "worker stopped responding"
+
+
+@pytest.mark.usefixtures("db")
+def test_progress_writes_are_throttled(monkeypatch):
+    task_id = enqueue("run_search", {})
+    claim_task("w", "now", time.time())
+    writes = []
+    monkeypatch.setattr(tasks, "set_task_progress", lambda _tid, progress, _now: writes.append(dict(progress)))
+    reporter = tasks._ProgressReporter(task_id, interval_s=60)
+    for i in range(100):
+        reporter({"embedded": i})
+    reporter.flush()
+    assert writes == [{"embedded": 0}, {"embedded": 99}]
+
+
+class _ListSource(BaseJobSource):
+    name = "listed"
+
+    def search(self, _query, _limit=50):
+        return [
+            Job(job_id="", title=f"Engineer {i}", company="Acme", url=f"https://example.com/{i}", source=self.name, description="python")
+            for i in range(3)
+        ]
+
+
+class _Collection:
+    def __init__(self):
+        self.ids = []
+
+    def upsert(self, ids, **_fields):
+        self.ids.extend(ids)
+
+
+@pytest.mark.usefixtures("db")
+def test_run_search_task_reports_per_source_progress(monkeypatch):
+    monkeypatch.setattr("src.agents.job_scout.embed", lambda *_args, **_kwargs: [0.1, 0.2])
+    monkeypatch.setattr(tasks, "PROGRESS_INTERVAL_S", 0.0)
+    monkeypatch.setattr("src.agents.job_scout.get_sources_from_env", lambda: [_ListSource()])
+    collection = _Collection()
+    handlers = tasks.agent_handlers(collection, None)
+
+    task_id = enqueue("run_search", {"query": "python", "limit_per_source": 3})
+    updates = []
+    monkeypatch.setattr(tasks, "set_task_progress", lambda _tid, progress, _now: updates.append(progress["embedded"]))
+    TaskWorker(handlers, parallelism=1).run_once()
+
+    task = get_task(task_id)
+    assert task["status"] == "done"
+    assert task["result"] == {"summary": {"listed": 3}, "added": 3}
+    assert updates == [0, 1, 2, 3, 3]
+    assert len(collection.ids) == 3
+
+
+@pytest.mark.usefixtures("db")
+def test_rank_task_reports_its_stages(monkeypatch):
+    jobs = [{"job_id": "a", "run_id": "r1"}, {"job_id": "b", "run_id": "r1", "llm_pending": True}]
+    monkeypatch.setattr("src.agents.match_rank.MatchRankAgent.rank", lambda _self, _resume_id, **_kwargs: jobs)
+    monkeypatch.setattr(tasks, "PROGRESS_INTERVAL_S", 0.0)
+    seen = []
+    monkeypatch.setattr(tasks, "set_task_progress", lambda _tid, progress, _now: seen.append(dict(progress)))
+    task_id = enqueue("rank", {"resume_id": "res-1", "deadline_s": 1.0})
+    TaskWorker(tasks.agent_handlers(_Collection(), None), parallelism=1).run_once()
+
+    assert get_task(task_id)["result"] == {"run_id": "r1", "jobs": 2}
+    assert seen == [{"stage": "rank"}, {"stage": "rerank", "jobs": 2, "pending": 1}]
@@ -0,0 +1,54 @@
+import src.config as config
+from src.storage.sqlite import get_run_spans, init_db, list_traced_runs, recent_stage_spans
+from src.tracing import Tracer, stage_percentiles
+
+
+def test_spans_nest_and_aggregate(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    tracer = Tracer("run-1", "job_search")
+    with tracer.span("run_search"):
+        with tracer.span("fetch", source="remotive"):
+            pass
+        for _ in range(3):
+            with tracer.span("embed", aggregate=True):
+                pass
+    tracer.flush()
+    tracer.flush()  # re-flushing rewrites rather than duplicating
+
+    rows = {row["name"]: row for row in get_run_spans("run-1")}
+    assert len(rows) == 3
+    assert rows["run_search"]["parent_id"] is None
+    assert rows["fetch"]["parent_id"] == rows["run_search"]["span_id"]
+    assert rows["fetch"]["attrs"] == '{"source": "remotive"}'
+    assert rows["embed"]["count"] == 3
+    assert list_traced_runs()[0]["run_id"] == "run-1"
+
+
+def test_span_records_time_when_block_raises(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    tracer = Tracer("run-err", "rank")
+    try:
+        with tracer.span("rank"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    tracer.flush()
+
+    assert [row["name"] for row in get_run_spans("run-err")] == ["rank"]
+
+
+def test_stage_percentiles_sum_spans_per_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    for i in range(1, 5):
+        tracer = Tracer(f"run-{i}", "rank")
+        with tracer.span("rank"):
+            pass
+        tracer.spans[0].duration_s = i / 10
+        tracer.flush()
+
+    stats = stage_percentiles([dict(row) for row in recent_stage_spans("rank", limit_runs=3)])
+
+    assert stats == [{"kind": "rank", "stage": "rank", "runs": 3, "p50_ms": 300.0, "p95_ms": 400.0}]
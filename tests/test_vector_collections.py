@@ -0,0 +1,107 @@
+import pytest
+
+import src.config as config
+from src.storage import vectordb
+from src.storage.sqlite import get_vector_collection, init_db, list_vector_collections
+from src.vector_collections import (
+    active_collection,
+    collection_name,
+    embed_model_key,
+    migrate_collection,
+)
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    monkeypatch.setattr(config, "VDB_JOBS_DIR", str(tmp_path / "vdb_jobs"))
+    monkeypatch.setattr(vectordb, "POINTER_CHECK_S", 0.0)
+    init_db()
+    jobs = vectordb.lazy_collection(config.VDB_JOBS_DIR, "jobs")
+    jobs.upsert(
+        ids=[f"j{i}" for i in range(5)],
+        documents=[f"job text {i}" for i in range(5)],
+        metadatas=[{"content_hash": f"h{i}"} for i in range(5)],
+        embeddings=[[float(i), 1.0] for i in range(5)],
+    )
+    return jobs
+
+
+def _embed(texts):
+    return [[float(len(text)), 0.0, 1.0] for text in texts]
+
+
+def test_existing_collection_is_registered_and_names_are_per_model(stores):
+    record = active_collection("jobs")
+    assert (record["name"], record["embed_model"], record["status"]) == ("jobs", embed_model_key(), "active")
+    assert stores.embed_model_key == embed_model_key()
+    name = collection_name("jobs", "ollama:mxbai-embed-large:latest")
+    assert name.startswith("jobs-ollama-mxbai-embed-large-latest-") and name != collection_name("jobs", "openai:mxbai-embed-large")
+
+
+def test_migration_switches_after_catching_up_with_concurrent_writes(stores):
+    old_model = stores.embed_model_key
+    seen = []
+
+    def _progress(progress):
+        seen.append(progress["stage"])
+        if progress["stage"] == "copy" and progress["copied"] == 2:
+            # The app keeps serving from the old collection and model while the copy runs.
+            assert stores.collection_name == "jobs" and vectordb.collection_embed_model(stores) == old_model.split(":", 1)[1]
+            stores.upsert(ids=["j9"], documents=["new job"], metadatas=[{"content_hash": "h9"}], embeddings=[[9.0, 1.0]])
+            stores.upsert(ids=["j0"], documents=["job text 0 v2"], metadatas=[{"content_hash": "h0b"}], embeddings=[[0.5, 1.0]])
+            stores.delete(ids=["j4"])
+
+    result = migrate_collection("jobs", model="ollama:new-embed", batch_size=2, embed=_embed, on_progress=_progress, grace_s=0)
+    assert result["switched"] and result["synced"] >= 1 and seen[-1] == "done"
+    assert stores.embed_model_key == "ollama:new-embed" and stores.collection_name == result["collection"]
+    page = stores.get(ids=["j0", "j9"], include=["documents", "embeddings", "metadatas"])
+    assert sorted(page["ids"]) == ["j0", "j9"] and len(page["embeddings"][0]) == 3 and "job text 0 v2" in page["documents"]
+    assert {meta["embed_model"] for meta in page["metadatas"]} == {"ollama:new-embed"}
+    assert stores.count() == 5 and not stores.get(ids=["j4"])["ids"]
+    statuses = {row["name"]: row["status"] for row in list_vector_collections("jobs")}
+    assert statuses == {"jobs": "retired", result["collection"]: "active"}
+    assert migrate_collection("jobs", model="ollama:new-embed", embed=_embed)["switched"] is False
+
+
+def test_grace_sync_keeps_writes_to_the_new_collection(stores):
+    old = vectordb.get_or_create_collection(vectordb.get_chroma_client(config.VDB_JOBS_DIR), "jobs")
+
+    def _progress(progress):
+        if progress["stage"] == "grace":
+            # Processes that followed the switch write to the new collection; a lagging one to the old.
+            assert stores.embed_model_key == "ollama:new-embed"
+            stores.upsert(ids=["j7"], documents=["after switch"], metadatas=[{"content_hash": "h7"}], embeddings=[[1.0, 0.0, 1.0]])
+            stores.upsert(ids=["j1"], documents=["job text 1 v2"], metadatas=[{"content_hash": "h1b"}], embeddings=[[2.0, 0.0, 1.0]])
+            old.upsert(ids=["j8"], documents=["lagging write"], metadatas=[{"content_hash": "h8"}], embeddings=[[8.0, 1.0]])
+
+    result = migrate_collection("jobs", model="ollama:new-embed", batch_size=2, embed=_embed, on_progress=_progress, grace_s=0.01)
+    assert result["synced"] == 1
+    page = stores.get(ids=["j1", "j7", "j8"], include=["documents"])
+    assert dict(zip(page["ids"], page["documents"], strict=True)) == {
+        "j1": "job text 1 v2",
+        "j7": "after switch",
+        "j8": "lagging write",
+    }
+
+
+@pytest.mark.usefixtures("stores")
+def test_interrupted_migration_resumes_from_its_cursor():
+    embedded = []
+
+    def _failing(texts):
+        if embedded:
+            raise RuntimeError("embedding host down")
+        embedded.extend(texts)
+        return _embed(texts)
+
+    with pytest.raises(RuntimeError):
+        migrate_collection("jobs", model="ollama:new-embed", batch_size=2, embed=_failing, grace_s=0)
+    building = get_vector_collection("jobs", "building")
+    assert (building["copied"], building["dim"], building["error"]) == (2, 3, "embedding host down")
+    assert active_collection("jobs")["name"] == "jobs"
+
+    embedded.clear()
+    resumed = migrate_collection("jobs", model="ollama:new-embed", batch_size=2, embed=lambda texts: embedded.extend(texts) or _embed(texts), grace_s=0)
+    assert resumed["switched"] and resumed["copied"] == 5
+    assert embedded == ["job text 2", "job text 3", "job text 4"]
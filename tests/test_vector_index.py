@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+import src.config as config
+from src.maintenance import rebuild_collection
+from src.storage.sqlite import init_db
+from src.storage.vectordb import get_chroma_client, get_or_create_collection, index_metadata
+from src.vector_index import collection_stats, exact_neighbors, load_vectors, recall_at_k, sweep
+
+
+def _vectors(n, dim=8, seed=0):
+    rng = random.Random(seed)
+    return [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(n)]
+
+
+def test_index_metadata_defaults_and_validation(monkeypatch):
+    monkeypatch.setattr(config, "VECTOR_SPACE", "cosine")
+    monkeypatch.setattr(config, "HNSW_M", 0)
+    monkeypatch.setattr(config, "HNSW_CONSTRUCTION_EF", 200)
+    monkeypatch.setattr(config, "HNSW_SEARCH_EF", 0)
+    assert index_metadata() == {"hnsw:space": "cosine", "hnsw:construction_ef": 200}
+    assert index_metadata("ip", m=32, search_ef=64) == {
+        "hnsw:space": "ip",
+        "hnsw:M": 32,
+        "hnsw:construction_ef": 200,
+        "hnsw:search_ef": 64,
+    }
+    with pytest.raises(ValueError):
+        index_metadata("euclid")
+
+
+def test_exact_neighbors_and_recall():
+    vectors = [[1.0, 0.0], [10.0, 1.0], [0.0, 1.0], [-1.0, 0.0]]
+    # Cosine ranks by angle, L2 by distance: the long vector is close in angle only.
+    assert exact_neighbors(vectors, [[1.0, 0.05]], 2, "cosine").tolist() == [[1, 0]]
+    assert exact_neighbors(vectors, [[1.0, 0.05]], 2, "l2").tolist() == [[0, 2]]
+    assert recall_at_k([["a", "b"], ["c", "x"]], [["a", "b"], ["c", "d"]]) == 0.75
+
+
+def test_new_collections_use_cosine_and_sweep_matches_exact_search(tmp_path):
+    collection = get_or_create_collection(get_chroma_client(str(tmp_path / "vdb")), "jobs")
+    vectors = _vectors(300)
+    collection.add(ids=[f"j{i}" for i in range(300)], embeddings=vectors)
+    stats = collection_stats(collection)
+    assert (stats["space"], stats["count"], stats["dim"]) == ("cosine", 300, 8)
+
+    ids, matrix = load_vectors(collection, batch_size=128)
+    assert len(ids) == 300 and matrix.shape == (300, 8)
+    rows = sweep(ids, matrix, _vectors(20, seed=1), ms=[8], construction_efs=[64], search_efs=[16, 128], k=5)
+    assert [(row["M"], row["search_ef"]) for row in rows] == [(8, 16), (8, 128)]
+    assert rows[-1]["recall@5"] >= 0.95 and rows[-1]["p50_ms"] > 0
+
+
+def test_rebuild_changes_index_settings_and_can_reembed(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    init_db()
+    client = get_chroma_client(str(tmp_path / "vdb"))
+    legacy = client.create_collection("jobs")  # created before VECTOR_SPACE: Chroma's L2 default
+    legacy.add(ids=["a", "b"], documents=["alpha", "beta"], embeddings=_vectors(2))
+    assert collection_stats(legacy)["space"] == "l2"
+
+    rebuilt = rebuild_collection(client, "jobs", index={"hnsw:space": "cosine", "hnsw:M": 32})
+    stats = collection_stats(rebuilt)
+    assert (stats["space"], stats["M"], stats["count"]) == ("cosine", 32, 2)
+
+    rebuilt = rebuild_collection(client, "jobs", embed_documents=lambda docs: [[float(len(doc))] * 8 for doc in docs])
+    page = rebuilt.get(ids=["a"], include=["embeddings"])
+    assert list(page["embeddings"][0]) == pytest.approx([5.0] * 8) and collection_stats(rebuilt)["M"] == 32
@@ -0,0 +1,101 @@
+import contextlib
+
+import pytest
+
+import src.config as config
+from src.agents.job_scout import JobScoutAgent
+from src.models import Job
+from src.storage.sqlite import get_job_states, init_db, set_vector_states
+from src.storage.vectordb import VectorWriter, get_chroma_client, get_or_create_collection
+
+
+class _Collection:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def upsert(self, ids, **_fields):
+        if self.fail:
+            raise RuntimeError("disk full")
+        self.batches.append(list(ids))
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Tracer:
+    def span(self, *_args, **_kwargs):
+        return contextlib.nullcontext()
+
+
+def test_writer_flushes_by_size_and_replaces_rebuffered_ids():
+    collection, flushed = _Collection(), []
+    writer = VectorWriter(collection, batch_size=3, flush_interval_s=60, on_flush=flushed.extend)
+    writer.add("a", "doc a", {}, [0.0])
+    writer.add("b", "doc b", {}, [0.0])
+    writer.add("a", "doc a v2", {}, [1.0])
+    assert collection.batches == [] and len(writer) == 2
+    writer.add("c", "doc c", {}, [0.0])
+    assert collection.batches == [["a", "b", "c"]] and flushed == ["a", "b", "c"]
+    with writer:
+        writer.add("d", "doc d", {}, [0.0])
+    assert collection.batches[-1] == ["d"] and writer.written == 4
+
+
+def test_writer_flushes_by_age_and_reports_failed_batches():
+    clock, errors = _Clock(), []
+    writer = VectorWriter(_Collection(), batch_size=100, flush_interval_s=2.0, clock=clock)
+    writer.add("a", "doc", {}, [0.0])
+    clock.now = 1.0
+    writer.add("b", "doc", {}, [0.0])
+    assert writer.collection.batches == []
+    clock.now = 2.5
+    writer.add("c", "doc", {}, [0.0])
+    assert writer.collection.batches == [["a", "b", "c"]]
+
+    failing = VectorWriter(_Collection(fail=True), batch_size=2, on_error=lambda ids, exc: errors.append((ids, str(exc))))
+    failing.add("x", "doc", {}, [0.0])
+    failing.add("y", "doc", {}, [0.0])
+    assert errors == [(["x", "y"], "disk full")] and failing.failed == 2 and len(failing) == 0
+
+
+def _job(i):
+    return Job(job_id=f"j{i}", title=f"Engineer {i}", company="Acme", url=f"https://acme.dev/{i}", source="s", description=f"python role {i}")
+
+
+def test_interrupted_batch_is_reconciled(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SQLITE_PATH", str(tmp_path / "app.db"))
+    monkeypatch.setattr(config, "NEAR_DUP_THRESHOLD", 0.0)
+    init_db()
+    collection = get_or_create_collection(get_chroma_client(str(tmp_path / "vdb")), "jobs")
+    scout = JobScoutAgent(collection)
+    embedded = []
+
+    def _embed(text, **_kwargs):
+        if "role 3" in text:
+            raise KeyboardInterrupt
+        embedded.append(text)
+        return [float(len(text)), 1.0]
+
+    monkeypatch.setattr("src.agents.job_scout.embed", _embed)
+    scout._store_jobs([_job(0), _job(1)], _Tracer(), set(), {})
+    assert collection.count() == 2
+    with pytest.raises(KeyboardInterrupt):
+        scout._store_jobs([_job(2), _job(3)], _Tracer(), set(), {})
+    states = get_job_states([f"j{i}" for i in range(4)])
+    assert [states[f"j{i}"][1] for i in range(4)] == ["stored", "stored", "pending", "pending"]
+    assert collection.count() == 2  # j2's vector was still buffered
+
+    set_vector_states(["j1"], "pending")  # written, but the run died before recording it
+    monkeypatch.setattr("src.agents.job_scout.embed", lambda text, **_kwargs: embedded.append(text) or [0.5, 1.0])
+    embedded.clear()
+    assert scout.reconcile_vectors(batch_size=2) == {"checked": 3, "stored": 1, "reembedded": 2, "failed": 0}
+    assert [text.split("\n")[0] for text in embedded] == ["Engineer 2 at Acme ", "Engineer 3 at Acme "]
+    assert {state for _hash, state in get_job_states([f"j{i}" for i in range(4)]).values()} == {"stored"}
+    assert collection.count() == 4
+    assert scout.reconcile_vectors()["checked"] == 0